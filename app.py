@@ -1,27 +1,36 @@
 # app.py
 # -*- coding: utf-8 -*-
-import os, sys, re, base64, hashlib
+import os, sys, re, hashlib
 from pathlib import Path
-from dotenv import load_dotenv
+try:  # .env 는 선택 — 없으면 환경변수만 사용
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
 import streamlit as st
 import pandas as pd
 
 # ── 환경설정(.env) ────────────────────────────────────────────────────────────
 ROOT = Path(__file__).resolve().parent
-load_dotenv(ROOT / ".env") or load_dotenv()  # 루트 우선, 없으면 기본 경로 탐색
+if load_dotenv:
+    load_dotenv(ROOT / ".env") or load_dotenv()  # 루트 우선, 없으면 기본 경로 탐색
 
 # ── 경로 상수 ─────────────────────────────────────────────────────────────────
 DATA       = Path("data")              # 베이스 CSV 루트(불변)
 PAGES      = ROOT / "pages"            # Streamlit 멀티페이지 디렉터리
-DRIVER_DIR = ROOT / "driver_image"     # 드라이버 이미지(.png)
-LOGO_DIR   = ROOT / "team_logo"        # 팀 로고(.png)
 
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 # ── 내부 모듈 ─────────────────────────────────────────────────────────────────
 from f1sim.io.save import ensure_save_slot, get_paths
+from f1sim.io.data import read_csv
 from f1sim.core.sim import simulate_round
+from f1sim import jobs, perf
+from f1sim.ui.jobs_panel import take_job, job_busy
+from f1sim.ui.asset_index import asset_index, find_asset, find_driver_img, thumb_url
+
+perf.page_begin("app")     # 맨 끝 perf.page_end() 까지가 이 페이지 렌더
+asset_index()  # 시작 시 에셋 스캔(이후엔 디렉터리가 바뀔 때만 재스캔)
 
 # (옵션) 테마/헤더
 try:
@@ -65,37 +74,10 @@ def _norm_hex(c: str | None) -> str | None:
     if not c.startswith("#"): c = "#" + c
     return c.upper() if re.fullmatch(r"#[0-9A-Fa-f]{6}", c) else None
 
-def _slug(s: str) -> str:
-    s = str(s).lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
-    return s
-
 def _hash_idx(key: str, n: int) -> int:
     if n <= 0: return 0
     return int(hashlib.md5(key.encode("utf-8")).hexdigest(), 16) % n
 
-@st.cache_data(show_spinner=False)
-def _b64(path: str) -> str:
-    p = Path(path)
-    if not p.exists(): return ""
-    data = p.read_bytes()
-    return "data:image/png;base64," + base64.b64encode(data).decode("ascii")
-
-def _best_match_png(dirpath: Path, names: list[str]) -> Path | None:
-    if not dirpath.exists(): return None
-    cands = list(dirpath.glob("*.png"))
-    if not cands: return None
-    # 정확 매칭
-    for nm in names:
-        p = dirpath / f"{nm}.png"
-        if p.exists(): return p
-    # 부분 매칭
-    for nm in names:
-        t = nm.lower()
-        for p in cands:
-            if t in p.stem.lower(): return p
-    return None
-
 # ── 루트 선택(세이브 슬롯 경로 주입) ──────────────────────────────────────────
 # 팀이 선택되면: 세이브 슬롯 생성/보장 → 이후 모든 CSV는 슬롯에서 읽기/쓰기
 # 팀이 없으면: 베이스(DATA)에서 읽기(읽기 전용)
@@ -113,9 +95,9 @@ else:
              "tracks": DATA / "tracks.csv"}
 
 # ── CSV 로드(현재 루트 기준) ─────────────────────────────────────────────────
-teams   = pd.read_csv(paths["teams"])
-drivers = pd.read_csv(paths["drivers"])
-tracks  = pd.read_csv(paths["tracks"]).sort_values("round")
+teams   = read_csv(paths["teams"])
+drivers = read_csv(paths["drivers"])
+tracks  = read_csv(paths["tracks"]).sort_values("round")
 
 # round 기본값 세팅(최초 1회)
 if st.session_state["round"] is None:
@@ -147,21 +129,14 @@ for tid, nm in team_map.items():
 
 def _find_team_logo(team_id: str) -> Path | None:
     disp = team_display_name.get(str(team_id), team_map.get(str(team_id), str(team_id)))
-    exact = LOGO_DIR / f"{disp}.png"
-    if exact.exists(): return exact
-    p = _best_match_png(LOGO_DIR, [disp, _slug(disp), team_map.get(str(team_id), ""), _slug(team_map.get(str(team_id), ""))])
+    p = find_asset("logo", disp, team_map.get(str(team_id), ""))
     if p: return p
-    if LOGO_DIR.exists():
-        cands = list(LOGO_DIR.glob("*.png"))
-        if cands: return cands[_hash_idx(str(team_id), len(cands))]
+    cands = list(asset_index()["logo"].values())
+    if cands: return cands[_hash_idx(str(team_id), len(cands))]
     return None
 
 def _find_driver_img_by_name(name: str) -> Path | None:
-    if not isinstance(name, str): return None
-    s = _slug(name)
-    parts = name.split()
-    last = _slug(parts[-1]) if parts else s
-    return _best_match_png(DRIVER_DIR, [name, s, last])
+    return find_driver_img(name)
 
 def get_team_drivers(team_id: str) -> list[dict]:
     df = drivers[drivers[col_team].astype(str) == str(team_id)].copy()
@@ -187,7 +162,7 @@ def card_team_summary(team_id: str) -> str:
     def duo(img1, img2, h=200):
         def tag(p):
             if p and Path(p).exists():
-                return f'<img src="{_b64(str(p))}" style="width:100%; height:100%; object-fit:cover; display:block;"/>'
+                return f'<img src="{thumb_url(p, "hero")}" style="width:100%; height:100%; object-fit:cover; display:block;"/>'
             return '<div style="width:100%; height:100%; background:#0f0f13;"></div>'
         return f'''
 <div style="width:100%; height:{h}px; background:#0f0f13; overflow:hidden; display:flex; gap:2px;">
@@ -198,7 +173,7 @@ def card_team_summary(team_id: str) -> str:
     def logo(box=80, img=44):
         box_css = f"width:{box}px; height:{box}px; background:{team_bg}; border:1px solid {F1['border']}; border-radius:12px; display:grid; place-items:center;"
         if logo_p and logo_p.exists():
-            return f'<div style="{box_css}"><img src="{_b64(str(logo_p))}" style="width:{img}px; height:{img}px; object-fit:contain; display:block;"/></div>'
+            return f'<div style="{box_css}"><img src="{thumb_url(logo_p, "logo")}" style="width:{img}px; height:{img}px; object-fit:contain; display:block;"/></div>'
         return f'<div style="{box_css}; color:#777;">?</div>'
 
     def row(d):
@@ -287,11 +262,18 @@ st.markdown(
 # ── (선택) 스모크 테스트: 시뮬 1라운드 실행 버튼 ───────────────────────────────
 with st.expander("개발자 도구 · 스모크 테스트", expanded=False):
     st.caption("세이브 슬롯 루트에서 퀄리/레이스를 1회 실행합니다.")
-    if st.button("라운드 시뮬레이션 실행", help="현재 round 값을 사용해 quali/race CSV를 세이브 슬롯에 기록"):
-        try:
-            qdf, rdf = simulate_round(round_no, root=ROOT_IO)
-            st.success("시뮬 완료. 아래 미리보기와 세이브 슬롯 sim/ 폴더를 확인하세요.")
-            st.dataframe(qdf.head(10), use_container_width=True)
-            st.dataframe(rdf.head(10), use_container_width=True)
-        except Exception as e:
-            st.error(f"시뮬 실패: {e}")
+    engine = st.radio("레이스 엔진", ["lap", "events"], horizontal=True, key="race_engine",
+                      help="events: 이산 사건 엔진(피트레인 점유·더블 스택·SC 줄서기)")
+    if st.button("라운드 시뮬레이션 실행", help="현재 round 값을 사용해 quali/race CSV를 세이브 슬롯에 기록",
+                 disabled=job_busy("sim_round_job")):
+        st.session_state["sim_round_job"] = jobs.submit(
+            "simulate_round", simulate_round, round_no, root=ROOT_IO, engine=engine,
+            key=f"sim_round:{ROOT_IO}|{round_no}|{engine}")
+    out = take_job("sim_round_job", "라운드 시뮬레이션")
+    if out:
+        qdf, rdf = out
+        st.success("시뮬 완료. 아래 미리보기와 세이브 슬롯 sim/ 폴더를 확인하세요.")
+        st.dataframe(qdf.head(10), use_container_width=True)
+        st.dataframe(rdf.head(10), use_container_width=True)
+
+perf.page_end()
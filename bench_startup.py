@@ -0,0 +1,144 @@
+# bench_startup.py
+# 콜드 스타트 측정: 페이지별 첫 렌더 시간 + 모듈별 import 시간
+# 실행:  python bench_startup.py [페이지 ...] [--top 15] [--team MCL] [--save-dir 경로] [--json out.json]
+#        페이지를 생략하면 app.py + pages/*.py 전부. 페이지마다 새 파이썬 프로세스(-X importtime)에서
+#        Streamlit AppTest 로 스크립트를 한 번(첫 렌더 = 서버 쪽 첫 화면까지) + 한 번 더(리런) 실행한다.
+#        무거운 선택 모듈(openai/jsonschema/svgpathtools/dotenv)이 첫 렌더에 올라왔는지도 표시.
+#        --save-dir 가 없으면 data/*.csv 를 복사한 임시 세이브 슬롯을 쓰고 끝나면 지운다.
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+BASE_FILES = ("teams.csv", "drivers.csv", "tracks.csv")    # f1sim.io.save 와 같은 세이브 슬롯 구성
+HEAVY = ("openai", "jsonschema", "svgpathtools", "dotenv")
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _child(page: str, save_dir: str, team: str) -> None:
+    """자식 프로세스: 페이지 첫 렌더/리런 시간을 JSON 한 줄로 stdout 에."""
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    t_st = time.perf_counter() - t0
+    at = AppTest.from_file(str(BASE_DIR / page), default_timeout=300)
+    if save_dir:
+        at.session_state["save_dir"] = save_dir
+    if team:
+        at.session_state["team_id"] = team
+    t1 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t1
+    t2 = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - t2
+    print(json.dumps({
+        "page": page,
+        "streamlit_import_ms": round(t_st * 1000, 1),
+        "first_render_ms": round(first * 1000, 1),
+        "rerun_ms": round(rerun * 1000, 1),
+        "exception": [str(e.value)[:200] for e in at.exception][:1],
+        "heavy_loaded": [m for m in HEAVY if m in sys.modules],
+    }, ensure_ascii=False))
+
+
+def _parse_importtime(stderr: str) -> list:
+    """-X importtime 출력 → [{module, self_ms, cumulative_ms, depth}] (최상위 패키지 기준 아님, 전부)."""
+    rows = []
+    for ln in stderr.splitlines():
+        m = _IMPORTTIME.match(ln)
+        if m:
+            rows.append({"module": m.group(4), "self_ms": int(m.group(1)) / 1000.0,
+                         "cumulative_ms": int(m.group(2)) / 1000.0, "depth": len(m.group(3)) // 2})
+    return rows
+
+
+def bench_page(page: str, save_dir: str, team: str, top: int) -> dict:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable, "-X", "importtime", __file__, "--child", page,
+                        "--save-dir", save_dir, "--team", team],
+                       cwd=BASE_DIR, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    res = None
+    for ln in p.stdout.splitlines()[::-1]:
+        if ln.startswith("{"):
+            res = json.loads(ln)
+            break
+    if res is None:
+        res = {"page": page, "exception": [p.stderr.strip().splitlines()[-1] if p.stderr.strip() else f"exit {p.returncode}"]}
+    imports = _parse_importtime(p.stderr)
+    # 최상위(depth 0) 모듈의 누적 시간으로 순위 — 측정 도구 자체(AppTest) import 는 뺀다
+    top_lvl = sorted((r for r in imports if r["depth"] == 0 and not r["module"].startswith("streamlit.testing")),
+                     key=lambda r: -r["cumulative_ms"])
+    res["process_ms"] = round(wall * 1000, 1)
+    res["import_total_ms"] = round(sum(r["cumulative_ms"] for r in top_lvl), 1)
+    res["top_imports"] = [{"module": r["module"], "cumulative_ms": round(r["cumulative_ms"], 1)} for r in top_lvl[:top]]
+    return res
+
+
+def _fmt(res: dict, top: int) -> str:
+    lines = [f"── {res['page']}"]
+    if "first_render_ms" in res:
+        lines.append(f"   첫 렌더 {res['first_render_ms']:.0f} ms · 리런 {res['rerun_ms']:.0f} ms · "
+                     f"streamlit import {res['streamlit_import_ms']:.0f} ms · 프로세스 {res['process_ms']:.0f} ms")
+        lines.append(f"   import 합계(측정 도구 제외) {res['import_total_ms']:.0f} ms · 무거운 선택 모듈: "
+                     f"{', '.join(res['heavy_loaded']) or '없음'}")
+    if res.get("exception"):
+        lines.append(f"   ! 예외: {res['exception'][0]}")
+    for r in res.get("top_imports", [])[:top]:
+        lines.append(f"     {r['cumulative_ms']:8.1f} ms  {r['module']}")
+    return "\n".join(lines)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="페이지별 콜드 스타트(첫 렌더)/import 시간 측정")
+    ap.add_argument("pages", nargs="*", help="app.py 기준 상대 경로 (기본: app.py + pages/*.py)")
+    ap.add_argument("--top", type=int, default=10, help="페이지별로 보여 줄 import 상위 개수")
+    ap.add_argument("--save-dir", default="", help="세이브 슬롯 경로(세션 상태 save_dir 로 주입)")
+    ap.add_argument("--team", default="", help="팀 ID(세션 상태 team_id 로 주입 — 팀 선택이 필요한 페이지용)")
+    ap.add_argument("--json", default="", help="결과를 JSON 파일로도 저장")
+    ap.add_argument("--child", default="", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        _child(args.child, args.save_dir, args.team)
+        return
+
+    pages = args.pages or ["app.py"] + sorted(str(p.relative_to(BASE_DIR)) for p in (BASE_DIR / "pages").glob("*.py"))
+    tmp = None
+    save_dir = args.save_dir
+    if not save_dir:
+        tmp = tempfile.TemporaryDirectory(prefix="f1sim_bench_")
+        for name in BASE_FILES:
+            if (BASE_DIR / "data" / name).exists():
+                shutil.copy2(BASE_DIR / "data" / name, Path(tmp.name) / name)
+        save_dir = tmp.name
+    results = []
+    try:
+        for pg in pages:
+            res = bench_page(pg, save_dir, args.team, args.top)
+            results.append(res)
+            print(_fmt(res, args.top), flush=True)
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+    ok = [r for r in results if "first_render_ms" in r]
+    if ok:
+        print(f"\n첫 렌더 중앙값 {sorted(r['first_render_ms'] for r in ok)[len(ok)//2]:.0f} ms "
+              f"(최대 {max(r['first_render_ms'] for r in ok):.0f} ms, {len(ok)}/{len(results)} 페이지)")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[저장] {args.json}")
+
+
+if __name__ == "__main__":
+    main()
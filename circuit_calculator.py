@@ -1,20 +1,32 @@
 # prep_circuit_metrics.py
 # 1단계: 모든 서킷 SVG를 스캔해 길이/시간 보정용 메트릭 CSV 생성
 # 사용 전 설치:  pip install svgpathtools pandas
+# 실행:  python circuit_calculator.py [--force] [--jobs N] [--watch]
+#        바뀐 서킷(SVG 내용/tracks.csv 행)만 다시 계산, --watch 는 저장할 때마다 재보정
 
 import os
 import re
+import sys
 import json
 import math
+import time
+import base64
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 
+import numpy as np
 import pandas as pd
 try:
-    from svgpathtools import parse_path, Path as SvgPath
+    import svgpathtools  # noqa: F401  (평탄화는 f1sim.core.svg_geom)
 except ImportError as e:
     raise SystemExit("svgpathtools 가 필요합니다. 먼저 설치하세요:  pip install svgpathtools") from e
 
+from f1sim.core.svg_geom import Polyline, flatten_d, project, arc_between, simplify
+from f1sim.engine.speed_profile import build_speed_profile
+
 import xml.etree.ElementTree as ET
 
 # ---- 경로 구성 (test4.py 와 같은 경로 기준) ----
@@ -25,6 +37,23 @@ INFO_DIR.mkdir(exist_ok=True)
 
 TRACKS_CSV  = INFO_DIR / "tracks.csv"
 OUT_CSV     = INFO_DIR / "circuit_calibration.csv"
+LUT_DIR     = INFO_DIR / "track_lut"      # 세션 페이지용 호길이 LUT (서킷별 JSON)
+CACHE_JSON  = INFO_DIR / ".calibration_cache.json"   # 서킷별 결과 캐시 (증분 보정)
+
+# LUT 재샘플 간격(px) / 곡선 세그먼트 평탄화 샘플 수
+LUT_STEP_PX     = 2.0
+LUT_SEG_SAMPLES = 24
+LUT_VERSION     = 2
+
+# 페이지용 경량 트랙 모양(LUT JSON 의 shape): 단순화 허용 오차 / 좌표 자릿수 / 길이 상대 오차 상한
+SHAPE_TOL_PX    = 0.35
+SHAPE_DECIMALS  = 1
+SHAPE_LEN_TOL   = 2e-3
+
+# 캐시 키에 섞는 계산 버전 — 보정 로직을 바꾸면 올릴 것
+CALIB_VERSION   = 2
+# 재계산 대상이 이보다 적으면 프로세스 풀 없이 바로 처리(풀 기동 비용 > 계산 비용)
+POOL_MIN_JOBS   = 6
 
 # tracks.csv 에 랩타임 없을 때 추정 속도
 DEFAULT_BASE_KMH = 220.0
@@ -86,49 +115,186 @@ def _grab_markers_from_metadata(root: ET.Element) -> Dict[str, Any]:
     return {}
 
 # --------------- 기하/길이 계산 helpers ---------------
+# 모든 길이/투영은 f1sim.core.svg_geom 의 평탄화 폴리라인(경로 d 당 1회)을 공유한다.
 def _path_len_px(d: Optional[str]) -> float:
-    if not d:
-        return 0.0
-    try:
-        p = parse_path(d)
-        return float(p.length(error=1e-3))
-    except Exception:
-        return 0.0
+    poly = flatten_d(d, LUT_SEG_SAMPLES) if d else None
+    return poly.length if poly else 0.0
 
-def _nearest_s(path: SvgPath, x: float, y: float, samples: int = 4000) -> float:
-    """점(x,y)에 가장 가까운 경로상의 아크길이 s(px) 근사"""
-    L = float(path.length(error=1e-3))
-    best_s, best_d2 = 0.0, 1e30
-    for i in range(samples+1):
-        s = (L * i) / samples
-        try:
-            t = path.ilength(s, error=1e-3)
-            z = path.point(t)
-        except Exception:
-            # 최후: 파라미터 t 균등 샘플
-            t = i / samples
-            z = path.point(t)
-        dx, dy = (z.real - x), (z.imag - y)
-        d2 = dx*dx + dy*dy
-        if d2 < best_d2:
-            best_d2, best_s = d2, s
-    return best_s
+def _nearest_s(poly: Polyline, x: float, y: float) -> float:
+    """점(x,y)에 가장 가까운 경로상의 아크길이 s(px) — 선분 최근접 투영"""
+    return float(project(poly, (x, y))[0])
 
 def _pit_segment_len_px(pit_d: Optional[str], pit_in_xy: Optional[Tuple[float,float]], pit_out_xy: Optional[Tuple[float,float]]) -> float:
     if not pit_d or not pit_in_xy or not pit_out_xy:
         return 0.0
-    try:
-        pit_path = parse_path(pit_d)
-        L = float(pit_path.length(error=1e-3))
-        s_in  = _nearest_s(pit_path, pit_in_xy[0],  pit_in_xy[1])
-        s_out = _nearest_s(pit_path, pit_out_xy[0], pit_out_xy[1])
-        if L <= 0:
-            return 0.0
-        # 경로 진행 방향 기준 in→out 아크길이
-        seg = (s_out - s_in) if s_out >= s_in else (L - s_in + s_out)
-        return float(seg)
-    except Exception:
+    poly = flatten_d(pit_d, LUT_SEG_SAMPLES)
+    if poly is None or poly.length <= 0:
         return 0.0
+    # 경로 진행 방향 기준 in→out 아크길이
+    return arc_between(poly, pit_in_xy, pit_out_xy)
+
+# --------------- 호길이 LUT ---------------
+def _resample_polyline(poly: Polyline, step_px: float = LUT_STEP_PX):
+    """호길이 균등 재샘플 → (xy(N,2), tan(N,2), 길이). s_i = i/(N-1) 이 곧 누적 호길이 비율."""
+    cum = poly.cum
+    L = poly.length
+    n = max(64, int(math.ceil(L / max(0.25, step_px))) + 1)
+    s = np.linspace(0.0, L, n)
+    xy = np.stack([np.interp(s, cum, poly.xy[:, 0]), np.interp(s, cum, poly.xy[:, 1])], axis=1)
+
+    closed = np.hypot(*(xy[0] - xy[-1])) < 1e-3 * max(1.0, L)
+    if closed:
+        nxt = np.roll(xy, -1, axis=0); nxt[-1] = xy[1]
+        prv = np.roll(xy, 1, axis=0);  prv[0] = xy[-2]
+    else:
+        nxt = np.vstack([xy[1:], xy[-1:]])
+        prv = np.vstack([xy[:1], xy[:-1]])
+    tan = nxt - prv
+    tan /= np.maximum(np.hypot(tan[:, 0], tan[:, 1]), 1e-12)[:, None]
+    return xy, tan, L
+
+def _nearest_s_poly(xy: np.ndarray, p: Tuple[float, float]) -> float:
+    """균등 재샘플 폴리라인 위 최근접 s(0~1). 최근접 샘플 양쪽 선분에 투영해 보정."""
+    n = len(xy)
+    d2 = (xy[:, 0] - p[0]) ** 2 + (xy[:, 1] - p[1]) ** 2
+    i = int(np.argmin(d2))
+    best_s, best_d = i / (n - 1), float(d2[i])
+    for j in (i - 1, i):
+        if j < 0 or j + 1 >= n:
+            continue
+        a, b = xy[j], xy[j + 1]
+        ab = b - a
+        den = float(ab @ ab)
+        if den <= 0:
+            continue
+        u = min(1.0, max(0.0, float((np.asarray(p) - a) @ ab) / den))
+        q = a + u * ab
+        d = float(((q - p) ** 2).sum())
+        if d < best_d:
+            best_d, best_s = d, (j + u) / (n - 1)
+    return best_s
+
+def _q(v: float) -> float:
+    return round(float(v), SHAPE_DECIMALS) + 0.0   # -0.0 방지
+
+def _num(v: float) -> str:
+    s = f"{_q(v):.{SHAPE_DECIMALS}f}".rstrip("0").rstrip(".")
+    return s if s not in ("", "-0") else "0"
+
+def _shape_d(poly: Optional[Polyline]) -> Optional[str]:
+    """
+    폴리라인 → 단순화·양자화한 path d ("M x y L x y ...").
+    길이가 원본 대비 SHAPE_LEN_TOL 넘게 달라지면 허용 오차를 줄여 다시 한다.
+    """
+    if poly is None:
+        return None
+    tol = SHAPE_TOL_PX
+    for _ in range(6):
+        xy = np.round(simplify(poly.xy, tol), SHAPE_DECIMALS)
+        xy = xy[np.concatenate([[True], np.any(np.diff(xy, axis=0) != 0, axis=1)])]
+        L = float(np.hypot(*np.diff(xy, axis=0).T).sum())
+        if abs(L - poly.length) <= SHAPE_LEN_TOL * max(1.0, poly.length):
+            break
+        tol *= 0.5
+    return "M" + "L".join(f"{_num(x)} {_num(y)}" for x, y in xy)
+
+def _finish_line(root: ET.Element) -> Optional[list]:
+    """polyline#finish / line#finish 의 첫 두 점 [x1,y1,x2,y2]."""
+    for el in root.iter():
+        if el.get("id") != "finish":
+            continue
+        tag = _localname(el.tag)
+        try:
+            if tag == "polyline":
+                pts = [tuple(map(float, q.split(","))) for q in (el.get("points") or "").split()]
+                if len(pts) >= 2:
+                    return [pts[0][0], pts[0][1], pts[1][0], pts[1][1]]
+            elif tag == "line":
+                return [float(el.get(k)) for k in ("x1", "y1", "x2", "y2")]
+        except Exception:
+            pass
+    return None
+
+def build_track_shape(root: ET.Element, poly_m: Optional[Polyline], poly_p: Optional[Polyline],
+                      markers: Dict[str, Optional[Tuple[float, float]]]) -> Dict[str, Any]:
+    """
+    세션 페이지가 SVG 원본 대신 쓰는 최소 트랙 모양.
+    main/pit 단순화 d, viewBox, 결승선, 피트 마커만 남기고 metadata·그리드 점 등은 버린다.
+    """
+    fin = _finish_line(root)
+    return {
+        "view": root.get("viewBox") or "0 0 1200 800",
+        "main": _shape_d(poly_m),
+        "pit": _shape_d(poly_p),
+        "finish": [_q(v) for v in fin] if fin else None,
+        "markers": {k: ([_q(p[0]), _q(p[1])] if p else None)
+                    for k, p in ((k, markers.get(k)) for k in ("pitIn", "pitOut", "pitStop"))},
+    }
+
+def _lut_entry(xy: np.ndarray, tan: np.ndarray, L: float) -> Dict[str, Any]:
+    buf = np.concatenate([xy, tan], axis=1).astype("<f4").tobytes()   # [x,y,tx,ty]*N
+    return {"n": int(len(xy)), "len_px": round(L, 3),
+            "data": base64.b64encode(buf).decode("ascii")}
+
+def build_track_lut(svg_path: Path, markers: Dict[str, Optional[Tuple[float, float]]],
+                    step_px: float = LUT_STEP_PX, lap_sec: Optional[float] = None,
+                    length_km: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    세션 페이지용 트랙 LUT.
+      main/pit: 호길이 균등 재샘플 [x,y,tx,ty] float32 (base64)
+      s: finish/mainOut/pitStop/pitOut/pitInMain/pitInPit (0~1, 없으면 null → JS 기본값)
+      shape: 그리기용 최소 트랙 모양(build_track_shape) — 있으면 페이지는 SVG를 받지 않는다
+      speed: main 곡률 기반 속도 배율 m(s) (f1sim.engine.speed_profile, lap_sec 기준 정규화)
+    """
+    raw = svg_path.read_bytes()
+    root = ET.fromstring(raw)
+    d_main = _find_path_d(root, "main")
+    poly_m = flatten_d(d_main, LUT_SEG_SAMPLES) if d_main else None
+    if poly_m is None:
+        return None
+    d_pit = _find_path_d(root, "pit")
+    poly_p = flatten_d(d_pit, LUT_SEG_SAMPLES) if d_pit else None
+
+    xy_m, tan_m, L_m = _resample_polyline(poly_m, step_px)
+    out: Dict[str, Any] = {
+        "version": LUT_VERSION,
+        "svg_sha1": hashlib.sha1(raw).hexdigest()[:12],
+        "step_px": step_px,
+        "main": _lut_entry(xy_m, tan_m, L_m),
+        "pit": None,
+        "s": {},
+        "shape": build_track_shape(root, poly_m, poly_p, markers),
+        "speed": build_speed_profile(xy_m, L_m, lap_sec, length_km),
+    }
+    xy_p = None
+    if poly_p is not None:
+        xy_p, tan_p, L_p = _resample_polyline(poly_p, step_px)
+        out["pit"] = _lut_entry(xy_p, tan_p, L_p)
+
+    def on(xy, p):
+        return None if (xy is None or p is None) else round(_nearest_s_poly(xy, p), 6)
+
+    line = _finish_line(root)
+    fin = ((line[0] + line[2]) / 2, (line[1] + line[3]) / 2) if line else None
+    out["s"] = {
+        "finish":    on(xy_m, fin),
+        "mainOut":   on(xy_m, markers.get("pitOut")),
+        "pitStop":   on(xy_p, markers.get("pitStop")),
+        "pitOut":    on(xy_p, markers.get("pitOut")),
+        "pitInMain": on(xy_m, markers.get("pitIn")),
+        "pitInPit":  on(xy_p, markers.get("pitIn")),
+    }
+    return out
+
+def write_track_lut(svg_path: Path, markers: Dict[str, Optional[Tuple[float, float]]],
+                    lap_sec: Optional[float] = None, length_km: Optional[float] = None) -> Optional[Path]:
+    lut = build_track_lut(svg_path, markers, lap_sec=lap_sec, length_km=length_km)
+    if not lut:
+        return None
+    LUT_DIR.mkdir(parents=True, exist_ok=True)
+    out = LUT_DIR / f"{svg_path.stem}.json"
+    out.write_text(json.dumps(lut, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    return out
 
 # --------------- tracks.csv 로드 ---------------
 def _pick_col(df, candidates):
@@ -257,9 +423,10 @@ def process_svg(svg_path: Path, track_info: Optional[Dict[str,Any]]) -> Dict[str
     data["main_len_px"] = round(main_len, 3) if main_len else None
 
     # pit 마커 찾기: id 우선, 없으면 metadata JSON
-    pit_in_xy  = _grab_point_by_id(root, "pitIn")
-    pit_out_xy = _grab_point_by_id(root, "pitOut")
-    if (pit_in_xy is None or pit_out_xy is None):
+    pit_in_xy   = _grab_point_by_id(root, "pitIn")
+    pit_out_xy  = _grab_point_by_id(root, "pitOut")
+    pit_stop_xy = _grab_point_by_id(root, "pitStop")
+    if (pit_in_xy is None or pit_out_xy is None or pit_stop_xy is None):
         md = _grab_markers_from_metadata(root)
         def _pick_xy(o, k):
             try:
@@ -273,6 +440,8 @@ def process_svg(svg_path: Path, track_info: Optional[Dict[str,Any]]) -> Dict[str
             pit_in_xy = _pick_xy(md, "pitIn")
         if pit_out_xy is None and md:
             pit_out_xy = _pick_xy(md, "pitOut")
+        if pit_stop_xy is None and md:
+            pit_stop_xy = _pick_xy(md, "pitStop")
 
     pit_len = _pit_segment_len_px(d_pit, pit_in_xy, pit_out_xy)
     data["pit_len_px"] = round(pit_len, 3) if pit_len else None
@@ -291,6 +460,14 @@ def process_svg(svg_path: Path, track_info: Optional[Dict[str,Any]]) -> Dict[str
         data["lap_sec_csv"] = est
         data["lap_sec_src"] = f"estimated({DEFAULT_BASE_KMH}km/h)"
 
+    # 세션 페이지용 호길이 LUT (info/track_lut/{stem}.json) — 속도 프로파일은 lap_sec_csv 기준
+    if d_main:
+        try:
+            write_track_lut(svg_path, {"pitIn": pit_in_xy, "pitOut": pit_out_xy, "pitStop": pit_stop_xy},
+                            lap_sec=data["lap_sec_csv"], length_km=data["length_km"])
+        except Exception as e:
+            data["notes"] = (data["notes"] + "; " if data["notes"] else "") + f"lut error: {e}"
+
     # px_per_sec 계산
     if data["main_len_px"] and data["lap_sec_csv"] and data["lap_sec_csv"] > 0:
         px_per_sec = data["main_len_px"] / data["lap_sec_csv"]
@@ -309,38 +486,176 @@ def process_svg(svg_path: Path, track_info: Optional[Dict[str,Any]]) -> Dict[str
 
     return data
 
-# --------------- 메인 ---------------
-def main():
+# --------------- 증분 보정 (서킷별 캐시) ---------------
+CSV_COLS = [
+    "file","circuit","main_len_px","pit_len_px",
+    "lap_sec_csv","lap_sec_src","length_km",
+    "px_per_sec","sec_per_px","pit_travel_sec","notes"
+]
+
+def _plain(v):
+    """pd.NA / numpy 스칼라 → JSON 가능한 파이썬 값"""
+    if v is None:
+        return None
+    try:
+        if pd.isna(v):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return v.item() if isinstance(v, np.generic) else v
+
+def _calib_key(svg_bytes: bytes, track_info: Optional[Dict[str, Any]]) -> str:
+    """SVG 내용 + 매칭된 tracks.csv 행 + 계산 파라미터 해시"""
+    h = hashlib.sha1(svg_bytes)
+    h.update(json.dumps(track_info, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    h.update(f"|{CALIB_VERSION}|{LUT_VERSION}|{LUT_STEP_PX}|{LUT_SEG_SAMPLES}|{DEFAULT_BASE_KMH}".encode())
+    return h.hexdigest()
+
+def _load_cache() -> Dict[str, Any]:
+    try:
+        obj = json.loads(CACHE_JSON.read_text(encoding="utf-8"))
+        if obj.get("version") == CALIB_VERSION and isinstance(obj.get("entries"), dict):
+            return obj["entries"]
+    except Exception:
+        pass
+    return {}
+
+def _save_cache(entries: Dict[str, Any]) -> None:
+    tmp = CACHE_JSON.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": CALIB_VERSION, "entries": entries}, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(CACHE_JSON)
+
+def _calibrate_one(svg_path: Path, track_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """서킷 1개 보정(+LUT 기록). 프로세스 풀에서 호출되므로 모듈 최상위 함수."""
+    row = process_svg(svg_path, track_info)
+    # 매칭된 정식 이름이 있으면 덮어쓰기
+    if track_info and isinstance(track_info.get("name"), str):
+        row["circuit"] = track_info["name"].strip()
+    return {k: _plain(v) for k, v in row.items()}
+
+def _run_jobs(todo, jobs: Optional[int]) -> Dict[str, Dict[str, Any]]:
+    """변경된 서킷들 계산. 많으면 프로세스 풀로 분산, 풀 실패 시 직렬."""
+    out: Dict[str, Dict[str, Any]] = {}
+    workers = min(len(todo), jobs or os.cpu_count() or 1)
+    if workers > 1 and len(todo) >= POOL_MIN_JOBS:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                futs = {svg.name: ex.submit(_calibrate_one, svg, info) for svg, info, _ in todo}
+                for name, f in futs.items():
+                    out[name] = f.result()
+            return out
+        except (OSError, RuntimeError) as e:   # 풀 생성 불가 환경(BrokenProcessPool 포함)
+            print(f"[경고] 프로세스 풀 실패 → 직렬 처리: {e}", file=sys.stderr)
+            out.clear()
+    for svg, info, _ in todo:
+        out[svg.name] = _calibrate_one(svg, info)
+    return out
+
+def calibrate(jobs: Optional[int] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    circuit/*.svg 증분 보정.
+    캐시 키(SVG 내용 + tracks.csv 행)가 그대로이고 LUT 파일이 있으면 이전 결과 재사용,
+    바뀐 서킷만 다시 계산한다. CSV는 변경이 있을 때만 다시 쓴다.
+    """
     if not CIRCUIT_DIR.exists():
         raise SystemExit(f"circuit 폴더가 없습니다: {CIRCUIT_DIR}")
 
     tracks_df = load_tracks(TRACKS_CSV)
+    cache = _load_cache()
 
-    rows = []
+    rows: Dict[str, Dict[str, Any]] = {}
+    keys: Dict[str, str] = {}
+    todo = []
     for svg in sorted(CIRCUIT_DIR.glob("*.svg")):
         track_info = match_track(tracks_df, svg.stem) if not tracks_df.empty else None
-        row = process_svg(svg, track_info)
-        # 매칭된 정식 이름이 있으면 덮어쓰기
-        if track_info and "name" in track_info and isinstance(track_info["name"], str):
-            row["circuit"] = track_info["name"].strip()
-        rows.append(row)
-
-    # CSV 저장
-    cols = [
-        "file","circuit","main_len_px","pit_len_px",
-        "lap_sec_csv","lap_sec_src","length_km",
-        "px_per_sec","sec_per_px","pit_travel_sec","notes"
-    ]
-    df = pd.DataFrame(rows, columns=cols)
-    df.to_csv(OUT_CSV, index=False, encoding="utf-8-sig")
-
-    # 요약 출력
-    print(f"[완료] {len(rows)}개 서킷 분석 → {OUT_CSV}")
+        if track_info is not None:
+            track_info = {k: _plain(v) for k, v in track_info.items()}
+        key = _calib_key(svg.read_bytes(), track_info)
+        keys[svg.name] = key
+        hit = cache.get(svg.name)
+        if (not force and hit and hit.get("key") == key
+                and (hit["row"].get("main_len_px") is None or (LUT_DIR / f"{svg.stem}.json").exists())):
+            rows[svg.name] = hit["row"]
+        else:
+            todo.append((svg, track_info, key))
+
+    rows.update(_run_jobs(todo, jobs) if todo else {})
+    removed = sorted(set(cache) - set(keys))
+    entries = {name: {"key": keys[name], "row": rows[name]} for name in keys}
+
+    df = pd.DataFrame([rows[name] for name in keys], columns=CSV_COLS)
+    if todo or removed or not OUT_CSV.exists():
+        df.to_csv(OUT_CSV, index=False, encoding="utf-8-sig")
+    if entries != cache:
+        _save_cache(entries)
+    return {"df": df, "changed": [svg.name for svg, _, _ in todo], "removed": removed}
+
+def _report(res: Dict[str, Any], dt: float) -> None:
+    df = res["df"]
+    print(f"[완료] {len(df)}개 서킷 (재계산 {len(res['changed'])}, 캐시 {len(df) - len(res['changed'])}) "
+          f"{dt * 1000:.0f} ms → {OUT_CSV}")
+    print(f"       트랙 LUT → {LUT_DIR}")
     warn = df[df["notes"].notna() & (df["notes"]!="")]
     if not warn.empty:
         print("\n다음 항목은 확인 필요:")
         for _, r in warn.iterrows():
             print(f" - {r['file']}: {r['notes']}")
 
+# --------------- 감시 모드 ---------------
+def _snapshot() -> Dict[str, Tuple[int, int]]:
+    """circuit/*.svg + tracks.csv 의 (mtime_ns, size)"""
+    snap = {}
+    for p in [*CIRCUIT_DIR.glob("*.svg"), TRACKS_CSV]:
+        try:
+            st = p.stat()
+            snap[p.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+    return snap
+
+def watch(interval: float = 0.5, jobs: Optional[int] = None) -> None:
+    """파일 변경을 폴링하다가 바뀐 서킷만 다시 보정 (Ctrl+C 로 종료)"""
+    print(f"[watch] {CIRCUIT_DIR} 감시 중 (Ctrl+C 종료)")
+    snap = _snapshot()
+    try:
+        while True:
+            time.sleep(interval)
+            cur = _snapshot()
+            if cur == snap:
+                continue
+            # 편집기가 저장을 끝낼 때까지 잠깐 대기(연속 변경 합치기)
+            while True:
+                time.sleep(min(0.2, interval))
+                nxt = _snapshot()
+                if nxt == cur:
+                    break
+                cur = nxt
+            touched = sorted(k for k in set(cur) | set(snap) if cur.get(k) != snap.get(k))
+            snap = cur
+            t0 = time.perf_counter()
+            try:
+                res = calibrate(jobs)
+            except Exception as e:
+                print(f"[watch] 실패: {e}", file=sys.stderr)
+                continue
+            print(f"[watch] 변경: {', '.join(touched)}")
+            _report(res, time.perf_counter() - t0)
+    except KeyboardInterrupt:
+        print("[watch] 종료")
+
+# --------------- 메인 ---------------
+def main():
+    ap = argparse.ArgumentParser(description="서킷 SVG 보정 메트릭/트랙 LUT 생성 (증분)")
+    ap.add_argument("--force", action="store_true", help="캐시 무시하고 전부 다시 계산")
+    ap.add_argument("--jobs", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--watch", action="store_true", help="circuit/ 변경 감시 후 바뀐 서킷만 재보정")
+    ap.add_argument("--interval", type=float, default=0.5, help="감시 폴링 간격(초)")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    _report(calibrate(args.jobs, args.force), time.perf_counter() - t0)
+    if args.watch:
+        watch(args.interval, args.jobs)
+
 if __name__ == "__main__":
     main()
@@ -6,6 +6,9 @@ from typing import List, Dict, Tuple
 import pandas as pd
 import math
 
+from ..io.data import read_csv, write_csv
+from ..perf import timed
+
 # 팀 측정치 스케일(권장값)
 PIT_GAIN_POINT_FACTOR = 10.0   # 0..1 → 0..10p 가산
 MORALE_POINT_FACTOR   = 5.0    # Δmorale 실효 반영 배율(팀 사기)
@@ -17,6 +20,7 @@ def _clip(x, lo=CLIP_MIN, hi=CLIP_MAX):
 def _risk_mult(risk: str) -> float:
     return {"low":1.0, "mid":0.85, "high":0.7}.get((risk or "mid").lower(), 0.85)
 
+@timed("effects.crew_training", "effects")
 def apply_crew_training_effect(state: dict, plan: dict, outcome: dict) -> dict:
     """
     기존 페이지 코드 호환: state(dict) in/out.
@@ -44,6 +48,7 @@ def apply_crew_training_effect(state: dict, plan: dict, outcome: dict) -> dict:
     state["team_morale"] = _clip(float(state["team_morale"]) + morale_d * MORALE_POINT_FACTOR, -50.0, 150.0)
     return state
 
+@timed("effects.hr_side_effects", "effects")
 def apply_hr_side_effects(root: Path, team_id: str,
                           plans: List[dict], outcomes: List[dict]) -> dict:
     """
@@ -60,8 +65,8 @@ def apply_hr_side_effects(root: Path, team_id: str,
     # 로드
     t_p = root / "teams.csv"
     d_p = root / "drivers.csv"
-    teams = pd.read_csv(t_p)
-    drivers = pd.read_csv(d_p)
+    teams = read_csv(t_p)
+    drivers = read_csv(d_p)
 
     # 기본 컬럼 보정
     for col, default in [("dev_speed", 1.00), ("strategy", 75.0), ("reliability", 70.0)]:
@@ -122,8 +127,8 @@ def apply_hr_side_effects(root: Path, team_id: str,
     drivers["tire_mgmt"]= drivers["tire_mgmt"].astype(float).clip(CLIP_MIN, CLIP_MAX)
 
     # 저장
-    teams.to_csv(t_p, index=False, encoding="utf-8")
-    drivers.to_csv(d_p, index=False, encoding="utf-8")
+    write_csv(teams, t_p)
+    write_csv(drivers, d_p)
 
     # 요약
     return {
@@ -1,16 +1,24 @@
 # f1sim/ai/llm_client.py
 # -*- coding: utf-8 -*-
+# openai/jsonschema/dotenv 는 실제로 LLM 을 부를 때 처음 import 한다(페이지 콜드 스타트에서 제외).
+# 키가 없거나 패키지가 없으면 ask_llm_json 호출 시 예외 → 호출하는 쪽의 로컬 폴백으로 빠진다.
 import os, json, hashlib
-from dotenv import load_dotenv
-from openai import OpenAI
-from jsonschema import validate, ValidationError
+from functools import lru_cache
 
-load_dotenv()
-API_KEY = os.getenv("OPENAI_API_KEY")
-if not API_KEY:
-    raise RuntimeError("OPENAI_API_KEY 환경변수가 없습니다. .env에 설정해 주세요.")
+from ..perf import timed, count
 
-client = OpenAI(api_key=API_KEY)
+@lru_cache(maxsize=1)
+def _client():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY 환경변수가 없습니다. .env에 설정해 주세요.")
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
 
 def digest_inputs(obj: dict) -> str:
     import hashlib, json
@@ -66,11 +74,16 @@ def _sanitize_for_schema(schema_name: str, data: dict) -> dict:
     return data
 # ─────────────────────────────────────────────────────────────────────────────
 
+@timed("llm.ask_json", "llm")
 def ask_llm_json(schema: dict, system_prompt: str, user_prompt: str, temperature: float = 0.4) -> dict:
     """
     schema: {"name":"...", "schema":{...}}  (jsonschema dict)
     OpenAI 응답을 스키마로 검증해 dict로 반환.
     """
+    count("llm.calls")
+    client = _client()          # 키/패키지가 없으면 여기서 예외(jsonschema 까지 읽지 않음)
+    from jsonschema import validate, ValidationError
+
     resp = client.chat.completions.create(
         model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
         temperature=temperature,
@@ -12,7 +12,6 @@ RACE_NOISE  = 0.002
 
 # 타이어/전략
 COMPOUNDS   = ["S", "M", "H"]
-BASE_DEG    = {"S": 0.010, "M": 0.006, "H": 0.004}
 ABR_SPLIT   = 0.65    # 마모도 기준: 낮으면 1스톱(2스틴트), 높으면 2스톱(3스틴트)
 
 # 이벤트/신뢰성
@@ -26,3 +25,9 @@ SC_FACTOR   = 0.60    # SC 동안 페이스 배율(느려짐 → 실질 랩타
 VSC_FACTOR  = 0.75
 SC_LAPS     = (3, 5)
 VSC_LAPS    = (1, 3)
+
+# 레이스 엔진: "lap"(드라이버별 합계) | "events"(이산 사건 — 피트레인 점유/더블 스택/SC 줄서기)
+RACE_ENGINE      = "lap"
+PIT_SERVICE_SEC  = 2.6    # 박스 작업 시간(피트 크루 100 기준)
+PIT_RELEASE_GAP  = 1.0    # 피트 출구 최소 간격(초)
+PIT_STACK_GAP    = 0.8    # 더블 스택: 앞차 작업 끝 → 다음 차 작업 시작(초)
@@ -12,13 +12,18 @@ from ..engine.physics import (
     ref_lap_time_sec,
     perf_scalar,
     lap_time_from_perf,
-    stint_multiplier,
     pit_loss_sec,
 )
-from ..engine.events import sample_safety_periods, is_in_any, rain_flag, dnf_flag
+from ..engine.tyres import track_tyres
+from ..engine.weather import track_weather, track_lap_sec, crossover, INTER_AT
+from ..engine.events import sample_safety_periods, is_in_any, dnf_flag
 from ..engine.strategy import choose_strategy
+from ..engine.race_events import CarSpec, PitLane, run_events
 from ..config import QUAL_NOISE, RACE_NOISE, SEED
+from ..config import RACE_ENGINE, PIT_SERVICE_SEC, PIT_RELEASE_GAP, PIT_STACK_GAP
+from ..perf import timed
 from ..config import SC_FACTOR as _SCF, VSC_FACTOR as _VSCF
+from ..io.data import read_csv, write_csv
 
 # 전역 RNG (엔진 내부 SEED와 동일)
 _rng = np.random.default_rng(SEED)
@@ -54,7 +59,7 @@ def _load_pre_bonus_map(root: Path, round_no: int) -> Dict[str, float]:
         return m
     for p in simdir.glob(f"pre_bonus_round_{round_no:02d}_*.csv"):
         try:
-            df = pd.read_csv(p)
+            df = read_csv(p)
             if "driver_id" in df.columns and "bonus_decimal" in df.columns:
                 for _, r in df.iterrows():
                     did = str(r["driver_id"]).strip()
@@ -68,6 +73,7 @@ def _load_pre_bonus_map(root: Path, round_no: int) -> Dict[str, float]:
     return m
 
 
+@timed("sim.load_round", "sim")
 def _load_round(round_no: int, root: Path):
     """
     현재 세이브 루트(root) 기준으로 라운드/팀/드라이버/로스터를 불러온다.
@@ -76,9 +82,9 @@ def _load_round(round_no: int, root: Path):
     """
     root = Path(root)
 
-    tracks = pd.read_csv(root / "tracks.csv")
-    teams = pd.read_csv(root / "teams.csv")
-    drivers = pd.read_csv(root / "drivers.csv")
+    tracks = read_csv(root / "tracks.csv")
+    teams = read_csv(root / "teams.csv")
+    drivers = read_csv(root / "drivers.csv")
 
     assert_csv_schema(tracks, REQUIRED_TRACKS, "tracks")
     assert_csv_schema(teams, REQUIRED_TEAMS, "teams")
@@ -92,7 +98,7 @@ def _load_round(round_no: int, root: Path):
     # (선택) 라운드별 로스터 사용
     roster_path = root / f"roster_round_{round_no:02d}.csv"
     if roster_path.exists():
-        roster = pd.read_csv(roster_path)
+        roster = read_csv(roster_path)
         pairs = [
             (
                 str(r["team_id"]),
@@ -120,6 +126,7 @@ def _load_round(round_no: int, root: Path):
 # ─────────────────────────────────────────────────────────────────────────────
 # 퀄리파잉
 # ─────────────────────────────────────────────────────────────────────────────
+@timed("sim.run_qualifying", "sim")
 def run_qualifying(round_no: int, root: Path) -> pd.DataFrame:
     """
     - root/sim/quali_round_{RR}.csv 저장
@@ -129,7 +136,8 @@ def run_qualifying(round_no: int, root: Path) -> pd.DataFrame:
     (root / "sim").mkdir(parents=True, exist_ok=True)
 
     track, teams, drivers, pairs = _load_round(round_no, root)
-    wet = False  # 퀄리는 기본 건조로 가정
+    # 노면: 결정 세션(Q3) 날씨 타임라인의 평균 젖음
+    wet = bool(track_weather(track, round_no, "Q3").wet.mean() >= INTER_AT)
     ref = ref_lap_time_sec(float(track["length_km"]))
 
     bonus_map = _load_pre_bonus_map(root, round_no)
@@ -162,18 +170,24 @@ def run_qualifying(round_no: int, root: Path) -> pd.DataFrame:
     q["grid_pos"] = range(1, len(q) + 1)
 
     q_path = root / "sim" / f"quali_round_{round_no:02d}.csv"
-    q.to_csv(q_path, index=False, encoding="utf-8")
+    write_csv(q, q_path)
     return q
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 레이스
 # ─────────────────────────────────────────────────────────────────────────────
-def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.DataFrame:
+@timed("sim.run_race", "sim")
+def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None,
+             engine: str | None = None) -> pd.DataFrame:
     """
     - 퀄리 결과(qdf)가 없으면 root/sim/quali_round_{RR}.csv → 없으면 run_qualifying 호출
     - 결과를 root/sim/race_round_{RR}.csv 로 저장
+    - engine: "lap"(기본, config.RACE_ENGINE) | "events"(f1sim/engine/race_events.py).
+      랩타임·전략·DNF 추첨은 같고, "events" 는 피트레인 대기/SC 줄서기까지 사건 순서로 풀어
+      pit_wait_s 열을 더한다.
     """
+    engine = engine or RACE_ENGINE
     root = Path(root)
     (root / "sim").mkdir(parents=True, exist_ok=True)
 
@@ -182,12 +196,14 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
     # 퀄리 결과 확보
     if qdf is None:
         q_path = root / "sim" / f"quali_round_{round_no:02d}.csv"
-        qdf = pd.read_csv(q_path) if q_path.exists() else run_qualifying(round_no, root)
+        qdf = read_csv(q_path) if q_path.exists() else run_qualifying(round_no, root)
 
     # 레이스 파라미터
     laps = int(track["laps"])
     ref = ref_lap_time_sec(float(track["length_km"]))
-    wet = bool(rain_flag(float(track["rain_base_prob"])))
+    # 랩별 노면(날씨 타임라인, 페이지/타임라인 엔진과 같은 캐시·같은 랩 길이) — 0 슬릭 / 1 인터 / 2 웻
+    wcls = track_weather(track, round_no, "RACE").laps(laps, track_lap_sec(track))["cls"]
+    wet = bool(wcls.any())
     events = sample_safety_periods(
         laps, float(track["sc_base_prob"]), float(track["vsc_base_prob"])
     )
@@ -198,8 +214,12 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
 
     # 프리 보너스
     bonus_map = _load_pre_bonus_map(root, round_no)
+    # 타이어 표(컴파운드 × 나이) — 트랙당 한 번
+    tyres = track_tyres(track)
+    wet_ci = np.array([-1, tyres.index(crossover(1)), tyres.index(crossover(2))])
 
     out_rows = []
+    specs: List[CarSpec] = []
 
     # 그리드 순서대로 시뮬
     for _, row in qdf.sort_values("grid_pos").iterrows():
@@ -211,18 +231,34 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
         stints = choose_strategy(laps, float(track["abrasion_index"]))
         total_time, total_pits, cur_lap = 0.0, 0, 1
         fastest_lap = float("inf")
+        raw_laps, pit_laps, retire_lap = [], [], None
 
+        mg = 1.0 + 0.6 * (100.0 - float(drow["tire_mgmt"])) / 100.0
         for (comp, seg_laps) in stints:
-            mult = stint_multiplier(
-                comp, float(track["abrasion_index"]), float(drow["tire_mgmt"])
-            )
-
-            for _ in range(int(seg_laps)):
+            # 스틴트 랩별 배율(워밍업 + 마모 + 클리프)을 표에서 한 번에.
+            # 노면 종류가 바뀌는 랩은 크로스오버 피트(새 세트라 타이어 나이 0부터)
+            seg = int(seg_laps)
+            cls = wcls[np.minimum(np.arange(cur_lap - 1, cur_lap - 1 + seg), laps - 1)]
+            swap = np.r_[False, cls[1:] != cls[:-1]]
+            ci = np.where(cls == 0, tyres.index(comp), wet_ci[cls])
+            age = np.arange(seg) - np.maximum.accumulate(np.where(swap, np.arange(seg), 0))
+            mult = 1.0 + tyres.delta(ci, age, mg)
+
+            for k in range(seg):
                 lap_no = cur_lap
+                if swap[k]:
+                    total_pits += 1
+                    pit_laps.append(lap_no - 1)
+                    total_time += pit_loss_sec(
+                        float(track["pit_loss_sec"]),
+                        sc_active=is_in_any(lap_no, events_py["SC"]),
+                        pit_crew=float(trow["pit_crew"]),
+                    )
+                wet_l = bool(cls[k])
 
                 perf = perf_scalar(
                     drow, trow,
-                    quali_mode=False, wet=wet, grip_idx=float(track["grip_index"])
+                    quali_mode=False, wet=wet_l, grip_idx=float(track["grip_index"])
                 )
                 # 프리 보너스 가산
                 b = float(bonus_map.get(did, 0.0))
@@ -230,9 +266,10 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
 
                 lap_t = lap_time_from_perf(
                     ref, perf,
-                    grip_idx=float(track["grip_index"]), wet=wet, noise=RACE_NOISE
+                    grip_idx=float(track["grip_index"]), wet=wet_l, noise=RACE_NOISE
                 )
-                lap_t *= float(mult)
+                lap_t *= float(mult[k])
+                raw_laps.append(float(lap_t))
 
                 # SC/VSC 영향 (랩타임 증가)
                 if is_in_any(lap_no, events_py["SC"]):
@@ -247,6 +284,7 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
                 # DNF 확률 분산(전체 레이스 중 1회라도 발생)
                 if dnf and _rng.random() < 1.0 / max(1, laps):
                     # 레이스 중단
+                    retire_lap = lap_no
                     cur_lap = laps + 1
                     break
 
@@ -254,6 +292,7 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
             if cur_lap > laps:
                 break
             total_pits += 1
+            pit_laps.append(cur_lap - 1)
             sc_active = is_in_any(cur_lap, events_py["SC"])
             total_time += pit_loss_sec(
                 float(track["pit_loss_sec"]),
@@ -261,6 +300,12 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
                 pit_crew=float(trow["pit_crew"]),
             )
 
+        if engine == "events":
+            crew = (100.0 - float(trow["pit_crew"])) / 100.0
+            specs.append(CarSpec(car_id=did, team=team_id, lap_times=raw_laps, pit_laps=pit_laps,
+                                 service_sec=PIT_SERVICE_SEC * (1.0 + 0.06 * crew),
+                                 retire_lap=(retire_lap or laps) if dnf else None))
+
         finished = (cur_lap > laps) and (not dnf)
         status = "Finished" if finished else "DNF"
         out_rows.append(
@@ -272,17 +317,31 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
                 "total_time_s": float(total_time) if status == "Finished" else None,
                 "fastest_lap_s": None if fastest_lap == float("inf") else float(fastest_lap),
                 "pit_stops": int(total_pits),
+                "laps": int(retire_lap if retire_lap is not None else min(cur_lap - 1, laps)),
                 "status": status,
                 "wet": bool(wet),
                 "events_json": json.dumps(events_py),
             }
         )
 
+    if engine == "events":
+        ev = run_events(specs, laps=laps, pit=PitLane(loss_sec=float(track["pit_loss_sec"]),
+                                                      release_gap=PIT_RELEASE_GAP, stack_gap=PIT_STACK_GAP),
+                        sc=events_py)
+        for row, r in zip(out_rows, ev["results"]):
+            row.update({"total_time_s": r["time_s"] if r["status"] == "Finished" else None,
+                        "fastest_lap_s": r["fastest_lap_s"], "pit_stops": r["pit_stops"],
+                        "laps": r["laps"], "status": r["status"], "pit_wait_s": r["pit_wait_s"]})
+
     df = pd.DataFrame(out_rows)
 
-    # 순위/포인트 계산
-    fin = df[df["status"] == "Finished"].sort_values("total_time_s").copy()
+    # 순위/포인트 계산 — 완주 랩 수가 먼저(체커 때 랩 다운된 차는 시간이 짧아도 뒤), 같은 랩이면 시간
+    fin = df[df["status"] == "Finished"].sort_values(["laps", "total_time_s"], ascending=[False, True]).copy()
     dnf_df = df[df["status"] != "Finished"].copy()
+    down = laps - fin["laps"]
+    lapped = down > 0
+    fin.loc[lapped, "status"] = ["+%d Lap%s" % (n, "s" if n > 1 else "") for n in down[lapped]]
+    fin.loc[lapped, "total_time_s"] = None
 
     fin["pos"] = np.arange(1, len(fin) + 1, dtype=int)
     if len(dnf_df):
@@ -301,17 +360,18 @@ def run_race(round_no: int, root: Path, qdf: pd.DataFrame | None = None) -> pd.D
         out_df.loc[out_df.index[i], "points"] = pts[i]
 
     r_path = root / "sim" / f"race_round_{round_no:02d}.csv"
-    out_df.to_csv(r_path, index=False, encoding="utf-8")
+    write_csv(out_df, r_path)
     return out_df
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 라운드 일괄 실행
 # ─────────────────────────────────────────────────────────────────────────────
-def simulate_round(round_no: int, root: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+@timed("sim.simulate_round", "sim")
+def simulate_round(round_no: int, root: Path, engine: str | None = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
-    퀄리 → 레이스를 연속 수행하고 CSV 저장.
+    퀄리 → 레이스를 연속 수행하고 CSV 저장. engine 은 run_race 참고.
     """
     q = run_qualifying(round_no, root)
-    r = run_race(round_no, root, qdf=q)
+    r = run_race(round_no, root, qdf=q, engine=engine)
     return q, r
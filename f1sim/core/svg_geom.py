@@ -0,0 +1,144 @@
+# f1sim/core/svg_geom.py
+# -*- coding: utf-8 -*-
+"""
+SVG path 기하 유틸 (NumPy).
+
+- flatten_d(d): path d 문자열 → 누적 호길이가 붙은 폴리라인 (d 문자열 기준 캐시)
+  직선은 양 끝점, 베지어는 번스타인 다항식을 한 번에 평가, 호(Arc)만 seg.point 로 샘플.
+- project(poly, pts): 점들의 최근접 호길이 s(px) — 전 선분에 대해 벡터화한 최근접 투영.
+- simplify(xy, tol): 더글러스-포이커 단순화(허용 오차 px) — 페이지용 경량 트랙 모양.
+길이/피트 구간/LUT 계산이 모두 같은 평탄화 결과를 공유한다.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+
+SEG_SAMPLES = 24          # 곡선 세그먼트당 균등 t 샘플 수
+_PROJ_CHUNK = 1 << 20     # project() 한 번에 만드는 (점 × 선분) 행렬 상한
+
+
+@dataclass(frozen=True)
+class Polyline:
+    """평탄화된 경로. xy(N,2) / cum(N,) = 시작점부터 누적 호길이(px)."""
+    xy: np.ndarray
+    cum: np.ndarray
+
+    @property
+    def length(self) -> float:
+        return float(self.cum[-1]) if len(self.cum) else 0.0
+
+
+def _bezier_pts(seg, ts: np.ndarray) -> np.ndarray:
+    """2·3차 베지어를 t 배열에서 한 번에 평가 → (len(ts),2)."""
+    b = np.array([[z.real, z.imag] for z in seg.bpoints()], dtype=np.float64)
+    t = ts[:, None]; u = 1.0 - t
+    if len(b) == 3:
+        return u * u * b[0] + 2 * u * t * b[1] + t * t * b[2]
+    return u ** 3 * b[0] + 3 * u * u * t * b[1] + 3 * u * t * t * b[2] + t ** 3 * b[3]
+
+
+def flatten_path(path, seg_samples: int = SEG_SAMPLES) -> Polyline:
+    """svgpathtools Path → Polyline (연속 중복점 제거)."""
+    from svgpathtools import Line, QuadraticBezier, CubicBezier
+
+    ts = np.linspace(0.0, 1.0, seg_samples + 1)
+    parts = []
+    for seg in path:
+        if isinstance(seg, Line):
+            parts.append(np.array([[seg.start.real, seg.start.imag],
+                                   [seg.end.real, seg.end.imag]], dtype=np.float64))
+        elif isinstance(seg, (QuadraticBezier, CubicBezier)):
+            parts.append(_bezier_pts(seg, ts))
+        else:  # Arc 등: 드물어서 점별 평가
+            zs = [seg.point(float(t)) for t in ts]
+            parts.append(np.array([[z.real, z.imag] for z in zs], dtype=np.float64))
+    xy = np.concatenate(parts) if parts else np.zeros((0, 2))
+    if len(xy) > 1:
+        keep = np.ones(len(xy), dtype=bool)
+        keep[1:] = np.any(np.abs(np.diff(xy, axis=0)) > 1e-9, axis=1)
+        xy = xy[keep]
+    cum = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))]) if len(xy) else np.zeros(0)
+    xy.setflags(write=False); cum.setflags(write=False)
+    return Polyline(xy, cum)
+
+
+@lru_cache(maxsize=256)
+def flatten_d(d: str, seg_samples: int = SEG_SAMPLES) -> Optional[Polyline]:
+    """path d 문자열 → Polyline. 파싱 실패/빈 경로면 None."""
+    if not d:
+        return None
+    try:  # svgpathtools 는 첫 평탄화 때 import (미설치 안내는 circuit_calculator 쪽)
+        from svgpathtools import parse_path
+    except ImportError:
+        return None
+    try:
+        poly = flatten_path(parse_path(d), seg_samples)
+    except Exception:
+        return None
+    return poly if len(poly.xy) >= 2 else None
+
+
+def project(poly: Polyline, pts) -> np.ndarray:
+    """
+    점(K,2) 각각의 최근접 호길이 s(px).
+    모든 선분에 대한 클램프 투영을 (K × M) 행렬로 계산하고 argmin.
+    """
+    P = np.atleast_2d(np.asarray(pts, dtype=np.float64))
+    A = poly.xy[:-1]
+    AB = poly.xy[1:] - A
+    den = np.maximum((AB * AB).sum(axis=1), 1e-18)
+    seg_len = np.diff(poly.cum)
+    out = np.empty(len(P))
+    step = max(1, _PROJ_CHUNK // max(1, len(A)))
+    for k0 in range(0, len(P), step):
+        p = P[k0:k0 + step]
+        ax = p[:, 0:1] - A[None, :, 0]
+        ay = p[:, 1:2] - A[None, :, 1]
+        u = np.clip((ax * AB[None, :, 0] + ay * AB[None, :, 1]) / den, 0.0, 1.0)
+        dx = ax - u * AB[None, :, 0]
+        dy = ay - u * AB[None, :, 1]
+        j = np.argmin(dx * dx + dy * dy, axis=1)
+        r = np.arange(len(p))
+        out[k0:k0 + step] = poly.cum[j] + u[r, j] * seg_len[j]
+    return out
+
+
+def simplify(xy: np.ndarray, tol: float) -> np.ndarray:
+    """더글러스-포이커: 원래 폴리라인에서 tol(px) 이상 벗어나지 않는 최소 꼭짓점만 남긴다."""
+    n = len(xy)
+    if n <= 2 or tol <= 0:
+        return xy
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        a, b = xy[i], xy[j]
+        ab = b - a
+        p = xy[i + 1:j] - a
+        den = float(ab @ ab)
+        if den <= 1e-18:       # 닫힌 경로 양 끝처럼 시작=끝이면 점 거리
+            d2 = (p * p).sum(axis=1)
+        else:
+            u = np.clip((p @ ab) / den, 0.0, 1.0)
+            q = p - u[:, None] * ab
+            d2 = (q * q).sum(axis=1)
+        k = int(np.argmax(d2))
+        if d2[k] > tol * tol:
+            m = i + 1 + k
+            keep[m] = True
+            stack.append((i, m)); stack.append((m, j))
+    return xy[keep]
+
+
+def arc_between(poly: Polyline, a, b) -> float:
+    """경로 진행 방향 기준 a→b 호길이(px). 닫힌/열린 경로 모두 끝을 넘으면 한 바퀴 감는다."""
+    s_a, s_b = project(poly, [a, b])
+    L = poly.length
+    return float(s_b - s_a) if s_b >= s_a else float(L - s_a + s_b)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 import numpy as np
-from ..config import VREF_KMH, ALPHA_PACE, BETA_GRIP, GAMMA_WET, BASE_DEG, SEED
+from ..config import VREF_KMH, ALPHA_PACE, BETA_GRIP, GAMMA_WET, SEED
 
 _rng = np.random.default_rng(SEED)
 
@@ -26,12 +26,6 @@ def lap_time_from_perf(ref_s: float, perf: float, *, grip_idx: float, wet: bool,
     base *= float(_rng.normal(1.0, float(noise)))
     return max(0.0, base)
 
-def stint_multiplier(comp: str, abrasion: float, tire_mgmt: float) -> float:
-    """스틴트 평균 페이스 배율(마모/관리 반영)."""
-    base_deg = BASE_DEG[comp] * (0.5 + 0.9*float(abrasion))
-    mg = (100.0 - float(tire_mgmt))/100.0
-    return 1.0 + base_deg*(1.0 + 0.6*mg)
-
 def pit_loss_sec(pit_loss_track: float, *, sc_active: bool, pit_crew: float) -> float:
     """피트 손실(트랙 손실 × SC 할인 × 피트크루 보정)."""
     crew_bonus = (100.0 - float(pit_crew))/100.0
@@ -0,0 +1,266 @@
+# f1sim/engine/quali_session.py
+# -*- coding: utf-8 -*-
+"""
+헤드리스 퀄리파잉 세션 엔진.
+
+f1sim/ui/js/quali_core.js 와 같은 모델(PACE/FUELMIX/TIRE 테이블, 연료 소모, 타이어 마모,
+출발 → 아웃랩 → 타임랩 → 인랩 → 피트 정차)을 브라우저 애니메이션 없이 계산해
+세션 결과(persist_quali_result / EventState.register_session 입력)를 만든다.
+
+- 퀄리에선 차량끼리 간섭이 없고 러닝마다 새 타이어·정해진 연료로 나가므로,
+  모든 (차량, 러닝)의 본선 주행을 numpy 2차원 격자 하나로 적분하고(_drive)
+  피트레인/정차/예약 출발은 구간 시간으로 이어 붙인다. 20대 세션이 수 ms.
+- 결승선 통과 시각은 격자 사이를 선형 보간한다(JS는 1/60초 스텝으로 양자화).
+- 트랙 LUT 의 속도 프로파일(speed)이 있으면 본선 거리를 환산 시간(SpeedProfile.tau)으로 바꿔
+  같은 격자에서 찾는다 — 코너/직선 속도 배분이 JS(speedAt)와 같아진다.
+- 플레이어 차량은 runs 가 비어 있으면 출발하지 않는다(브라우저와 동일).
+- env["wet_min"](f1sim.engine.weather 분별 노면 젖음)이 있으면 러닝마다 예약 출발 시각의 값으로
+  타이어 표(건조/젖음)를 고르고, AI 차량은 맞지 않는 타이어를 크로스오버한다(quali_core.js 와 같은 규칙).
+  '세션 끝까지 계산'(스킵)은 autopilot=True 로 빈 runs 에 default_runs() 를 채운다.
+
+사용:
+    from f1sim.engine.quali_session import simulate_quali
+    payload = simulate_quali(plans, session="Q1", duration_sec=1080,
+                             lap_base=lap_base, pit_travel=pit_travel, env=env,
+                             track_s=(TRACK_LUT or {}).get("s"), speed=(TRACK_LUT or {}).get("speed"))
+"""
+from __future__ import annotations
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .speed_profile import SpeedProfile
+from .weather import crossover, tyre_class, wet_class
+from ..perf import timed
+
+# quali_core.js / 05_q*.py 상수와 같은 값
+TRANS_SIM = 0.25
+PIT_WAIT_SEC = 4.0
+FUEL_PER_LAP = 1.6
+FUEL_FLOW_MAX = 100.0 / 3600.0
+
+PACE = {
+    "Attack":     {"speed": 1.020, "wear": 1.40},
+    "Aggressive": {"speed": 1.010, "wear": 1.18},
+    "Standard":   {"speed": 1.000, "wear": 1.00},
+    "Light":      {"speed": 0.992, "wear": 0.86},
+    "Conserve":   {"speed": 0.985, "wear": 0.74},
+}
+FUELMIX = {
+    "Push":     {"speed": 1.010, "burn": 1.30},
+    "Balanced": {"speed": 1.000, "burn": 1.00},
+    "Conserve": {"speed": 0.995, "burn": 0.80},
+}
+TIRE = {
+    "soft":         {"gripDry": 1.030, "gripWet": 0.78,  "wearDry": 0.080, "wearWet": 0.16},
+    "medium":       {"gripDry": 1.000, "gripWet": 0.80,  "wearDry": 0.060, "wearWet": 0.14},
+    "hard":         {"gripDry": 0.980, "gripWet": 0.82,  "wearDry": 0.045, "wearWet": 0.12},
+    "intermediate": {"gripDry": 0.945, "gripWet": 1.020, "wearDry": 0.120, "wearWet": 0.070},
+    "wet":          {"gripDry": 0.905, "gripWet": 1.000, "wearDry": 0.180, "wearWet": 0.080},
+}
+
+# 트랙 LUT 에 s값이 없을 때 JS와 같은 기본값
+TRACK_S_DEFAULTS = {"finish": 0.01, "mainOut": 0.02, "pitStop": 0.05,
+                    "pitOut": 0.85, "pitInMain": 0.90, "pitInPit": 0.02}
+
+_MAX_LAP = 16   # 타임랩 번호 상한(러닝당 랩 1..6 + 아웃/인랩 여유)
+_FIX_ITERS = 3  # 타이어 수명(거리 함수) 고정점 반복 횟수
+
+
+def _get(p, *keys, default=None):
+    """DriverPlan(dataclass) / 페이지 payload(dict) 양쪽에서 값 읽기."""
+    for k in keys:
+        v = p.get(k) if isinstance(p, dict) else getattr(p, k, None)
+        if v is not None:
+            return v
+    return default
+
+
+def default_tyre(env: dict) -> str:
+    w = float((env or {}).get("wetness", 0.0))
+    return crossover(int(wet_class(w)), "soft")
+
+
+def default_runs(duration_sec: float) -> List[dict]:
+    """플레이어 차량 스킵용 기본 러닝(초반/후반 2회, 3랩 중 2번째 타임)."""
+    d = float(duration_sec)
+    return [{"start_sec": min(60.0, max(0.0, d - 60.0)), "laps": 3, "timed_laps": [2]},
+            {"start_sec": max(0.0, min(d * 0.6, d - 300.0)), "laps": 3, "timed_laps": [2]}]
+
+
+def _drive(speed_k: np.ndarray, wear_k: np.ndarray, burn: np.ndarray, fuel0: np.ndarray,
+           v_main: float, u_need: float, h: float):
+    """
+    메인 트랙 구간(toMain 이후 ~ 피트 진입)을 행=(차량, 러닝) 국소 시간 격자로 한 번에 적분.
+    러닝마다 새 타이어(수명 1.0)와 정해진 연료로 출발하므로 행끼리 독립이다.
+    연료는 시간의 함수(정확), 타이어 수명은 거리의 함수 → 고정점 반복으로 맞춘다.
+    반환: tau[cols], u[rows, cols](mainOut 기준 누적 환산 거리 — 속도 프로파일이 없으면 랩 거리, 단조 증가),
+          fuel[rows, cols]
+    """
+    cols = int(np.ceil(u_need / (v_main * 0.90) / h)) + 2
+    tau = np.arange(cols) * h
+    fuel = np.maximum(0.0, fuel0[:, None] - burn[:, None] * tau)
+    fuel_fx = speed_k[:, None] * (1 - 0.006 * fuel)
+    life = np.ones_like(fuel)
+    u = np.zeros_like(fuel)
+    for _ in range(_FIX_ITERS):
+        v = v_main * np.clip(fuel_fx * (1 - 0.06 * (1 - life)), 0.90, 1.25)
+        np.cumsum((v[:, 1:] + v[:, :-1]) * (0.5 * h), axis=1, out=u[:, 1:])
+        life = np.maximum(0.0, 1.0 - wear_k[:, None] * u)
+    return tau, u, fuel
+
+
+@timed("engine.simulate_quali", "engine")
+def simulate_quali(plans: Sequence, *, session: str, duration_sec: float,
+                   lap_base: float, pit_travel: float, env: dict,
+                   track_s: Optional[dict] = None, grip_in_speed: Optional[bool] = None,
+                   autopilot: bool = False, step: float = 0.25, speed: Optional[dict] = None) -> dict:
+    """
+    plans: DriverPlan 또는 페이지 PLAN dict 목록(name/team/abbr/base_vmul/is_player/runs,
+           선택: pace/fuelMix/compound). 반환은 브라우저 exportResult() 와 같은 구조.
+    grip_in_speed: None 이면 Q1=False, Q2/Q3=True (페이지와 동일).
+    autopilot: runs 가 빈 차량(플레이어)도 기본 러닝으로 내보낸다.
+    step: 본선 적분 격자 간격(초).
+    speed: 트랙 LUT 의 "speed"(곡률 속도 배율). None 이면 등속.
+    """
+    env = dict(env or {})
+    S = dict(TRACK_S_DEFAULTS)
+    for k, v in (track_s or {}).items():
+        if isinstance(v, (int, float)) and np.isfinite(v):
+            S[k] = float(v)
+    if grip_in_speed is None:
+        grip_in_speed = str(session).upper() != "Q1"
+
+    n = len(plans)
+    duration = float(duration_sec)
+    lap_base = float(lap_base)
+    h = float(step)
+    wet = float(env.get("wetness", 0.0))
+    grip = max(0.8, min(1.04, float(env.get("grip_base", 0.97)))) * (1 - 0.10 * wet)
+
+    tyres = list(TIRE)
+    paces = list(PACE)
+    mixes = list(FUELMIX)
+    t_grip = np.array([[TIRE[t]["gripDry"] for t in tyres], [TIRE[t]["gripWet"] for t in tyres]])
+    t_wear = np.array([[TIRE[t]["wearDry"] for t in tyres], [TIRE[t]["wearWet"] for t in tyres]])
+    t_cls = tyre_class(tyres)
+    wet_min = np.asarray(env.get("wet_min") or [wet], dtype=float)
+    p_speed = np.array([PACE[p]["speed"] for p in paces])
+    p_wear = np.array([PACE[p]["wear"] for p in paces])
+    m_speed = np.array([FUELMIX[m]["speed"] for m in mixes])
+    m_burn = np.array([FUELMIX[m]["burn"] for m in mixes])
+
+    def _idx(table: list, v, dflt: str) -> int:
+        return table.index(v) if v in table else table.index(dflt)
+
+    dty = default_tyre(env)
+    base_vmul = np.array([float(_get(p, "base_vmul", default=1.0)) for p in plans])
+    compound = np.array([_idx(tyres, _get(p, "compound"), dty) for p in plans])
+    pace = np.array([_idx(paces, _get(p, "pace"), "Standard") for p in plans])
+    mix = np.array([_idx(mixes, _get(p, "fuelMix", "fuel_mix"), "Balanced") for p in plans])
+    player = np.array([bool(_get(p, "is_player", "isPlayer", default=False)) for p in plans])
+
+    runs = [list(_get(p, "runs", default=[]) or []) for p in plans]
+    if autopilot:
+        runs = [rr or default_runs(duration) for rr in runs]
+
+    # 1) 러닝 단위 주행 구간을 한 번에 적분 (행 = 차량×러닝)
+    rc, rl, rt, rs = [], [], [], []
+    for i, rr in enumerate(runs):
+        for r in rr:
+            rc.append(i)
+            rs.append(float(r.get("start_sec", 0.0) or 0.0))
+            rl.append(min(_MAX_LAP - 2, max(1, int(r.get("laps", 3) or 3))))
+            rt.append({int(x) for x in (r.get("timed_laps") or [2])})
+    rc = np.array(rc, dtype=int)
+    rl = np.array(rl, dtype=int)
+
+    v_main = (1.0 / max(0.1, lap_base)) * (grip if grip_in_speed else 1.0)
+    v_pit = 1.0 / max(0.5, float(pit_travel))
+    d_fin = (S["finish"] - S["mainOut"]) % 1.0 or 1.0     # mainOut → 첫 결승선
+    d_in = (S["pitInMain"] - S["mainOut"]) % 1.0 or 1.0   # mainOut → 첫 피트 진입점
+    t_out = ((S["pitOut"] - S["pitStop"]) % 1.0) / v_pit + TRANS_SIM    # 정차 위치 → 본선 합류
+    t_in = TRANS_SIM + ((S["pitStop"] - S["pitInPit"]) % 1.0) / v_pit   # 본선 이탈 → 정차 위치
+    prof = SpeedProfile(speed)
+
+    def w_out(d):
+        """mainOut 기준 거리(랩) → 환산 거리(_drive 의 u 축)"""
+        return prof.tau(d, S["mainOut"])
+
+    drive = []   # 행별 (결승선 통과 국소 시각들, 피트 진입 국소 시각)
+    if len(rc):
+        # 러닝별 노면: 예약 출발 시각의 젖음 → 타이어 표 행, AI 는 맞는 종류로 크로스오버
+        rw = wet_min[np.clip((np.asarray(rs) // 60).astype(int), 0, wet_min.size - 1)]
+        want = wet_class(rw)
+        comp = compound[rc].copy()
+        for j in np.nonzero(~player[rc] & (t_cls[comp] != want))[0]:
+            comp[j] = tyres.index(crossover(int(want[j]), tyres[comp[j]]))
+        wt = (want > 0).astype(int)                    # 인터 경계(weather.INTER_AT) 이상이면 젖은 노면 표
+        speed_k = (base_vmul * p_speed[pace] * m_speed[mix])[rc] * t_grip[wt, comp]
+        wear_k = t_wear[wt, comp] * p_wear[pace][rc]
+        burn = np.minimum(FUEL_FLOW_MAX, (FUEL_PER_LAP / lap_base) * m_burn[mix])[rc]
+        fuel0 = (1 + rl + 1) * FUEL_PER_LAP * 1.05
+        tau, u, fuel = _drive(speed_k, wear_k, burn, fuel0, v_main, w_out(d_fin + rl.max() + 2.0), h)
+        for row in range(len(rc)):
+            ur, laps = u[row], int(rl[row])
+            # 결승선 통과 k=1..laps+1 (1번째는 아웃랩 끝 → 기록 없음)
+            t_fin = np.interp(w_out(d_fin + np.arange(laps + 1)), ur, tau)
+            f_fin = np.interp(t_fin, tau, fuel[row])
+            k_in = laps + 1
+            low = np.nonzero(f_fin[1:] <= 0.2)[0]       # 연료 부족 → 조기 인랩
+            if low.size:
+                k_in = min(k_in, int(low[0]) + 2)
+            u_k = d_fin + (k_in - 1)
+            u_pit = d_in + np.ceil(u_k - d_in + 1e-9)
+            drive.append((t_fin[:k_in], float(np.interp(w_out(u_pit), ur, tau))))
+
+    # 2) 차량별 러닝 배정(예약 순서/피트 복귀 시각) — 세션 종료 이후 통과는 무효
+    best = np.full(n, np.inf)
+    ran = compound.copy()          # 실제로 끼운 타이어(마지막으로 나간 러닝, 크로스오버 반영 — JS car.compound 와 같음)
+    lap_times: List[List[float]] = [[] for _ in range(n)]
+    row0 = 0
+    for i, rr in enumerate(runs):
+        rows = list(range(row0, row0 + len(rr)))
+        row0 += len(rr)
+        pending = [(float(r.get("start_sec", 0.0)), j) for j, r in zip(rows, rr)]
+        free_at = 0.0
+        while pending:
+            t_rel = max(free_at, min(t for t, _ in pending))
+            if t_rel >= duration:
+                break
+            # 시각이 된 미사용 러닝 중 배열 앞쪽 것(JS find 와 동일)
+            k = next(ix for ix, (t, _) in enumerate(pending) if t <= t_rel)
+            _, row = pending.pop(k)
+            ran[i] = comp[row]
+            t_fin, t_pit = drive[row]
+            t_main = t_rel + t_out
+            for lap_no in range(2, len(t_fin) + 1):
+                if t_main + t_fin[lap_no - 1] > duration:
+                    break
+                if lap_no in rt[row]:
+                    lt = float(t_fin[lap_no - 1] - t_fin[lap_no - 2])
+                    lap_times[i].append(lt)
+                    best[i] = min(best[i], lt)
+            free_at = t_main + t_pit + t_in + PIT_WAIT_SEC
+
+    # 순위: best 오름차순, 동률/무기록은 PLAN 순서 유지
+    order = sorted(range(n), key=lambda i: best[i])
+    results = []
+    for pos, i in enumerate(order, start=1):
+        p = plans[i]
+        results.append({
+            "pos": pos,
+            "name": _get(p, "name", default=""),
+            "team": _get(p, "team", default=""),
+            "abbr": _get(p, "abbr", default=""),
+            "best": None if not np.isfinite(best[i]) else round(float(best[i]), 3),
+            "laps": [round(float(x), 3) for x in lap_times[i]],
+            "compound": tyres[int(ran[i])],
+        })
+    return {
+        "session": session,
+        "duration_sec": int(duration) if float(duration).is_integer() else duration,
+        "laps_ref_sec": lap_base,
+        "env": env,
+        "results": results,
+    }
@@ -0,0 +1,219 @@
+# f1sim/engine/race_events.py
+# -*- coding: utf-8 -*-
+"""
+이산 사건(discrete-event) 레이스 엔진 — core/sim.py 랩 엔진과 나란히 쓰는 두 번째 엔진.
+
+랩 엔진은 피트를 드라이버 합계에 pit_loss_sec 를 더하는 것으로 끝내서 차량끼리 만날 일이 없다.
+여기선 시각 순 힙(heapq) 하나에 사건을 넣고 꺼내며 진행한다.
+- LAP(결승선 통과) / PIT_IN(피트레인 진입) / BOX(박스 도착·작업 시작) / PIT_OUT(피트레인 이탈)
+  / RETIRE(리타이어). SC_DEPLOY · SC_END(SC·VSC 시작·종료)는 힙에 넣지 않고 선두 통과 때 바로
+  적용한다 — 선두의 다음 랩부터 새 상태로 예약돼야 하기 때문.
+- 피트레인: 팀 박스는 한 번에 한 대 — 같은 팀 두 번째 차는 앞차 작업이 끝나고 STACK_GAP 뒤에야
+  작업 시작(더블 스택 대기). 출구는 한 줄 — 앞 이탈 차와 RELEASE_GAP 이상 벌려 내보낸다(릴리스 순서).
+- SC 동안 선두는 SC_FACTOR 페이스, 뒤차는 델타 타임(VSC_FACTOR 페이스)으로 따라붙다가
+  같은 랩 앞차 통과 뒤 SC_GAP 에서 줄을 선다(추월 없음, 간격이 줄어든다). VSC 는 모두 VSC_FACTOR 페이스.
+  SC·VSC 구간의 피트는 레인 손실이 0.75배(physics.pit_loss_sec 와 같은 할인).
+- 차량마다 대기 중인 사건은 많아야 하나 → 힙 크기 ≤ 차량 수, 비용 O(사건 수 · log n).
+  랩 안을 잘게 적분하지 않는다(랩타임은 입력).
+- 선두가 마지막 랩을 끝내면 체커 — 나머지는 다음 결승선 통과에서 끝난다(랩 뒤진 차량은 그 랩 수로).
+
+사용:
+    from f1sim.engine.race_events import CarSpec, PitLane, run_events
+    out = run_events(cars, laps=57, pit=PitLane(loss_sec=21.0), sc={"SC": [(12, 15)], "VSC": []})
+    out["results"], out["events"]
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import heapq
+
+from ..config import SC_FACTOR, VSC_FACTOR
+from ..perf import timed
+
+# 사건 종류(같은 시각이면 이 순서로 처리)
+SC_END, SC_DEPLOY, RETIRE, PIT_OUT, BOX, PIT_IN, LAP = range(7)
+EVENT_NAMES = ("sc_end", "sc_deploy", "retire", "pit_out", "box", "pit_in", "lap")
+
+SC_PIT_DISCOUNT = 0.75     # SC/VSC 중 피트레인 손실 배율(physics.pit_loss_sec 와 같은 값)
+
+
+@dataclass
+class CarSpec:
+    """차량 입력. lap_times[k] = k+1 랩 순수 주행 시간(SC·피트 제외), pit_laps = 그 랩 끝에 피트."""
+    car_id: str
+    team: str
+    lap_times: Sequence[float]
+    pit_laps: Sequence[int] = ()
+    service_sec: float = 2.6           # 박스 작업 시간(피트 크루 반영)
+    retire_lap: Optional[int] = None   # 이 랩 도중 리타이어(랩 절반 지점)
+
+
+@dataclass
+class PitLane:
+    """loss_sec: 정차 한 번의 트랙 기준 손실(작업 포함, tracks.csv pit_loss_sec). 레인 주행분은 loss − service."""
+    loss_sec: float
+    release_gap: float = 1.0           # 출구 최소 간격(초)
+    stack_gap: float = 0.8             # 더블 스택: 앞차 작업 끝 → 다음 차 작업 시작 최소 간격(초)
+    sc_gap: float = 0.6                # SC 줄서기 간격(초)
+
+
+@dataclass
+class _Car:
+    spec: CarSpec
+    lap: int = 0                       # 끝낸 랩 수
+    t: float = 0.0                     # 마지막 결승선 통과(또는 피트 이탈) 시각
+    status: str = "running"
+    finish_t: Optional[float] = None
+    fastest: float = float("inf")
+    stops: List[dict] = field(default_factory=list)
+
+
+def _sc_state(sc: Dict[str, Sequence[Tuple[int, int]]]) -> Dict[int, List[Tuple[int, str]]]:
+    """선두 랩 → [(사건, 종류)]. (s, e) 구간은 선두가 s 랩을 시작할 때 시작, e 랩을 끝낼 때 종료.
+    s = 1 이면 키가 0 — run_events 가 출발 시점에 처리한다."""
+    marks: Dict[int, List[Tuple[int, str]]] = {}
+    for kind in ("SC", "VSC"):
+        for s, e in sc.get(kind, []) or []:
+            marks.setdefault(int(s) - 1, []).append((SC_DEPLOY, kind))
+            marks.setdefault(int(e), []).append((SC_END, kind))
+    for v in marks.values():
+        v.sort()                                   # 같은 랩이면 종료 먼저(SC_END < SC_DEPLOY)
+    return marks
+
+
+@timed("engine.race_events", "engine")
+def run_events(cars: Sequence[CarSpec], *, laps: int, pit: PitLane,
+               sc: Optional[Dict[str, Sequence[Tuple[int, int]]]] = None,
+               start_gap: float = 0.25) -> dict:
+    """
+    cars: 그리드 순서. start_gap: 그리드 한 칸당 출발 지연(초).
+    반환: {"results": [차량별 {car_id, status, laps, time_s, fastest_lap_s, pit_stops, pit_wait_s, stops}],
+           "events": [(시각, 종류, car_id|"", 랩)], "sc_periods": [(종류, 시작 시각, 끝 시각)]}
+    """
+    laps = max(1, int(laps))
+    state = [_Car(spec=c) for c in cars]
+    heap: List[tuple] = []
+    seq = 0
+
+    def push(t: float, kind: int, i: int, lap: int, arg=None) -> None:
+        nonlocal seq
+        heapq.heappush(heap, (t, kind, seq, i, lap, arg))
+        seq += 1
+
+    log: List[tuple] = []
+    marks = _sc_state(sc or {})
+    active: Optional[str] = None           # 현재 "SC" | "VSC" | None
+    sc_open: Optional[float] = None
+    sc_periods: List[tuple] = []
+    sc_tail: Dict[int, float] = {}         # SC 중 랩별 마지막 통과 예정 시각(줄서기)
+    box_free: Dict[str, float] = {}        # 팀 박스가 비는 시각
+    last_exit = -1e9
+    lead_lap = 0
+    checkered: Optional[float] = None
+
+    def lap_time(car: _Car, lap: int) -> float:
+        base = float(car.spec.lap_times[min(lap, len(car.spec.lap_times)) - 1])
+        return base / float(VSC_FACTOR) if active else base
+
+    def schedule_lap(i: int, t0: float, extra: float = 0.0) -> None:
+        """다음 결승선 통과 예약. t0 = 랩 시작(랩타임 기준점), extra = 그 위에 얹힌 피트레인 시간."""
+        car = state[i]
+        nxt = car.lap + 1
+        if car.spec.retire_lap is not None and nxt >= int(car.spec.retire_lap):
+            push(t0 + extra + 0.5 * lap_time(car, nxt), RETIRE, i, nxt)
+            return
+        t1 = t0 + extra + lap_time(car, nxt)
+        if active == "SC":
+            tail = sc_tail.get(nxt)
+            if tail is None:                           # 이 랩 첫 차 = 세이프티카 바로 뒤
+                t1 = t0 + extra + lap_time(car, nxt) * float(VSC_FACTOR) / float(SC_FACTOR)
+            else:
+                t1 = max(t1, tail + pit.sc_gap)
+            sc_tail[nxt] = t1
+        push(t1, LAP, i, nxt, t0)
+
+    def flag(t: float, kind: int, what: str) -> None:
+        """SC/VSC 시작·종료를 즉시 적용 — 뒤이어 예약하는 랩이 새 상태를 본다."""
+        nonlocal active, sc_open
+        if kind == SC_DEPLOY and active is None:
+            active, sc_open = what, t
+        elif kind == SC_END and active == what:
+            sc_periods.append((what, round(sc_open, 3), round(t, 3)))
+            active, sc_open = None, None
+            sc_tail.clear()
+        else:
+            return
+        log.append((t, EVENT_NAMES[kind], what, lead_lap))
+
+    # 1랩부터인 구간(선두 랩 0 표시)은 선두가 0 랩을 '끝내는' 일이 없으니 출발 때 켠다 — 첫 랩 예약 전에
+    for k, what in marks.get(0, []):
+        flag(0.0, k, what)
+
+    for i in range(len(state)):
+        state[i].t = i * start_gap
+        schedule_lap(i, state[i].t)
+
+    while heap:
+        t, kind, _, i, lap, arg = heapq.heappop(heap)
+        car = state[i]
+        log.append((t, EVENT_NAMES[kind], car.spec.car_id, lap))
+        if kind == RETIRE:
+            car.status, car.finish_t = "DNF", None
+            continue
+
+        if kind == LAP:
+            car.lap, car.fastest = lap, min(car.fastest, t - arg)
+            car.t = t
+            if lap > lead_lap:                          # 선두가 새 랩 → SC 표시/체커(선두 다음 랩 예약 전에)
+                lead_lap = lap
+                for k, what in marks.get(lap, []):
+                    flag(t, k, what)
+                if lap >= laps and checkered is None:
+                    checkered = t
+            if checkered is not None:
+                car.status, car.finish_t = "Finished", t
+                continue
+            if lap in car.spec.pit_laps:
+                push(t, PIT_IN, i, lap)
+            else:
+                schedule_lap(i, t)
+            continue
+
+        # 피트레인: 진입 → 박스(팀 박스 비기를 기다림) → 작업 → 출구(릴리스 간격)
+        under = active is not None
+        drive = max(0.0, float(pit.loss_sec) - float(car.spec.service_sec)) * (SC_PIT_DISCOUNT if under else 1.0)
+        if kind == PIT_IN:
+            car.stops.append({"lap": lap, "in": t, "wait": 0.0, "out": None, "sc": active or ""})
+            push(t + 0.5 * drive, BOX, i, lap, drive)
+        elif kind == BOX:
+            team = car.spec.team
+            start = max(t, box_free.get(team, -1e9) + pit.stack_gap)
+            done = start + float(car.spec.service_sec)
+            box_free[team] = done
+            stop = car.stops[-1]
+            stop["wait"] = start - t
+            push(done + 0.5 * arg, PIT_OUT, i, lap)
+        elif kind == PIT_OUT:
+            out = max(t, last_exit + pit.release_gap)
+            last_exit = out
+            stop = car.stops[-1]
+            stop["wait"] += out - t
+            stop["out"] = out
+            # 진입~이탈이 통째로 다음 랩에 얹힌다(인랩/아웃랩 손실 = 레인 주행 + 작업 + 대기)
+            schedule_lap(i, stop["in"], extra=out - stop["in"])
+
+    results = []
+    for c in state:
+        results.append({
+            "car_id": c.spec.car_id,
+            "status": c.status if c.status != "running" else "DNF",
+            "laps": c.lap,
+            "time_s": None if c.finish_t is None else round(c.finish_t, 3),
+            "fastest_lap_s": None if c.fastest == float("inf") else round(c.fastest, 3),
+            "pit_stops": len(c.stops),
+            "pit_wait_s": round(sum(s["wait"] for s in c.stops), 3),
+            "stops": [{k: (round(v, 3) if isinstance(v, float) else v) for k, v in s.items()} for s in c.stops],
+        })
+    return {"results": results,
+            "events": [(round(t, 3), k, who, lap) for t, k, who, lap in log],
+            "sc_periods": sc_periods}
@@ -0,0 +1,530 @@
+# f1sim/engine/race_timeline.py
+# -*- coding: utf-8 -*-
+"""
+서버 계산 레이스 타임라인.
+
+06_main_race 의 레이스를 Python에서 한 번에 끝까지 계산해
+(1) 확정 결과(미디어 페이지 입력)와 (2) 브라우저가 보간만 하는 키프레임 타임라인을 만든다.
+
+- 랩 단위로 차량 축 numpy 계산: 페이스/타이어(그립·마모)/연료/스틴트/피트, 차량 간 더티 에어·추월.
+  타이어 손실(워밍업·마모·클리프·노면 온도)은 f1sim.engine.tyres 표에서 [컴파운드, 타이어 나이]로 모은다.
+  랩별 노면 젖음(f1sim.engine.weather)이 있으면 그립 손실을 곱하고, 다음 랩 노면에 맞지 않는 타이어면
+  그 랩 끝에 크로스오버 피트(스틴트 계획에 맞는 종류 스틴트를 끼워 넣는다).
+- 트랙 LUT 의 속도 프로파일(speed_profile)이 있으면 랩 안 시간 배분을 곡률 배율대로 한다
+  (랩타임 자체는 같고, 피트 진입·합류 시각과 키프레임 위치만 달라진다).
+- 차량별 진행 거리 D(결승선 기준 누적 랩, 단조 증가)를 구간 노트로 잡고(환산 시간 축에서 선형),
+  KF_DT 간격으로 샘플링해 s(uint16), lap(uint8), 상태|컴파운드(uint8)를 프레임 축 델타 인코딩 → zlib → base64.
+  본선 s 는 프로파일이 있으면 환산 시간 좌표(SpeedProfile.warp, timeline["warp"])로 저장해 시간에 선형을 유지한다.
+- JS(f1sim/ui/js/race_timeline.js)는 두 프레임 사이만 보간하므로 임의 시점 탐색/배속이 즉시다.
+
+사용:
+    from f1sim.engine.race_timeline import simulate_race
+    out = simulate_race(plan_payload, lap_base=lap_base, total_laps=57,
+                        track_s=(TRACK_LUT or {}).get("s"), speed=(TRACK_LUT or {}).get("speed"))
+    out["result"], out["timeline"]
+"""
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence
+import base64
+import logging
+import zlib
+
+import numpy as np
+
+from .quali_session import PACE, TRACK_S_DEFAULTS, _get
+from .speed_profile import SpeedProfile
+from .tyres import track_tyres
+from .weather import crossover, tyre_class, wet_class, wet_loss
+from ..perf import timed
+
+log = logging.getLogger(__name__)
+
+# 06_main_race.py 페이지 상수와 같은 값
+TRANS_SIM = 0.25
+PIT_WAIT_SEC = 2.7
+PIT_TRAVEL = 18.0
+FUEL_PER_LAP = 1.6
+FUEL_FLOW_MAX = 100.0 / 3600.0
+FUEL_START = 25.0
+
+RACE_TIRE = {
+    "soft":         {"gripDry": 1.030, "wearDry": 0.060},
+    "medium":       {"gripDry": 1.000, "wearDry": 0.045},
+    "hard":         {"gripDry": 0.980, "wearDry": 0.035},
+    "intermediate": {"gripDry": 0.960, "wearDry": 0.080},
+    "wet":          {"gripDry": 0.930, "wearDry": 0.120},
+}
+COMPOUNDS = list(RACE_TIRE)
+_CLS = tyre_class(COMPOUNDS)
+
+LAP_NOISE = 0.003      # 랩별 페이스 흔들림(표준편차, 비율)
+START_LOSS = 1.2       # 스탠딩 스타트 손실(초)
+BOX_LIFE = 0.12        # 이 아래로 떨어질 랩이면 계획보다 먼저 피트
+FOLLOW_GAP = 0.30      # 앞차 뒤 최소 간격(초) — 못 추월하면 이만큼 뒤에 선다
+PASS_DELTA = 0.15      # 추월 시도 최소 페이스 차(초/랩)
+PASS_SPAN = 0.80       # 페이스 차가 PASS_DELTA+PASS_SPAN 이면 성공 확률 최대
+PASS_P_MAX = 0.85
+
+KF_DT = 1.0            # 키프레임 간격(시뮬 초)
+TIMELINE_VERSION = 2
+
+# 키프레임 상태 코드(하위 4비트) — race_timeline.js 와 같은 순서
+ST_MAIN, ST_PIT, ST_STOP, ST_DONE = range(4)
+
+
+def _stints(p, total_laps: int) -> List[dict]:
+    """stint_plan 정리: to_lap 오름차순, 마지막은 결승까지."""
+    out = []
+    for st_ in (_get(p, "stint_plan", default=[]) or []):
+        comp = str(st_.get("compound") or "soft").lower()
+        out.append({"to_lap": int(st_.get("to_lap") or total_laps),
+                    "compound": comp if comp in RACE_TIRE else "soft",
+                    "pace": st_.get("pace") if st_.get("pace") in PACE else "Standard"})
+    out.sort(key=lambda x: x["to_lap"])
+    if not out:
+        out = [{"to_lap": total_laps, "compound": "soft", "pace": "Standard"}]
+    out[-1]["to_lap"] = total_laps
+    return out
+
+
+class _Ctx:
+    """레이스 상수(체크포인트 밖 — 같은 입력이면 다시 만들 수 있다)."""
+    __slots__ = ("plan", "n", "laps_tot", "lap_base", "S", "prof", "d_in", "d_out",
+                 "t_lane_in", "t_lane_out", "line_frac", "base_vmul", "burn", "tyres", "wet", "want")
+
+    def __init__(self, plan: Sequence, *, lap_base: float, total_laps: int,
+                 track_s: Optional[dict], pit_travel: float, speed: Optional[dict],
+                 tyre_env: Optional[dict] = None, wet: Optional[Sequence[float]] = None):
+        S = dict(TRACK_S_DEFAULTS)
+        for k, v in (track_s or {}).items():
+            if isinstance(v, (int, float)) and np.isfinite(v):
+                S[k] = float(v)
+        self.plan, self.S = list(plan), S
+        self.n = len(self.plan)
+        self.laps_tot = max(1, int(total_laps))
+        self.lap_base = float(lap_base)
+        self.prof = SpeedProfile(speed)
+        # 결승선 기준 거리(랩 분수): 피트 진입점 / 본선 합류점
+        self.d_in = (S["pitInMain"] - S["finish"]) % 1.0 or 1.0
+        self.d_out = (S["mainOut"] - S["finish"]) % 1.0
+        v_pit = 1.0 / max(0.5, float(pit_travel))
+        self.t_lane_in = TRANS_SIM + ((S["pitStop"] - S["pitInPit"]) % 1.0) / v_pit
+        self.t_lane_out = ((S["pitOut"] - S["pitStop"]) % 1.0) / v_pit + TRANS_SIM
+        self.line_frac = (1.0 - self.d_in) / (1.0 - self.d_in + self.d_out)   # 피트 구간 중 결승선 통과 비율
+        self.base_vmul = np.array([float(_get(p, "base_vmul", default=1.0)) for p in self.plan])
+        self.burn = min(FUEL_FLOW_MAX, FUEL_PER_LAP / self.lap_base)
+        self.tyres = track_tyres(tyre_env)     # tracks.csv abrasion_index/temp_mean_c/temp_std_c
+        # 랩별 노면 젖음(0..1, wet[k] = k+1 랩) — 모자라면 마지막 값, 없으면 건조. want[L] = L+1 랩에 맞는 종류
+        w = np.asarray(wet if wet is not None and len(wet) else [0.0], dtype=float)
+        self.wet = np.clip(w[np.minimum(np.arange(self.laps_tot + 1), w.size - 1)], 0.0, 1.0)
+        self.want = wet_class(self.wet)
+
+    def tau(self, d):
+        """결승선 기준 거리 d(랩) → 환산 시간(랩타임 1 단위)"""
+        return self.prof.tau(d, self.S["finish"])
+
+
+@dataclass
+class RaceState:
+    """
+    lap 랩을 끝낸 시점의 레이스 상태(체크포인트).
+    차량 축 배열(D/T/fuel/life/sidx/age), 스틴트 계획, RNG 비트 생성기 상태, 랩별 기록(cross/pit_a/comp_hist).
+    기록 배열은 (laps+1, n) 전체 크기지만 lap 행까지만 유효 — 본 레이스 체크포인트끼리는 같은 배열을
+    공유하고(뒤 랩은 앞 행을 건드리지 않는다), 분기(branch)할 때 한 번 복사한다.
+    """
+    lap: int
+    D: np.ndarray
+    T: np.ndarray
+    fuel: np.ndarray
+    life: np.ndarray
+    sidx: np.ndarray
+    age: np.ndarray                   # 지금 세트로 끝낸 랩 수(타이어 표 인덱스)
+    stints: List[List[dict]]
+    rng: dict
+    cross: np.ndarray
+    pit_a: np.ndarray
+    comp_hist: np.ndarray
+
+    def branch(self, overrides: Optional[Dict[int, List[dict]]] = None) -> "RaceState":
+        """같은 시점에서 갈라지는 사본. overrides = {차량 인덱스: 새 스틴트 계획(전체)}."""
+        stints = list(self.stints)
+        for i, plan in (overrides or {}).items():
+            stints[int(i)] = plan
+        return replace(self, stints=stints, cross=self.cross.copy(), pit_a=self.pit_a.copy(),
+                       comp_hist=self.comp_hist.copy())
+
+    def to_dict(self) -> dict:
+        """JSON 직렬화용(기록은 lap 행까지만)."""
+        k = self.lap + 1
+        return {"v": TIMELINE_VERSION, "lap": self.lap,
+                **{f: getattr(self, f).tolist() for f in ("D", "T", "fuel", "life", "sidx", "age")},
+                "stints": self.stints, "rng": self.rng,
+                "cross": self.cross[:k].tolist(), "comp_hist": self.comp_hist[:k].tolist(),
+                "pit_a": [[None if not np.isfinite(x) else float(x) for x in row] for row in self.pit_a[:k]]}
+
+    @classmethod
+    def from_dict(cls, d: dict, total_laps: int) -> "RaceState":
+        k, n = int(d["lap"]) + 1, len(d["D"])
+        rows = max(1, int(total_laps)) + 1
+        cross, pit_a = np.zeros((rows, n)), np.full((rows, n), np.nan)
+        comp_hist = np.zeros((rows, n), dtype=int)
+        cross[:k] = np.array(d["cross"], dtype=float).reshape(k, n)
+        pit_a[:k] = np.array(d["pit_a"], dtype=float).reshape(k, n)     # None → nan
+        comp_hist[:k] = np.array(d["comp_hist"], dtype=int).reshape(k, n)
+        arr = {f: np.array(d[f], dtype=float) for f in ("D", "T", "fuel", "life")}
+        age = np.array(d.get("age") or [0] * n, dtype=int)
+        return cls(lap=int(d["lap"]), sidx=np.array(d["sidx"], dtype=int), age=age, stints=d["stints"], rng=d["rng"],
+                   cross=cross, pit_a=pit_a, comp_hist=comp_hist, **arr)
+
+
+def _start(ctx: _Ctx, seed: int) -> RaceState:
+    n = ctx.n
+    stints = [_stints(p, ctx.laps_tot) for p in ctx.plan]
+    for plan in stints:                     # 젖은 노면 출발이면 첫 스틴트부터 맞는 종류로
+        c0 = plan[0]["compound"]
+        if _CLS[COMPOUNDS.index(c0)] != ctx.want[0]:
+            plan[0] = dict(plan[0], compound=crossover(int(ctx.want[0]), c0), dry=c0)
+    return RaceState(
+        lap=0,
+        D=-0.010 * np.arange(n),            # 그리드: 결승선 뒤로 줄세우기(페이지와 동일)
+        T=np.zeros(n), fuel=np.full(n, FUEL_START), life=np.ones(n), sidx=np.zeros(n, dtype=int),
+        age=np.zeros(n, dtype=int),
+        stints=stints,
+        rng=np.random.default_rng(seed).bit_generator.state,
+        cross=np.zeros((ctx.laps_tot + 1, n)),           # cross[L] = L랩 결승선 통과 시각
+        pit_a=np.full((ctx.laps_tot + 1, n), np.nan),
+        comp_hist=np.zeros((ctx.laps_tot + 1, n), dtype=int),   # L랩 주행 컴파운드
+    )
+
+
+def _lap(ctx: _Ctx, st_: RaceState, rng: np.random.Generator) -> None:
+    """한 랩 진행(제자리 갱신). 난수는 랩마다 같은 개수만 뽑는다 — 분기끼리 같은 랩엔 같은 난수(공통 난수)."""
+    n, L, laps_tot, stints = ctx.n, st_.lap + 1, ctx.laps_tot, st_.stints
+    sidx, life, fuel, D, T = st_.sidx, st_.life, st_.fuel, st_.D, st_.T
+    cur = [stints[i][min(sidx[i], len(stints[i]) - 1)] for i in range(n)]
+    comp = np.array([COMPOUNDS.index(c["compound"]) for c in cur])
+    pace = [c["pace"] for c in cur]
+    mgmt = np.array([PACE[pc]["wear"] for pc in pace])
+    grip = np.array([RACE_TIRE[COMPOUNDS[c]]["gripDry"] for c in comp])
+    wear = np.array([RACE_TIRE[COMPOUNDS[c]]["wearDry"] * PACE[pc]["wear"] for c, pc in zip(comp, pace)])
+    spd = np.array([PACE[pc]["speed"] for pc in pace])
+    st_.comp_hist[L] = comp
+
+    # 피트: 계획 랩 도달 또는 타이어 고갈 예상(마지막 랩 제외)
+    has_next = np.array([sidx[i] + 1 < len(stints[i]) for i in range(n)])
+    plan_end = np.array([cur[i]["to_lap"] for i in range(n)])
+    pit = (L < laps_tot) & (((L >= plan_end) & has_next) | (life - wear < BOX_LIFE))
+    swap = (L < laps_tot) & (_CLS[comp] != ctx.want[L])         # 다음 랩 노면에 맞지 않는 타이어
+    if swap.any():
+        pit = pit | swap
+        stints = st_.stints = list(stints)                     # 체크포인트끼리 공유 — 바꿀 때만 복사
+        for i in np.nonzero(swap)[0]:
+            plan, k = stints[i], min(int(sidx[i]), len(stints[i]) - 1)
+            nk = k + 1 if has_next[i] else None
+            if nk is not None and _CLS[COMPOUNDS.index(plan[nk]["compound"])] == ctx.want[L]:
+                continue
+            src = plan[nk] if nk is not None else plan[k]
+            dry = src.get("dry", src["compound"])
+            new = dict(src, compound=crossover(int(ctx.want[L]), dry), dry=dry)
+            stints[i] = (plan[:k] + [dict(plan[k], to_lap=min(int(plan[k]["to_lap"]), L))] + [new]
+                         + plan[(nk if nk is not None else k) + 1:])
+
+    # 랩 페이스: 연료는 랩 중간값, 타이어 손실은 표 한 번 인덱싱(페이스별 마모 배율)
+    fuel_mid = np.maximum(0.0, fuel - 0.5 * FUEL_PER_LAP)
+    tyre = ctx.tyres.delta(comp, st_.age, mgmt)
+    grip = grip * (1.0 - wet_loss(_CLS[comp], ctx.wet[L - 1]))
+    vmul = np.clip(ctx.base_vmul * spd * grip * (1 - 0.004 * fuel_mid) / (1.0 + tyre), 0.90, 1.25)
+    noise, u_pass = rng.normal(0.0, LAP_NOISE, n), rng.random(n)
+    unit = ctx.lap_base / vmul * (1.0 + noise)          # 1랩 주행 시간
+    if L == 1:
+        T = T + START_LOSS
+
+    main_to_line = L - D
+    tau_D = ctx.tau(D)
+    t_a = T + (ctx.tau(L - 1 + ctx.d_in) - tau_D) * unit
+    t_b = t_a + ctx.t_lane_in + PIT_WAIT_SEC + ctx.t_lane_out
+    c = np.where(pit, t_a + ctx.line_frac * (t_b - t_a), T + (ctx.tau(float(L)) - tau_D) * unit)
+
+    # 더티 에어/추월: 직전 랩 통과 순서대로 바로 앞차와 비교(같은 랩 차량끼리)
+    order = np.argsort(st_.cross[L - 1] if L > 1 else np.arange(n), kind="stable")
+    for k in range(1, n):
+        i, j = order[k], order[k - 1]
+        if pit[i] or pit[j] or c[i] >= c[j] + FOLLOW_GAP:
+            continue
+        if c[i] < c[j]:
+            p_pass = np.clip((unit[j] - unit[i] - PASS_DELTA) / PASS_SPAN, 0.0, PASS_P_MAX)
+            if u_pass[i] < p_pass:
+                continue
+        c[i] = c[j] + FOLLOW_GAP
+    st_.cross[L] = c
+
+    dt_lap = np.where(pit, t_b, c) - T
+    st_.fuel = np.maximum(0.0, fuel - ctx.burn * np.where(pit, t_a - T, dt_lap))
+    st_.life = np.where(pit, 1.0, np.maximum(0.0, life - wear * main_to_line))
+    st_.pit_a[L] = np.where(pit, t_a, np.nan)
+    st_.sidx = sidx + pit
+    st_.age = np.where(pit, 0, st_.age + 1)
+    st_.T = np.where(pit, t_b, c)
+    st_.D = np.where(pit, L + ctx.d_out, float(L))
+    st_.lap = L
+
+
+def _advance(ctx: _Ctx, st_: RaceState, keep: Optional[List[RaceState]] = None) -> RaceState:
+    """st_ 를 결승까지 진행. keep 이 있으면 매 랩 끝 체크포인트를 붙인다(배열은 새 객체라 참조만)."""
+    rng = np.random.Generator(np.random.PCG64())
+    rng.bit_generator.state = st_.rng
+    while st_.lap < ctx.laps_tot:
+        _lap(ctx, st_, rng)
+        st_.rng = rng.bit_generator.state
+        if keep is not None:
+            keep.append(replace(st_))
+    return st_
+
+
+def _finish(st_: RaceState, laps_tot: int):
+    """결승: 선두가 마지막 랩을 끝낸 뒤 각자 다음 결승선 통과에서 체커."""
+    cross, n = st_.cross, st_.cross.shape[1]
+    t_lead = float(cross[laps_tot].min())
+    fin_lap = np.argmax(cross >= t_lead, axis=0)
+    fin_lap[~(cross >= t_lead).any(axis=0)] = laps_tot
+    return fin_lap, cross[fin_lap, np.arange(n)]
+
+
+class RaceRun:
+    """
+    체크포인트가 붙은 본 레이스. states[L] = L랩 끝 상태(0 = 출발 전).
+    branch(L, overrides) → 그 시점부터 다른 결정으로 끝까지 다시 계산한 결과(공통 구간은 재계산 없음).
+    """
+
+    def __init__(self, ctx: _Ctx, states: List[RaceState]):
+        self.ctx, self.states = ctx, states
+        self.final = states[-1]
+
+    def checkpoint(self, lap: int) -> RaceState:
+        return self.states[max(0, min(int(lap), self.ctx.laps_tot))]
+
+    def result(self, st_: Optional[RaceState] = None) -> dict:
+        st_ = st_ or self.final
+        fin_lap, t_fin = _finish(st_, self.ctx.laps_tot)
+        return _classify(self.ctx.plan, st_.stints, st_.cross, st_.pit_a, st_.comp_hist,
+                         fin_lap, t_fin, self.ctx.laps_tot)
+
+    def branch(self, lap: int, overrides: Optional[Dict[int, List[dict]]] = None) -> RaceState:
+        return _advance(self.ctx, self.checkpoint(lap).branch(overrides))
+
+    def branches(self, lap: int, options: Sequence[Optional[Dict[int, List[dict]]]]) -> List[dict]:
+        """같은 체크포인트에서 여러 결정을 한 번에 평가 → [{"finish": 차량별 체커 시각, "fin_lap"}]."""
+        out = []
+        for ov in options:
+            fin_lap, t_fin = _finish(self.branch(lap, ov), self.ctx.laps_tot)
+            out.append({"fin_lap": fin_lap, "finish": t_fin})
+        return out
+
+
+def race_run(plan: Sequence, *, lap_base: float, total_laps: int, track_s: Optional[dict] = None,
+             pit_travel: float = PIT_TRAVEL, seed: int = 0, speed: Optional[dict] = None,
+             tyre_env: Optional[dict] = None, wet: Optional[Sequence[float]] = None) -> RaceRun:
+    """simulate_race 와 같은 레이스를 랩마다 체크포인트를 남기며 계산."""
+    ctx = _Ctx(plan, lap_base=lap_base, total_laps=total_laps, track_s=track_s,
+               pit_travel=pit_travel, speed=speed, tyre_env=tyre_env, wet=wet)
+    st_ = _start(ctx, seed)
+    states = [replace(st_)]
+    _advance(ctx, st_, keep=states)
+    return RaceRun(ctx, states)
+
+
+@timed("engine.simulate_race", "engine")
+def simulate_race(plan: Sequence, *, lap_base: float, total_laps: int,
+                  track_s: Optional[dict] = None, pit_travel: float = PIT_TRAVEL,
+                  seed: int = 0, kf_dt: float = KF_DT, speed: Optional[dict] = None,
+                  tyre_env: Optional[dict] = None, wet: Optional[Sequence[float]] = None) -> dict:
+    """
+    plan: 그리드 순서의 페이지 PLAN(name/team/abbr/base_vmul/stint_plan).
+    speed: 트랙 LUT 의 "speed"(곡률 속도 배율). None 이면 등속.
+    tyre_env: tracks.csv 행의 abrasion_index/temp_mean_c/temp_std_c(없으면 기준 조건).
+    wet: 랩별 노면 젖음(WeatherTimeline.laps()["wet"]). None 이면 건조.
+    반환: {"result": 순위표(미디어 페이지 입력), "timeline": 브라우저 재생용 키프레임}
+    """
+    ctx = _Ctx(plan, lap_base=lap_base, total_laps=total_laps, track_s=track_s,
+               pit_travel=pit_travel, speed=speed, tyre_env=tyre_env, wet=wet)
+    st_ = _advance(ctx, _start(ctx, seed))
+    fin_lap, t_fin = _finish(st_, ctx.laps_tot)
+    result = _classify(ctx.plan, st_.stints, st_.cross, st_.pit_a, st_.comp_hist, fin_lap, t_fin, ctx.laps_tot)
+    timeline = _keyframes(st_.cross, st_.pit_a, st_.comp_hist, fin_lap, t_fin, ctx.S, ctx.d_in, ctx.d_out,
+                          ctx.t_lane_in, ctx.t_lane_out, ctx.laps_tot, float(kf_dt), ctx.prof)
+    return {"result": result, "timeline": timeline}
+
+
+# ── 전략 분기: 언더컷/오버컷 조언 ────────────────────────────────────────────
+@timed("engine.pit_advice", "engine")
+def pit_advice(run: RaceRun, car: int, lap: int, *, horizon: int = 6,
+               compounds: Optional[Sequence[str]] = None) -> dict:
+    """
+    lap 랩 끝 체크포인트에서 car 의 다음 피트를 lap+1 … lap+horizon 랩 × 컴파운드로 바꿔 본 분기들.
+    반환: {"lap", "rival"(바로 앞 차 인덱스 | None), "base": 현재 계획, "options": [...] (도착 순위·시간 순)}
+      각 항목 {pit_lap, compound, pos, time_sec, delta(현재 계획 대비 초), rival_gap(앞 차 대비 초, 음수 = 앞섬), kind}
+      kind: "undercut"(계획보다 먼저) | "overcut"(늦게) | "plan" | "add_stop"(남은 계획 피트가 없는데 한 번 더)
+    계획 그대로인 분기가 본선과 다르게 끝나면(재현 실패) 그 항목만 빼고 로그를 남긴다 — 조언 패널 전체를 죽이지 않게.
+    분기는 현재 스틴트 끝(to_lap)과 다음 스틴트 컴파운드만 바꾸고 그 뒤 스틴트는 그대로 둔다
+    (p 가 넘어선 to_lap 은 한 랩씩 밀어 올림). 다음 스틴트가 없으면 결승까지 가는 스틴트를 하나 붙인다.
+    """
+    ctx = run.ctx
+    lap = max(0, min(int(lap), ctx.laps_tot - 1))
+    cp = run.checkpoint(lap)
+    plan = cp.stints[car]
+    k = min(int(cp.sidx[car]), len(plan) - 1)
+    cur = plan[k]
+    order = np.argsort(-(cp.D + 1e-6 * np.arange(ctx.n))) if lap == 0 else np.argsort(cp.cross[lap], kind="stable")
+    at = int(np.nonzero(order == car)[0][0])
+    rival = int(order[at - 1]) if at > 0 else None
+    planned = cur["to_lap"] if k + 1 < len(plan) else None
+
+    choices, options = [], [None]
+    for p in range(lap + 1, min(ctx.laps_tot - 1, lap + int(horizon)) + 1):
+        for c in (compounds or COMPOUNDS[:3]):
+            if k + 1 < len(plan):
+                rest = [dict(s, to_lap=max(int(s["to_lap"]), p + j)) for j, s in enumerate(plan[k + 1:], start=1)]
+                if rest[0]["compound"] != c:
+                    rest[0] = {kk: v for kk, v in rest[0].items() if kk != "dry"}   # 직접 고른 슬릭
+                    rest[0]["compound"] = c
+            else:
+                rest = [{"to_lap": ctx.laps_tot, "compound": c, "pace": cur["pace"]}]
+            new = plan[:k] + [dict(cur, to_lap=p)] + rest
+            choices.append((p, c, new == plan))
+            options.append({car: new})
+    res = run.branches(lap, options)
+
+    def row(r, p, c):
+        fin = r["finish"]
+        key = np.lexsort((fin, -r["fin_lap"]))
+        pos = int(np.nonzero(key == car)[0][0]) + 1
+        gap = None if rival is None else round(float(fin[car] - fin[rival]), 3)
+        return {"pit_lap": p, "compound": c, "pos": pos, "time_sec": round(float(fin[car]), 3),
+                "rival_gap": gap}
+
+    base = row(res[0], planned, None)
+    base["kind"] = "plan"
+    rows = []
+    for r, (p, c, same) in zip(res[1:], choices):
+        x = row(r, p, c)
+        if same and x["time_sec"] != base["time_sec"]:    # 계획 그대로인 분기는 본선과 같아야 한다(공통 난수)
+            log.warning("pit_advice: 계획 분기 불일치 car=%s lap=%s pit=%s %s: %s != %s — 항목 생략",
+                        car, lap, p, c, x["time_sec"], base["time_sec"])
+            continue
+        x["delta"] = round(x["time_sec"] - base["time_sec"], 3)
+        if planned is None:
+            x["kind"] = "add_stop"
+        else:
+            x["kind"] = "plan" if p == planned else ("undercut" if p < planned else "overcut")
+        rows.append(x)
+    rows.sort(key=lambda x: (x["pos"], x["time_sec"]))
+    return {"lap": lap, "rival": rival, "base": base, "options": rows}
+
+
+def _classify(plan, stints, cross, pit_a, comp_hist, fin_lap, t_fin, laps_tot) -> dict:
+    n = len(plan)
+    order = sorted(range(n), key=lambda i: (-int(fin_lap[i]), float(t_fin[i])))
+    lead = order[0]
+    rows = []
+    for pos, i in enumerate(order, start=1):
+        fl = int(fin_lap[i])
+        lap_t = np.diff(cross[:fl + 1, i])
+        stops = [L for L in range(1, fl + 1) if np.isfinite(pit_a[L, i]) and pit_a[L, i] < t_fin[i]]
+        comps = [COMPOUNDS[int(comp_hist[1, i])]] + [COMPOUNDS[int(comp_hist[L + 1, i])] for L in stops if L < laps_tot]
+        down = int(fin_lap[lead]) - fl
+        rows.append({
+            "pos": pos,
+            "name": _get(plan[i], "name", default=""),
+            "team": _get(plan[i], "team", default=""),
+            "abbr": _get(plan[i], "abbr", default=""),
+            "grid": i + 1,
+            "laps": fl,
+            "time_sec": round(float(t_fin[i]), 3),
+            "gap": ("" if i == lead else (f"+{down} Lap" + ("s" if down > 1 else "")) if down > 0
+                    else f"+{float(t_fin[i] - t_fin[lead]):.3f}"),
+            "best_lap": round(float(lap_t.min()), 3) if lap_t.size else None,
+            "pit_stops": len(stops),
+            "stints": comps,
+        })
+    return {"total_laps": laps_tot, "results": rows}
+
+
+def _keyframes(cross, pit_a, comp_hist, fin_lap, t_fin, S, d_in, d_out,
+               t_lane_in, t_lane_out, laps_tot, kf_dt, prof: SpeedProfile) -> dict:
+    n = cross.shape[1]
+    t_end = float(t_fin.max()) + 2.0
+    frames = int(np.ceil(t_end / kf_dt)) + 1
+    tf = np.arange(frames) * kf_dt
+
+    pos = np.zeros((frames, n), dtype=np.uint16)
+    lap = np.zeros((frames, n), dtype=np.uint8)
+    st_ = np.zeros((frames, n), dtype=np.uint8)
+    pits = []
+    for i in range(n):
+        fl = int(fin_lap[i])
+        # 진행 거리 노트: 그리드 → (랩 통과 | 피트 진입/합류) … → 체커
+        kt, kd = [0.0], [-0.010 * i]
+        segs = []          # (진입, 정차 시작, 정차 끝, 합류)
+        for L in range(1, fl + 1):
+            a = pit_a[L, i]
+            if np.isfinite(a) and a < t_fin[i]:
+                b = a + t_lane_in + PIT_WAIT_SEC + t_lane_out
+                kt += [a, cross[L, i], b]
+                kd += [L - 1 + d_in, float(L), L + d_out]
+                segs.append((a, a + t_lane_in, a + t_lane_in + PIT_WAIT_SEC, b))
+            elif cross[L, i] > kt[-1]:
+                kt.append(cross[L, i])
+                kd.append(float(L))
+        kt.append(float(t_fin[i]))
+        kd.append(float(fl))
+        kt, kd = np.array(kt), np.array(kd)
+        keep = kt <= t_fin[i]
+        # 노트 사이는 환산 시간 축에서 선형 → 거리로 되돌리면 코너에서 느리고 직선에서 빠르다
+        w = np.interp(tf, kt[keep], prof.tau(kd[keep], S["finish"]))
+        d = prof.dist(w, S["finish"])
+        d[tf >= t_fin[i]] = fl
+
+        s_fin = prof.warp(S["finish"])      # 본선 좌표는 환산 시간 축(프로파일 없으면 s 그대로)
+        s = (s_fin + w) % 1.0
+        state = np.full(frames, ST_MAIN)
+        for (a, s0, s1, b) in segs:
+            lane_in = (tf >= a) & (tf < s0)
+            stop = (tf >= s0) & (tf < s1)
+            lane_out = (tf >= s1) & (tf < b)
+            w_in = np.clip((tf - a - TRANS_SIM) / max(1e-6, s0 - a - TRANS_SIM), 0.0, 1.0)
+            w_out = np.clip((tf - s1) / max(1e-6, b - s1 - TRANS_SIM), 0.0, 1.0)
+            s = np.where(lane_in, S["pitInPit"] + ((S["pitStop"] - S["pitInPit"]) % 1.0) * w_in, s)
+            s = np.where(stop, S["pitStop"], s)
+            s = np.where(lane_out, S["pitStop"] + ((S["pitOut"] - S["pitStop"]) % 1.0) * w_out, s)
+            state = np.where(lane_in | lane_out, ST_PIT, np.where(stop, ST_STOP, state))
+        done = tf >= t_fin[i]
+        s = np.where(done, s_fin, s)
+        state = np.where(done, ST_DONE, state)
+        pits.append([[round(float(x), 2) for x in seg] for seg in segs])
+
+        lap_i = np.clip(np.floor(d + 1e-9), 0, laps_tot).astype(int)
+        comp = comp_hist[np.clip(lap_i + 1, 1, laps_tot), i]
+        pos[:, i] = np.round((s % 1.0) * 65536.0).astype(np.int64) & 0xFFFF
+        lap[:, i] = lap_i
+        st_[:, i] = state | (comp << 4)
+
+    # 프레임 축 델타(모듈러) → 한 버퍼로 이어 붙여 zlib
+    def delta(a):
+        out = a.copy()
+        out[1:] = a[1:] - a[:-1]      # uint 오버플로 = 모듈러 뺄셈
+        return out
+
+    raw = delta(pos).astype("<u2").tobytes() + delta(lap).tobytes() + delta(st_).tobytes()
+    laps = [[round(float(x), 3) for x in cross[1:int(fin_lap[i]) + 1, i]] for i in range(n)]
+    return {
+        "v": TIMELINE_VERSION, "dt": kf_dt, "frames": frames, "n": n,
+        "t_end": round(t_end, 3), "total_laps": laps_tot,
+        "enc": "zlib+delta:u16,u8,u8",
+        "data": base64.b64encode(zlib.compress(raw, 9)).decode("ascii"),
+        "laps": laps,                    # 차량별 결승선 통과 시각(랩 타임 표시용)
+        "finish": [round(float(x), 3) for x in t_fin],
+        "pits": pits,
+        "compounds": COMPOUNDS,
+        "warp": not prof.flat,           # 본선 s 가 환산 시간 좌표 → JS 가 speedUnwarp 로 되돌린다
+    }
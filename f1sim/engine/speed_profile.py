@@ -0,0 +1,191 @@
+# f1sim/engine/speed_profile.py
+# -*- coding: utf-8 -*-
+"""
+곡률 기반 속도 프로파일.
+
+circuit_calculator.py 가 main 경로(호길이 균등 재샘플)에서
+코너 한계 속도(횡가속) → 가속/제동 한계 전·후진 패스로 속도 곡선을 만들고,
+랩 평균(조화 평균)으로 나눈 배율 m(s)를 트랙 LUT 의 "speed" 로 저장한다.
+  - ∫ ds / m(s) = 1 이므로 배율을 곱해도 랩타임(LAP_BASE, lap_sec_csv 기준)은 그대로이고
+    랩 안에서의 속도 분포만 달라진다.
+  - 저장: s 균등 bins 개 uint16(×1e-4) base64, 조회는 JS/Python 모두 O(1) (bin 상수).
+엔진은 SpeedProfile.tau() 로 '거리 → 기준 속도 환산 시간 거리'를 바꿔 같은 적분을 재사용한다.
+"""
+from __future__ import annotations
+from typing import Optional, List
+import base64
+import math
+
+import numpy as np
+
+PROFILE_VERSION = 1
+PROFILE_BINS = 512
+_Q = 1e-4                   # uint16 양자화 단위
+
+G = 9.81
+A_LAT = 4.0 * G             # 코너 횡가속 한계(m/s²)
+A_ACC = 1.2 * G             # 저속 가속 한계 — 최고속에서 0으로 줄어든다
+A_BRK = 4.5 * G             # 제동 한계
+V_TOP = 92.0                # 최고속(m/s, ≈ 330 km/h)
+V_MIN = 18.0                # 최저 코너 속도(m/s)
+CURV_WIN_M = 30.0           # 곡률 평활 창(m) — 폴리곤 꼭짓점의 꺾임을 코너 반경으로 펼친다
+LOOP_GAP = 0.01             # 시작·끝 간격이 랩 길이의 이 비율 이하면 한 바퀴로 이어진 경로
+DEFAULT_KM = 5.0            # length_km 없을 때 가정 길이
+
+ZONE_FRAC = 0.92            # 추월 구간: 최고 배율의 이 비율 이상이 이어지는 직선
+ZONE_MIN_LAP = 0.05         # 추월 구간 최소 길이(랩 비율)
+
+
+def _smooth(a: np.ndarray, w: int, periodic: bool) -> np.ndarray:
+    if w <= 1:
+        return a
+    k = np.ones(w) / w
+    if periodic:
+        pad = np.concatenate([a[-w:], a, a[:w]])
+        return np.convolve(pad, k, mode="same")[w:-w]
+    return np.convolve(np.pad(a, w, mode="edge"), k, mode="same")[w:-w]
+
+
+def _speed_passes(v: np.ndarray, ds: float, periodic: bool) -> np.ndarray:
+    """코너 한계 속도 v 에 가속(전진)/제동(후진) 한계를 건다. 닫힌 경로는 두 바퀴 돌려 이음새를 맞춘다."""
+    n = len(v)
+    reps = 2 if periodic else 1
+    out = v.copy()
+    for k in range(1, n * reps):
+        i, j = k % n, (k - 1) % n
+        a = A_ACC * max(0.0, 1.0 - (out[j] / V_TOP) ** 2)
+        out[i] = min(out[i], math.sqrt(out[j] ** 2 + 2.0 * a * ds))
+    for k in range(n * reps - 2, -1, -1):
+        i, j = k % n, (k + 1) % n
+        out[i] = min(out[i], math.sqrt(out[j] ** 2 + 2.0 * A_BRK * ds))
+    return out
+
+
+def _zones(m: np.ndarray) -> List[List[float]]:
+    """배율이 높은 구간(긴 직선) [s0, s1] — 끝은 제동 시작점. 랩 경계를 넘는 구간은 이어 붙인다."""
+    n = len(m)
+    hi = m >= ZONE_FRAC * float(m.max())
+    if hi.all() or not hi.any():
+        return []
+    r = int(np.argmin(hi))                # 낮은 bin 에서 시작하도록 회전
+    h = np.roll(hi, -r)
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], h.astype(int), [0]])))
+    out = []
+    for a, b in zip(edges[::2], edges[1::2]):
+        if (b - a) / n >= ZONE_MIN_LAP:
+            out.append([round(float((a + r) % n) / n, 4), round(float((b + r) % n) / n, 4)])
+    return out
+
+
+def build_speed_profile(xy: np.ndarray, len_px: float, lap_sec: Optional[float] = None,
+                        length_km: Optional[float] = None, bins: int = PROFILE_BINS) -> Optional[dict]:
+    """
+    xy: main 경로 호길이 균등 재샘플(N,2, s_i = i/(N-1)).
+    반환: LUT "speed" 항목 {n, q, data, lap_sec, v_kmh:[min,max], zones} (없으면 None)
+    """
+    n_pts = len(xy)
+    if n_pts < 8 or len_px <= 0:
+        return None
+    m_per_px = (float(length_km) if length_km else DEFAULT_KM) * 1000.0 / len_px
+    ds = len_px / (n_pts - 1) * m_per_px
+    gap = float(np.hypot(*(xy[0] - xy[-1])))
+    periodic = gap < LOOP_GAP * len_px
+
+    # 꼭짓점별 방향 변화(rad, 부호 포함 — 이음새의 작은 지그재그는 평활에서 상쇄) → 곡률(1/m)
+    if periodic:
+        pts = xy[:-1] if gap < 1e-3 * len_px else xy
+        d = np.roll(pts, -1, axis=0) - pts
+        ang = np.arctan2(d[:, 1], d[:, 0])
+        dth = ang - np.roll(ang, 1)
+    else:
+        pts = xy
+        d = np.diff(pts, axis=0)
+        ang = np.arctan2(d[:, 1], d[:, 0])
+        dth = np.concatenate([[0.0], np.diff(ang), [0.0]])
+    dth = (dth + math.pi) % (2 * math.pi) - math.pi
+    kappa = np.abs(_smooth(dth / ds, max(1, int(round(CURV_WIN_M / ds))), periodic))
+
+    v = np.clip(np.sqrt(A_LAT / np.maximum(kappa, 1e-9)), V_MIN, V_TOP)
+    v = _speed_passes(v, ds, periodic)
+
+    # s 균등 bin 으로 (bin 중심 보간) → 조화 평균으로 정규화
+    s_pts = np.arange(len(v)) / (len(v) if periodic else max(1, len(v) - 1))
+    s_bin = (np.arange(bins) + 0.5) / bins
+    vb = np.interp(s_bin, np.concatenate([s_pts, [1.0]]) if periodic else s_pts,
+                   np.concatenate([v, v[:1]]) if periodic else v)
+    v_h = 1.0 / float(np.mean(1.0 / vb))
+    m = vb / v_h
+    q = np.clip(np.round(m / _Q), 1, 65535).astype("<u2")
+
+    out = {
+        "version": PROFILE_VERSION,
+        "n": bins,
+        "q": _Q,
+        "data": base64.b64encode(q.tobytes()).decode("ascii"),
+        "zones": _zones(m),
+    }
+    if lap_sec and lap_sec > 0:
+        v_ref = len_px * m_per_px / float(lap_sec)       # lap_sec_csv 에 맞춘 평균 속도(m/s)
+        out["lap_sec"] = round(float(lap_sec), 3)
+        out["v_kmh"] = [round(float(m.min() * v_ref * 3.6), 1), round(float(m.max() * v_ref * 3.6), 1)]
+    return out
+
+
+class SpeedProfile:
+    """LUT "speed" 항목 디코더. 없거나 잘못되면 평탄(배율 1) 프로파일."""
+
+    def __init__(self, obj: Optional[dict] = None):
+        m = None
+        try:
+            if obj and obj.get("data"):
+                raw = np.frombuffer(base64.b64decode(obj["data"]), dtype="<u2")
+                if len(raw) == int(obj.get("n", len(raw))) and len(raw) > 0:
+                    m = raw.astype(np.float64) * float(obj.get("q", _Q))
+        except Exception:
+            m = None
+        self.flat = m is None
+        self.m = np.ones(1) if m is None else m
+        n = len(self.m)
+        self.n = n
+        # 누적 환산 시간(랩 비율): cum[k] = Σ_{j<k} 1/m_j / n, cum[n] = 1
+        self._grid = np.arange(n + 1) / n
+        c = np.concatenate([[0.0], np.cumsum(1.0 / self.m) / n])
+        self._cum = c / c[-1]
+
+    def at(self, s):
+        """s(0~1, 경로 시작 기준) 에서의 속도 배율 — bin 조회 O(1)."""
+        if self.flat:
+            return np.ones_like(np.asarray(s, dtype=float)) if np.ndim(s) else 1.0
+        k = (np.mod(np.asarray(s, dtype=float), 1.0) * self.n).astype(int) % self.n
+        return self.m[k] if np.ndim(s) else float(self.m[k])
+
+    def _G(self, x):
+        x = np.asarray(x, dtype=float)
+        f = np.floor(x)
+        return f + np.interp(x - f, self._grid, self._cum)
+
+    def _Ginv(self, y):
+        y = np.asarray(y, dtype=float)
+        f = np.floor(y)
+        return f + np.interp(y - f, self._cum, self._grid)
+
+    def warp(self, s):
+        """경로 s → 환산 시간 좌표(0~1). 시간에 선형이라 키프레임 델타 압축이 유지된다 — 역변환은 JS speedUnwarp."""
+        if self.flat:
+            return np.mod(s, 1.0) if np.ndim(s) else float(s) % 1.0
+        r = np.mod(self._G(s), 1.0)
+        return r if np.ndim(s) else float(r)
+
+    def tau(self, d, s0: float = 0.0):
+        """s0 에서 d 랩 진행할 때 걸리는 시간을 '기준 속도 1랩 = 1' 단위로. 평탄하면 d 그대로."""
+        if self.flat:
+            return np.asarray(d, dtype=float) if np.ndim(d) else float(d)
+        r = self._G(s0 + np.asarray(d, dtype=float)) - self._G(s0)
+        return r if np.ndim(d) else float(r)
+
+    def dist(self, w, s0: float = 0.0):
+        """tau 의 역함수: 환산 시간 w 동안 s0 에서 나아간 거리(랩)."""
+        if self.flat:
+            return np.asarray(w, dtype=float) if np.ndim(w) else float(w)
+        r = self._Ginv(self._G(s0) + np.asarray(w, dtype=float)) - s0
+        return r if np.ndim(w) else float(r)
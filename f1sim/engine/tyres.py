@@ -0,0 +1,107 @@
+# f1sim/engine/tyres.py
+# -*- coding: utf-8 -*-
+"""
+공용 타이어 모델 — 랩 엔진(core/sim.py)과 서버 레이스 타임라인(race_timeline.py)이 같이 쓴다.
+
+타이어 나이(그 세트로 달린 랩 수) k 마다 랩타임 손실 비율을 미리 계산해 둔 표:
+- 워밍업: 첫 랩 warm × exp(−k / warm_laps). 노면이 최적 온도창보다 차가우면 더 길다.
+- 마모: 수명 life_k = 1 − wear_eff·(k+0.5) (랩 중간 값). 손실 deg × (1−life)^DEG_EXP — 갈수록 가팔라진다.
+- 클리프: life 가 CLIFF_LIFE 아래로 떨어지면 CLIFF_RATE × ((CLIFF_LIFE−life)/CLIFF_LIFE)² 추가(상한 CLIFF_MAX).
+- 온도: tracks.csv temp_mean_c/temp_std_c 로 최적 창(t_opt ± t_win) 이탈의 기댓값을 구해
+  마모 속도에 곱한다(E[(T−t_opt)²] = (mean−t_opt)² + std²).
+- 마모 속도는 abrasion_index(0.5 = 기준)에 비례.
+표는 (트랙 조건) 하나당 컴파운드 × 나이 2차원 배열 — 엔진은 delta[컴파운드, 나이] 로 한 번에 모은다.
+lru_cache 로 같은 트랙 조건은 한 번만 만든다.
+
+사용:
+    tab = track_tyres(track_row)                  # tracks.csv 한 행(dict/Series)
+    d = tab.delta(tab.index("M"), np.arange(20), mgmt=1.1)   # 스틴트 20랩의 랩별 손실 비율
+"""
+from __future__ import annotations
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+# wear 는 race_core.js / race_timeline.RACE_TIRE 의 wearDry 와 같은 값(수명/랩)
+TYRE = {
+    "soft":         {"wear": 0.060, "deg": 0.030, "warm": 0.010, "warm_laps": 0.6, "t_opt": 22.0, "t_win": 10.0},
+    "medium":       {"wear": 0.045, "deg": 0.024, "warm": 0.015, "warm_laps": 1.0, "t_opt": 26.0, "t_win": 12.0},
+    "hard":         {"wear": 0.035, "deg": 0.020, "warm": 0.022, "warm_laps": 1.6, "t_opt": 30.0, "t_win": 14.0},
+    "intermediate": {"wear": 0.080, "deg": 0.030, "warm": 0.012, "warm_laps": 0.8, "t_opt": 16.0, "t_win": 8.0},
+    "wet":          {"wear": 0.120, "deg": 0.034, "warm": 0.012, "warm_laps": 0.8, "t_opt": 12.0, "t_win": 8.0},
+}
+COMPOUNDS = list(TYRE)
+ALIASES = {"S": "soft", "M": "medium", "H": "hard", "I": "intermediate", "W": "wet"}
+
+DEG_EXP = 1.6
+CLIFF_LIFE = 0.25
+CLIFF_RATE = 0.04
+CLIFF_MAX = 0.05
+TEMP_SENS = 0.15
+MAX_AGE = 80           # 이보다 오래된 세트는 마지막 값을 쓴다
+
+
+class TyreTable:
+    """컴파운드 × 나이 표. warm/deg/life: shape (len(COMPOUNDS), MAX_AGE+1)."""
+    __slots__ = ("warm", "deg", "life", "params")
+
+    def __init__(self, warm: np.ndarray, deg: np.ndarray, life: np.ndarray, params: tuple):
+        self.warm, self.deg, self.life, self.params = warm, deg, life, params
+
+    @staticmethod
+    def index(comp: str) -> int:
+        c = str(comp)
+        return COMPOUNDS.index(ALIASES.get(c, c.lower()))
+
+    def delta(self, comp, age, mgmt=1.0) -> np.ndarray:
+        """랩타임 손실 비율(0.02 = 2% 느림). comp/age/mgmt 는 스칼라나 같은 모양 배열.
+        mgmt: 드라이버 타이어 관리 배율(마모 손실에만 곱한다, 1.0 = 기준)."""
+        a = np.minimum(np.asarray(age, dtype=int), MAX_AGE)
+        return self.warm[comp, a] + self.deg[comp, a] * mgmt
+
+
+@lru_cache(maxsize=64)
+def tyre_table(abrasion: float = 0.5, temp_mean: float = 25.0, temp_std: float = 0.0) -> TyreTable:
+    age = np.arange(MAX_AGE + 1, dtype=float)
+    warm = np.zeros((len(COMPOUNDS), age.size))
+    deg = np.zeros_like(warm)
+    life = np.zeros_like(warm)
+    for ci, c in enumerate(COMPOUNDS):
+        p = TYRE[c]
+        off = ((temp_mean - p["t_opt"]) ** 2 + temp_std ** 2) / p["t_win"] ** 2
+        wear = p["wear"] * (0.5 + float(abrasion)) * (1.0 + TEMP_SENS * off)
+        cold = 1.0 + max(0.0, p["t_opt"] - temp_mean) / p["t_win"]
+        lf = np.clip(1.0 - wear * (age + 0.5), 0.0, 1.0)
+        cliff = np.minimum(CLIFF_MAX, CLIFF_RATE * (np.maximum(0.0, CLIFF_LIFE - lf) / CLIFF_LIFE) ** 2)
+        warm[ci] = p["warm"] * np.exp(-age / (p["warm_laps"] * cold))
+        deg[ci] = p["deg"] * (1.0 - lf) ** DEG_EXP + cliff
+        life[ci] = lf
+    for a in (warm, deg, life):
+        a.setflags(write=False)          # 캐시 공유 — 읽기 전용
+    return TyreTable(warm, deg, life, (abrasion, temp_mean, temp_std))
+
+
+def _num(row, key: str, default: float) -> float:
+    try:
+        v = float(row[key])
+    except (KeyError, TypeError, ValueError, IndexError):
+        return default
+    return v if np.isfinite(v) else default
+
+
+def track_tyres(row=None, *, abrasion: Optional[float] = None, temp_mean: Optional[float] = None,
+                temp_std: Optional[float] = None) -> TyreTable:
+    """tracks.csv 한 행(abrasion_index, temp_mean_c, temp_std_c)으로 표. 없는 값은 기준값."""
+    row = row if row is not None else {}
+    a = abrasion if abrasion is not None else _num(row, "abrasion_index", 0.5)
+    m = temp_mean if temp_mean is not None else _num(row, "temp_mean_c", 25.0)
+    s = temp_std if temp_std is not None else _num(row, "temp_std_c", 0.0)
+    return tyre_table(round(float(a), 3), round(float(m), 1), round(float(s), 1))
+
+
+def stint_deltas(tab: TyreTable, comps: Sequence[str], laps: Sequence[int], mgmt: float = 1.0) -> np.ndarray:
+    """스틴트 목록(컴파운드, 랩 수) → 레이스 전체 랩별 손실 비율(이어 붙인 1차원)."""
+    ci = np.repeat([tab.index(c) for c in comps], laps)
+    age = np.concatenate([np.arange(int(n)) for n in laps]) if len(laps) else np.zeros(0, dtype=int)
+    return tab.delta(ci, age, mgmt)
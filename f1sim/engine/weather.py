@@ -0,0 +1,189 @@
+# f1sim/engine/weather.py
+# -*- coding: utf-8 -*-
+"""
+세션 날씨 타임라인 — 분 단위 확률 과정(비 시작·세기, 노면 젖음·건조, 노면 온도).
+
+- 소나기: 세션(+앞선 PRE_MIN 분) 동안 포아송 개수. λ 는 세션 중 한 번이라도 비가 올 확률이
+  tracks.csv rain_base_prob 가 되도록 λ = −ln(1 − p). 시작 시각 균등, 길이 지수분포(평균 SHOWER_MIN 분),
+  세기 베타 분포, 모양은 RAMP_MIN 분 동안 오르내리는 사다리꼴 — (소나기 × 분) 브로드캐스트로 한 번에 합친다.
+- 노면 젖음 w: w[t+1] = a[t]·w[t] + b[t], a = 1 − K_WET·rain − k_dry, b = K_WET·rain
+  (건조 속도 k_dry 는 노면 온도에 비례). 시간 가변 1차 선형 점화식이라 로그 누적합으로 루프 없이 푼다.
+- 노면 온도: temp_mean_c + temp_std_c × (세션 편차 + 느린 요동) − 비 냉각.
+- 크로스오버: 젖음 INTER_AT / WET_AT 경계로 슬릭 → 인터 → 웻(quali_core.js 기본 타이어와 같은 경계).
+  맞지 않는 타이어는 경계 밖 거리 × WRONG_TYRE 만큼 그립 손실 — 엔진 모두 같은 함수로 판단한다.
+(round, session, seed, 트랙 조건) 마다 lru_cache — 같은 주말 같은 세션이면 모든 엔진이 같은 배열을 본다.
+JS 짝: f1sim/ui/js/weather.js (크로스오버/그립 손실만, 타임라인은 Python 이 만들어 넘긴다).
+
+사용:
+    wx = track_weather(track_row, round_no, "RACE")     # tracks.csv 한 행(dict/Series)
+    wet = wx.laps(57, track_lap_sec(track_row))["wet"] # 랩 중간 시점 노면 젖음(엔진 모두 같은 랩 길이)
+    env.update(wx.env())                               # 퀄리 ENV(wetness/rain_prob/… + wet_min)
+"""
+from __future__ import annotations
+from functools import lru_cache
+from typing import Optional
+import zlib
+
+import numpy as np
+
+from ..config import SEED
+
+SESSION_MIN = {"FP1": 60, "FP2": 60, "FP3": 60, "Q1": 18, "Q2": 15, "Q3": 12, "RACE": 150}
+NOMINAL_RACE_MIN = 95.0   # lap_sec 없이 laps() 를 부를 때 레이스 길이
+DEFAULT_LAP_SEC = 90.0    # tracks.csv 에 랩타임 열이 없을 때(06 페이지 lap_base 기본값과 같음)
+LAP_SEC_COLS = ("typical_lap_sec", "lap_sec", "lap_time_sec", "avg_lap_sec")
+PRE_MIN = 60              # 세션 전 구간 — 시작부터 젖어 있을 수 있다
+
+SHOWER_MIN = 20.0         # 소나기 평균 길이(분)
+RAMP_MIN = 6.0            # 세기가 오르내리는 시간(분)
+RAIN_BETA = (1.6, 2.4)    # 소나기 최대 세기 분포
+K_WET = 0.25              # 세기 1 비에서 분당 젖음 속도
+K_DRY = 0.035             # 25°C 노면에서 분당 건조 속도
+RAIN_COOL = 8.0           # 세기 1 비에서 노면 온도 하강(°C)
+TEMP_WALK = 0.3           # 세션 안 온도 요동(temp_std_c 배율)
+
+INTER_AT = 0.30
+WET_AT = 0.65
+WRONG_TYRE = 0.40         # 맞지 않는 타이어: 경계 밖 젖음 1 당 그립 손실
+TRACK_WET_LOSS = 0.10     # 노면이 젖은 만큼 공통 그립 손실(퀄리 TRACK_GRIP_FACTOR 와 같은 계수)
+
+TYRE_CLASS = {"soft": 0, "medium": 0, "hard": 0, "intermediate": 1, "wet": 2}
+_BANDS = np.array([[0.0, INTER_AT], [INTER_AT, WET_AT], [WET_AT, 1.0]])
+
+
+class WeatherTimeline:
+    """분 격자(minute[i] = i 분 시작) 배열. rain/wet 0..1, temp °C."""
+    __slots__ = ("minutes", "rain", "wet", "temp", "params")
+
+    def __init__(self, rain: np.ndarray, wet: np.ndarray, temp: np.ndarray, params: tuple):
+        for a in (rain, wet, temp):
+            a.setflags(write=False)          # 캐시 공유 — 읽기 전용
+        self.minutes = int(rain.size)
+        self.rain, self.wet, self.temp, self.params = rain, wet, temp, params
+
+    def at(self, t_sec) -> dict:
+        """세션 시각(초, 스칼라/배열) → {rain, wet, temp}. 범위 밖은 끝 값."""
+        x = np.asarray(t_sec, dtype=float) / 60.0
+        grid = np.arange(self.minutes, dtype=float)
+        return {k: np.interp(x, grid, getattr(self, k)) for k in ("rain", "wet", "temp")}
+
+    def laps(self, n_laps: int, lap_sec: Optional[float] = None) -> dict:
+        """랩 k(0부터) 중간 시점 값. lap_sec 가 없으면 NOMINAL_RACE_MIN 에 랩을 고르게 편다.
+        반환: {rain, wet, temp, cls(0 슬릭 / 1 인터 / 2 웻)}"""
+        n = max(1, int(n_laps))
+        sec = float(lap_sec) if lap_sec else NOMINAL_RACE_MIN * 60.0 / n
+        out = self.at((np.arange(n) + 0.5) * sec)
+        out["cls"] = wet_class(out["wet"])
+        return out
+
+    def env(self) -> dict:
+        """퀄리 페이지 ENV 의 비/노면 항목(시작 시점 wetness + 분별 wet_min)."""
+        raining = self.rain > 0.05
+        return {"rain_prob": round(float(raining.mean()), 3),
+                "rain_intensity": round(float(self.rain[raining].mean()) if raining.any() else 0.0, 3),
+                "wetness": round(float(self.wet[0]), 3),
+                "wet_min": [round(float(x), 3) for x in self.wet]}
+
+
+def _seed(round_no: int, session: str, seed: int) -> np.random.Generator:
+    return np.random.default_rng([int(seed) & 0xFFFFFFFF, int(round_no) & 0xFFFFFFFF,
+                                  zlib.crc32(str(session).upper().encode("utf-8"))])
+
+
+@lru_cache(maxsize=128)
+def weather_timeline(round_no: int, session: str, seed: int = SEED, *, rain_prob: float = 0.2,
+                     temp_mean: float = 25.0, temp_std: float = 3.0,
+                     minutes: Optional[int] = None) -> WeatherTimeline:
+    rng = _seed(round_no, session, seed)
+    m = int(minutes or SESSION_MIN.get(str(session).upper(), 60))
+    span = PRE_MIN + m
+    t = np.arange(span, dtype=float)
+
+    # 소나기 — 개수는 세션 길이(앞 구간 포함) 비율로
+    p = min(0.999, max(0.0, float(rain_prob)))
+    lam = -np.log1p(-p) * span / m
+    k = int(rng.poisson(lam))
+    start = rng.uniform(-SHOWER_MIN, span, k)
+    length = rng.exponential(SHOWER_MIN, k) + RAMP_MIN
+    peak = rng.beta(*RAIN_BETA, k)
+    up = np.clip((t[None, :] - start[:, None]) / RAMP_MIN, 0.0, 1.0)
+    down = np.clip((start[:, None] + length[:, None] - t[None, :]) / RAMP_MIN, 0.0, 1.0)
+    rain = np.clip((peak[:, None] * np.minimum(up, down)).sum(axis=0), 0.0, 1.0) if k else np.zeros(span)
+
+    # 노면 온도 — 세션 편차 1회 + 누적 요동
+    walk = np.cumsum(rng.normal(0.0, 1.0, span)) / np.sqrt(span)
+    temp = float(temp_mean) + float(temp_std) * (rng.normal() + TEMP_WALK * walk) - RAIN_COOL * rain
+
+    # 젖음: w[t+1] = a[t] w[t] + b[t], w[0] = 0  →  w[t+1] = P[t] · Σ_{s≤t} b[s] / P[s], P = Π a
+    k_dry = K_DRY * np.clip(temp / 25.0, 0.4, 2.0)
+    a = np.clip(1.0 - K_WET * rain - k_dry, 0.5, 1.0)
+    b = K_WET * rain
+    log_p = np.cumsum(np.log(a))
+    wet = np.empty(span)
+    wet[0] = 0.0
+    wet[1:] = (np.exp(log_p) * np.cumsum(b * np.exp(-log_p)))[:-1]
+    wet = np.clip(wet, 0.0, 1.0)
+
+    sl = slice(PRE_MIN, span)
+    return WeatherTimeline(rain[sl].copy(), wet[sl].copy(), temp[sl].copy(),
+                           (round_no, str(session).upper(), seed, p, temp_mean, temp_std))
+
+
+def _num(row, key: str, default: float) -> float:
+    try:
+        v = float(row[key])
+    except (KeyError, TypeError, ValueError, IndexError):
+        return default
+    return v if np.isfinite(v) else default
+
+
+def track_weather(row, round_no: int, session: str, seed: int = SEED,
+                  minutes: Optional[int] = None) -> WeatherTimeline:
+    """tracks.csv 한 행(rain_base_prob, temp_mean_c, temp_std_c)으로 세션 타임라인."""
+    row = row if row is not None else {}
+    return weather_timeline(int(round_no), str(session).upper(), int(seed),
+                            rain_prob=round(_num(row, "rain_base_prob", 0.2), 3),
+                            temp_mean=round(_num(row, "temp_mean_c", 25.0), 1),
+                            temp_std=round(_num(row, "temp_std_c", 3.0), 1),
+                            minutes=minutes)
+
+
+def track_lap_sec(row) -> float:
+    """타임라인에서 랩 → 분 환산에 쓰는 랩 길이(초). 06 페이지 lap_base 와 같은 열·기본값."""
+    row = row if row is not None else {}
+    for c in LAP_SEC_COLS:
+        v = _num(row, c, 0.0)
+        if v > 0:
+            return v
+    return DEFAULT_LAP_SEC
+
+
+# ── 크로스오버 / 그립 ─────────────────────────────────────────────────────────
+def wet_class(w) -> np.ndarray:
+    """노면 젖음 → 맞는 타이어 종류(0 슬릭 / 1 인터 / 2 웻)."""
+    w = np.asarray(w, dtype=float)
+    return (w >= INTER_AT).astype(int) + (w >= WET_AT).astype(int)
+
+
+def tyre_class(compound) -> np.ndarray:
+    """컴파운드 이름(들) → 타이어 종류."""
+    if isinstance(compound, str):
+        return np.asarray(TYRE_CLASS.get(compound, 0))
+    return np.array([TYRE_CLASS.get(str(c), 0) for c in compound], dtype=int)
+
+
+def wet_loss(cls, w) -> np.ndarray:
+    """그립 손실 비율: 공통(젖은 노면) + 맞지 않는 타이어(종류 구간 밖 거리 × WRONG_TYRE)."""
+    w = np.asarray(w, dtype=float)
+    band = _BANDS[np.asarray(cls, dtype=int)]
+    off = np.maximum(band[..., 0] - w, 0.0) + np.maximum(w - band[..., 1], 0.0)
+    return TRACK_WET_LOSS * w + WRONG_TYRE * off
+
+
+def crossover(cls: int, dry: str = "medium") -> str:
+    """맞는 종류의 컴파운드 이름. 슬릭으로 돌아갈 땐 dry(원래 계획 슬릭)."""
+    if int(cls) >= 2:
+        return "wet"
+    if int(cls) == 1:
+        return "intermediate"
+    return dry if TYRE_CLASS.get(dry, 1) == 0 else "medium"
@@ -0,0 +1,89 @@
+# f1sim/io/data.py
+# -*- coding: utf-8 -*-
+"""
+CSV 데이터 접근 계층 (프로세스 공용 캐시).
+
+teams/drivers/tracks 와 세이브 슬롯 CSV 를 (경로, mtime, 크기) 키로 한 번만 파싱하고
+모든 페이지·세션이 같은 DataFrame 을 공유한다. 위젯 클릭으로 인한 rerun 은 CSV 를 다시 읽지 않는다.
+- read_csv(path): 공용 프레임의 사본. pandas Copy-on-Write 면 얕은 사본(공짜)이고
+  아니면 깊은 사본 — 어느 쪽이든 페이지가 컬럼을 바꿔도 캐시는 그대로다.
+- write_csv(df, path): 저장 + 해당 경로 무효화. 세이브 슬롯에 쓰는 곳은 모두 이것을 쓴다.
+- invalidate(path|dir|None): 명시적 무효화(같은 mtime 해상도 안에서 다시 써도 새로 읽힌다).
+- cache_info(): {entries, parses, hits} — rerun 중 파싱 횟수 확인용.
+계측(f1sim.perf): io.read_csv / io.write_csv 스팬, io.cache_hits · io.bytes_read · io.rows_parsed 카운터.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import os, threading
+
+import pandas as pd
+
+from .. import perf
+
+PathLike = Union[str, Path]
+
+try:  # pandas 3 은 항상 CoW, 2.x 는 옵션
+    _COW = int(pd.__version__.split(".")[0]) >= 3 or bool(pd.get_option("mode.copy_on_write"))
+except Exception:
+    _COW = False
+
+_LOCK = threading.Lock()
+_CACHE: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+_STATS = {"parses": 0, "hits": 0}
+
+
+def _key(p: Path) -> Tuple[str, Tuple[int, int]]:
+    st_ = p.stat()                                   # 없으면 FileNotFoundError(pd.read_csv 와 동일)
+    return str(p.resolve()), (st_.st_mtime_ns, st_.st_size)
+
+
+def _frame(path: PathLike) -> pd.DataFrame:
+    p = Path(path)
+    k, sig = _key(p)
+    with _LOCK:
+        hit = _CACHE.get(k)
+        if hit and hit[0] == sig:
+            _STATS["hits"] += 1
+            perf.count("io.cache_hits")
+            return hit[1]
+    with perf.span("io.read_csv", "io", file=p.name):
+        df = pd.read_csv(p)
+    perf.count("io.bytes_read", sig[1])
+    perf.count("io.rows_parsed", len(df))
+    with _LOCK:
+        _CACHE[k] = (sig, df)
+        _STATS["parses"] += 1
+    return df
+
+
+def read_csv(path: PathLike) -> pd.DataFrame:
+    """캐시된 CSV 프레임(호출자 전용 사본). 파일이 바뀌었으면 다시 파싱."""
+    df = _frame(path)
+    return df.copy(deep=not _COW)
+
+
+def write_csv(df: pd.DataFrame, path: PathLike) -> None:
+    """df → CSV(utf-8, index 없음) 후 캐시 무효화."""
+    with perf.span("io.write_csv", "io", file=Path(path).name, rows=len(df)):
+        df.to_csv(path, index=False, encoding="utf-8")
+    invalidate(path)
+
+
+def invalidate(path: Optional[PathLike] = None) -> int:
+    """path 파일(또는 그 디렉터리 아래 전부, None 이면 전체) 캐시 제거. 제거한 개수 반환."""
+    with _LOCK:
+        if path is None:
+            n = len(_CACHE)
+            _CACHE.clear()
+            return n
+        base = str(Path(path).resolve())
+        drop = [k for k in _CACHE if k == base or k.startswith(base + os.sep)]
+        for k in drop:
+            del _CACHE[k]
+        return len(drop)
+
+
+def cache_info() -> dict:
+    with _LOCK:
+        return {"entries": len(_CACHE), **_STATS}
@@ -5,12 +5,17 @@ from pathlib import Path
 import shutil, time
 import pandas as pd
 
+from .data import invalidate
+from .. import jobs
+from ..perf import timed
+
 BASE_FILES = ["teams.csv", "drivers.csv", "tracks.csv"]
 
 def _now_slot(team_id: str | None = None) -> str:
     ts = time.strftime("%Y%m%d_%H%M%S")
     return f"run_{ts}" + (f"_{team_id}" if team_id else "")
 
+@timed("save.create_slot", "io")
 def create_save_slot(DATA: Path, team_id: str | None = None) -> Path:
     """data/saves/run_타임스탬프_(팀ID)/ 에 base CSV 복제."""
     saves = DATA / "saves"
@@ -61,16 +66,22 @@ def get_paths(state, DATA: Path) -> dict[str, Path]:
         "crew_log": root / "crew_training_log.csv",
     }
 
+@timed("save.delete", "io")
 def delete_current_save(state) -> None:
     """현재 세이브 폴더 삭제 + 세션 상태 초기화(안전)."""
     sd = state.get("save_dir")
     if sd and Path(sd).exists():
         shutil.rmtree(sd, ignore_errors=True)
+        invalidate(sd)
+    # 이 세이브에서 돌던 백그라운드 작업은 취소(결과를 받을 곳이 사라진다)
+    for k in ("rd_job", "crew_job", "crew_outcome_job", "media_job", "sim_round_job"):
+        jobs.cancel(state.get(k))
     # 게임 진행 관련 키 초기화
     for k in [
         "save_dir", "team_id", "round",
         "rd_proposal", "rd_picks_ui", "confirm_final_submit",
         "crew_prop", "crew_picks", "confirm_ct_submit",
+        "rd_job", "crew_job", "crew_outcome_job", "crew_outcome_ctx", "media_job", "sim_round_job",
         "quali", "race"
     ]:
         state.pop(k, None)
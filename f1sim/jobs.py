@@ -0,0 +1,273 @@
+# f1sim/jobs.py
+# -*- coding: utf-8 -*-
+"""
+백그라운드 작업 큐 (LLM 호출 · 시뮬 배치).
+
+Streamlit 스크립트 스레드를 막지 않도록 프로세스 공용 스레드 풀에서 실행하고,
+페이지는 작업 ID 로 상태를 폴링한다(f1sim/ui/jobs_panel.py).
+- submit(name, fn, *args, key=...): 같은 key 의 작업이 대기/실행 중이면 새로 돌리지 않고 그 ID 를 돌려준다.
+  fn 이 job 키워드를 받으면 JobCtx 를 넘긴다 — job.progress(0.4, "메모"), job.check() 로 취소 확인.
+- status(id) / result(id) / wait(id, timeout) / cancel(id) / latest(key) / forget(id)
+- 최근 JOB_KEEP 개 작업 기록(JSON 으로 표현되는 결과 포함)을 data/.jobs.json 에 남긴다.
+  재시작 때 끝나지 않았던 작업은 "lost" 로 바뀐다.
+작업 함수는 st.* 를 부르면 안 된다(스크립트 스레드가 아님).
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+
+from . import perf
+
+ROOT = Path(__file__).resolve().parents[1]
+JOBS_JSON = ROOT / "data" / ".jobs.json"
+JOB_WORKERS = int(os.getenv("F1SIM_JOB_WORKERS", "4"))
+JOB_KEEP = 64
+
+ACTIVE = ("queued", "running")
+FINAL = ("done", "failed", "cancelled", "lost")
+
+
+class JobCancelled(Exception):
+    """JobCtx.check() 가 취소 요청을 만나면 던진다."""
+
+
+@dataclass
+class _Job:
+    id: str
+    name: str
+    key: str
+    status: str = "queued"
+    progress: float = 0.0
+    note: str = ""
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    result: Any = None
+    has_result: bool = False
+    cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Any = field(default=None, repr=False)
+
+    def public(self) -> dict:
+        return {k: getattr(self, k) for k in
+                ("id", "name", "key", "status", "progress", "note", "created", "started",
+                 "finished", "error", "has_result")}
+
+
+class JobCtx:
+    """작업 함수에 넘기는 핸들: 진행률 보고와 협조적 취소."""
+
+    def __init__(self, job: _Job):
+        self._job = job
+
+    @property
+    def cancelled(self) -> bool:
+        return self._job.cancel.is_set()
+
+    def check(self) -> None:
+        if self._job.cancel.is_set():
+            raise JobCancelled(self._job.id)
+
+    def progress(self, frac: float, note: Optional[str] = None) -> None:
+        self.check()
+        with _LOCK:
+            self._job.progress = min(1.0, max(0.0, float(frac)))
+            if note is not None:
+                self._job.note = str(note)
+
+
+_LOCK = threading.RLock()
+_JOBS: "OrderedDict[str, _Job]" = OrderedDict()
+_BY_KEY: Dict[str, str] = {}            # key → 가장 최근 작업 ID
+_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _POOL
+    with _LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=max(1, JOB_WORKERS), thread_name_prefix="f1sim-job")
+        return _POOL
+
+
+def _wants_ctx(fn: Callable) -> bool:
+    try:
+        return "job" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+# ── 영속화 ───────────────────────────────────────────────────────────────────
+def _jsonable(x: Any) -> bool:
+    try:
+        json.dumps(x)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _persist() -> None:
+    with _LOCK:
+        recs = []
+        for j in _JOBS.values():
+            r = j.public()
+            if j.status == "done" and j.has_result and _jsonable(j.result):
+                r["result"] = j.result
+            else:
+                r["has_result"] = False
+            recs.append(r)
+    try:
+        JOBS_JSON.parent.mkdir(parents=True, exist_ok=True)
+        tmp = JOBS_JSON.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"jobs": recs}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, JOBS_JSON)
+    except OSError:
+        pass    # 기록은 부가 기능 — 디스크 문제로 작업을 실패시키지 않는다
+
+
+def _restore() -> None:
+    try:
+        recs = json.loads(JOBS_JSON.read_text(encoding="utf-8")).get("jobs", [])
+    except (OSError, ValueError):
+        return
+    with _LOCK:
+        for r in recs:
+            try:
+                j = _Job(id=r["id"], name=r["name"], key=r["key"])
+            except (KeyError, TypeError):
+                continue
+            for k in ("status", "progress", "note", "created", "started", "finished", "error"):
+                if k in r:
+                    setattr(j, k, r[k])
+            if j.status in ACTIVE:            # 이전 프로세스에서 끝나지 못함
+                j.status, j.error = "lost", "서버 재시작으로 중단됨"
+            j.has_result = "result" in r
+            j.result = r.get("result")
+            _JOBS[j.id] = j
+            _BY_KEY[j.key] = j.id
+
+
+def _trim() -> None:
+    """끝난 작업부터 오래된 순으로 JOB_KEEP 개까지만 남긴다."""
+    over = len(_JOBS) - JOB_KEEP
+    for jid in [k for k, j in _JOBS.items() if j.status in FINAL][:max(0, over)]:
+        j = _JOBS.pop(jid)
+        if _BY_KEY.get(j.key) == jid:
+            del _BY_KEY[j.key]
+
+
+# ── 실행 ─────────────────────────────────────────────────────────────────────
+def _run(job: _Job, fn: Callable, args: tuple, kwargs: dict) -> None:
+    with _LOCK:
+        if job.status != "queued":            # 시작 전에 취소됨
+            return
+        job.status, job.started = "running", time.time()
+    status, result, error = "done", None, None
+    try:
+        if _wants_ctx(fn):
+            kwargs = {**kwargs, "job": JobCtx(job)}
+        with perf.span(f"job:{job.name}", "job"):
+            result = fn(*args, **kwargs)
+    except JobCancelled:
+        status = "cancelled"
+    except Exception as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+    with _LOCK:
+        if job.status == "running":           # cancel() 이 먼저 표시했으면 결과는 버린다
+            job.status, job.error = status, error
+            if status == "done":
+                job.result, job.has_result, job.progress = result, True, 1.0
+        job.finished = time.time()
+    _persist()
+
+
+def submit(name: str, fn: Callable, *args, key: Optional[str] = None, **kwargs) -> str:
+    """작업 제출 → 작업 ID. key 가 같은 작업이 대기/실행 중이면 그 ID(중복 실행 없음)."""
+    key = key or f"{name}:{uuid.uuid4().hex}"
+    with _LOCK:
+        jid = _BY_KEY.get(key)
+        if jid and jid in _JOBS and _JOBS[jid].status in ACTIVE:
+            return jid
+        job = _Job(id=uuid.uuid4().hex[:12], name=name, key=key)
+        _JOBS[job.id] = job
+        _BY_KEY[key] = job.id
+        _trim()
+    job.future = _pool().submit(_run, job, fn, args, kwargs)
+    _persist()
+    return job.id
+
+
+def status(job_id: Optional[str]) -> Optional[dict]:
+    """작업 상태(결과 제외) — 없으면 None."""
+    with _LOCK:
+        j = _JOBS.get(job_id or "")
+        return j.public() if j else None
+
+
+def result(job_id: Optional[str], default: Any = None) -> Any:
+    with _LOCK:
+        j = _JOBS.get(job_id or "")
+        return j.result if (j and j.status == "done" and j.has_result) else default
+
+
+def wait(job_id: Optional[str], timeout: float) -> Optional[dict]:
+    """최대 timeout 초 동안 끝나기를 기다린 뒤 상태(빠른 작업이 진행 패널을 깜빡이지 않게)."""
+    with _LOCK:
+        j = _JOBS.get(job_id or "")
+        fut = j.future if j else None
+    if fut is not None:
+        try:
+            fut.result(timeout=timeout)
+        except Exception:
+            pass        # 타임아웃/취소 — 상태로 판단
+    return status(job_id)
+
+
+def latest(key: str) -> Optional[str]:
+    """key 로 제출된 가장 최근 작업 ID."""
+    with _LOCK:
+        return _BY_KEY.get(key)
+
+
+def cancel(job_id: Optional[str]) -> bool:
+    """대기 중이면 바로 취소, 실행 중이면 취소 표시(작업은 JobCtx.check 에서 멈추고 결과는 버려진다)."""
+    with _LOCK:
+        j = _JOBS.get(job_id or "")
+        if not j or j.status not in ACTIVE:
+            return False
+        j.cancel.set()
+        if j.future is not None:
+            j.future.cancel()
+        j.status, j.finished = "cancelled", time.time()
+    _persist()
+    return True
+
+
+def forget(job_id: Optional[str]) -> None:
+    """끝난 작업 기록 삭제(실패 작업 다시 시도용). 결과를 받아 간 작업은 _trim 이 정리한다 —
+    같은 key 로 붙은 다른 세션이 아직 읽을 수 있다."""
+    with _LOCK:
+        j = _JOBS.get(job_id or "")
+        if not j or j.status in ACTIVE:
+            return
+        del _JOBS[j.id]
+        if _BY_KEY.get(j.key) == j.id:
+            del _BY_KEY[j.key]
+    _persist()
+
+
+def active() -> list:
+    with _LOCK:
+        return [j.public() for j in _JOBS.values() if j.status in ACTIVE]
+
+
+_restore()
@@ -0,0 +1,237 @@
+# f1sim/perf.py
+# -*- coding: utf-8 -*-
+"""
+핫패스 계측: 중첩 타이밍 스팬 + 카운터 → Chrome trace-event JSON.
+
+- span(name, cat, **args): with 블록 시간 기록(스레드별 중첩). timed(name) 은 같은 것의 데코레이터.
+- count(name, n): 누적 카운터(읽은 바이트, 파싱한 행, LLM 호출, 캐시 적중 …).
+- page_begin(name) / page_end(): 최상위 스크립트 페이지용(st.stop/rerun 으로 끝나지 않은 실행만 기록).
+- summary() / counters() / chrome_trace() / reset(): 집계·내보내기(chrome://tracing, Perfetto).
+- client_report(source, data): 브라우저가 보낸 프레임 시간 요약(f1sim/ui/js/frame_stats.js)을 함께 기록.
+  드물게(세션 끝에 한 번) 오므로 계측이 꺼져 있어도 최근 PERF_MAX_CLIENT 개는 남긴다.
+꺼져 있으면(기본) span 은 공용 no-op, count 는 플래그 확인 한 번 — 거의 0 비용.
+켜기: 환경변수 F1SIM_PERF=1 또는 enable(True)(사이드바 "성능 계측" 패널). 기록은 프로세스 공용,
+최근 PERF_MAX_EVENTS 개만 남긴다.
+"""
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+import os
+import threading
+import time
+
+PERF_MAX_EVENTS = int(os.getenv("F1SIM_PERF_MAX_EVENTS", "20000"))
+PERF_MAX_CLIENT = 50
+
+_ENABLED = os.getenv("F1SIM_PERF", "") not in ("", "0")
+_LOCK = threading.Lock()
+_EVENTS: deque = deque(maxlen=PERF_MAX_EVENTS)
+_COUNTERS: Dict[str, float] = {}
+_CLIENT: deque = deque(maxlen=PERF_MAX_CLIENT)
+_TLS = threading.local()
+_PID = os.getpid()
+_T0 = time.perf_counter()
+
+
+def enabled() -> bool:
+    return _ENABLED
+
+
+def enable(on: bool = True) -> None:
+    global _ENABLED
+    _ENABLED = bool(on)
+
+
+def _now_us() -> float:
+    return (time.perf_counter() - _T0) * 1e6
+
+
+def _stack() -> list:
+    s = getattr(_TLS, "stack", None)
+    if s is None:
+        s = _TLS.stack = []
+    return s
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "t0", "child_us")
+
+    def __init__(self, name: str, cat: str, args: Optional[dict]):
+        self.name, self.cat, self.args = name, cat, args
+        self.t0 = 0.0
+        self.child_us = 0.0
+
+    def __enter__(self):
+        _stack().append(self)
+        self.t0 = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        dur = _now_us() - self.t0
+        st_ = _stack()
+        if st_ and st_[-1] is self:
+            st_.pop()
+        if st_:
+            st_[-1].child_us += dur
+        ev = {"name": self.name, "cat": self.cat, "ph": "X", "ts": round(self.t0, 1), "dur": round(dur, 1),
+              "pid": _PID, "tid": threading.get_ident(), "self": round(dur - self.child_us, 1)}
+        if self.args:
+            ev["args"] = self.args
+        if exc_type is not None:
+            ev.setdefault("args", {})["exc"] = exc_type.__name__
+        with _LOCK:
+            _EVENTS.append(ev)
+        return False
+
+    def set(self, **kw) -> None:
+        """스팬 안에서 알게 된 값(행 수 등)을 args 에 추가."""
+        if self.args is None:
+            self.args = {}
+        self.args.update(kw)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **kw) -> None:
+        pass
+
+
+_NOOP = _NoSpan()
+
+
+def span(name: str, cat: str = "app", **args):
+    """중첩 타이밍 스팬. 꺼져 있으면 공용 no-op."""
+    if not _ENABLED:
+        return _NOOP
+    return _Span(name, cat, args or None)
+
+
+def timed(name: Optional[str] = None, cat: str = "app") -> Callable:
+    """함수 전체를 스팬으로 감싸는 데코레이터."""
+    def deco(fn: Callable) -> Callable:
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*a, **kw):
+            if not _ENABLED:
+                return fn(*a, **kw)
+            with _Span(label, cat, None):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+
+def count(name: str, n: float = 1) -> None:
+    if not _ENABLED:
+        return
+    with _LOCK:
+        v = _COUNTERS.get(name, 0) + n
+        _COUNTERS[name] = v
+        _EVENTS.append({"name": name, "ph": "C", "ts": round(_now_us(), 1), "pid": _PID,
+                        "tid": threading.get_ident(), "args": {"value": v}})
+
+
+# ── 최상위 스크립트 페이지 ───────────────────────────────────────────────────
+def page_begin(name: str) -> None:
+    """페이지 스크립트 맨 위에서. 끝에 page_end() 가 닿아야 기록된다(중간 중단은 page.interrupted 카운트)."""
+    if not _ENABLED:
+        return
+    prev = getattr(_TLS, "page", None)
+    if prev is not None:                   # 이전 실행이 st.stop/rerun 으로 끝남 — 버리고 스택 정리
+        count("page.interrupted")
+        st_ = _stack()
+        if prev in st_:
+            del st_[st_.index(prev):]
+    sp = _Span(f"page:{name}", "page", None)
+    _TLS.page = sp
+    sp.__enter__()
+
+
+def page_end() -> None:
+    sp = getattr(_TLS, "page", None)
+    _TLS.page = None
+    if sp is not None:
+        st_ = _stack()
+        if sp in st_:                      # 페이지 안에서 닫히지 않은 스팬이 있으면 함께 정리
+            del st_[st_.index(sp) + 1:]
+        sp.__exit__(None, None, None)
+
+
+@contextmanager
+def page(name: str):
+    """main() 이 있는 페이지용: with perf.page("06_main_race"): run_main_race()"""
+    with span(f"page:{name}", "page"):
+        yield
+
+
+# ── 브라우저 프레임 시간 ─────────────────────────────────────────────────────
+def client_report(source: str, data: dict) -> dict:
+    """브라우저 요약을 {source, ts, data} 로 남기고 trace 에는 instant 이벤트(ph "i")로 넣는다."""
+    rec = {"source": source, "ts": time.time(), "data": data}
+    ev = {"name": f"client:{source}", "cat": "client", "ph": "i", "s": "g", "ts": round(_now_us(), 1),
+          "pid": _PID, "tid": threading.get_ident(), "args": data}
+    with _LOCK:
+        _CLIENT.append(rec)
+        _EVENTS.append(ev)
+    return rec
+
+
+def client_reports() -> List[dict]:
+    with _LOCK:
+        return list(_CLIENT)
+
+
+# ── 집계 / 내보내기 ──────────────────────────────────────────────────────────
+def reset() -> None:
+    with _LOCK:
+        _EVENTS.clear()
+        _COUNTERS.clear()
+        _CLIENT.clear()
+
+
+def counters() -> Dict[str, float]:
+    with _LOCK:
+        return dict(_COUNTERS)
+
+
+def summary() -> List[dict]:
+    """스팬 이름별 {name, cat, calls, total_ms, self_ms, max_ms} (total 내림차순)."""
+    with _LOCK:
+        evs = [e for e in _EVENTS if e["ph"] == "X"]
+    agg: Dict[str, dict] = {}
+    for e in evs:
+        a = agg.setdefault(e["name"], {"name": e["name"], "cat": e["cat"], "calls": 0,
+                                       "total_ms": 0.0, "self_ms": 0.0, "max_ms": 0.0})
+        a["calls"] += 1
+        a["total_ms"] += e["dur"] / 1000.0
+        a["self_ms"] += e["self"] / 1000.0
+        a["max_ms"] = max(a["max_ms"], e["dur"] / 1000.0)
+    out = sorted(agg.values(), key=lambda r: -r["total_ms"])
+    for r in out:
+        for k in ("total_ms", "self_ms", "max_ms"):
+            r[k] = round(r[k], 2)
+    return out
+
+
+def chrome_trace() -> dict:
+    """Chrome trace-event 형식 dict (json.dumps 해서 chrome://tracing / ui.perfetto.dev 로 열기)."""
+    with _LOCK:
+        evs = list(_EVENTS)
+    names = {t.ident: t.name for t in threading.enumerate()}
+    meta = [{"name": "thread_name", "ph": "M", "pid": _PID, "tid": tid, "args": {"name": names.get(tid, str(tid))}}
+            for tid in sorted({e["tid"] for e in evs})]
+    trace = []
+    for e in evs:
+        e = dict(e)
+        e.pop("self", None)
+        trace.append(e)
+    return {"traceEvents": meta + trace, "displayTimeUnit": "ms"}
@@ -0,0 +1,161 @@
+# f1sim/shared.py
+# -*- coding: utf-8 -*-
+"""
+프로세스 공용 내용 주소(content-addressed) 저장소 — 세션 간 불변 데이터 공유.
+
+라운드 단위로 정해지는 큰 payload(레이스 타임라인·결과, LLM 제안 JSON 등)를
+내용 해시로 한 번만 보관하고, st.session_state 에는 작은 핸들(Shared)만 둔다.
+- put(obj) → Shared: 같은 내용이면 어느 세션에서 넣어도 같은 핸들(같은 객체)을 돌려준다.
+- memo(key, factory) → (Shared, 새로 계산했는지): 입력 해시 key 로 계산 결과 공유.
+- deref(x): 핸들이면 값, 아니면 그대로(예전 세션 상태 호환).
+- 핸들을 쥔 세션이 하나라도 있으면 값이 살아 있고(약한 참조), 최근 SHARED_PIN 개는
+  세션이 없어도 잠시 남겨 재계산을 줄인다.
+- session_report(state) / store_info(): 세션별 메모리(개인/공유 구분)와 저장소 현황.
+값은 여러 세션이 함께 보므로 읽기 전용 — 바꿔야 하면 copy.deepcopy 후 다시 put.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Tuple
+import hashlib
+import json
+import os
+import sys
+import threading
+import weakref
+
+SHARED_PIN = int(os.getenv("F1SIM_SHARED_PIN", "32"))
+
+
+class Shared:
+    """공유 값 핸들. 세션에는 이 객체(참조)만 저장된다. nbytes 는 정규 JSON 크기(근사)."""
+    __slots__ = ("digest", "value", "nbytes", "__weakref__")
+
+    def __init__(self, digest: str, value: Any, nbytes: int):
+        self.digest = digest
+        self.value = value
+        self.nbytes = nbytes
+
+    def __repr__(self) -> str:
+        return f"Shared({self.digest[:10]}, {self.nbytes}B)"
+
+
+_LOCK = threading.RLock()
+_BY_DIGEST: "weakref.WeakValueDictionary[str, Shared]" = weakref.WeakValueDictionary()
+_BY_KEY: "weakref.WeakValueDictionary[Hashable, Shared]" = weakref.WeakValueDictionary()
+_PIN: "OrderedDict[str, Shared]" = OrderedDict()
+_STATS = {"puts": 0, "dedup": 0, "memo_hits": 0, "memo_misses": 0}
+
+
+def _canon(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _pin(h: Shared) -> None:
+    _PIN[h.digest] = h
+    _PIN.move_to_end(h.digest)
+    while len(_PIN) > max(0, SHARED_PIN):
+        _PIN.popitem(last=False)
+
+
+def put(obj: Any) -> Shared:
+    """obj 를 내용 해시로 보관하고 핸들 반환. 같은 내용이 이미 있으면 기존 핸들(새 obj 는 버려진다)."""
+    if isinstance(obj, Shared):
+        return obj
+    raw = _canon(obj)
+    digest = hashlib.sha1(raw).hexdigest()
+    with _LOCK:
+        _STATS["puts"] += 1
+        h = _BY_DIGEST.get(digest)
+        if h is None:
+            h = Shared(digest, obj, len(raw))
+            _BY_DIGEST[digest] = h
+        else:
+            _STATS["dedup"] += 1
+        _pin(h)
+        return h
+
+
+def memo(key: Hashable, factory: Callable[[], Any]) -> Tuple[Shared, bool]:
+    """key(입력 해시 등)로 계산 결과를 공유. 없으면 factory() 로 만들어 put. (핸들, 새로 계산했는지)"""
+    with _LOCK:
+        h = _BY_KEY.get(key)
+        if h is not None:
+            _STATS["memo_hits"] += 1
+            _pin(h)
+            return h, False
+        _STATS["memo_misses"] += 1
+    h = put(factory())          # 계산은 잠금 밖 — 동시에 같은 key 를 계산해도 내용 해시로 하나로 합쳐진다
+    with _LOCK:
+        _BY_KEY[key] = h
+    return h, True
+
+
+def deref(x: Any) -> Any:
+    return x.value if isinstance(x, Shared) else x
+
+
+def store_info() -> dict:
+    with _LOCK:
+        hs = list(_BY_DIGEST.values())
+        return {"entries": len(hs), "bytes": sum(h.nbytes for h in hs), "pinned": len(_PIN), **_STATS}
+
+
+# ── 세션 메모리 보고 ─────────────────────────────────────────────────────────
+def _sizeof(obj: Any, seen: set) -> int:
+    """대략적인 깊은 크기(byte). 공유 핸들은 핸들 자체만 센다."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, Shared):
+        return sys.getsizeof(obj)
+    mem = getattr(obj, "memory_usage", None)
+    if callable(mem) and hasattr(obj, "columns"):           # DataFrame
+        try:
+            return int(mem(deep=True).sum())
+        except Exception:
+            pass
+    nb = getattr(obj, "nbytes", None)
+    if isinstance(nb, int):                                   # ndarray
+        return nb + sys.getsizeof(obj)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_sizeof(k, seen) + _sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _sizeof(vars(obj), seen)
+    return size
+
+
+def _handles(obj: Any, out: dict, seen: set) -> None:
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    if isinstance(obj, Shared):
+        out[obj.digest] = obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            _handles(v, out, seen)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            _handles(v, out, seen)
+
+
+def session_report(state) -> List[dict]:
+    """세션 상태 키별 {key, type, private_bytes, shared_bytes} (개인 크기 내림차순)."""
+    rows = []
+    for k in list(state.keys()):
+        try:
+            v = state[k]
+        except Exception:
+            continue
+        hs: dict = {}
+        _handles(v, hs, set())
+        rows.append({
+            "key": str(k),
+            "type": type(v).__name__,
+            "private_bytes": _sizeof(v, set()),
+            "shared_bytes": sum(h.nbytes for h in hs.values()),
+        })
+    rows.sort(key=lambda r: r["private_bytes"], reverse=True)
+    return rows
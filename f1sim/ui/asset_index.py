@@ -0,0 +1,197 @@
+# f1sim/ui/asset_index.py
+# -*- coding: utf-8 -*-
+"""
+에셋 인덱스 + 썸네일.
+
+- driver_image/, team_logo/, f1_machine/, tire/, circuit/ 를 한 번 스캔해
+  정규화 키(소문자 영숫자) → 파일 경로 맵을 만든다. 디렉터리 mtime이 바뀔 때만 재스캔.
+- UI가 실제로 쓰는 크기(SIZES)로 WebP 썸네일을 static/thumbs/ 에 만든다.
+  파일명에 원본 내용 해시가 들어가므로 원본이 바뀐 에셋만 다시 생성된다.
+- Pillow가 없으면 원본 경로를 그대로 쓴다.
+
+사용:
+    from f1sim.ui.asset_index import find_asset, thumb_url
+    p = find_asset("driver", "Lando Norris")
+    url = thumb_url(p, "avatar")
+
+일괄 생성: python -m f1sim.ui.asset_index
+"""
+from __future__ import annotations
+from pathlib import Path
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import difflib
+import re
+
+from .assets import ROOT, STATIC_DIR, asset_url, content_hash
+
+try:
+    from PIL import Image
+except Exception:  # Pillow 미설치 → 원본 사용
+    Image = None
+
+THUMB_DIR = STATIC_DIR / "thumbs"
+
+# 종류별 원본 디렉터리(앞쪽 우선)
+ASSET_DIRS: Dict[str, List[Path]] = {
+    "driver": [ROOT / "driver_image", ROOT / "images/drivers"],
+    "logo":   [ROOT / "team_logo"],
+    "car":    [ROOT / "f1_machine", ROOT / "car_image"],
+    "tire":   [ROOT / "tire", ROOT / "tires", ROOT / "images/tires"],
+    "track":  [ROOT / "circuit"],
+}
+ASSET_EXTS: Dict[str, Tuple[str, ...]] = {
+    "driver": (".png", ".jpg"),
+    "logo":   (".png",),
+    "car":    (".png",),
+    "tire":   (".png",),
+    "track":  (".svg",),
+}
+
+# UI 표시 크기의 2배(HiDPI) 박스 — 비율 유지로 그 안에 맞춘다
+SIZES: Dict[str, Tuple[int, int]] = {
+    "hero":   (400, 400),   # 팀 카드 드라이버 사진(높이 200px)
+    "avatar": (144, 144),   # 세션 페이지 플레이어 카드(64~72px)
+    "card":   (320, 320),   # 프리 레이스 드라이버 카드
+    "logo":   (96, 96),     # 팀 로고(44px)
+    "car":    (720, 240),   # 프리 레이스 차량 이미지
+    "tire":   (48, 48),     # 타이어 아이콘(22~24px)
+}
+
+TIRE_ALIASES = {
+    "soft": "soft", "s": "soft",
+    "medium": "medium", "m": "medium",
+    "hard": "hard", "h": "hard",
+    "intermediate": "intermediate", "i": "intermediate", "inters": "intermediate",
+    "wet": "wet", "w": "wet",
+}
+
+
+def norm_key(s) -> str:
+    return re.sub(r"[^a-z0-9]", "", str(s or "").lower())
+
+
+def _dirs_stamp() -> tuple:
+    out = []
+    for kind, dirs in ASSET_DIRS.items():
+        for d in dirs:
+            try:
+                out.append((kind, str(d), d.stat().st_mtime_ns))
+            except OSError:
+                out.append((kind, str(d), 0))
+    return tuple(out)
+
+
+@lru_cache(maxsize=4)
+def _build_index(stamp: tuple) -> Dict[str, Dict[str, Path]]:
+    idx: Dict[str, Dict[str, Path]] = {k: {} for k in ASSET_DIRS}
+    for kind, dirs in ASSET_DIRS.items():
+        exts = ASSET_EXTS[kind]
+        for d in dirs:
+            if not d.exists():
+                continue
+            for p in sorted(d.iterdir()):
+                if p.suffix.lower() in exts:
+                    idx[kind].setdefault(norm_key(p.stem), p)
+    return idx
+
+
+def asset_index() -> Dict[str, Dict[str, Path]]:
+    """kind → {정규화 키: 경로}. 디렉터리가 바뀌지 않았으면 캐시 재사용."""
+    return _build_index(_dirs_stamp())
+
+
+def find_asset(kind: str, *names, fuzzy: bool = True) -> Optional[Path]:
+    """정확 키 → 부분 일치 → (선택) 근사 일치 순서로 찾는다."""
+    table = asset_index().get(kind, {})
+    if not table:
+        return None
+    keys = [norm_key(n) for n in names if norm_key(n)]
+    for k in keys:
+        if k in table:
+            return table[k]
+    for k in keys:
+        for stem, p in table.items():
+            if k in stem or stem in k:
+                return p
+    if fuzzy:
+        for k in keys:
+            m = difflib.get_close_matches(k, list(table), n=1, cutoff=0.8)
+            if m:
+                return table[m[0]]
+    return None
+
+
+def find_driver_img(name: str) -> Optional[Path]:
+    if not isinstance(name, str) or not name.strip():
+        return None
+    parts = name.split()
+    return find_asset("driver", name, parts[-1] if len(parts) > 1 else name, fuzzy=False)
+
+
+def find_tire_img(compound: str) -> Optional[Path]:
+    key = (compound or "").strip().lower()
+    return find_asset("tire", TIRE_ALIASES.get(key, key or "soft"), fuzzy=False)
+
+
+def find_track_svg(track_name: str) -> Optional[Path]:
+    """서킷 이름 → circuit/*.svg (없으면 첫 파일)."""
+    table = asset_index().get("track", {})
+    if not track_name or not table:
+        return None
+    return find_asset("track", track_name, fuzzy=False) or next(iter(table.values()))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 썸네일
+# ─────────────────────────────────────────────────────────────────────────────
+def _thumb_name(src: Path, box: Tuple[int, int]) -> str:
+    stem = "".join(ch if (ch.isalnum() or ch in "-_") else "_" for ch in src.stem)
+    return f"{stem}.{content_hash(src)}.{box[0]}x{box[1]}.webp"
+
+
+def thumb_path(src: Optional[Path], size: str | Tuple[int, int]) -> Optional[Path]:
+    """원본 → WebP 썸네일 경로(없으면 생성). Pillow 없거나 실패하면 원본."""
+    if not src:
+        return None
+    src = Path(src)
+    if not src.exists():
+        return None
+    if Image is None or src.suffix.lower() == ".svg":
+        return src
+    box = SIZES[size] if isinstance(size, str) else tuple(size)
+    dst = THUMB_DIR / _thumb_name(src, box)
+    if dst.exists():
+        return dst
+    try:
+        THUMB_DIR.mkdir(parents=True, exist_ok=True)
+        with Image.open(src) as im:
+            im = im.convert("RGBA") if im.mode not in ("RGB", "RGBA") else im.copy()
+            im.thumbnail(box, Image.LANCZOS)
+            tmp = dst.with_name(dst.name + ".tmp")
+            im.save(tmp, format="WEBP", quality=85, method=4)
+        tmp.replace(dst)
+        return dst
+    except Exception:
+        return src
+
+
+def thumb_url(src: Optional[Path], size: str | Tuple[int, int]) -> str:
+    return asset_url(thumb_path(src, size))
+
+
+def build_all_thumbnails() -> int:
+    """모든 이미지 에셋을 종류별 크기로 미리 생성. 생성/확인한 개수 반환."""
+    plan = {"driver": ("hero", "avatar", "card"), "logo": ("logo",),
+            "car": ("car",), "tire": ("tire",)}
+    n = 0
+    for kind, sizes in plan.items():
+        for p in asset_index().get(kind, {}).values():
+            for s in sizes:
+                if thumb_path(p, s):
+                    n += 1
+    return n
+
+
+if __name__ == "__main__":
+    print(f"thumbnails: {build_all_thumbnails()} -> {THUMB_DIR}")
@@ -0,0 +1,96 @@
+# f1sim/ui/assets.py
+# -*- coding: utf-8 -*-
+"""
+세션 페이지용 정적 이미지 URL.
+
+- 원본(driver_image/, tire/ 등)을 ROOT/static/assets/ 에 '내용 해시'가 붙은 이름으로 복사하고
+  Streamlit 정적 서빙 경로(app/static/...) URL을 돌려준다.
+- 파일 내용이 바뀌면 이름이 바뀌므로 브라우저 캐시(ETag/Last-Modified)를 그대로 믿어도 된다.
+- server.enableStaticServing 이 꺼져 있으면 data URI로 폴백(프로세스 내 캐시).
+"""
+from __future__ import annotations
+from pathlib import Path
+from functools import lru_cache
+from typing import Optional
+import base64
+import hashlib
+import mimetypes
+import shutil
+
+from .. import perf
+
+ROOT = Path(__file__).resolve().parents[2]
+STATIC_DIR = ROOT / "static"              # app.py 옆 static/ (Streamlit 규약)
+ASSET_DIR = STATIC_DIR / "assets"
+URL_PREFIX = "app/static/assets"          # 상대 URL: baseUrlPath 아래에서도 동작
+
+_HASH_LEN = 12
+
+
+def static_serving_enabled() -> bool:
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _file_key(p: Path):
+    st_ = p.stat()
+    return (str(p), st_.st_mtime_ns, st_.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _hash_of(path: str, mtime_ns: int, size: int) -> str:
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()[:_HASH_LEN]
+
+
+def content_hash(path: Path) -> str:
+    """파일 내용 해시(앞 12자). (경로, mtime, 크기)가 같으면 다시 읽지 않는다."""
+    return _hash_of(*_file_key(Path(path)))
+
+
+@lru_cache(maxsize=512)
+def _publish(path: str, mtime_ns: int, size: int) -> str:
+    """원본 → static/assets/{stem}.{hash}{ext} (이미 있으면 재사용). URL 반환."""
+    src = Path(path)
+    digest = _hash_of(path, mtime_ns, size)
+    stem = "".join(ch if (ch.isalnum() or ch in "-_") else "_" for ch in src.stem)
+    name = f"{stem}.{digest}{src.suffix.lower()}"
+    dst = ASSET_DIR / name
+    if not dst.exists():
+        ASSET_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_suffix(dst.suffix + ".tmp")
+        shutil.copyfile(src, tmp)
+        tmp.replace(dst)
+    return f"{URL_PREFIX}/{name}"
+
+
+@lru_cache(maxsize=512)
+def _data_uri(path: str, mtime_ns: int, size: int) -> str:
+    mime = mimetypes.guess_type(path)[0] or "image/png"
+    with perf.span("ui.base64", "ui", file=Path(path).name):
+        b64 = base64.b64encode(Path(path).read_bytes()).decode("ascii")
+    perf.count("ui.base64_bytes", len(b64))
+    return f"data:{mime};base64,{b64}"
+
+
+def asset_url(path: Optional[Path]) -> str:
+    """파일 경로 → 브라우저에서 쓸 URL. 없으면 ''."""
+    if not path:
+        return ""
+    p = Path(path)
+    if not p.exists():
+        return ""
+    key = _file_key(p)
+    if static_serving_enabled():
+        try:
+            # 이미 static/ 아래(해시 이름 썸네일 등)면 복사 없이 그대로
+            return "app/static/" + p.resolve().relative_to(STATIC_DIR).as_posix()
+        except ValueError:
+            pass
+        try:
+            return _publish(*key)
+        except OSError:
+            pass
+    return _data_uri(*key)
@@ -0,0 +1,44 @@
+# f1sim/ui/frame_stats.py
+# -*- coding: utf-8 -*-
+"""
+세션 페이지가 보낸 프레임 시간 요약(f1sim/ui/js/frame_stats.js) 받기.
+
+요약 형식: {v, page, engine('worker'|'main'|'timeline'), backend('svg'|'canvas'), frames, dropped, durSec,
+           env{cores, dpr}, sections{frame|render|ui: {n, mean, p50, p90, p99, max}}, worker{… physics/overtake/lag}}
+- perf.client_report 로 서버 쪽 trace 와 같은 곳에 남기고(사이드바 "성능 계측"),
+- 세이브 슬롯의 frame_stats.jsonl 에 한 줄씩 덧붙여 렌더 백엔드/엔진 버전별로 나중에 비교한다.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional
+import json
+
+import streamlit as st
+
+from f1sim import perf
+
+MAX_BYTES = 16_000      # 요약 하나의 상한(정상은 2~3KB) — 넘으면 구간 표만 버린다
+LOG_NAME = "frame_stats.jsonl"
+
+
+def _compact(data: dict) -> dict:
+    if len(json.dumps(data, ensure_ascii=False, default=str)) <= MAX_BYTES:
+        return data
+    return {k: v for k, v in data.items() if k not in ("sections", "worker")} | {"truncated": True}
+
+
+def log_frame_stats(source: str, data) -> Optional[dict]:
+    """요약을 기록하고 {source, ts, data} 반환. 형식이 아니면 None(결과 저장은 그대로 진행)."""
+    if not isinstance(data, dict):
+        return None
+    data = _compact(data)
+    rec = perf.client_report(source, data)
+    rec["round"] = st.session_state.get("round")
+    save_dir = st.session_state.get("save_dir")
+    if save_dir and Path(save_dir).is_dir():
+        try:
+            with open(Path(save_dir) / LOG_NAME, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            pass
+    return rec
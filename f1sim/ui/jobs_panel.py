@@ -0,0 +1,91 @@
+# f1sim/ui/jobs_panel.py
+# -*- coding: utf-8 -*-
+"""
+페이지 쪽 백그라운드 작업 폴링 (f1sim/jobs.py).
+
+- take_job(slot, label): 버튼으로 시작한 작업. session_state[slot] 의 작업이 진행 중이면
+  진행 패널(자동 폴링 프래그먼트)을 그리고 None, 끝나면 결과를 한 번 돌려주고 slot 을 비운다.
+- await_job(label, name, fn, *args, key=...): 페이지 진행에 꼭 필요한 결과.
+  같은 key 로 끝난 결과가 있으면 그대로, 없으면 제출하고 진행 패널을 그린 뒤 st.stop().
+- job_busy(slot): 같은 작업 중복 클릭 방지용(버튼 disabled).
+- job_key(kind, save_dir, ctx): 중복 제거 key. 세이브 슬롯 + 프롬프트 컨텍스트 digest —
+  같은 질문이라도 팀/라운드/결과/슬롯이 다르면 다른 작업이다.
+끝난 작업은 여기서 forget 하지 않는다. 같은 key 로 붙은 다른 세션이 아직 결과를 읽어야 할 수 있어서,
+기록 정리는 큐의 _trim(JOB_KEEP)에 맡긴다.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Optional
+import hashlib
+import json
+
+import streamlit as st
+
+from f1sim import jobs
+
+POLL_SEC = 0.7
+QUICK_SEC = 0.25    # 이 안에 끝나는 작업은 진행 패널 없이 바로 결과
+
+
+@st.fragment(run_every=POLL_SEC)
+def _poll(job_id: str, label: str, cancellable: bool = True):
+    j = jobs.status(job_id)
+    if not j or j["status"] not in jobs.ACTIVE:
+        st.rerun()          # 끝나면 전체 리런 → 호출한 쪽이 결과를 받는다
+    pct = int(round(100 * float(j["progress"] or 0.0)))
+    wait = "대기 중" if j["status"] == "queued" else (j["note"] or "진행 중")
+    st.progress(pct, text=f"⏳ {label} · {wait}")
+    if cancellable and st.button("취소", key=f"job_cancel_{job_id}"):
+        jobs.cancel(job_id)
+        st.rerun()
+
+
+def job_key(kind: str, save_dir, ctx: Any) -> str:
+    raw = json.dumps([str(save_dir), ctx], sort_keys=True, ensure_ascii=False, default=str)
+    return f"{kind}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+def job_busy(slot: str) -> bool:
+    j = jobs.status(st.session_state.get(slot))
+    return bool(j and j["status"] in jobs.ACTIVE)
+
+
+def take_job(slot: str, label: str) -> Optional[Any]:
+    jid = st.session_state.get(slot)
+    if not jid:
+        return None
+    j = jobs.status(jid)
+    if j is None:
+        st.session_state.pop(slot, None)
+        return None
+    if j["status"] in jobs.ACTIVE:
+        _poll(jid, label)
+        return None
+    st.session_state.pop(slot, None)
+    out = jobs.result(jid)
+    if j["status"] == "failed":
+        st.error(f"{label} 실패: {j['error']}")
+    elif j["status"] in ("cancelled", "lost"):
+        st.info(f"{label} 취소됨")
+    return out
+
+
+def await_job(label: str, name: str, fn: Callable, *args, key: str, **kwargs) -> Any:
+    jid = jobs.latest(key)
+    j = jobs.status(jid)
+    if j and j["status"] == "done" and j["has_result"]:
+        return jobs.result(jid)
+    if j and j["status"] == "failed":
+        st.error(f"{label} 실패: {j['error']}")
+        if st.button("다시 시도", key=f"job_retry_{jid}"):
+            jobs.forget(jid)
+            st.rerun()
+        st.stop()
+    if not j or j["status"] not in jobs.ACTIVE:
+        jid = jobs.submit(name, fn, *args, key=key, **kwargs)
+    j = jobs.wait(jid, QUICK_SEC)
+    if j and j["status"] == "done" and j["has_result"]:
+        return jobs.result(jid)
+    if j and j["status"] not in jobs.ACTIVE:
+        st.rerun()          # 실패/취소 — 위 분기에서 안내
+    _poll(jid, label, cancellable=False)
+    st.stop()
@@ -0,0 +1,130 @@
+  // ── 차량 렌더 레이어 (f1sim/ui/js/car_layer.js) ──────────────────────────
+  // 트랙 SVG는 그대로 두고, 움직이는 차량/라벨/선택 링만 그리는 백엔드.
+  //  - 'svg'   : 차량마다 <circle>/<text> transform 갱신(기존 방식)
+  //  - 'canvas': 스테이지 위에 겹친 <canvas>에 한 번에 그린다. 클릭은 좌표 히트 테스트.
+  // 백엔드는 HUD의 [data-r] 버튼으로 바꾸고 localStorage 에 기억한다.
+  // 백엔드별 렌더 시간(JS)과 프레임 간격(rAF)을 EMA로 집계해 #rdrInfo 에 표시.
+  function makeCarLayer(opt){
+    const o = Object.assign({r:6, strokeW:2, backend:'canvas', key:'f1sim.render'}, opt||{});
+    const stage=o.stage, gAct=o.gAct, ring=o.selRing;
+    const ringR = parseFloat(ring && ring.getAttribute('r')) || (o.r+4);
+    const L = {backend:'svg', stats:{svg:{ms:0, gap:0, n:0}, canvas:{ms:0, gap:0, n:0}}};
+    let cv=null, ctx=null, dpr=1, font='9px sans-serif', dirty=true, lastSel=-1, t0=0, tLast=0;
+    let cars=[];
+
+    function layout(){
+      if (!cv) return;
+      const w=stage.clientWidth, h=stage.clientHeight;
+      dpr=window.devicePixelRatio||1;
+      cv.style.left=stage.offsetLeft+'px'; cv.style.top=stage.offsetTop+'px';
+      cv.style.width=w+'px'; cv.style.height=h+'px';
+      cv.width=Math.max(1, Math.round(w*dpr)); cv.height=Math.max(1, Math.round(h*dpr));
+      const m=stage.getScreenCTM(), rc=stage.getBoundingClientRect();
+      if (m) ctx.setTransform(dpr*m.a, dpr*m.b, dpr*m.c, dpr*m.d, dpr*(m.e-rc.left), dpr*(m.f-rc.top));
+      dirty=true;
+    }
+    function ensureCanvas(){
+      if (cv) return !!ctx;
+      cv=document.createElement('canvas');
+      cv.style.cssText='position:absolute; pointer-events:none; z-index:1;';
+      ctx=cv.getContext('2d');
+      if (!ctx) return false;
+      stage.parentNode.insertBefore(cv, stage.nextSibling);
+      try { font=`9px ${getComputedStyle(stage).fontFamily||'sans-serif'}`; } catch(e){}
+      if (window.ResizeObserver) new ResizeObserver(layout).observe(stage);
+      layout();
+      return true;
+    }
+
+    L.setBackend = function(name){
+      const want = (name==='svg') ? 'svg' : 'canvas';
+      L.backend = (want==='canvas' && ensureCanvas()) ? 'canvas' : 'svg';
+      gAct.style.display = (L.backend==='svg') ? '' : 'none';
+      if (cv) cv.style.display = (L.backend==='canvas') ? '' : 'none';
+      if (ring) ring.style.display='none';
+      for (const c of cars){ c._px=null; c._py=null; }   // 다음 프레임에 전부 다시 배치
+      dirty=true; lastSel=-1;
+      try { localStorage.setItem(o.key, L.backend); } catch(e){}
+      document.querySelectorAll('[data-r]').forEach(b=>b.classList.toggle('primary', b.getAttribute('data-r')===L.backend));
+    };
+    L.layout = layout;
+
+    // 위치 기록(+SVG면 즉시 반영). 좌표가 그대로면 아무 것도 안 한다.
+    L.place = function(car, x, y){
+      if (car._px===x && car._py===y) return;
+      car._px=x; car._py=y; dirty=true;
+      if (L.backend==='svg'){
+        car.el.setAttribute('transform', `translate(${x},${y})`);
+        car.lab.setAttribute('x', x+8); car.lab.setAttribute('y', y-8);
+      }
+    };
+
+    // 프레임 마무리: 선택 링(SVG) 또는 캔버스 전체 다시 그리기
+    L.draw = function(list, selIdx){
+      cars = list;
+      const sel = (selIdx===null || selIdx===undefined) ? null : list[selIdx];
+      if (L.backend==='svg'){
+        if (!ring) return;
+        if (!sel || sel._px==null){ ring.style.display='none'; return; }
+        ring.setAttribute('transform', `translate(${sel._px},${sel._py})`);
+        ring.setAttribute('stroke', sel.color || '#0b5cff');
+        ring.style.display='block';
+        return;
+      }
+      const si = sel ? selIdx : -1;
+      if (!dirty && si===lastSel) return;
+      dirty=false; lastSel=si;
+      ctx.save(); ctx.setTransform(1,0,0,1,0,0); ctx.clearRect(0,0,cv.width,cv.height); ctx.restore();
+      ctx.lineWidth=o.strokeW; ctx.strokeStyle='#fff';
+      for (const c of list){
+        if (c._px==null) continue;
+        ctx.beginPath(); ctx.arc(c._px, c._py, o.r, 0, Math.PI*2);
+        ctx.fillStyle=c.color; ctx.fill(); ctx.stroke();
+      }
+      ctx.font=font; ctx.fillStyle='#e5e7eb';
+      for (const c of list){ if (c._px!=null) ctx.fillText(c.abbr||'', c._px+8, c._py-8); }
+      if (sel && sel._px!=null){
+        ctx.save(); ctx.setLineDash([4,4]); ctx.lineWidth=3; ctx.strokeStyle=sel.color||'#0b5cff';
+        ctx.beginPath(); ctx.arc(sel._px, sel._py, ringR, 0, Math.PI*2); ctx.stroke(); ctx.restore();
+      }
+    };
+
+    // 클라이언트 좌표 → 가장 가까운 차량 인덱스(반경 안), 없으면 -1
+    L.pick = function(clientX, clientY){
+      const m=stage.getScreenCTM(); if (!m) return -1;
+      const p=new DOMPoint(clientX, clientY).matrixTransform(m.inverse());
+      let best=-1, bd=(o.r+6)*(o.r+6);
+      cars.forEach((c,i)=>{
+        if (c._px==null) return;
+        const dx=c._px-p.x, dy=c._py-p.y, d=dx*dx+dy*dy;
+        if (d<=bd){ bd=d; best=i; }
+      });
+      return best;
+    };
+    stage.addEventListener('click', (ev)=>{
+      if (L.backend!=='canvas' || !o.onPick) return;
+      const i=L.pick(ev.clientX, ev.clientY); if (i>=0) o.onPick(i);
+    });
+
+    // 렌더 구간 계측: begin(now) … end()
+    L.begin = function(now){
+      const st=L.stats[L.backend];
+      if (tLast) st.gap = st.n ? st.gap*0.95 + (now-tLast)*0.05 : (now-tLast);
+      tLast=now; t0=performance.now();
+    };
+    L.end = function(){
+      const st=L.stats[L.backend], ms=performance.now()-t0;
+      st.ms = st.n ? st.ms*0.95 + ms*0.05 : ms; st.n++;
+    };
+    L.report = function(){
+      const el=document.getElementById('rdrInfo'); if (!el) return;
+      el.textContent = ['svg','canvas'].filter(k=>L.stats[k].n).map(k=>{
+        const s=L.stats[k]; return `${k}${k===L.backend?'*':''} ${s.ms.toFixed(2)}ms/${s.gap.toFixed(1)}ms`;
+      }).join(' · ');
+    };
+
+    document.querySelectorAll('[data-r]').forEach(b=>b.addEventListener('click', ()=>L.setBackend(b.getAttribute('data-r'))));
+    let saved=null; try { saved=localStorage.getItem(o.key); } catch(e){}
+    L.setBackend(saved || o.backend);
+    return L;
+  }
@@ -0,0 +1,20 @@
+  // ── Python 채널 (f1sim/ui/js/channel.js) ────────────────────────────────────
+  // session_channel 컴포넌트(부모 프레임)로 결과를 보낸다. 압축/분할/ack 는 부모가 맡는다.
+  //   CHAN.send('quali_result', obj).then(ack => ...)   // Python이 다 받으면 resolve
+  const CHAN = (function(){
+    const wait = {};
+    let seq = 0;
+    window.addEventListener('message', (e)=>{
+      const m = e.data;
+      if (!m || m.f1chan !== 'ack' || e.source !== window.parent) return;
+      if (wait[m.id]){ wait[m.id](m); delete wait[m.id]; }
+    });
+    function send(kind, body){
+      const id = `${Date.now().toString(36)}-${(seq++).toString(36)}`;
+      return new Promise((resolve)=>{
+        wait[id] = resolve;
+        window.parent.postMessage({f1chan:'send', id, kind, body}, '*');
+      });
+    }
+    return {send, available: window.parent !== window};
+  })();
@@ -0,0 +1,52 @@
+  // ── 프레임 시간 계측 (f1sim/ui/js/frame_stats.js) ─────────────────────────
+  // 구간별 시간(ms)을 고정 크기 링 버퍼에 모아 백분위(p50/p90/p99)로 요약한다. DOM 없음 — 워커에서도 쓴다.
+  //   FSTAT = makeFrameStats({meta:{page:'Q1'}})
+  //   FSTAT.frame(now)                  // rAF 마다: 프레임 간격 + 놓친 프레임 수
+  //   FSTAT.add('render', ms)           // 구간 시간 직접 기록
+  //   FSTAT.time('ui', renderUI)        // 함수 실행 시간 기록
+  //   FSTAT.summary()                   // Python 으로 보내는 작은 JSON
+  // 링 버퍼(최근 cap 개)로 백분위, 평균/최대/개수는 전체 누적.
+  const FSTAT_VERSION = 1;
+
+  function makeFrameStats(opt){
+    const o = Object.assign({cap:1024, budgetMs:1000/60, meta:{}}, opt||{});
+    const F = {meta:Object.assign({}, o.meta), sec:{}, frames:0, dropped:0, t0:0, tLast:0};
+
+    function ring(){ return {buf:new Float32Array(o.cap), i:0, n:0, count:0, sum:0, max:0}; }
+    F.add = function(name, ms){
+      if (!(ms >= 0)) return;
+      const r = F.sec[name] || (F.sec[name] = ring());
+      r.buf[r.i] = ms; r.i = (r.i + 1) % o.cap; if (r.n < o.cap) r.n++;
+      r.count++; r.sum += ms; if (ms > r.max) r.max = ms;
+    };
+    F.time = function(name, fn){
+      const t = performance.now();
+      try { return fn(); } finally { F.add(name, performance.now() - t); }
+    };
+    F.frame = function(now){
+      if (F.tLast){
+        const gap = now - F.tLast;
+        F.add('frame', gap);
+        if (gap > o.budgetMs*1.5) F.dropped += Math.round(gap/o.budgetMs) - 1;
+      } else F.t0 = now;
+      F.tLast = now; F.frames++;
+    };
+    F.reset = function(){ F.sec = {}; F.frames = 0; F.dropped = 0; F.t0 = 0; F.tLast = 0; };
+
+    function pct(sorted, q){ return sorted.length ? sorted[Math.min(sorted.length-1, Math.floor(q*sorted.length))] : 0; }
+    const r3 = (x)=>Math.round(x*1000)/1000;
+    F.summary = function(extra){
+      const sections = {};
+      for (const k of Object.keys(F.sec)){
+        const r = F.sec[k], s = Array.from(r.buf.subarray(0, r.n)).sort((a,b)=>a-b);
+        sections[k] = {n:r.count, mean:r3(r.sum/Math.max(1, r.count)),
+                       p50:r3(pct(s, .5)), p90:r3(pct(s, .9)), p99:r3(pct(s, .99)), max:r3(r.max)};
+      }
+      const env = (typeof navigator!=='undefined') ? {cores:navigator.hardwareConcurrency||0} : {};
+      if (typeof window!=='undefined') env.dpr = window.devicePixelRatio || 1;
+      return Object.assign({v:FSTAT_VERSION, frames:F.frames, dropped:F.dropped,
+                            durSec:r3(F.tLast > F.t0 ? (F.tLast - F.t0)/1000 : 0),
+                            env, sections}, F.meta, extra||{});
+    };
+    return F;
+  }
@@ -0,0 +1,153 @@
+  // ── 퀄리파잉 시뮬 코어 (f1sim/ui/js/quali_core.js) ────────────────────────
+  // DOM 없이 상태와 고정 스텝만 가진다. sim_host.js 워커 안에서 돈다.
+  // cfg: plan/상수/테이블(PACE·FUELMIX·TIRE)/트랙 LUT(geo)/s-값 — 페이지가 build() 뒤에 넘긴다.
+  const QUALI_FIELDS = [
+    ['mode','mode'], ['s','n'], ['sPit','n'], ['lap','n'], ['dist','n'], ['tireLife','n'], ['fuel','n'],
+    ['lapsLeft','n'], ['runIdx','n'], ['inLap','b'], ['wantBox','b'], ['best','n'],
+    ['compound','compound'], ['nextCompound','compound'], ['pace','pace'], ['fuelMix','fuelMix'],
+  ];
+  function makeQualiCore(cfg){
+    const C=cfg, G=cfg.geo, S=cfg.s, ENV=cfg.ENV, PACE=cfg.PACE, FUELMIX=cfg.FUELMIX, TIRE=cfg.TIRE;
+    const ptOn=(g,s)=>lutAt(g,s);
+    const reachedForward=(a,b,target)=>(b>=a) ? (target>=a && target<=b) : (target>=a || target<=b);
+    const defaultTy=crossTy(wetClass(ENV.wetness), "soft");
+    // 분별 노면 젖음(f1sim/engine/weather.py) — 러닝 출발 시점 값을 그 러닝 내내 쓴다(quali_session 과 같은 규칙)
+    const wetAt=(t)=>seriesAt(ENV.wet_min, Math.max(0, t)/60, ENV.wetness);
+
+    const core={simT:-5.0, running:true, done:false, events:[], fields:QUALI_FIELDS, cmd:{}};
+    core.cars = cfg.plan.map(info=>({
+      isPlayer:!!info.isPlayer, base_vmul:parseFloat(info.base_vmul||1.0),
+      mode:'pit', s:0, sPit:S.pitStop, lap:0, dist:0,
+      runIdx:-1, lapsLeft:0, lastCross:null, best:null, timed:null,
+      inLap:false, pitTargetS:null, waitUntil:null, wantBox:false, fx:null,
+      compound:defaultTy, nextCompound:defaultTy, tireLife:1.0,
+      pace:"Standard", fuelMix:"Balanced", fuel:0.0,
+      _reserv: info.isPlayer ? [] : (Array.isArray(info.runs)? info.runs.map(r=>({t:r.start_sec, laps:r.laps, timed:new Set(r.timed_laps||[2])})) : []),
+    }));
+    const cars=core.cars;
+
+    core.cmd.release = function(i, laps=3, timed=[2]){
+      const car=cars[i]; if (!car || car.mode!=='pit') return;
+      car.runIdx = (car.runIdx<0 ? 0 : car.runIdx+1);
+      car.lapsLeft = Math.max(1, parseInt(laps||3));
+      car.timed = new Set(Array.isArray(timed)? timed.map(x=>parseInt(x,10)): [2]);
+      car.inLap = false; car.wantBox = false;
+      car.lastCross=null; car.lap=0;
+      car.mode='pitGo'; car.pitTargetS = S.pitOut;
+      const lapsFuel = 1 + car.lapsLeft + 1;   // out + hot + in
+      car.fuel = lapsFuel * C.FUEL_PER_LAP * 1.05;
+      car.compound = car.nextCompound || car.compound;
+      car.wet = wetAt(core.simT);
+      car.dryTy = car.dryTy || car.compound;     // 계획 컴파운드(슬릭 복귀용)
+      if (!car.isPlayer && tyreClass(car.compound)!==wetClass(car.wet)) car.compound = crossTy(wetClass(car.wet), car.dryTy);
+    };
+    core.cmd.box = function(i){
+      const car=cars[i]; if (!car) return;
+      if (car.mode==='main'){ car.inLap = true; car.lapsLeft = 0; car.wantBox = false; }
+      else { car.wantBox = true; car.lapsLeft = 0; }
+    };
+    core.cmd.set = function(i, patch){
+      const car=cars[i]; if (!car || !patch) return;
+      for (const k of ['pace','fuelMix','nextCompound']) if (patch[k]) car[k]=patch[k];
+    };
+
+    // AI 예약 출발 — 스텝마다 확인
+    function releaseDueAI(){
+      cars.forEach((car,i)=>{
+        if (car.isPlayer || car.mode!=='pit' || car._reserv.length===0) return;
+        const hit=car._reserv.find(z=>z && core.simT>=z.t && !z._used);
+        if (hit){ hit._used=true; core.cmd.release(i, hit.laps, Array.from(hit.timed)); }
+      });
+    }
+
+    core.step = function(h){
+      if (core.running){
+        core.simT += h;
+        if (core.simT >= C.DURATION){ core.running=false; core.done=true; }
+      }
+      const simT=core.simT;
+      if (simT < 0) return;
+      if (core.running) releaseDueAI();
+
+      const pMain=G.main, pPit=G.pit;
+      const baseMain=1/Math.max(0.1, C.LAP_BASE);
+      const vMainBase=C.gripInSpeed ? baseMain*C.TRACK_GRIP_FACTOR : baseMain;
+      const vPit=1/Math.max(0.5, C.PIT_TRAVEL);
+
+      cars.forEach((car, idx)=>{
+        if (car.mode==='pitGo'){
+          const before=car.sPit; car.sPit=(car.sPit + vPit*h)%1;
+          const targetS=car.pitTargetS ?? S.pitOut;
+          if (reachedForward(before, car.sPit, targetS)){
+            if (Math.abs(targetS - S.pitOut) < 1e-3){
+              const a=ptOn(pPit, S.pitOut), b=ptOn(pMain, S.mainOut);
+              car.mode='toMain'; car.fx={t0Sim: simT, durSim: C.TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
+            } else {
+              car.mode='pitStopWait';
+              car.compound = car.nextCompound || car.compound;
+              car.waitUntil = simT + C.PIT_WAIT_SEC;
+            }
+          }
+
+        } else if (car.mode==='pitStopWait'){
+          if (simT >= (car.waitUntil||0)){ car.mode='pit'; car.tireLife = 1.0; }
+
+        } else if (car.mode==='toMain'){
+          if (simT - car.fx.t0Sim >= car.fx.durSim){ car.mode='main'; car.s=S.mainOut; car.lap=0; car.lastCross=null; car.inLap=car.wantBox?true:false; car.wantBox=false; }
+
+        } else if (car.mode==='toPit'){
+          if (simT - car.fx.t0Sim >= car.fx.durSim){ car.mode='pitGo'; car.sPit=S.pitInPit; car.pitTargetS = S.pitStop; }
+
+        } else if (car.mode==='main'){
+          const tDat=TIRE[car.compound] || TIRE.soft;
+          const wetRun=wetClass(car.wet ?? ENV.wetness) > 0;     // weather.js WX_INTER_AT 경계
+          const tireGrip=(wetRun? tDat.gripWet : tDat.gripDry);
+          const paceFx=PACE[car.pace] || PACE.Standard;
+          const mixFx=FUELMIX[car.fuelMix] || FUELMIX.Balanced;
+          const tireDegFx=(1 - 0.06*(1 - car.tireLife));
+          const fuelMassFx=(1 - 0.006*car.fuel);
+          const vmul=Math.max(0.90, Math.min(1.25, car.base_vmul * paceFx.speed * mixFx.speed * tireGrip * tireDegFx * fuelMassFx));
+          const before=car.s; car.s=(car.s + vMainBase*vmul*speedAt(G.speed, car.s)*h)%1;
+
+          const desiredRate=(C.FUEL_PER_LAP / C.LAP_BASE) * (FUELMIX[car.fuelMix]?.burn || 1.0);
+          const actualRate = Math.min(C.FUEL_FLOW_MAX, desiredRate);
+          car.fuel = Math.max(0, car.fuel - actualRate * h);
+
+          const ds=(car.s - before + 1)%1;
+          const wearLap=(wetRun? tDat.wearWet : tDat.wearDry) * paceFx.wear;
+          car.tireLife = Math.max(0, car.tireLife - wearLap * ds);
+
+          const sLine=(S.finish||0.01);
+          if (reachedForward(before, car.s, sLine)){
+            car.lap += 1;
+            if (car.lastCross===null){ car.lastCross=simT; }
+            else {
+              const lapTime=simT - car.lastCross; car.lastCross=simT;
+              const isTimed = car.timed ? car.timed.has(car.lap) : true;
+              if (isTimed){
+                core.events.push(['lap', idx, lapTime]);
+                if (car.best===null || lapTime < car.best) car.best=lapTime;
+              }
+              if (car.lapsLeft>0){ car.lapsLeft -= 1; if (car.lapsLeft<=0){ car.inLap=true; } }
+              if (car.fuel <= 0.2) car.inLap=true;
+            }
+          }
+          if (car.inLap && reachedForward(before, car.s, S.pitInMain)){
+            const a=ptOn(pMain, S.pitInMain), b=ptOn(pPit, S.pitInPit);
+            car.mode='toPit'; car.fx={t0Sim: simT, durSim: C.TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
+          }
+          car.dist = (car.runIdx>=0?car.runIdx:0)*10 + car.lap + car.s;
+        }
+      });
+    };
+
+    core.xy = function(car){
+      if (core.simT>=0 && car.mode==='main') return ptOn(G.main, car.s);
+      if (core.simT>=0 && (car.mode==='toMain' || car.mode==='toPit')){
+        const w=Math.max(0,Math.min(1,(core.simT - car.fx.t0Sim)/car.fx.durSim));
+        return {x: car.fx.ax*(1-w)+car.fx.bx*w, y: car.fx.ay*(1-w)+car.fx.by*w};
+      }
+      return ptOn(G.pit, car.sPit);
+    };
+    return core;
+  }
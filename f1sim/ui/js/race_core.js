@@ -0,0 +1,165 @@
+  // ── 레이스 시뮬 코어 (f1sim/ui/js/race_core.js) ───────────────────────────
+  // 그리드 → 주행/피트 → 오버테이크 FSM. DOM 없이 sim_host.js 워커 안에서 돈다.
+  // 피트 s-값(0.85/0.02/0.90/0.05)은 기존 레이스 페이지 값을 그대로 쓴다.
+  // cfg.WET(랩별 노면 젖음, f1sim/engine/weather.py)이 있으면 그립 손실 + 맞지 않는 타이어 크로스오버 피트.
+  const RACE_FIELDS = [
+    ['mode','mode'], ['s','n'], ['sPit','n'], ['lap','n'], ['tireLife','n'], ['fuel','n'],
+    ['wantBox','b'], ['lane','n'], ['compound','compound'], ['pace','pace'],
+  ];
+  function makeRaceCore(cfg){
+    const C=cfg, G=cfg.geo, S=cfg.s, PACE=cfg.PACE, TIRE=cfg.TIRE;
+    const reachedForward=(a,b,target)=>(b>=a) ? (target>=a && target<=b) : (target>=a || target<=b);
+    function ptOnPlus(g,s){ const P=lutAt(g, s); return {x:P.x, y:P.y, nx:-P.ty, ny:P.tx}; }
+
+    const core={simT:0.0, running:false, done:false, events:[], fields:RACE_FIELDS, cmd:{}, prof:{otkMs:0}};
+    core.cars = cfg.plan.map((info, i)=>{
+      const s0=(S.finish - 0.010*i) % 1;   // 피니시 라인 뒤로 줄세우기
+      return {
+        name:info.name, team:info.team, base_vmul:parseFloat(info.base_vmul||1.0),
+        mode:'grid', s:(s0<0? s0+1 : s0), sPit:0, lap:0,
+        lastCross:null, compound:"soft", tireLife:1.0, pace:"Standard", fuel:25.0,
+        lane:0, otk:{state:'none', until:0, dir:0, rival:null}, _vmulInst:1.0,
+        plan:(info.stint_plan||[]), pitTargetS:null, waitUntil:null, wantBox:false, fx:null,
+      };
+    });
+    const cars=core.cars;
+
+    core.cmd.go = function(){ core.running=true; };
+    core.cmd.box = function(i){ if (cars[i]) cars[i].wantBox=true; };
+    core.cmd.set = function(i, patch){
+      const car=cars[i]; if (!car || !patch) return;
+      if (patch.pace) car.pace=patch.pace;
+      if (patch.compound && car.mode==='pitStopWait') car.compound=patch.compound;
+    };
+
+    core.step = function(h){
+      if (core.running) core.simT += h;
+      const simT=core.simT, pMain=G.main, pPit=G.pit;
+      const vMainBase = 1 / Math.max(0.1, C.LAP_BASE);
+      const vPit = 1 / Math.max(0.5, C.PIT_TRAVEL);
+
+      cars.forEach((car, idx)=>{
+        if (car.mode==='grid'){
+          if (core.running){ car.mode='main'; car.lastCross=null; }
+          return;
+        }
+        if (car.mode==='pit') return;
+        if (car.mode==='pitGo'){
+          const before=car.sPit;
+          car.sPit=(car.sPit + vPit*h)%1;
+          const targetS = car.pitTargetS ?? 0.85;
+          if (reachedForward(before, car.sPit, targetS)){
+            if (Math.abs(targetS - 0.85) < 1e-3){
+              const a=ptOnPlus(pPit, 0.85), b=ptOnPlus(pMain, 0.02);
+              car.mode='toMain'; car.fx={t0Sim: simT, durSim: C.TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
+            } else {
+              car.mode='pitStopWait'; car.waitUntil = simT + C.PIT_WAIT_SEC;
+              if (car.swapTo){ car.compound = car.swapTo; car.swapTo = null; }
+            }
+          }
+          return;
+        }
+        if (car.mode==='pitStopWait'){
+          // 작업 끝 → 피트 출구(0.85)까지 주행 후 본선 합류
+          if (simT >= (car.waitUntil||0)){ car.mode='pitGo'; car.pitTargetS = 0.85; car.tireLife = 1.0; }
+          return;
+        }
+        if (car.mode==='toMain'){
+          if (simT - car.fx.t0Sim >= car.fx.durSim){ car.mode='main'; car.s=0.02; }
+          return;
+        }
+        if (car.mode==='toPit'){
+          if (simT - car.fx.t0Sim >= car.fx.durSim){ car.mode='pitGo'; car.sPit=0.02; car.pitTargetS = 0.05; }
+          return;
+        }
+
+        // === main 주행 ===
+        const paceFx = PACE[car.pace] || PACE.Standard;
+        const tDat = TIRE[car.compound] || TIRE.soft;
+
+        const groupBias = (car.base_vmul || 1.0);
+        const perLapNoise = 1.0 + ( (Math.sin((car.lap + car.s)*11.0 + car.base_vmul*7.7) ) * 0.004 );
+        const wetFx = 1 - wetLoss(tyreClass(car.compound), seriesAt(C.WET, car.lap, 0));
+        const vmul = Math.max(0.90, Math.min(1.25, groupBias * paceFx.speed * tDat.gripDry * wetFx * perLapNoise * (1 - 0.004*car.fuel)));
+        car._vmulInst = vmul;
+
+        const before=car.s;
+        car.s = (car.s + vMainBase*vmul*speedAt(G.speed, car.s)*h) % 1;
+
+        const desiredRate = (C.FUEL_PER_LAP / C.LAP_BASE);
+        const actualRate  = Math.min(C.FUEL_FLOW_MAX, desiredRate);
+        car.fuel = Math.max(0, car.fuel - actualRate * h);
+
+        const ds = (car.s - before + 1) % 1;
+        const wearLap = tDat.wearDry * (PACE[car.pace]?.wear || 1.0);
+        car.tireLife = Math.max(0, car.tireLife - wearLap * ds);
+
+        const sLine = (S.finish || 0.01);
+        if (reachedForward(before, car.s, sLine)){
+          car.lap += 1;
+          if (car.lastCross === null){ car.lastCross = simT; }
+          else { const lapTime = simT - car.lastCross; car.lastCross = simT; core.events.push(['lap', idx, lapTime]); }
+          if (car.lap >= C.TOTAL_LAPS) { core.done = true; core.running = false; }
+        }
+
+        const plan = car.plan || [];
+        const stint = plan.find(st => (car.lap < (st.to_lap||C.TOTAL_LAPS+1)));
+        if (stint) {
+          car.pace = stint.pace || car.pace;
+          if (car.lap+0.0001 >= (stint.to_lap||9999) || car.tireLife<0.12) { car.wantBox = true; }
+          if (car.mode==='pitStopWait') { car.compound = stint.compound || car.compound; }
+        }
+        if (C.WET && car.lap+1 < C.TOTAL_LAPS){
+          const want = wetClass(seriesAt(C.WET, car.lap+1, 0));
+          if (want !== tyreClass(car.compound)){ car.wantBox = true; car.swapTo = crossTy(want, (stint && stint.compound) || car.compound); }
+        }
+        if (car.wantBox && reachedForward(before, car.s, 0.90)) {
+          const a=ptOnPlus(pMain, 0.90), b=ptOnPlus(pPit, 0.02);
+          car.mode='toPit'; car.fx={t0Sim: simT, durSim: C.TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
+          car.wantBox=false;
+        }
+      });
+
+      // === 오버테이크 FSM === (시간은 core.prof.otkMs 에 누적 → sim_host 의 frame_stats)
+      const tOtk=performance.now();
+      const onMain = cars.filter(c => c.mode==='main').sort((a,b)=> (b.lap+b.s) - (a.lap+a.s));
+      for (let i=0; i<onMain.length-1; i++){
+        const front=onMain[i], back=onMain[i+1];
+        if (front.otk.state!=='none' || back.otk.state!=='none') continue;
+        if (front.lap !== back.lap) continue;
+        let gap = (front.s - back.s); if (gap < 0) gap += 1.0;
+        if (gap > 0 && gap < 0.018 && (back._vmulInst||1.0) > (front._vmulInst||1.0) + 0.015){
+          const dir = (Math.random()<0.5 ? -1 : +1);
+          back.otk = { state:'prep', until: simT + 0.8, dir, rival: front };
+          back.lane = dir;
+        }
+      }
+      for (const car of onMain){
+        if (car.otk.state==='none') continue;
+        const rival = car.otk.rival;
+        const ahead = rival && ( (car.lap + car.s) > (rival.lap + rival.s) );
+        if (car.otk.state==='prep'){
+          if (simT >= car.otk.until){ car.otk.state='side'; car.otk.until = simT + 1.6; }
+        } else if (car.otk.state==='side'){
+          car.s = (car.s + C.OTK_SIDE_RATE*h) % 1;
+          if (ahead || simT >= car.otk.until){ car.otk.state='merge'; car.otk.until = simT + 0.7; }
+        } else if (car.otk.state==='merge'){
+          if (simT >= car.otk.until){ car.lane = 0; car.otk={state:'none', until:0, dir:0, rival:null}; }
+          else { const w = 1 - Math.max(0, Math.min(1, (car.otk.until - simT)/0.7)); car.lane = car.otk.dir * (1 - w); }
+        }
+      }
+      core.prof.otkMs += performance.now() - tOtk;
+    };
+
+    core.xy = function(car){
+      if (car.mode==='toMain' || car.mode==='toPit'){
+        const w=Math.max(0,Math.min(1,(core.simT - car.fx.t0Sim)/car.fx.durSim));
+        return {x: car.fx.ax*(1-w)+car.fx.bx*w, y: car.fx.ay*(1-w)+car.fx.by*w};
+      }
+      const onPit = (car.mode==='pit' || car.mode==='pitGo' || car.mode==='pitStopWait');
+      const p = onPit ? ptOnPlus(G.pit, car.sPit) : ptOnPlus(G.main, car.s);
+      const offset = (car.mode==='main') ? 6*(car.lane||0) : 0;
+      return {x: p.x+offset*p.nx, y: p.y+offset*p.ny};
+    };
+    return core;
+  }
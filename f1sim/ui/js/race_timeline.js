@@ -0,0 +1,99 @@
+  // ── 레이스 타임라인 재생 (f1sim/ui/js/race_timeline.js) ────────────────────
+  // f1sim/engine/race_timeline.py 가 만든 키프레임을 풀어 두 프레임 사이만 보간한다.
+  // 시뮬은 이미 끝나 있으므로 탐색(seek)/배속은 인덱스 계산뿐이다.
+  //   PLAY = makeRaceTimeline(TL, {geo:{main,pit}, s:{finish,pitInMain,mainOut}, speed, onReady})
+  //   TL.warp 이면 본선 s 는 환산 시간 좌표 → speed 프로파일로 되돌려 그린다.
+  //   PLAY.tick(now) → PLAY.sample(cars) → PLAY.pos (Float32Array [x,y]*n)
+  const TL_MAIN = 0, TL_PIT = 1, TL_STOP = 2, TL_DONE = 3;
+  const TL_MODES = ['main', 'pit', 'pitStopWait', 'finished'];
+
+  function makeRaceTimeline(TL, opt){
+    const n=TL.n, F=TL.frames, dt=TL.dt, geo=opt.geo, S=opt.s||{};
+    const fin=S.finish||0, prof=TL.warp ? (opt.speed||null) : null;
+    const dIn=(((S.pitInMain!=null?S.pitInMain:0.90)-fin)%1+1)%1 || 1;
+    const dOut=(((S.mainOut!=null?S.mainOut:0.02)-fin)%1+1)%1;
+    const P={
+      t:0, speed:1, playing:false, ready:false, end:TL.t_end||0,
+      pos:new Float32Array(2*n), pos16:null, lap8:null, st8:null, _last:null,
+    };
+    // 랩 타임(결승선 통과 시각 차)
+    const lapDur=(TL.laps||[]).map(c=>c.map((x,k)=>x-(k?c[k-1]:0)));
+
+    async function inflate(b64){
+      const bin=atob(b64), u8=new Uint8Array(bin.length);
+      for (let i=0;i<bin.length;i++) u8[i]=bin.charCodeAt(i);
+      const ds=new Blob([u8]).stream().pipeThrough(new DecompressionStream('deflate'));
+      return new Uint8Array(await new Response(ds).arrayBuffer());
+    }
+    // 프레임 축 누적합(모듈러) — 정수 배열 자체의 오버플로가 곧 mod 2^k
+    function undelta(a){ for (let f=1;f<F;f++){ const o=f*n, p=o-n; for (let i=0;i<n;i++) a[o+i]+=a[p+i]; } return a; }
+
+    P.load=async function(){
+      const raw=await inflate(TL.data), m=F*n;
+      const pos=new Uint16Array(m), dv=new DataView(raw.buffer, raw.byteOffset, raw.byteLength);
+      for (let k=0;k<m;k++) pos[k]=dv.getUint16(2*k, true);
+      P.pos16=undelta(pos);
+      P.lap8=undelta(raw.slice(2*m, 3*m));
+      P.st8=undelta(raw.slice(3*m, 4*m));
+      P.ready=true;
+      if (opt.onReady) opt.onReady(P);
+      return P;
+    };
+
+    P.seek=function(t){ P.t=Math.max(0, Math.min(P.end, +t||0)); };
+    P.play=function(on){ P.playing=(on===undefined)?!P.playing:!!on; P._last=null; };
+    P.setSpeed=function(v){ if (Number.isFinite(v) && v>0) P.speed=v; };
+    P.tick=function(now){
+      if (P.playing && P._last!=null) P.seek(P.t + Math.min(0.25, (now-P._last)/1000)*P.speed);
+      P._last=now;
+      if (P.t>=P.end) P.playing=false;
+      return P.t;
+    };
+    P.finished=function(){ return P.ready && P.t>=P.end; };
+
+    // 피트 구간 안의 진행 거리(랩 분수): 진입 L-1+dIn → 합류 L+dOut 선형
+    function pitFrac(i, t, lap){
+      const segs=(TL.pits && TL.pits[i])||[];
+      for (const g of segs){
+        if (t>=g[0] && t<=g[3]){
+          const u=(t-g[0])/Math.max(1e-6, g[3]-g[0]);
+          return dIn + u*(1-dIn+dOut) - ((lap>0 && TL.laps[i][lap-1]>=g[0]) ? 1 : 0);
+        }
+      }
+      return 0;
+    }
+
+    P.sample=function(cars){
+      if (!P.ready) return;
+      const x=Math.min(P.t/dt, F-1), f0=Math.floor(x), f1=Math.min(F-1, f0+1), w=x-f0;
+      const o0=f0*n, o1=f1*n, started=P.t>0;
+      for (let i=0;i<n;i++){
+        const b0=P.st8[o0+i], b1=P.st8[o1+i], m0=b0&15, m1=b1&15;
+        const onPit0=(m0===TL_PIT||m0===TL_STOP), onPit1=(m1===TL_PIT||m1===TL_STOP);
+        let s0=P.pos16[o0+i]/65536, s1=P.pos16[o1+i]/65536, s=s0;
+        if (onPit0===onPit1){
+          let ds=s1-s0; if (ds>0.5) ds-=1; else if (ds<-0.5) ds+=1;
+          s=((s0+ds*w)%1+1)%1;
+        } else if (w>=0.5){ s=s1; }
+        const useNext=(onPit0!==onPit1) && w>=0.5, mode=useNext?m1:m0;
+        if (!(useNext?onPit1:onPit0)) s=speedUnwarp(prof, s);
+        const q=lutAt((useNext?onPit1:onPit0)?geo.pit:geo.main, s);
+        P.pos[2*i]=q.x; P.pos[2*i+1]=q.y;
+
+        const c=cars[i]; if (!c) continue;
+        const lap=useNext?P.lap8[o1+i]:P.lap8[o0+i];
+        c.mode = started ? TL_MODES[mode] : 'grid';
+        c.compound = TL.compounds[((useNext?b1:b0)>>4)] || c.compound;
+        // 리더보드 정렬용 s = 결승선 기준 랩 내 진행 비율(체커 받은 차는 먼저 들어온 순)
+        c.s = (mode===TL_PIT||mode===TL_STOP) ? pitFrac(i, P.t, lap)
+            : (mode===TL_DONE ? 1e-3*(1-TL.finish[i]/(P.end+1)) : ((s-fin)%1+1)%1);
+        if (lap===0 && c.s>0.5) c.s-=1;   // 그리드: 아직 결승선 뒤
+        if (lap!==c.lap || !started){
+          c.lap=lap;
+          c.lapTimes=(lapDur[i]||[]).slice(0, lap);
+          c.lastLapTime=c.lapTimes.length ? c.lapTimes[c.lapTimes.length-1] : null;
+        }
+      }
+    };
+    return P;
+  }
@@ -0,0 +1,30 @@
+  // ── 고정 스텝 시뮬레이션 클럭 (f1sim/ui/js/sim_clock.js) ─────────────────
+  // 실시간 dt×배속을 누산해 step(h)를 h=clk.step 으로 필요한 만큼 돌린다.
+  //  - 배속이 높아도 한 스텝은 항상 작으므로 라인 통과/피트 진입을 놓치지 않는다.
+  //  - 한 프레임에서 budgetMs 를 넘기면 나머지는 다음 프레임으로 넘기고,
+  //    밀린 시간이 maxLagSec×배속 을 넘으면 버린다(느린 기기에서 지연 누적 방지).
+  //  - 리더보드/패널 같은 DOM 갱신은 uiDue()로 uiHz 에 맞춰 스로틀한다.
+  function makeSimClock(opt){
+    const clk = Object.assign({step:1/60, budgetMs:8, maxLagSec:1.0, maxRealDt:0.25, uiHz:8}, opt||{});
+    clk.acc = 0; clk.lastUi = -1e9;
+    clk.stats = {frames:0, steps:0, stepsLast:0, overBudget:0, droppedSec:0, simMsLast:0};
+    clk.reset = function(){ clk.acc = 0; clk.lastUi = -1e9; };
+    clk.advance = function(realDt, speed, stepFn){
+      const t0 = performance.now(), st = clk.stats;
+      clk.acc += Math.min(Math.max(0, realDt), clk.maxRealDt) * speed;
+      let n = 0;
+      while (clk.acc >= clk.step){
+        stepFn(clk.step); clk.acc -= clk.step; n++;
+        if ((n & 7) === 0 && performance.now() - t0 > clk.budgetMs){ st.overBudget++; break; }
+      }
+      const lagMax = clk.maxLagSec * Math.max(1, speed);
+      if (clk.acc > lagMax){ st.droppedSec += clk.acc - lagMax; clk.acc = lagMax; }
+      st.frames++; st.steps += n; st.stepsLast = n; st.simMsLast = performance.now() - t0;
+      return n;
+    };
+    clk.uiDue = function(now){
+      if (now - clk.lastUi >= 1000/clk.uiHz){ clk.lastUi = now; return true; }
+      return false;
+    };
+    return clk;
+  }
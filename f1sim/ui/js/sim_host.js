@@ -0,0 +1,132 @@
+  // ── 시뮬 호스트 (f1sim/ui/js/sim_host.js) ─────────────────────────────────
+  // 시뮬 코어(quali_core.js / race_core.js)를 전용 Worker에서 돌리고,
+  // 메인 스레드는 프레임(Float32Array, transferable)을 받아 그리기만 한다.
+  //  - 워커 → 페이지: {type:'frame', simT, running, done, pos[x,y]*n, num[필드]*n, ev[[종류,i,값]]}
+  //    페이지가 ack로 버퍼를 돌려줄 때까지 다음 프레임은 보내지 않는다(메인이 바쁘면 자연히 건너뜀).
+  //    약 1초마다 prof(워커 쪽 frame_stats 요약: physics/overtake/lag)를 함께 보낸다.
+  //  - 페이지 → 워커: init / speed / cmd(release·box·set·go …) / ack
+  //  - Worker를 못 만들면(CSP/샌드박스) 같은 워커 소스를 메인 스레드 shim으로 돌린다.
+  const SIM_ENUMS = {
+    mode: ['grid','pit','pitGo','pitStopWait','toMain','toPit','main'],
+    compound: ['soft','medium','hard','intermediate','wet'],
+    pace: ['Attack','Aggressive','Standard','Light','Conserve'],
+    fuelMix: ['Push','Balanced','Conserve'],
+  };
+
+  // 코어 상태 → 버퍼. fields: [[이름, 'n'|'b'|열거형 키], …]. null 은 NaN.
+  function simPack(core, pos, num){
+    const F=core.fields, nf=F.length, cars=core.cars;
+    for (let i=0;i<cars.length;i++){
+      const c=cars[i], q=core.xy(c);
+      pos[2*i]=q.x; pos[2*i+1]=q.y;
+      for (let k=0;k<nf;k++){
+        const v=c[F[k][0]], kind=F[k][1];
+        num[i*nf+k] = (v===null || v===undefined) ? NaN
+                    : kind==='n' ? v : kind==='b' ? (v?1:0) : SIM_ENUMS[kind].indexOf(v);
+      }
+    }
+  }
+  function simApply(cars, fields, num){
+    const nf=fields.length;
+    for (let i=0;i<cars.length;i++){
+      const c=cars[i];
+      for (let k=0;k<nf;k++){
+        const v=num[i*nf+k], name=fields[k][0], kind=fields[k][1];
+        c[name] = Number.isNaN(v) ? null : kind==='n' ? v : kind==='b' ? v>0 : (SIM_ENUMS[kind][v] ?? null);
+      }
+    }
+  }
+
+  // 워커 쪽 진입점: simWorkerMain(self, makeQualiCore)
+  function simWorkerMain(scope, factory){
+    let core=null, clk=null, speed=1, tPrev=0, waiting=false, sentFields=false, tProf=0;
+    const pool=[];
+    // 틱별 시뮬 시간: physics = 스텝 전체 − overtake(코어가 core.prof.otkMs 로 누적), lag = 밀린 시뮬 시간
+    const fs=(typeof makeFrameStats==='function') ? makeFrameStats() : null;
+    function post(){
+      if (waiting || !core) return;
+      const n=core.cars.length, nf=core.fields.length;
+      let b=pool.pop();
+      if (!b || b.pos.length!==2*n) b={pos:new Float32Array(2*n), num:new Float32Array(nf*n)};
+      simPack(core, b.pos, b.num);
+      const st=clk.stats;
+      const msg={type:'frame', simT:core.simT, running:core.running, done:core.done,
+                 pos:b.pos, num:b.num, ev:core.events.splice(0),
+                 clk:{steps:st.stepsLast, overBudget:st.overBudget, droppedSec:st.droppedSec, simMs:st.simMsLast}};
+      if (!sentFields){ msg.fields=core.fields; sentFields=true; }
+      const now=performance.now();
+      if (fs && now-tProf>=1000){ msg.prof=fs.summary({overBudget:st.overBudget, droppedSec:st.droppedSec}); tProf=now; }
+      waiting=true;
+      scope.postMessage(msg, [b.pos.buffer, b.num.buffer]);
+    }
+    function tick(){
+      const now=performance.now(), dt=tPrev ? (now-tPrev)/1000 : 0; tPrev=now;
+      if (fs) fs.frame(now);
+      const p=core.prof, o0=p ? p.otkMs : 0;
+      const n=clk.advance(dt, speed, core.step);
+      if (fs && n){
+        const otk=p ? p.otkMs-o0 : 0;
+        fs.add('physics', clk.stats.simMsLast-otk);
+        if (p) fs.add('overtake', otk);
+        fs.add('lag', clk.acc*1000);
+      }
+      post();
+    }
+    scope.onmessage = (ev)=>{
+      const m=ev.data||{};
+      if (m.type==='init'){
+        core=factory(m.cfg); clk=makeSimClock(m.clock); speed=m.speed||1;
+        setInterval(tick, 1000/60); post();
+      } else if (m.type==='ack'){
+        waiting=false; if (m.pos && m.pos.byteLength) pool.push({pos:m.pos, num:m.num});
+      } else if (m.type==='speed'){ speed=m.v;
+      } else if (m.type==='cmd' && core && core.cmd[m.cmd]){ core.cmd[m.cmd](...(m.args||[])); }
+    };
+  }
+
+  // 페이지 쪽: opt = {worker, cfg, cars(미러), clock, speed, onFrame}
+  //  worker = {url, factory}(정적 번들, page_js.worker_ref) 또는 {src}(인라인 소스)
+  function makeSimHost(opt){
+    const H={mode:'worker', frame:null, pos:null, fields:null, clk:null, prof:null};
+    const W=opt.worker || {src: opt.src};
+    const src=W.src || `importScripts(${JSON.stringify(new URL(W.url, document.baseURI).href)});\nsimWorkerMain(self, self[${JSON.stringify(W.factory)}]);\n`;
+    const backlog=[];   // 첫 프레임 전 메시지(워커 실패 시 shim으로 재생)
+    let port=null, worker=null;
+
+    function onMsg(ev){
+      const m=ev.data;
+      if (!m || m.type!=='frame') return;
+      if (m.fields) H.fields=m.fields;
+      if (!H.pos || H.pos.length!==m.pos.length) H.pos=new Float32Array(m.pos.length);
+      H.pos.set(m.pos);
+      if (H.fields) simApply(opt.cars, H.fields, m.num);
+      for (const e of m.ev){
+        const c=opt.cars[e[1]]; if (!c) continue;
+        if (e[0]==='lap'){ c.lapTimes.push(e[2]); c.lastLapTime=e[2]; }
+      }
+      H.clk=m.clk; H.frame=m; backlog.length=0;
+      if (m.prof) H.prof=m.prof;
+      if (opt.onFrame) opt.onFrame(m);
+      port.postMessage({type:'ack', pos:m.pos, num:m.num}, H.mode==='worker' ? [m.pos.buffer, m.num.buffer] : []);
+    }
+    function send(msg){ if (!H.frame) backlog.push(msg); port.postMessage(msg); }
+    function startLocal(){
+      H.mode='main';
+      const scope={onmessage:null, postMessage:(m)=>onMsg({data:m})};
+      if (W.src) new Function('self', W.src)(scope);
+      else simWorkerMain(scope, globalThis[W.factory]);   // 페이지 번들에 코어가 같이 들어 있다
+      port={postMessage:(m)=>scope.onmessage({data:m})};
+      backlog.splice(0).forEach(m=>port.postMessage(m));
+    }
+    try {
+      const url=URL.createObjectURL(new Blob([src], {type:'text/javascript'}));
+      worker=new Worker(url); port=worker;
+      worker.onmessage=onMsg;
+      worker.onerror=()=>{ if (H.frame) return; worker.terminate(); startLocal(); };
+    } catch(e){ port={postMessage:()=>{}}; startLocal(); }
+
+    send({type:'init', cfg:opt.cfg, clock:opt.clock||{}, speed:opt.speed||1});
+    H.send = (cmd, ...args)=>send({type:'cmd', cmd, args});
+    H.speed = (v)=>send({type:'speed', v});
+    return H;
+  }
@@ -0,0 +1,107 @@
+  // ── 트랙 기하 LUT (f1sim/ui/js/track_geom.js) ──────────────────────────────
+  // 호길이 균등 재샘플 폴리라인: a = Float32Array [x,y,tx,ty]*n, s_i = i/(n-1)
+  // 프레임마다 getPointAtLength 를 부르지 않고 O(1) 보간한다.
+  function lutFromB64(o){
+    if (!o || !o.data || !o.n) return null;
+    const bin=atob(o.data), u8=new Uint8Array(bin.length);
+    for (let i=0;i<bin.length;i++) u8[i]=bin.charCodeAt(i);
+    return {n:o.n, len:o.len_px, a:new Float32Array(u8.buffer)};
+  }
+  function lutFromPath(path, step){
+    // LUT 파일이 없을 때: 시작 시 1회만 SVG 경로 샘플링
+    const L=Math.max(1, path.getTotalLength());
+    const n=Math.max(64, Math.ceil(L/(step||2))+1), a=new Float32Array(n*4);
+    for (let i=0;i<n;i++){ const q=path.getPointAtLength(L*i/(n-1)); a[4*i]=q.x; a[4*i+1]=q.y; }
+    const closed=Math.hypot(a[0]-a[4*(n-1)], a[1]-a[4*(n-1)+1]) < 1e-3*L;
+    for (let i=0;i<n;i++){
+      let j=i-1, k=i+1;
+      if (j<0) j = closed ? n-2 : 0;
+      if (k>n-1) k = closed ? 1 : n-1;
+      const tx=a[4*k]-a[4*j], ty=a[4*k+1]-a[4*j+1], m=Math.hypot(tx,ty)||1;
+      a[4*i+2]=tx/m; a[4*i+3]=ty/m;
+    }
+    return {n, len:L, a};
+  }
+  function lutAt(g, s){
+    const m=g.n-1, c=(s<0?0:(s>1?1:s))*m;
+    let i=c|0; if (i>=m) i=m-1;
+    const f=c-i, a=g.a, j=i<<2, k=j+4;
+    const tx=a[j+2]+(a[k+2]-a[j+2])*f, ty=a[j+3]+(a[k+3]-a[j+3])*f, mag=Math.hypot(tx,ty)||1;
+    return {x:a[j]+(a[k]-a[j])*f, y:a[j+1]+(a[k+1]-a[j+1])*f, tx:tx/mag, ty:ty/mag};
+  }
+  function lutNearestS(g, p){
+    if (!g || !p) return 0;
+    const a=g.a; let best=0, bd=Infinity;
+    for (let i=0;i<g.n;i++){ const dx=a[4*i]-p.x, dy=a[4*i+1]-p.y, d=dx*dx+dy*dy; if (d<bd){ bd=d; best=i; } }
+    return best/(g.n-1);
+  }
+  // 곡률 속도 배율 m(s) (LUT.speed, s 균등 bin uint16×q) — 랩 평균이 1이 되도록 정규화돼 있다
+  function speedFromB64(o){
+    if (!o || !o.data || !o.n) return null;
+    const bin=atob(o.data), u8=new Uint8Array(bin.length);
+    for (let i=0;i<bin.length;i++) u8[i]=bin.charCodeAt(i);
+    const q=new Uint16Array(u8.buffer), m=new Float32Array(o.n), k=o.q||1e-4;
+    for (let i=0;i<o.n;i++) m[i]=q[i]*k;
+    // 누적 환산 시간(정규화) — race_timeline 의 warp 좌표 역변환용
+    const cum=new Float64Array(o.n+1);
+    for (let i=0;i<o.n;i++) cum[i+1]=cum[i]+1/m[i];
+    for (let i=1;i<=o.n;i++) cum[i]/=cum[o.n];
+    return {n:o.n, m, cum, zones:o.zones||[]};
+  }
+  function speedAt(p, s){
+    if (!p) return 1;
+    let i=((s%1+1)%1)*p.n|0; if (i>=p.n) i=p.n-1;
+    return p.m[i];
+  }
+  // 환산 시간 좌표 u → 경로 s (SpeedProfile.warp 의 역함수). 프로파일 없으면 그대로.
+  function speedUnwarp(p, u){
+    if (!p) return u;
+    u=(u%1+1)%1;
+    const c=p.cum; let lo=0, hi=p.n;
+    while (hi-lo>1){ const mid=(lo+hi)>>1; if (c[mid]<=u) lo=mid; else hi=mid; }
+    const w=c[lo+1]-c[lo];
+    return (lo + (w>0 ? (u-c[lo])/w : 0))/p.n;
+  }
+  function lutPick(v, fallback){ return (typeof v==='number' && Number.isFinite(v)) ? v : fallback; }
+  // 그리기용 트랙 모양 {view, main, pit, finish:[x1,y1,x2,y2]|null, mk:{pitIn,pitOut,pitStop}}
+  // LUT 의 shape(circuit_calculator 가 단순화)가 있으면 그대로, 없으면 SVG 원본을 DOMParser 로 읽는다.
+  function trackShape(raw, lut){
+    const pt=a=>(a && a.length===2) ? {x:a[0], y:a[1]} : null;
+    const sh=lut && lut.shape;
+    if (sh) return {
+      view: sh.view || "0 0 1200 800", main: sh.main || '', pit: sh.pit || '',
+      finish: sh.finish || null,
+      mk: {pitIn: pt(sh.markers && sh.markers.pitIn), pitOut: pt(sh.markers && sh.markers.pitOut),
+           pitStop: pt(sh.markers && sh.markers.pitStop)},
+    };
+    if (!raw || !raw.trim()) return null;
+    const doc=new DOMParser().parseFromString(raw, "image/svg+xml");
+    const root=doc.querySelector('svg');
+    const pathD=id=>{ const el=doc.querySelector(`path#${id}`) || doc.querySelector('path'); return el ? (el.getAttribute('d')||'') : ''; };
+    let finish=null;
+    const fin=doc.querySelector('polyline#finish, line#finish');
+    if (fin){
+      if (fin.tagName.toLowerCase()==='polyline'){
+        const pts=(fin.getAttribute('points')||'').trim().split(/\s+/).map(s=>s.split(',').map(parseFloat));
+        if (pts.length>=2) finish=[pts[0][0], pts[0][1], pts[1][0], pts[1][1]];
+      } else finish=['x1','y1','x2','y2'].map(k=>+fin.getAttribute(k));
+    }
+    const md=doc.querySelector('metadata'); let meta={};
+    try{ meta = md ? JSON.parse(md.textContent||"{}") : {}; }catch(e){ meta={}; }
+    const mark=id=>{
+      const el=doc.querySelector(`#${id}`), a=el ? (el.getAttribute('data-pt')||'').split(',').map(parseFloat) : [];
+      if (a.length===2 && a.every(Number.isFinite)) return {x:a[0], y:a[1]};
+      return (meta[id] && meta[id].pts && meta[id].pts[0]) || null;
+    };
+    return {
+      view: (root && root.getAttribute('viewBox')) || "0 0 1200 800",
+      main: pathD('main'), pit: pathD('pit'), finish,
+      mk: {pitIn: mark('pitIn'), pitOut: mark('pitOut'), pitStop: mark('pitStop')},
+    };
+  }
+  // 페이지 설정의 기하 참조 {svg, lut}(정적 URL) → {raw, lut}. 실패하면 빈 SVG / LUT 없음.
+  async function loadGeometry(ref){
+    const get=(u, kind)=> u ? fetch(u).then(r=>r.ok ? r[kind]() : null).catch(()=>null) : Promise.resolve(null);
+    const [raw, lut]=await Promise.all([get(ref && ref.svg, 'text'), get(ref && ref.lut, 'json')]);
+    return {raw: raw || '', lut};
+  }
@@ -0,0 +1,22 @@
+  // ── 노면 젖음 크로스오버 (f1sim/ui/js/weather.js) ─────────────────────────
+  // f1sim/engine/weather.py 의 wet_class / tyre_class / wet_loss / crossover 와 같은 경계·계수.
+  // 타임라인(분·랩별 젖음 배열)은 Python 이 만들어 cfg 로 넘긴다 — 여기선 판단만 한다.
+  const WX_INTER_AT = 0.30, WX_WET_AT = 0.65, WX_WRONG_TYRE = 0.40, WX_TRACK_WET_LOSS = 0.10;
+  const WX_BANDS = [[0, WX_INTER_AT], [WX_INTER_AT, WX_WET_AT], [WX_WET_AT, 1]];
+
+  function wetClass(w){ return (w >= WX_WET_AT) ? 2 : (w >= WX_INTER_AT ? 1 : 0); }
+  function tyreClass(c){ return c==='wet' ? 2 : (c==='intermediate' ? 1 : 0); }
+  function wetLoss(cls, w){
+    const b = WX_BANDS[cls] || WX_BANDS[0];
+    return WX_TRACK_WET_LOSS*w + WX_WRONG_TYRE*(Math.max(0, b[0]-w) + Math.max(0, w-b[1]));
+  }
+  function crossTy(cls, dry){
+    if (cls >= 2) return 'wet';
+    if (cls === 1) return 'intermediate';
+    return (dry && tyreClass(dry)===0) ? dry : 'medium';
+  }
+  // 배열 series 의 k 번째(범위 밖은 끝 값). series 가 없으면 fallback.
+  function seriesAt(series, k, fallback){
+    if (!Array.isArray(series) || !series.length) return fallback;
+    return +series[Math.max(0, Math.min(series.length-1, Math.floor(k)))] || 0;
+  }
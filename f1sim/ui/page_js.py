@@ -0,0 +1,97 @@
+# f1sim/ui/page_js.py
+# -*- coding: utf-8 -*-
+"""
+세션 페이지(components.html) 스크립트에 끼워 넣는 공용 JS 조각.
+f1sim/ui/js/{name}.js 를 읽어 mtime 기준으로 캐시한다.
+
+번들: 공용 조각을 하나로 이어 static/js/f1sim-{kind}.{내용 해시}.js 로 내보낸다.
+파일명이 버전이므로 브라우저가 한 번 받아 캐시하고, 페이지는 <script src> 한 줄과 작은 설정만 보낸다.
+정적 서빙이 꺼져 있으면 예전처럼 본문을 인라인으로 넣는다.
+"""
+from __future__ import annotations
+from pathlib import Path
+from functools import lru_cache
+import hashlib
+import json
+
+from .assets import STATIC_DIR, asset_url, static_serving_enabled
+
+JS_DIR = Path(__file__).resolve().parent / "js"
+BUNDLE_DIR = STATIC_DIR / "js"
+
+# 페이지 번들(전역 함수로 로드) / 워커 번들(importScripts). 워커 쪽엔 DOM 코드가 없어야 한다.
+BUNDLES = {
+    "page":   ("track_geom", "sim_clock", "frame_stats", "car_layer", "sim_host", "channel", "race_timeline",
+               "weather", "quali_core", "race_core"),
+    "worker": ("track_geom", "sim_clock", "frame_stats", "sim_host", "weather", "quali_core", "race_core"),
+}
+
+
+@lru_cache(maxsize=16)
+def _read(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+def page_js(name: str) -> str:
+    p = JS_DIR / f"{name}.js"
+    return _read(str(p), p.stat().st_mtime_ns)
+
+
+def worker_src(core: str, factory: str) -> str:
+    """시뮬 워커 소스(JS 문자열 리터럴): track_geom + sim_clock + frame_stats + sim_host + weather + 코어 + 진입점."""
+    src = "\n".join(page_js(n) for n in ("track_geom", "sim_clock", "frame_stats", "sim_host", "weather", core))
+    src += f"\nsimWorkerMain(self, {factory});\n"
+    return json.dumps(src).replace("</", "<\\/")
+
+
+def _stamp(kind: str) -> tuple:
+    return tuple((n, (JS_DIR / f"{n}.js").stat().st_mtime_ns) for n in BUNDLES[kind])
+
+
+@lru_cache(maxsize=8)
+def _bundle(kind: str, stamp: tuple) -> tuple:
+    names = [n for n, _ in stamp]
+    src = f"// f1sim {kind} bundle: {', '.join(names)}\n" + "\n".join(page_js(n) for n in names)
+    digest = hashlib.sha1(src.encode("utf-8")).hexdigest()[:12]
+    return src, BUNDLE_DIR / f"f1sim-{kind}.{digest}.js"
+
+
+def bundle_source(kind: str = "page") -> str:
+    return _bundle(kind, _stamp(kind))[0]
+
+
+@lru_cache(maxsize=8)
+def _publish(kind: str, stamp: tuple) -> str:
+    src, dst = _bundle(kind, stamp)
+    if not dst.exists():
+        BUNDLE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(dst.name + ".tmp")
+        tmp.write_text(src, encoding="utf-8")
+        tmp.replace(dst)
+    return asset_url(dst)
+
+
+def bundle_url(kind: str = "page") -> str:
+    """정적 번들 URL(내용 해시 파일명). 정적 서빙이 꺼져 있거나 쓰기 실패면 ''."""
+    if not static_serving_enabled():
+        return ""
+    try:
+        return _publish(kind, _stamp(kind))
+    except OSError:
+        return ""
+
+
+def bundle_tag() -> str:
+    """페이지 <script> 앞에 넣을 공용 번들 태그."""
+    url = bundle_url("page")
+    if url:
+        return f'<script src="{url}"></script>'
+    return "<script>\n" + bundle_source("page") + "\n</script>"
+
+
+def worker_ref(core: str, factory: str) -> str:
+    """makeSimHost({worker}) 설정(JS 리터럴): 정적 번들 URL + 팩토리 이름, 없으면 인라인 소스."""
+    url = bundle_url("worker")
+    if url:
+        return json.dumps({"url": url, "factory": factory})
+    return '{"src": %s, "factory": %s}' % (worker_src(core, factory), json.dumps(factory))
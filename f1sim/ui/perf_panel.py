@@ -0,0 +1,59 @@
+# f1sim/ui/perf_panel.py
+# -*- coding: utf-8 -*-
+"""
+사이드바 "성능 계측" 패널 (f1sim/perf.py).
+
+켜기/끄기, 스팬별 집계(직전 실행까지), 카운터, 브라우저 프레임 시간 요약, Chrome trace JSON 내려받기, 초기화.
+계측은 프로세스 공용이라 켜면 모든 세션의 실행이 함께 기록된다.
+"""
+from __future__ import annotations
+import json
+
+import streamlit as st
+
+from f1sim import perf
+
+
+def _trace_bytes() -> bytes:
+    return json.dumps(perf.chrome_trace(), ensure_ascii=False).encode("utf-8")
+
+
+def _client_row(r: dict) -> dict:
+    d = r["data"]
+    fr = (d.get("sections") or {}).get("frame") or {}
+    w = (d.get("worker") or {}).get("sections") or {}
+    return {"세션": r["source"], "엔진": d.get("engine"), "렌더": d.get("backend"),
+            "프레임 p50": fr.get("p50"), "p99": fr.get("p99"), "놓친 프레임": d.get("dropped"),
+            "physics p99": (w.get("physics") or {}).get("p99")}
+
+
+def perf_sidebar():
+    with st.sidebar.expander("성능 계측", expanded=False):
+        on = st.checkbox("계측 켜기", value=perf.enabled(), key="perf_on",
+                         help="스팬/카운터 기록(F1SIM_PERF=1 과 같음). 끄면 오버헤드 거의 0.")
+        if on != perf.enabled():
+            perf.enable(on)
+        client = perf.client_reports()
+        if client:
+            st.caption("브라우저 프레임 시간(ms)")
+            st.dataframe([_client_row(r) for r in reversed(client)], use_container_width=True, hide_index=True)
+        rows = perf.summary()
+        if not rows:
+            st.caption("기록 없음 — 켠 뒤 페이지를 한 번 더 실행하세요.")
+            return
+        st.dataframe([{"스팬": r["name"], "호출": r["calls"], "합계 ms": r["total_ms"],
+                       "자체 ms": r["self_ms"], "최대 ms": r["max_ms"]} for r in rows[:20]],
+                     use_container_width=True, hide_index=True)
+        cnt = perf.counters()
+        if cnt:
+            st.dataframe([{"카운터": k, "값": v} for k, v in sorted(cnt.items())],
+                         use_container_width=True, hide_index=True)
+        c1, c2 = st.columns(2)
+        with c1:
+            st.download_button("trace.json", data=_trace_bytes, file_name="f1sim_trace.json",
+                               mime="application/json", use_container_width=True,
+                               help="chrome://tracing 또는 ui.perfetto.dev 에서 열기")
+        with c2:
+            if st.button("초기화", key="perf_reset", use_container_width=True):
+                perf.reset()
+                st.rerun()
@@ -0,0 +1,79 @@
+# f1sim/ui/session_channel.py
+# -*- coding: utf-8 -*-
+"""
+세션 페이지 ↔ Python 양방향 채널(커스텀 컴포넌트).
+
+- 페이지 HTML을 컴포넌트 안의 iframe(srcdoc)으로 띄운다. 페이지 스크립트는 CHAN.send(kind, obj)만 부른다
+  (f1sim/ui/js/channel.js).
+- 부모 프레임(channel_frontend/index.html)이 JSON → deflate → base64 → CHUNK 조각으로 나눠
+  setComponentValue 로 하나씩 보내고, Python(on_change 콜백)이 받은 조각 번호를 render 인자 ack 로
+  돌려주면 다음 조각을 보낸다. 조각 하나당 재실행 한 번 — 값이 덮어써져 잃는 일이 없다.
+- 완성된 메시지는 세션 inbox 에 쌓이고 페이지 맨 위에서 take_messages(key)로 꺼낸다.
+  페이지 새로고침/쿼리 파라미터가 없으므로 URL 길이 제한도 없다.
+
+사용:
+    for msg in take_messages("chan_Q1"):
+        persist_quali_result("Q1", msg["body"])
+    session_channel(html, height=1320, key="chan_Q1")
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import List, Optional
+import base64
+import hashlib
+import json
+import zlib
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+_FRONTEND = Path(__file__).resolve().parent / "channel_frontend"
+_component = components.declare_component("f1_session_channel", path=str(_FRONTEND))
+
+
+def _chan(key: str) -> dict:
+    return st.session_state.setdefault(f"{key}__chan", {"rx_id": None, "parts": {}, "ack": None, "inbox": []})
+
+
+def _decode(parts: List[str], enc: str):
+    raw = base64.b64decode("".join(parts).encode("ascii"))
+    if enc == "deflate":
+        raw = zlib.decompress(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _on_value(key: str) -> None:
+    """조각 수신(재실행 전 콜백): 저장 → ack 갱신 → 다 모이면 inbox 로."""
+    v = st.session_state.get(key)
+    if not isinstance(v, dict) or "id" not in v:
+        return
+    ch = _chan(key)
+    mid, seq, total = str(v["id"]), int(v.get("seq", 0)), max(1, int(v.get("total", 1)))
+    if ch["rx_id"] != mid:
+        ch["rx_id"], ch["parts"] = mid, {}
+    ch["parts"][seq] = v.get("data") or ""
+    ack = {"id": mid, "seq": seq, "done": len(ch["parts"]) >= total}
+    if ack["done"]:
+        msg = {"id": mid, "kind": v.get("kind") or "result"}
+        try:
+            msg["body"] = _decode([ch["parts"][k] for k in range(total)], v.get("enc") or "json")
+        except Exception as e:      # 깨진 조각/형식 오류 → 페이지가 경고로 보여준다
+            msg["error"] = ack["error"] = f"{type(e).__name__}: {e}"
+        ch["inbox"].append(msg)
+        ch["parts"] = {}
+    ch["ack"] = ack
+
+
+def take_messages(key: str, kind: Optional[str] = None) -> List[dict]:
+    """완성된 메시지({id, kind, body} 또는 {id, kind, error})를 꺼낸다(한 번만 전달)."""
+    ch = _chan(key)
+    out = [m for m in ch["inbox"] if kind is None or m["kind"] == kind]
+    ch["inbox"] = [m for m in ch["inbox"] if not (kind is None or m["kind"] == kind)]
+    return out
+
+
+def session_channel(html: str, *, height: int, key: str) -> None:
+    """components.html 대체: 같은 HTML을 띄우되 CHAN.send 로 Python에 결과를 보낼 수 있다."""
+    rev = hashlib.sha1(html.encode("utf-8")).hexdigest()[:16]   # 같으면 iframe 유지(시뮬 계속)
+    _component(html=html, rev=rev, height=int(height), ack=_chan(key)["ack"],
+               key=key, default=None, on_change=_on_value, args=(key,))
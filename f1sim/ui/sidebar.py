@@ -3,6 +3,8 @@
 from pathlib import Path
 import streamlit as st
 from f1sim.io.save import delete_current_save
+from f1sim import shared
+from f1sim.ui.perf_panel import perf_sidebar
 
 def attach_reset_sidebar():
     with st.sidebar:
@@ -17,3 +19,20 @@ def attach_reset_sidebar():
             delete_current_save(st.session_state)
             st.success("진행 데이터를 삭제했습니다. 처음부터 다시 시작할 수 있어요.")
             st.rerun()
+
+        with st.expander("세션 메모리", expanded=False):
+            _memory_report()
+    perf_sidebar()
+
+
+def _memory_report():
+    """이 세션의 session_state 키별 크기(개인/공유)와 프로세스 공용 저장소 현황."""
+    rows = shared.session_report(st.session_state)
+    own = sum(r["private_bytes"] for r in rows)
+    ref = sum(r["shared_bytes"] for r in rows)
+    info = shared.store_info()
+    st.caption(f"개인 {own/1024:.1f} KB · 공유 참조 {ref/1024:.1f} KB · "
+               f"공유 저장소 {info['entries']}개 / {info['bytes']/1024:.1f} KB (중복 제거 {info['dedup']}회)")
+    st.dataframe([{"키": r["key"], "타입": r["type"], "개인 KB": round(r["private_bytes"]/1024, 1),
+                   "공유 KB": round(r["shared_bytes"]/1024, 1)} for r in rows[:15]],
+                 use_container_width=True, hide_index=True)
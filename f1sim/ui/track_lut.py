@@ -0,0 +1,62 @@
+# f1sim/ui/track_lut.py
+# -*- coding: utf-8 -*-
+"""
+세션 페이지용 트랙 LUT 로더.
+
+circuit_calculator.py 가 info/track_lut/{서킷}.json 으로 만든
+호길이 균등 재샘플 폴리라인([x,y,tx,ty] float32, base64)과 마커 s값을 읽는다.
+SVG 내용 해시가 다르면(서킷 수정 후 재계산 안 함) None → JS가 시작 시 1회 직접 샘플링.
+LUT에 최소 트랙 모양(shape)이 있으면 페이지는 SVG 원본을 아예 받지 않는다.
+"""
+from __future__ import annotations
+from pathlib import Path
+from functools import lru_cache
+from typing import Optional
+import json
+
+from .assets import ROOT, asset_url, content_hash
+from .page_js import page_js
+
+LUT_DIR = ROOT / "info" / "track_lut"
+LUT_VERSION = 2
+
+
+@lru_cache(maxsize=32)
+def _read_lut(path: str, mtime_ns: int) -> Optional[dict]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def _lut_path(svg_path: Optional[Path]) -> Optional[Path]:
+    """SVG와 짝이 맞는(버전·내용 해시 일치) LUT 파일 경로."""
+    if not svg_path:
+        return None
+    p = LUT_DIR / f"{Path(svg_path).stem}.json"
+    if not p.exists():
+        return None
+    lut = _read_lut(str(p), p.stat().st_mtime_ns)
+    if not lut or lut.get("version") != LUT_VERSION:
+        return None
+    if lut.get("svg_sha1") != content_hash(Path(svg_path)):
+        return None
+    return p
+
+
+def load_track_lut(svg_path: Optional[Path]) -> Optional[dict]:
+    p = _lut_path(svg_path)
+    return _read_lut(str(p), p.stat().st_mtime_ns) if p else None
+
+
+def geometry_ref(svg_path: Optional[Path]) -> dict:
+    """페이지 설정용 기하 참조 {svg, lut}: 본문 대신 캐시되는 URL(loadGeometry 가 받아 온다)."""
+    p = _lut_path(svg_path)
+    if p and (_read_lut(str(p), p.stat().st_mtime_ns) or {}).get("shape"):
+        return {"svg": None, "lut": asset_url(p)}
+    return {"svg": asset_url(svg_path), "lut": asset_url(p) if p else None}
+
+
+def geom_js() -> str:
+    """페이지 스크립트(IIFE) 안에 그대로 넣는 트랙 기하 함수들."""
+    return page_js("track_geom")
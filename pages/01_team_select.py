@@ -1,12 +1,11 @@
 # pages/01_team_select.py
 # -*- coding: utf-8 -*-
-import sys, re, base64, hashlib
+import sys, re, hashlib
 from pathlib import Path
 
 # ---- 루트/데이터/에셋 절대경로 ----
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
-DRIVER_DIR = ROOT / "driver_image"    # 드라이버 PNG들
 LOGO_DIR   = ROOT / "team_logo"       # 팀 로고 PNG들
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -27,6 +26,14 @@ except Exception:
         st.markdown(f"### {title}")
         if subtitle: st.caption(subtitle)
 
+from f1sim.io.data import read_csv
+from f1sim.ui.asset_index import asset_index, find_asset, find_driver_img, thumb_url
+from f1sim.ui.perf_panel import perf_sidebar
+from f1sim import perf
+
+perf.page_begin("01_team_select")     # 맨 끝 perf.page_end() 까지가 이 페이지 렌더
+perf_sidebar()
+
 brand_header("Team Select", "카드를 눌러 팀을 고르세요")
 
 # ---- 데이터 로드 & 가드 ----
@@ -35,9 +42,9 @@ if missing:
     st.error("누락된 파일: " + ", ".join(missing) + f"\n예상 위치: {DATA}")
     st.stop()
 
-teams   = pd.read_csv(DATA / "teams.csv")
-drivers = pd.read_csv(DATA / "drivers.csv")
-tracks  = pd.read_csv(DATA / "tracks.csv").sort_values("round")
+teams   = read_csv(DATA / "teams.csv")
+drivers = read_csv(DATA / "drivers.csv")
+tracks  = read_csv(DATA / "tracks.csv").sort_values("round")
 
 # ---- 유틸 ----
 
@@ -73,39 +80,10 @@ def _norm_hex(c: str | None) -> str | None:
     if not c.startswith("#"): c = "#" + c
     return c.upper() if re.fullmatch(r"#[0-9A-Fa-f]{6}", c) else None
 
-def _slug(s: str) -> str:
-    s = str(s).lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
-    return s
-
 def _hash_idx(key: str, n: int) -> int:
     if n <= 0: return 0
     return int(hashlib.md5(key.encode("utf-8")).hexdigest(), 16) % n
 
-@st.cache_data(show_spinner=False)
-def _b64(path: str) -> str:
-    p = Path(path)
-    if not p.exists():
-        return ""
-    data = p.read_bytes()
-    return "data:image/png;base64," + base64.b64encode(data).decode("ascii")
-
-def _best_match_png(dirpath: Path, names: list[str]) -> Path | None:
-    """정확 매칭 → 부분 매칭."""
-    if not dirpath.exists(): return None
-    cands = list(dirpath.glob("*.png"))
-    if not cands: return None
-    # 1) 정확 일치
-    for nm in names:
-        p = dirpath / f"{nm}.png"
-        if p.exists(): return p
-    # 2) 부분 일치
-    for nm in names:
-        t = nm.lower()
-        for p in cands:
-            if t in p.stem.lower(): return p
-    return None
-
 # ---- 컬럼 명 추론(드라이버) ----
 drv_cols = {c.lower(): c for c in drivers.columns}
 col_team = drv_cols.get("team_id", "team_id")
@@ -147,12 +125,8 @@ st.session_state.setdefault("race", None)
 # 이미지/정보 매칭
 # =========================================================
 def _find_driver_image_by_name(name: str) -> Path | None:
-    """이름 전체 → 슬러그 → 성(last name) 순서로 탐색."""
-    if not isinstance(name, str): return None
-    s = _slug(name)
-    parts = name.split()
-    last = _slug(parts[-1]) if parts else s
-    return _best_match_png(DRIVER_DIR, [name, s, last])
+    """이름 전체 → 성(last name) 순서로 에셋 인덱스에서 탐색."""
+    return find_driver_img(name)
 
 def get_team_drivers(team_id: str) -> list[dict]:
     """팀의 드라이버 2명(번호/이름/국가/이미지). 2명 미만이면 폴백."""
@@ -171,15 +145,12 @@ def get_team_drivers(team_id: str) -> list[dict]:
     return rows[:2]
 
 def _find_team_logo(team_id: str) -> Path | None:
-    """drivers.team_name 우선 → 정확 파일명(팀 이름.png) → 슬러그/부분일치 → 폴백."""
+    """drivers.team_name 우선 → 팀 이름(정확/부분/근사 일치) → 폴백."""
     disp = team_display_name.get(str(team_id), team_map[str(team_id)])
-    exact = LOGO_DIR / f"{disp}.png"
-    if exact.exists(): return exact
-    p = _best_match_png(LOGO_DIR, [disp, _slug(disp), team_map[str(team_id)], _slug(team_map[str(team_id)])])
+    p = find_asset("logo", disp, team_map[str(team_id)])
     if p: return p
-    if LOGO_DIR.exists():
-        cands = list(LOGO_DIR.glob("*.png"))
-        if cands: return cands[_hash_idx(str(team_id), len(cands))]
+    cands = list(asset_index()["logo"].values())
+    if cands: return cands[_hash_idx(str(team_id), len(cands))]
     return None
 
 # =========================================================
@@ -188,7 +159,7 @@ def _find_team_logo(team_id: str) -> Path | None:
 def _html_duo_hero(img1: Path | None, img2: Path | None, height_px: int = 200) -> str:
     def tag(p: Path | None) -> str:
         if p and p.exists():
-            uri = _b64(str(p))
+            uri = thumb_url(p, "hero")
             return f'<img src="{uri}" style="width:100%; height:100%; object-fit:cover; display:block;"/>'
         return '<div style="width:100%; height:100%; background:#0f0f13;"></div>'
     return f"""
@@ -201,7 +172,7 @@ def _html_duo_hero(img1: Path | None, img2: Path | None, height_px: int = 200) -
 def _html_logo_fixed(path: Path | None, box_px: int, img_px: int, bg: str) -> str:
     box = f"width:{box_px}px; height:{box_px}px; background:{bg}; border:1px solid {F1['border']}; border-radius:12px; display:grid; place-items:center;"
     if path and path.exists():
-        uri = _b64(str(path))
+        uri = thumb_url(path, "logo")
         return f'<div style="{box}"><img src="{uri}" style="width:{img_px}px; height:{img_px}px; object-fit:contain; display:block;"/></div>'
     return f'<div style="{box}; color:#777;">?</div>'
 
@@ -299,3 +270,5 @@ with st.expander("이미지/로고 매칭 디버그"):
             "driver2_img": str(d2["img"]) if d2["img"] else "(none)",
         })
     st.dataframe(pd.DataFrame(dbg), use_container_width=True, height=260)
+
+perf.page_end()
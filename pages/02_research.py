@@ -1,7 +1,8 @@
 # pages/02_research.py
 # -*- coding: utf-8 -*-
-import sys, json
+import sys, hashlib
 from pathlib import Path
+from functools import lru_cache
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path: sys.path.insert(0, str(ROOT))
 
@@ -39,8 +40,13 @@ brand_header("차량 연구 (R&D)", "엔지니어 브리핑 → 선택지 카드
 
 # ---- 데이터 로드 ----
 from f1sim.io.save import ensure_save_slot, get_paths
+from f1sim.io.data import read_csv, write_csv
+from f1sim import jobs, shared, perf
+from f1sim.ui.jobs_panel import take_job, job_busy, job_key
 from f1sim.ui.sidebar import attach_reset_sidebar
 
+perf.page_begin("02_research")     # 맨 끝 perf.page_end() 까지가 이 페이지 렌더
+
 DATA = ROOT / "data"
 # 팀 선택 여부 확인 후, R&D 진입 시 세이브 슬롯 보장
 team_id = st.session_state.get("team_id")
@@ -55,8 +61,7 @@ PATHS = get_paths(st.session_state, DATA)
 attach_reset_sidebar()
 
 RD_PATH = PATHS["rd"]
-teams   = pd.read_csv(PATHS["teams"])
-tracks  = pd.read_csv(PATHS["tracks"]).sort_values("round")
+tracks  = read_csv(PATHS["tracks"]).sort_values("round")
 
 # ---- 세션 가드 ----
 team_id = st.session_state.get("team_id")
@@ -65,7 +70,6 @@ if not team_id:
     st.switch_page("pages/01_team_select.py")
 
 # ---- 현재 팀 상태/라운드 ----
-trow = teams.set_index("team_id").loc[team_id].to_dict()
 round_no = int(st.session_state.get("round", int(tracks["round"].min())))
 next3 = tracks[tracks["round"].between(round_no, min(round_no+2, int(tracks["round"].max())))][
     ["round","name","grip_index","abrasion_index"]
@@ -76,22 +80,29 @@ defaults = {
     "aero": 70, "engine": 70, "reliability": 70, "dev_efficiency": 70,
     "pit_crew": 70, "strategy": 75, "team_morale": 70, "budget_musd": 120.0
 }
-for k, v in defaults.items():
-    trow.setdefault(k, v)
-
-# ---- 백로그 로드/컬럼 보정(paid/charged_musd 추가) ----
-if RD_PATH.exists():
-    backlog = pd.read_csv(RD_PATH)
-else:
-    backlog = pd.DataFrame(columns=[
-        "project_id","team_id","planned_round","title","area","cost_musd",
-        "eta_rounds","remaining_rounds","risk","efficiency","expected_gain_hint",
-        "status","reason","paid","charged_musd"
-    ])
-# 오래된 파일 호환
-for col, default in [("paid", 0), ("charged_musd", 0.0)]:
-    if col not in backlog.columns:
-        backlog[col] = default
+BACKLOG_COLS = [
+    "project_id","team_id","planned_round","title","area","cost_musd",
+    "eta_rounds","remaining_rounds","risk","efficiency","expected_gain_hint",
+    "status","reason","paid","charged_musd"
+]
+
+# 프래그먼트는 각자 이 로더로 입력을 다시 얻는다(data 계층 캐시라 파싱 없음, 커밋 직후엔 새 값).
+def _team_row() -> dict:
+    row = read_csv(PATHS["teams"]).set_index("team_id").loc[team_id].to_dict()
+    for k, v in defaults.items():
+        row.setdefault(k, v)
+    return row
+
+def _backlog() -> pd.DataFrame:
+    """백로그 로드/컬럼 보정(paid/charged_musd 추가)."""
+    df = read_csv(RD_PATH) if RD_PATH.exists() else pd.DataFrame(columns=BACKLOG_COLS)
+    # 오래된 파일 호환
+    for col, default in [("paid", 0), ("charged_musd", 0.0)]:
+        if col not in df.columns:
+            df[col] = default
+    return df
+
+trow = _team_row()
 
 # ---- 유틸 ----
 def _pill(text, color):
@@ -149,13 +160,37 @@ def _predict_gains(dec: dict, team_state: dict) -> dict:
         eng  += gain*1.0
     return {"aero":aero, "reliability":reli, "engine":eng}
 
-# ---- 좌/우 영역 ----
-L, R = st.columns([0.62, 0.38])
-
-# =========================
-# L: 제안 생성 & 브리핑/선택지
-# =========================
-with L:
+def _pick_key(dec: dict) -> str:
+    raw = f"{dec.get('area','')}|{dec.get('title','')}"
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()[:8]
+
+def _clear_picks():
+    """선택 체크박스 상태 초기화(새 제안 수신/최종 제출 후)."""
+    for k in [k for k in st.session_state if str(k).startswith("rd_pick_")]:
+        del st.session_state[k]
+    st.session_state["rd_picks_ui"] = []
+
+@lru_cache(maxsize=8)
+def _card_models(prop: shared.Shared, dev_eff: float, rnd: int) -> tuple:
+    """제안 → 카드 표시값(ETA/추천도/예상 상승). 제안·개발 효율·라운드가 같으면 다시 계산하지 않는다."""
+    out = []
+    for d in prop.value.get("decisions", []):
+        eta = int(d.get("eta_rounds", 1))
+        out.append({
+            "dec": d, "key": _pick_key(d), "eta": eta, "eta_abs": _eta_abs_round(eta),
+            "score": _score(d, dev_eff), "gains": _predict_gains(d, {"dev_efficiency": dev_eff}),
+        })
+    return tuple(out)
+
+# ---- 프래그먼트 ----
+# 위젯 조작은 자기 프래그먼트만 다시 실행한다. 예산/백로그를 바꾸는 커밋 뒤에만 전체 리런.
+#   _proposal_request : 예산 상한 · 제안 생성 · 브리핑
+#   _backlog_panel    : 백로그 표 · 진행/적용/삭제
+#   _selection        : 선택지 카드 → (중첩) _submit_panel : 선택 요약 · 최종 제출/확인
+
+@st.fragment
+def _proposal_request():
+    trow = _team_row()
     st.subheader("엔지니어에게 제안 받기")
 
     max_spend = float(trow["budget_musd"])
@@ -166,7 +201,8 @@ with L:
     tloc["team_id"] = team_id
     tloc["budget_musd"] = spend
 
-    if st.button("LLM으로 연구 제안 생성", type="primary", use_container_width=True):
+    if st.button("LLM으로 연구 제안 생성", type="primary", use_container_width=True,
+                 disabled=job_busy("rd_job")):
         from f1sim.ai.llm_client import ask_llm_json, digest_inputs
         from f1sim.ai.schemas import RESEARCH_JSON_SCHEMA
         from f1sim.ai.prompts import system_common, prompt_research
@@ -176,88 +212,41 @@ with L:
             f"\n- 상한이 높을수록 복잡도 증가로 ETA가 1~2R 늘어날 수 있음을 반영."
         )
         inputs = {"team": tloc, "tracks": next3, "round": round_no, "max_budget_hint": spend}
-        js = ask_llm_json(
-            RESEARCH_JSON_SCHEMA,
+        digest = digest_inputs(inputs)
+        user_prompt = prompt_research(tloc, next3, round_no) + budget_hint + f"\n- inputs_digest: {digest}\n"
+        # 백그라운드 작업 — 같은 슬롯·같은 프롬프트로 이미 도는 중이면 그 작업을 이어서 기다린다
+        st.session_state["rd_job"] = jobs.submit(
+            "research_proposal", ask_llm_json, RESEARCH_JSON_SCHEMA,
             system_prompt=system_common(),
-            user_prompt=(
-                prompt_research(tloc, next3, round_no) + budget_hint +
-                f"\n- inputs_digest: {digest_inputs(inputs)}\n"
-            )
+            user_prompt=user_prompt,
+            key=job_key("rd", save_dir, user_prompt),
         )
-        st.session_state["rd_proposal"] = js
-        st.session_state["rd_picks_ui"] = []  # 이전 선택 초기화
-        st.success("연구 제안을 수신했습니다.")
 
-    prop = st.session_state.get("rd_proposal")
+    js = take_job("rd_job", "연구 제안 생성")
+    if js:
+        st.session_state["rd_proposal"] = shared.put(js)     # 세션에는 공유 핸들만
+        _clear_picks()  # 이전 선택 초기화
+        st.toast("연구 제안을 수신했습니다.")
+        st.rerun()      # 선택지 프래그먼트가 새 제안으로 그려지도록
 
-    # 원본 JSON은 expander로 숨김
+    prop = shared.deref(st.session_state.get("rd_proposal"))
     if prop:
+        # 원본 JSON은 expander로 숨김
         with st.expander("원본 제안 JSON 열기"):
             st.json(prop)
-
-    # 엔지니어 브리핑 + 선택지 카드
-    if prop:
-        decs = prop.get("decisions", [])
         st.markdown("#### 👨‍🔧 엔지니어 브리핑")
         with st.chat_message("assistant"):
             st.markdown(
-                f"매니저님, 이번 라운드 기준으로 총 **{len(decs)}건**의 연구안을 준비했습니다. "
+                f"매니저님, 이번 라운드 기준으로 총 **{len(prop.get('decisions', []))}건**의 연구안을 준비했습니다. "
                 f"개발 효율 **{int(trow['dev_efficiency'])}%**, 예산 상한 **${spend:.1f}M**을 반영했어요. "
                 "상한이 높아질수록 ETA가 다소 길어질 수 있습니다."
             )
 
-        st.markdown("---")
-        st.markdown("#### 🔎 선택지")
-        st.caption("체크한 항목은 우측 패널의 ‘최종 제출’에서 한 번에 확정됩니다.")
-
-        picks = st.session_state.get("rd_picks_ui", [])
-        # 선택지 카드
-        for i, d in enumerate(decs, 1):
-            area = d.get("area", "")
-            title = d.get("title", "제목 없음")
-            cost  = float(d.get("cost_musd", 0))
-            eta   = int(d.get("eta_rounds", 1))
-            riskp = _risk_pill(d.get("risk"))
-            score = _score(d, trow["dev_efficiency"])
-            eta_abs = _eta_abs_round(eta)
-            gains = _predict_gains(d, trow)
-
-            with st.container(border=True):
-                c1, c2 = st.columns([0.70, 0.30])
-                with c1:
-                    st.markdown(
-                        f"**{i}. [{_area_kr(area)}] {title}**  &nbsp; {riskp}",
-                        unsafe_allow_html=True
-                    )
-                    st.markdown(
-                        f"- 예상 완료: R{eta_abs} (ETA {eta}R) · 비용: ${cost:.1f}M"
-                    )
-                    gain_txt = []
-                    if gains["aero"]>0: gain_txt.append(f"aero +{gains['aero']:.1f}")
-                    if gains["reliability"]>0: gain_txt.append(f"reliability +{gains['reliability']:.1f}")
-                    if gains["engine"]>0: gain_txt.append(f"engine +{gains['engine']:.1f}")
-                    if gain_txt:
-                        st.markdown("예상 상승: " + " · ".join(gain_txt))
-                    st.progress(int(score*100), text=f"추천도 {int(score*100)} / 100")
-                    st.caption(d.get("reason", "사유 설명 없음"))
-                with c2:
-                    key = f"pick_{i}"
-                    checked_now = st.checkbox("선택", key=key,
-                                              value=any(p.get("title")==d.get("title") and p.get("area")==d.get("area") for p in picks))
-                    # 선택/해제 반영
-                    if checked_now and not any(p.get("title")==d.get("title") and p.get("area")==d.get("area") for p in picks):
-                        tmp = dict(d); tmp["_eta_abs"] = eta_abs; tmp["_score"] = score
-                        picks.append(tmp)
-                    if not checked_now:
-                        picks = [p for p in picks if not (p.get("title")==d.get("title") and p.get("area")==d.get("area"))]
-        st.session_state["rd_picks_ui"] = picks
-
-# =========================
-# R: 최종 제출 · 백로그/진행/삭제
-# =========================
-with R:
-    st.subheader("최종 제출 · 백로그 · 진행")
 
+@st.fragment
+def _submit_panel():
+    st.subheader("최종 제출")
+    trow = _team_row()
     ui_picks = st.session_state.get("rd_picks_ui", [])
     total_cost = sum(float(d.get("cost_musd",0)) for d in ui_picks) if ui_picks else 0.0
 
@@ -292,7 +281,7 @@ with R:
         with cc1:
             if st.button("확인",use_container_width=True):
                 # 1) 예산 차감
-                teams_df = teams.set_index("team_id")
+                teams_df = read_csv(PATHS["teams"]).set_index("team_id")
                 cur = float(teams_df.loc[team_id, "budget_musd"])
                 if total_cost > cur:
                     st.error("예산이 부족합니다.")
@@ -300,7 +289,7 @@ with R:
                 else:
                     new = round(cur - total_cost, 2)
                     teams_df.loc[team_id, "budget_musd"] = new
-                    teams_df.reset_index().to_csv(PATHS["teams"], index=False, encoding="utf-8")
+                    write_csv(teams_df.reset_index(), PATHS["teams"])
                     # 2) 백로그 기록 (paid=1, charged_musd 세팅)
                     rows = []
                     for d in ui_picks:
@@ -322,21 +311,69 @@ with R:
                             "paid": 1,
                             "charged_musd": float(d["cost_musd"]),
                         })
-                    new_backlog = pd.concat([backlog, pd.DataFrame(rows)], ignore_index=True)
-                    new_backlog.to_csv(RD_PATH, index=False, encoding="utf-8")
-                    # 상태 정리
-                    st.session_state["rd_picks_ui"] = []
+                    new_backlog = pd.concat([_backlog(), pd.DataFrame(rows)], ignore_index=True)
+                    write_csv(new_backlog, RD_PATH)
+                    # 상태 정리 — 예산/백로그가 바뀌었으니 전체 리런
+                    _clear_picks()
                     st.session_state["confirm_final_submit"] = False
-                    st.success("연구가 시작되었습니다. 예산이 차감되었습니다.")
+                    st.toast("연구가 시작되었습니다. 예산이 차감되었습니다.")
                     st.rerun()
-                    
+
         with cc2:
             if st.button("취소",use_container_width=True):
                 st.session_state["confirm_final_submit"] = False
                 st.info("최종 제출이 취소되었습니다.")
-                
 
-    st.markdown("---")
+
+@st.fragment
+def _selection():
+    trow = _team_row()
+    prop = st.session_state.get("rd_proposal")
+    cards = _card_models(shared.put(prop), float(trow["dev_efficiency"]), round_no) if prop else ()
+
+    SL, SR = st.columns([0.62, 0.38])
+    with SL:
+        if cards:
+            st.markdown("#### 🔎 선택지")
+            st.caption("체크한 항목은 우측 패널의 ‘최종 제출’에서 한 번에 확정됩니다.")
+        # 선택지 카드 — 체크 상태(위젯 key)가 곧 선택 목록
+        picks = []
+        for i, c in enumerate(cards, 1):
+            d, gains = c["dec"], c["gains"]
+            area = d.get("area", "")
+            title = d.get("title", "제목 없음")
+            cost  = float(d.get("cost_musd", 0))
+
+            with st.container(border=True):
+                c1, c2 = st.columns([0.70, 0.30])
+                with c1:
+                    st.markdown(
+                        f"**{i}. [{_area_kr(area)}] {title}**  &nbsp; {_risk_pill(d.get('risk'))}",
+                        unsafe_allow_html=True
+                    )
+                    st.markdown(
+                        f"- 예상 완료: R{c['eta_abs']} (ETA {c['eta']}R) · 비용: ${cost:.1f}M"
+                    )
+                    gain_txt = []
+                    if gains["aero"]>0: gain_txt.append(f"aero +{gains['aero']:.1f}")
+                    if gains["reliability"]>0: gain_txt.append(f"reliability +{gains['reliability']:.1f}")
+                    if gains["engine"]>0: gain_txt.append(f"engine +{gains['engine']:.1f}")
+                    if gain_txt:
+                        st.markdown("예상 상승: " + " · ".join(gain_txt))
+                    st.progress(int(c["score"]*100), text=f"추천도 {int(c['score']*100)} / 100")
+                    st.caption(d.get("reason", "사유 설명 없음"))
+                with c2:
+                    if st.checkbox("선택", key=f"rd_pick_{c['key']}"):
+                        picks.append({**d, "_eta_abs": c["eta_abs"], "_score": c["score"]})
+        st.session_state["rd_picks_ui"] = picks
+    with SR:
+        _submit_panel()
+
+
+@st.fragment
+def _backlog_panel():
+    st.subheader("백로그 · 진행")
+    backlog = _backlog()
 
     # ===== 백로그 표시 & 진행/적용(정렬/크기 일치) =====
     mine = backlog[backlog["team_id"]==team_id].copy()
@@ -356,9 +393,9 @@ with R:
                         r["status"] = "ready_to_apply"
                     return r
                 updated = backlog.apply(dec, axis=1)
-                updated.to_csv(RD_PATH, index=False, encoding="utf-8")
-                st.success("연구 시작")
-                st.rerun()
+                write_csv(updated, RD_PATH)
+                st.toast("연구 시작")
+                st.rerun(scope="fragment")
             st.markdown('</div>', unsafe_allow_html=True)
         with b2:
             st.markdown('<div id="applybtn">', unsafe_allow_html=True)
@@ -369,17 +406,17 @@ with R:
                 if not ready:
                     st.info("적용할 완료 프로젝트가 없습니다.")
                 else:
-                    teams_df = teams.set_index("team_id")
+                    teams_df = read_csv(PATHS["teams"]).set_index("team_id")
                     state = teams_df.loc[team_id].to_dict()
                     for k, v in defaults.items(): state.setdefault(k, v)
                     for prj in ready:
                         state = apply_research_effect(state, prj)  # 비용은 최종 제출 시 차감됨
                     for k, v in state.items():
                         teams_df.loc[team_id, k] = v
-                    teams_df.reset_index().to_csv(DATA/"teams.csv", index=False, encoding="utf-8")
+                    write_csv(teams_df.reset_index(), DATA/"teams.csv")
                     backlog.loc[mask, "status"] = "completed"
-                    backlog.to_csv(RD_PATH, index=False, encoding="utf-8")
-                    st.success(f"{len(ready)}개 프로젝트 적용 완료")
+                    write_csv(backlog, RD_PATH)
+                    st.toast(f"{len(ready)}개 프로젝트 적용 완료")
                     st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
     else:
@@ -392,13 +429,24 @@ with R:
     if st.button("삭제", use_container_width=True):
         if rm_id:
             new_backlog = backlog[backlog["project_id"] != rm_id]
-            new_backlog.to_csv(RD_PATH, index=False, encoding="utf-8")
-            st.success("삭제되었습니다. (예산은 환불되지 않습니다)")
-            st.rerun()
+            write_csv(new_backlog, RD_PATH)
+            st.toast("삭제되었습니다. (예산은 환불되지 않습니다)")
+            st.rerun(scope="fragment")
         else:
             st.warning("삭제할 project_id를 입력해 주세요.")
     st.markdown('</div>', unsafe_allow_html=True)
 
+
+# ---- 배치 ----
+L, R = st.columns([0.62, 0.38])
+with L:
+    _proposal_request()
+with R:
+    _backlog_panel()
+
+st.markdown("---")
+_selection()
+
 st.markdown(f"""
 <style>
 /* 버튼 텍스트를 기본 '검은색'으로 리셋 (disabled 포함) */
@@ -441,3 +489,5 @@ div[data-testid="stButton"] > button:disabled * {{
 }}
 </style>
 """, unsafe_allow_html=True)
+
+perf.page_end()
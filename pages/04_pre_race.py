@@ -1,7 +1,7 @@
 # pages/04_pre_race.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import sys, json, time, random, base64, hashlib
+import sys, json, time, random, hashlib
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -58,11 +58,14 @@ div[data-testid="stButton"] > button[kind="primary"] * { color: #fff !important;
 
 # ---- 세이브/데이터 경로 ----
 from f1sim.io.save import ensure_save_slot, get_paths
+from f1sim.io.data import read_csv, write_csv
 from f1sim.ui.sidebar import attach_reset_sidebar
+from f1sim.ui.asset_index import find_asset, find_driver_img, thumb_path
+from f1sim import perf
+
+perf.page_begin("04_pre_race")     # 맨 끝 perf.page_end() 까지가 이 페이지 렌더
 
 DATA       = ROOT / "data"
-DRIVER_DIR = ROOT / "driver_image"   # 있으면 사용
-CAR_DIR    = ROOT / "car_image"      # 있으면 사용
 
 team_id = st.session_state.get("team_id")
 if not team_id:
@@ -74,9 +77,9 @@ PATHS = get_paths(st.session_state, DATA)
 attach_reset_sidebar()
 
 # ---- 데이터 로드 ----
-teams   = pd.read_csv(PATHS["teams"])
-drivers = pd.read_csv(PATHS["drivers"])
-tracks  = pd.read_csv(PATHS["tracks"]).sort_values("round")
+teams   = read_csv(PATHS["teams"])
+drivers = read_csv(PATHS["drivers"])
+tracks  = read_csv(PATHS["tracks"]).sort_values("round")
 
 team_id = str(st.session_state.get("team_id"))
 round_no = int(st.session_state.get("round", int(tracks["round"].min())))
@@ -94,43 +97,13 @@ if team_id not in set(teams["team_id"]):
 # ─────────────────────────────────────────────────────────────────────────────
 # 유틸: 이미지 찾기/표시
 # ─────────────────────────────────────────────────────────────────────────────
-@st.cache_data(show_spinner=False)
-def _b64(path: str) -> str:
-    p = Path(path)
-    if not p.exists(): return ""
-    return "data:image/png;base64," + base64.b64encode(p.read_bytes()).decode("ascii")
-
-def _slug(s: str) -> str:
-    import re
-    s = str(s).lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
-    return s
-
-def _best_match_png(dirpath: Path, names: list[str]) -> Path | None:
-    if not dirpath.exists(): return None
-    cands = list(dirpath.glob("*.png"))
-    if not cands: return None
-    for nm in names:
-        p = dirpath / f"{nm}.png"
-        if p.exists(): return p
-    for nm in names:
-        t = nm.lower()
-        for p in cands:
-            if t in p.stem.lower(): return p
-    return None
-
+# 에셋 인덱스에서 찾고, 표시 크기 썸네일(WebP) 경로를 돌려준다
 def _find_driver_img(name: str) -> Path | None:
-    if not isinstance(name, str): return None
-    if not DRIVER_DIR.exists(): return None
-    s = _slug(name)
-    parts = name.split()
-    last = _slug(parts[-1]) if parts else s
-    return _best_match_png(DRIVER_DIR, [name, s, last])
+    return thumb_path(find_driver_img(name), "card")
 
 def _find_car_img(team_name: str) -> Path | None:
     if not isinstance(team_name, str): return None
-    if not CAR_DIR.exists(): return None
-    return _best_match_png(CAR_DIR, [team_name, _slug(team_name)])
+    return thumb_path(find_asset("car", team_name), "car")
 
 def _stable_key(*parts) -> str:
     return hashlib.md5(("::".join(map(str, parts))).encode("utf-8")).hexdigest()[:10]
@@ -339,7 +312,7 @@ if st.button("이번 프리 레이스 실행", type="primary", use_container_wid
         rows.append(row)
 
     st.session_state["pre_history"].extend(rows)
-    pd.DataFrame(st.session_state["pre_history"]).to_csv(RESULTS_PATH, index=False, encoding="utf-8")
+    write_csv(pd.DataFrame(st.session_state["pre_history"]), RESULTS_PATH)
 
     st.session_state["pre_attempt"] = att + 1
     st.success(f"{att}회차 프리 레이스 결과를 기록했습니다. 힌트를 참고해 다음 시도에서 더 가깝게 맞춰보세요!")
@@ -349,7 +322,7 @@ if st.button("이번 프리 레이스 실행", type="primary", use_container_wid
 # 선수별 누적 결과(카드형)
 # ─────────────────────────────────────────────────────────────────────────────
 if Path(RESULTS_PATH).exists():
-    prev = pd.read_csv(RESULTS_PATH)
+    prev = read_csv(RESULTS_PATH)
     if not prev.empty:
         st.markdown("#### 누적 결과 (선수별)")
         ccols = st.columns(2)
@@ -384,7 +357,7 @@ if done:
         st.error("결과 파일이 없습니다. 프리 레이스를 먼저 실행하세요.")
         st.stop()
 
-    df = pd.read_csv(RESULTS_PATH)
+    df = read_csv(RESULTS_PATH)
     if df.empty:
         st.error("결과 데이터가 비어 있습니다.")
         st.stop()
@@ -397,7 +370,7 @@ if done:
     best["round"] = round_no
     best["team_id"] = team_id
     best = best[["round","team_id","driver_id","driver_name","score_total","bonus_decimal"]]
-    best.to_csv(BONUS_PATH, index=False, encoding="utf-8")
+    write_csv(best, BONUS_PATH)
 
     st.session_state["pre_final_bonus"] = {r["driver_id"]: float(r["bonus_decimal"]) for _, r in best.iterrows()}
 
@@ -415,3 +388,5 @@ if done:
     st.divider()
     if st.button("⏱️ 퀄리파잉으로 진행", type="primary", use_container_width=True):
         st.switch_page("pages/05_q1.py")
+
+perf.page_end()
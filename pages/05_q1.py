@@ -1,13 +1,28 @@
 # pages/05_q1.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import re, json, base64, random
+import re, json, random, sys
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
 import streamlit as st
 import pandas as pd
 
+_PKG_ROOT = Path(__file__).resolve().parents[1]
+if str(_PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PKG_ROOT))
+from f1sim.io.data import read_csv
+from f1sim.ui.asset_index import find_driver_img, find_tire_img, find_track_svg, thumb_url
+from f1sim.ui.track_lut import load_track_lut, geometry_ref
+from f1sim.ui.page_js import bundle_tag, worker_ref
+from f1sim.ui.session_channel import session_channel, take_messages
+from f1sim.ui.frame_stats import log_frame_stats
+from f1sim.ui.jobs_panel import await_job
+from f1sim.ui.perf_panel import perf_sidebar
+from f1sim import perf
+from f1sim.engine.quali_session import simulate_quali
+from f1sim.engine.weather import track_weather
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 공통: 경로/입력 파일
 # ─────────────────────────────────────────────────────────────────────────────
@@ -25,9 +40,6 @@ DATA_DIR    = ROOT / "data"
 SAVE_ROOT   = DATA_DIR / "saves"
 CIRCUIT_DIR = ROOT / "circuit"
 
-DRIVER_IMG_DIRS = [ROOT/"driver_image", ROOT/"images/drivers"]
-TIRE_IMG_DIRS   = [ROOT/"tire", ROOT/"tires", ROOT/"images/tires"]
-
 DRIVERS_CSV_INFO = INFO_DIR / "drivers.csv"
 DRIVERS_CSV_DATA = DATA_DIR / "drivers.csv"
 TEAMS_CSV_INFO   = INFO_DIR / "teams.csv"
@@ -66,40 +78,19 @@ def _abbr_from_name(name: str) -> str:
         if len(base) >= 3: break
     return (base + "XXX")[:3]
 
-def _find_img_bytes(name: str):
-    if not name: return None
-    for d in DRIVER_IMG_DIRS:
-        png = d/f"{name}.png"; jpg = d/f"{name}.jpg"
-        if png.exists(): return png.read_bytes()
-        if jpg.exists(): return jpg.read_bytes()
-    return None
-
 def _img_uri(name: str):
-    b = _find_img_bytes(name)
-    if not b: return ""
-    b64 = base64.b64encode(b).decode("ascii")
-    return f"data:image/png;base64,{b64}"
+    # 에셋 인덱스 + 썸네일(정적 서빙 URL, 비활성 시 data URI 폴백)
+    return thumb_url(find_driver_img(name), "avatar")
 
 def _tire_uri(compound: str):
-    key = (compound or "").strip().lower()
-    fname = {"soft":"soft","s":"soft",
-             "medium":"medium","m":"medium",
-             "hard":"hard","h":"hard",
-             "intermediate":"intermediate","i":"intermediate","inters":"intermediate",
-             "wet":"wet","w":"wet"}.get(key, key or "soft")
-    for d in TIRE_IMG_DIRS:
-        png = d/f"{fname}.png"
-        if png.exists():
-            b64 = base64.b64encode(png.read_bytes()).decode("ascii")
-            return f"data:image/png;base64,{b64}"
-    return ""
+    return thumb_url(find_tire_img(compound), "tire")
 
 # 팀/트랙/로스터/보정
 def load_team_catalog():
     by_id, by_name, color_by_id, color_by_name = {}, {}, {}, {}
     for p in [TEAMS_CSV_DATA, TEAMS_CSV_INFO]:
         if not p.exists(): continue
-        df = pd.read_csv(p)
+        df = read_csv(p)
         col_id  = _norm_col(df, ["team_id","id"])
         col_nm  = _norm_col(df, ["name","team","constructor","team_name"], "name")
         col_col = _norm_col(df, ["team_color","color","hex","primary_color"], "team_color")
@@ -116,16 +107,18 @@ def load_team_catalog():
 
 def load_tracks(csv: Path):
     if not csv.exists(): return []
-    df = pd.read_csv(csv)
+    df = read_csv(csv)
     cols = {c.lower(): c for c in df.columns}
     name = cols.get("name") or cols.get("track") or cols.get("circuit") or list(df.columns)[0]
     rd   = cols.get("round") or cols.get("order")
     lap  = cols.get("typical_lap_sec") or cols.get("lap_sec") or cols.get("lap_time_sec") or cols.get("avg_lap_sec")
+    wx_cols = [cols[c] for c in ("rain_base_prob", "temp_mean_c", "temp_std_c") if c in cols]
     out=[]
     for _,r in df.iterrows():
         out.append({"name": str(r[name]).strip(),
                     "round": int(r[rd]) if rd and pd.notna(r[rd]) else None,
-                    "lap_sec": float(r[lap]) if lap and pd.notna(r[lap]) else None})
+                    "lap_sec": float(r[lap]) if lap and pd.notna(r[lap]) else None,
+                    "weather_env": {c.lower(): float(r[c]) for c in wx_cols if pd.notna(r[c])}})
     out.sort(key=lambda x: (999 if x["round"] is None else x["round"], x["name"]))
     return out
 
@@ -137,7 +130,7 @@ def load_roster(by_id, color_by_id, color_by_name):
         src = DRIVERS_CSV_DATA
     if not src or not src.exists(): return roster
 
-    df = pd.read_csv(src)
+    df = read_csv(src)
     num  = _norm_col(df, ["num","number","no","car_number"], "num")
     name = _norm_col(df, ["name","driver","driver_name"], "name")
     team = _norm_col(df, ["team","constructor","team_name"], None)
@@ -176,7 +169,7 @@ def load_roster(by_id, color_by_id, color_by_name):
 
 def load_calibration(csv: Path):
     if not csv.exists(): return []
-    df = pd.read_csv(csv)
+    df = read_csv(csv)
     cols = {c.lower(): c for c in df.columns}
     out=[]
     for _,r in df.iterrows():
@@ -195,14 +188,7 @@ def match_calib(calibs, circuit_name:str):
     return {}
 
 def find_svg_for_track(track_name: str) -> Path | None:
-    if not track_name or not CIRCUIT_DIR.exists(): return None
-    cands = list(CIRCUIT_DIR.glob("*.svg"))
-    key = re.sub(r"[^a-z0-9]","", track_name.lower())
-    for p in cands:
-        if re.sub(r"[^a-z0-9]","", p.stem.lower()) == key: return p
-    for p in cands:
-        if key in re.sub(r"[^a-z0-9]","", p.stem.lower()): return p
-    return cands[0] if cands else None
+    return find_track_svg(track_name)
 
 # 날씨(로컬 폴백)
 def get_weather_for_circuit(circuit:str, session:str):
@@ -428,7 +414,6 @@ def process_q1_and_route(result: dict, player_team: str):
     go_q2 = any(t == player_team for _, t in top15)
 
     # 다음 페이지 이동
-    st.query_params.clear()
     if go_q2:
         try: st.switch_page("pages/05_q2.py")
         except Exception: st.info("Q2 페이지를 찾지 못했습니다. 좌측 사이드바에서 이동하세요.")
@@ -482,20 +467,19 @@ class DriverPlan:
 def run_page():
     st.set_page_config(layout="wide", page_title=f"{SESSION} — Qualifying")
 
-    # 쿼리 파라미터로 결과(b64 JSON)가 넘어왔는지 확인
-    qp = st.query_params
-    if "quali_result_b64" in qp:
+    # 세션 채널로 결과가 들어왔는지 확인(페이지 새로고침 없이 on_change 콜백이 받아 둔다)
+    for msg in take_messages(f"chan_{SESSION}", "quali_result"):
         try:
-            b64 = qp.get("quali_result_b64")[0] if isinstance(qp.get("quali_result_b64"), list) else qp.get("quali_result_b64")
-            js = json.loads(base64.b64decode(b64.encode("ascii")).decode("utf-8"))
-            persist_quali_result(SESSION, js)
+            if msg.get("error"):
+                raise ValueError(msg["error"])
+            log_frame_stats(SESSION, msg["body"].pop("telemetry", None))
+            persist_quali_result(SESSION, msg["body"])
             # 플레이어 팀 이름은 세션 상태 보존
             player_team = st.session_state.get("player_team_last","")
-            process_q1_and_route(js, player_team)
+            process_q1_and_route(msg["body"], player_team)
             return
         except Exception as e:
             st.warning(f"결과 저장/전환 실패: {e}")
-            st.query_params.clear()
 
     # 다크 스타일 / 간격 최소화
     st.markdown("""
@@ -525,14 +509,17 @@ def run_page():
     if not svg_path or not svg_path.exists():
         st.error(f"서킷 SVG가 없습니다: circuit/{circuit}.svg")
         st.stop()
-    RAW_SVG = svg_path.read_text(encoding="utf-8", errors="ignore")
+    TRACK_LUT = load_track_lut(svg_path)   # 없으면 JS가 시작 시 1회 샘플링
 
     calibs = load_calibration(CALIB_CSV)
     calib  = match_calib(calibs, circuit)
     lap_base   = float(calib.get("lap_sec_csv") or trk.get("lap_sec") or 90.0)
     pit_travel = float(calib.get("pit_travel_sec") or 16.0)
 
-    weather = get_weather_for_circuit(circuit, SESSION)
+    # LLM 날씨/AI 런 계획은 백그라운드 작업 — 같은 세이브·라운드·세션이면 끝난 결과를 재사용(리런마다 부르지 않음)
+    job_key = f"{st.session_state.get('save_dir', '')}|{round_no}|{SESSION}|{circuit}"
+    weather = await_job("날씨 정보", "quali_weather", get_weather_for_circuit, circuit, SESSION,
+                        key=f"weather:{job_key}")
     env = {
         "air_temp_c": float(weather.get("air_temp_c", 22.0)),
         "track_temp_c": float(weather.get("track_temp_c", 30.0)),
@@ -541,6 +528,8 @@ def run_page():
         "wetness": float(weather.get("wetness", 0.0)),
         "grip_base": float(weather.get("grip_base", 0.97)),
     }
+    # 비/노면은 (라운드, 세션) 날씨 타임라인 — 분별 젖음 wet_min 을 브라우저 코어·헤드리스 엔진이 같이 읽는다
+    env.update(track_weather(trk.get("weather_env"), round_no, SESSION).env())
 
     roster = load_roster(by_id, color_by_id, color_by_name)
     if not roster:
@@ -560,7 +549,9 @@ def run_page():
     my_drivers = sorted(my_drivers, key=lambda x: (x.get("num") or 999))[:2]
 
     duration_sec = int(DURATION_MIN * 60)
-    ai_plans = get_ai_plan(SESSION, circuit, duration_sec, roster, player_team, lap_base)
+    ai_plans = await_job("AI 런 계획", "quali_ai_plan", get_ai_plan,
+                         SESSION, circuit, duration_sec, roster, player_team, lap_base,
+                         key=f"ai_plan:{job_key}|{player_team}")
     map_ai = {(p["name"], p["team"]): p for p in ai_plans}
     tire_imgs = {k: _tire_uri(k) for k in ["soft","medium","hard","intermediate","wet"]}
 
@@ -577,6 +568,15 @@ def run_page():
                                         {"start_sec": rnd.uniform(300, 520), "laps":3, "timed_laps":[2]}]
         plans.append(DriverPlan(d["name"], d["team"], d["abbr"], d["color"] or "", _img_uri(d["name"]), vm, False, runs=rr))
 
+    # 스킵: 헤드리스 엔진으로 세션 끝까지 즉시 계산(플레이어 차량은 기본 러닝)
+    if st.sidebar.button("⏩ 세션 끝까지 계산", use_container_width=True):
+        js = simulate_quali(plans, session=SESSION, duration_sec=duration_sec, lap_base=lap_base,
+                            pit_travel=pit_travel, env=env, track_s=(TRACK_LUT or {}).get("s"),
+                            speed=(TRACK_LUT or {}).get("speed"), autopilot=True)
+        persist_quali_result(SESSION, js)
+        process_q1_and_route(js, player_team)
+        return
+
     # ── 좌/우 레이아웃
     L, R = st.columns([0.66, 0.34])
 
@@ -652,6 +652,7 @@ def run_page():
         </div>
       </div>
       <div class="muted" style="margin:4px 0 2px;">배속은 <b>시간과 물리</b>가 함께 가속됩니다.</div>
+      <div class="muted" style="display:flex; gap:6px; align-items:center;">렌더 <button class="btn" data-r="svg">SVG</button><button class="btn" data-r="canvas">Canvas</button> <span id="rdrInfo"></span></div>
     </div>
 
     <div id="selPanel">
@@ -712,9 +713,10 @@ def run_page():
   </div>
 </div>
 
+%%BUNDLE%%
 <script>
 (function(){
-  const RAW = %%RAW_SVG%%;
+  const GEO_REF = %%GEO_REF%%;            // {svg, lut} 정적 URL — 본문은 시작 시 loadGeometry 로
   const PLAN = %%PLAN_JSON%%;
   const LAP_BASE = %%LAP_BASE%%;
   const DURATION = %%DURATION%%;
@@ -722,6 +724,8 @@ def run_page():
   const ENV = %%ENV_JSON%%;
   const TIRE_IMGS = %%TIRE_IMGS%%;
   const SESSION_STR = %%SESSION_STR%%;
+  let RAW = "", TRACK_LUT = null;
+  const SIM_WORKER = %%SIM_WORKER%%;        // {url, factory} 정적 워커 번들 | {src}
 
   const TRANS_SIM = 0.25;
   const PIT_WAIT_SEC = 4.0;
@@ -750,6 +754,9 @@ def run_page():
   };
 
   let SPEED = 2, simT = -5.0, running = true;
+  const SIM_STEP = 1/60, UI_HZ = 8;          // 시뮬 고정 스텝(초) / 표·패널 갱신 빈도
+  const CLOCK = makeSimClock({step: SIM_STEP, uiHz: UI_HZ});
+  let HOST = null;                             // 시뮬 워커(sim_host.js) — 메인 스레드는 그리기만
   const stage = document.getElementById('stage'), gTrack=document.getElementById('track'), gAct=document.getElementById('actors');
   const rows  = document.getElementById('rows'), lapInfo=document.getElementById('lapInfo');
   const timeText=document.getElementById('timeText'), selRing=document.getElementById('selRing');
@@ -762,39 +769,34 @@ def run_page():
   const selProg=document.getElementById('selProg'), selLaps=document.getElementById('selLaps');
 
   document.querySelectorAll('.speed .btn').forEach(b=>{
-    b.addEventListener('click', ()=>{ const m=parseFloat(b.getAttribute('data-m')||'1'); if(Number.isFinite(m)) SPEED=m; });
+    b.addEventListener('click', ()=>{ const m=parseFloat(b.getAttribute('data-m')||'1'); if(Number.isFinite(m)){ SPEED=m; if(HOST) HOST.speed(m); } });
   });
 
   document.getElementById('btnExport').addEventListener('click', ()=>{
     const js = JSON.stringify(exportResult(), null, 2);
     navigator.clipboard.writeText(js).then(()=>{ alert('결과 JSON을 복사했습니다.'); });
   });
-  document.getElementById('btnNext').addEventListener('click', ()=>{
-    const js = JSON.stringify(exportResult());
-    try { localStorage.setItem('quali_'+SESSION_STR, js); } catch(e){}
-    const b64 = btoa(unescape(encodeURIComponent(js)));
-    const url = new URL(window.location.href);
-    url.searchParams.set('quali_result_b64', b64);
-    url.searchParams.set('goto', 'AUTO');
-    window.location.href = url.toString();
+  document.getElementById('btnNext').addEventListener('click', (ev)=>{
+    const btn = ev.currentTarget, res = exportResult();
+    try { localStorage.setItem('quali_'+SESSION_STR, JSON.stringify(res)); } catch(e){}
+    // Python 채널로 전송(새로고침 없음) — 저장/페이지 이동은 Streamlit 쪽에서
+    btn.disabled = true;
+    CHAN.send('quali_result', Object.assign({telemetry: frameStats()}, res)).then((ack)=>{ if (ack.error){ btn.disabled = false; alert('결과 전송 실패: '+ack.error); } });
   });
 
-  function parseSVG(raw){ return (!raw||!raw.trim())?null:new DOMParser().parseFromString(raw, "image/svg+xml"); }
-  function getViewBox(doc){ const root=doc.querySelector('svg'); return (root && root.getAttribute('viewBox'))?root.getAttribute('viewBox'):"0 0 1200 800"; }
-  function grabPathD(doc,id){ const el=doc.querySelector(`path#${id}`); if(el) return el.getAttribute('d')||''; const any=doc.querySelector('path'); return any?(any.getAttribute('d')||''):''; }
   function text(x,y,str,size=10,fill='#e5e7eb'){const t=document.createElementNS(stage.namespaceURI,'text');t.setAttribute('x',x);t.setAttribute('y',y);t.setAttribute('font-size',String(size));t.setAttribute('fill',fill);t.textContent=str;return t;}
-  function nearestS(path,p){ if(!path||!p) return 0; const L=path.getTotalLength(),N=1000; let bestS=0,bestD=1e9; for(let i=0;i<=N;i++){const s=i/N; const q=path.getPointAtLength(s*L); const dx=q.x-p.x,dy=q.y-p.y; const d=dx*dx+dy*dy; if(d<bestD){bestD=d;bestS=s;} } return bestS; }
-  function ptOn(path,s){ const L=Math.max(1,path.getTotalLength()); const c=Math.max(0,Math.min(1,s)); const q=path.getPointAtLength(c*L); return {x:q.x,y:q.y}; }
+  function nearestS(g,p){ return lutNearestS(g,p); }
+  function ptOn(g,s){ return lutAt(g,s); }
   function reachedForward(a,b,target){ return (b>=a) ? (target>=a && target<=b) : (target>=a || target<=b); }
   function fmtTime(t){ if (t<0) return `-${Math.abs(t).toFixed(1)}s`; const mm=Math.floor(t/60); const ss=(t%60).toFixed(1).padStart(4,'0'); return `${mm}:${ss}`; }
-  function placeAt(el, lab, x, y){ el.setAttribute('transform', `translate(${x},${y})`); lab.setAttribute('x', x+8); lab.setAttribute('y', y-8); }
 
+  const GEO = {main:null, pit:null, speed:null};   // 트랙 LUT {n,len,a} / 속도 배율
   let sFinish=0, sMainOut=0, sPitStop=0, sPitOut=0, sPitInMain=0.90, sPitInPit=0.02;
   function build(){
-    const doc=parseSVG(RAW); if(!doc) return;
-    stage.setAttribute('viewBox', getViewBox(doc));
-    const dMainRaw=grabPathD(doc,'main');
-    const dPitRaw =grabPathD(doc,'pit');
+    const shp=trackShape(RAW, TRACK_LUT); if(!shp) return;
+    stage.setAttribute('viewBox', shp.view);
+    const dMainRaw=shp.main;
+    const dPitRaw =shp.pit;
     gTrack.innerHTML='';
     const pMain=document.createElementNS(stage.namespaceURI,'path');
     const pPit =document.createElementNS(stage.namespaceURI,'path');
@@ -809,33 +811,26 @@ def run_page():
     pMain.setAttribute('stroke-linecap','round'); pMain.setAttribute('stroke-linejoin','round');
     pPit .setAttribute('stroke-linecap','round'); pPit .setAttribute('stroke-linejoin','round');
     gTrack.appendChild(pMain); gTrack.appendChild(pPit);
-
-    const fin = doc.querySelector('polyline#finish, line#finish');
-    if(fin){
-      let x1,y1,x2,y2;
-      if (fin.tagName.toLowerCase()==='polyline'){
-        const pts=(fin.getAttribute('points')||'').trim().split(/\s+/).map(s=>s.split(',').map(parseFloat));
-        if (pts.length>=2){ x1=pts[0][0]; y1=pts[0][1]; x2=pts[1][0]; y2=pts[1][1]; }
-      } else { x1=+fin.getAttribute('x1'); y1=+fin.getAttribute('y1'); x2=+fin.getAttribute('x2'); y2=+fin.getAttribute('y2'); }
+    // 주행 기하는 LUT(사전 계산 or 시작 시 1회 샘플링)로만 계산
+    GEO.main = lutFromB64(TRACK_LUT && TRACK_LUT.main) || lutFromPath(pMain);
+    GEO.pit  = lutFromB64(TRACK_LUT && TRACK_LUT.pit)  || lutFromPath(pPit);
+    GEO.speed = speedFromB64(TRACK_LUT && TRACK_LUT.speed);   // 없으면 등속
+    const LS = (TRACK_LUT && TRACK_LUT.s) || {};
+
+    if(shp.finish){
+      const [x1,y1,x2,y2]=shp.finish;
       const ln=document.createElementNS(stage.namespaceURI,'line');
       ln.setAttribute('x1',x1); ln.setAttribute('y1',y1); ln.setAttribute('x2',x2); ln.setAttribute('y2',y2);
       ln.setAttribute('stroke','#ef4444'); ln.setAttribute('stroke-width','3'); gTrack.appendChild(ln);
-      const mid={x:(x1+x2)/2,y:(y1+y2)/2}; sFinish = nearestS(pMain, mid);
+      const mid={x:(x1+x2)/2,y:(y1+y2)/2}; sFinish = lutPick(LS.finish, nearestS(GEO.main, mid));
     } else { sFinish=0.01; }
 
-    function ptFromMeta(id){ const el=doc.querySelector(`#${id}`); if(!el) return null; const a=(el.getAttribute('data-pt')||'').split(',').map(parseFloat); if(a.length===2 && a.every(Number.isFinite)) return {x:a[0],y:a[1]}; return null; }
-    const md = doc.querySelector('metadata'); let meta={}; try{ meta = md ? JSON.parse(md.textContent||"{}") : {}; }catch(e){ meta={}; }
-
-    const mk = {
-      pitIn : ptFromMeta('pitIn')  || (meta.pitIn  && meta.pitIn.pts  && meta.pitIn.pts[0])  || null,
-      pitOut: ptFromMeta('pitOut') || (meta.pitOut && meta.pitOut.pts && meta.pitOut.pts[0]) || null,
-      pitStop:ptFromMeta('pitStop')|| (meta.pitStop&& meta.pitStop.pts&& meta.pitStop.pts[0])|| null
-    };
-    sPitOut    = mk.pitOut  ? nearestS(pPit, mk.pitOut)  : 0.85;
-    sMainOut   = mk.pitOut  ? nearestS(pMain, mk.pitOut) : 0.02;
-    sPitStop   = mk.pitStop ? nearestS(pPit, mk.pitStop) : 0.05;
-    sPitInMain = mk.pitIn   ? nearestS(pMain, mk.pitIn)  : 0.90;
-    sPitInPit  = mk.pitIn   ? nearestS(pPit,  mk.pitIn)  : 0.02;
+    const mk = shp.mk;
+    sPitOut    = lutPick(LS.pitOut,    mk.pitOut  ? nearestS(GEO.pit,  mk.pitOut)  : 0.85);
+    sMainOut   = lutPick(LS.mainOut,   mk.pitOut  ? nearestS(GEO.main, mk.pitOut)  : 0.02);
+    sPitStop   = lutPick(LS.pitStop,   mk.pitStop ? nearestS(GEO.pit,  mk.pitStop) : 0.05);
+    sPitInMain = lutPick(LS.pitInMain, mk.pitIn   ? nearestS(GEO.main, mk.pitIn)   : 0.90);
+    sPitInPit  = lutPick(LS.pitInPit,  mk.pitIn   ? nearestS(GEO.pit,  mk.pitIn)   : 0.02);
 
     return { pMain, pPit };
   }
@@ -862,15 +857,7 @@ def run_page():
     };
   }
 
-  function syncSelRing(){
-    if (selectedIdx === null){ selRing.style.display='none'; return; }
-    const car = cars[selectedIdx];
-    if (!car){ selRing.style.display='none'; return; }
-    const tr = car.el.getAttribute('transform') || 'translate(0,0)';
-    selRing.setAttribute('transform', tr);
-    selRing.setAttribute('stroke', car.el.getAttribute('fill') || '#0b5cff');
-    selRing.style.display='block';
-  }
+  function syncSelRing(){ LAYER.draw(cars, selectedIdx); }
   function renderSelPanel(bestRef){
     if (selectedIdx===null){ selPanel.style.display='none'; return; }
     const c = cars[selectedIdx]; if (!c){ selPanel.style.display='none'; return; }
@@ -898,6 +885,10 @@ def run_page():
     const idx = parseInt(t.getAttribute('data-idx')||'-1',10);
     if (Number.isFinite(idx) && idx>=0) showSelection(idx);
   });
+  const LAYER = makeCarLayer({stage, gAct, selRing, r:6, strokeW:2, onPick: showSelection});
+  // 프레임 시간 계측(frame/render/ui) — 결과와 함께 Python 으로 보내 perf 기록/세이브 슬롯에 남긴다
+  const FSTAT = makeFrameStats({meta: {page: SESSION_STR}});
+  const frameStats = ()=>FSTAT.summary({engine: HOST ? HOST.mode : 'none', backend: LAYER.backend, worker: HOST ? HOST.prof : null});
 
   function findCar(name, team){
     const norm = s => (s||'').toString().trim().toLowerCase();
@@ -910,25 +901,20 @@ def run_page():
   }
   function canChangeTireNow(car){ return !!car && car.mode === 'pitStopWait'; }
 
+  function pushCarSettings(car){
+    if (HOST) HOST.send('set', cars.indexOf(car), {pace:car.pace, fuelMix:car.fuelMix, nextCompound:car.nextCompound});
+  }
+
   window.releaseNow = function(name, team, laps=3, timed=[2]){
     const car = findCar(name, team);
     if (!car){ pendingReleases.push({name,team,laps,timed}); return; }
-    if (car.mode!=='pit') return;
-    car.runIdx = (car.runIdx<0 ? 0 : car.runIdx+1);
-    car.lapsLeft = Math.max(1, parseInt(laps||3));
-    car.timed = new Set(Array.isArray(timed)? timed.map(x=>parseInt(x,10)): [2]);
-    car.inLap = false; car.wantBox = false;
-    car.lastCross=null; car.lap=0;
-    car.mode='pitGo'; car.pitTargetS = sPitOut;
-    const lapsFuel = 1 + car.lapsLeft + 1;   // out + hot + in
-    car.fuel = lapsFuel * FUEL_PER_LAP * 1.05;
-    car.compound = car.nextCompound || car.compound;
+    if (car.mode!=='pit' || !HOST) return;
+    HOST.send('release', cars.indexOf(car), laps, timed);
   }
   window.boxNow = function(name, team){
     const car = findCar(name, team);
     if (!car){ pendingBoxes.push({name,team}); return; }
-    if (car.mode==='main'){ car.inLap = true; car.lapsLeft = 0; car.wantBox = false; }
-    else { car.wantBox = true; car.lapsLeft = 0; }
+    if (HOST) HOST.send('box', cars.indexOf(car));
   }
 
   const playerCtrlRefs = {};
@@ -959,7 +945,7 @@ def run_page():
       line2.appendChild(bSelect); line2.appendChild(bGo); line2.appendChild(bBox);
       rbox.appendChild(h); rbox.appendChild(s); rbox.appendChild(line1); rbox.appendChild(line2);
       card.appendChild(img); card.appendChild(rbox); mount.appendChild(card);
-      const apply=()=>{ const car=findCar(p.name,p.team); if(!car) return; car.pace=paceSel.value; car.fuelMix=fuelSel.value; if(car.mode==='pitStopWait') car.nextCompound=selTy.value; tyIcon.src=TIRE_IMGS[selTy.value]||tyIcon.src; };
+      const apply=()=>{ const car=findCar(p.name,p.team); if(!car) return; car.pace=paceSel.value; car.fuelMix=fuelSel.value; if(car.mode==='pitStopWait') car.nextCompound=selTy.value; pushCarSettings(car); tyIcon.src=TIRE_IMGS[selTy.value]||tyIcon.src; };
       selTy.addEventListener('change', apply); paceSel.addEventListener('change', apply); fuelSel.addEventListener('change', apply);
       bSelect.addEventListener('click',()=>{ const car=findCar(p.name,p.team); if(!car) return; const idx=cars.indexOf(car); if(idx>=0) showSelection(idx); });
       bGo.addEventListener('click',()=>{ window.releaseNow(p.name,p.team,3,[2]); });
@@ -1001,7 +987,7 @@ def run_page():
   }
 
   function exportResult(){
-    const order=lastOrder.slice();
+    const order=rankCars();
     return {
       session: SESSION_STR,
       duration_sec: DURATION,
@@ -1016,139 +1002,45 @@ def run_page():
     };
   }
 
-  let anim=null, tPrev=0;
+  let anim=null;
   function start(){
     const built=build(); if(!built) return;
-    const pMain=gTrack.querySelector('path:nth-of-type(1)');
-    const pPit =gTrack.querySelector('path:nth-of-type(2)');
+    LAYER.layout();
+    const pMain=GEO.main, pPit=GEO.pit;
     gAct.innerHTML=''; cars.length=0;
     for(let i=0;i<PLAN.length;i++){
       const car=mkCar(PLAN[i], i);
       car.sPit = sPitStop;
-      const q=ptOn(pPit, car.sPit); placeAt(car.el, car.lab, q.x, q.y);
+      const q=ptOn(pPit, car.sPit); LAYER.place(car, q.x, q.y);
       cars.push(car); prevRank.set(`${car.name}|${car.team}`, i);
     }
     playerCards(); buildTeamTelemetry();
-    // AI 예약 출발
-    PLAN.forEach((p,idx)=>{
-      if (!p.isPlayer){
-        const car=cars[idx]; car._reserv=(Array.isArray(p.runs)? p.runs.map(r=>({t:r.start_sec,laps:r.laps,timed:new Set(r.timed_laps||[2])})):[]);
-      }
-    });
-    setInterval(()=>{
-      if (simT<0 || simT>DURATION) return;
-      PLAN.forEach((p,idx)=>{
-        if (p.isPlayer) return;
-        const car=cars[idx];
-        if (!car || car.mode!=='pit' || !car._reserv || car._reserv.length===0) return;
-        const hit=car._reserv.find(z=>z && simT>=z.t && !z._used);
-        if (hit){ hit._used=true; car.timed=hit.timed; window.releaseNow(p.name,p.team,hit.laps,Array.from(hit.timed)); }
-      });
-    }, 120);
-
-    simT=-5.0; tPrev=0; if(anim) cancelAnimationFrame(anim); anim=requestAnimationFrame(loop);
+    HOST = makeSimHost({worker: SIM_WORKER, cars, speed: SPEED, clock: {step: SIM_STEP}, onFrame: onSimFrame, cfg: {
+      plan: PLAN, geo: {main: GEO.main, pit: GEO.pit, speed: GEO.speed},
+      s: {finish: sFinish, mainOut: sMainOut, pitStop: sPitStop, pitOut: sPitOut, pitInMain: sPitInMain, pitInPit: sPitInPit},
+      LAP_BASE, DURATION, PIT_TRAVEL, ENV, TRANS_SIM, PIT_WAIT_SEC, FUEL_PER_LAP, FUEL_FLOW_MAX, TRACK_GRIP_FACTOR,
+      PACE, FUELMIX, TIRE, gripInSpeed: false,
+    }});
+    simT=-5.0; CLOCK.reset(); if(anim) cancelAnimationFrame(anim); anim=requestAnimationFrame(loop);
   }
 
-  function loop(now){
-    if(!tPrev) tPrev=now;
-    const dt=(now-tPrev)/1000; tPrev=now;
-    const dtSim=dt*SPEED;
-
-    if (running){
-      simT += dtSim;
-      timeText.textContent = (simT<0) ? `Starts in ${fmtTime(-simT)}` : `${fmtTime(simT)} / ${fmtTime(DURATION)}`;
-      if (simT >= DURATION){
-        running=false; sessionDone.style.display='flex';
-        try{ localStorage.setItem('quali_'+SESSION_STR, JSON.stringify(exportResult())); }catch(e){}
-      }
+  // 워커 프레임 수신: cars(미러)는 sim_host가 채우고, 여기선 세션 상태만
+  function onSimFrame(m){
+    simT=m.simT; running=m.running;
+    if (m.done && sessionDone.style.display!=='flex'){
+      sessionDone.style.display='flex';
+      try{ localStorage.setItem('quali_'+SESSION_STR, JSON.stringify(exportResult())); }catch(e){}
     }
+  }
 
-    const pMain=gTrack.querySelector('path:nth-of-type(1)');
-    const pPit =gTrack.querySelector('path:nth-of-type(2)');
-    if(!pMain || !pPit){ requestAnimationFrame(loop); return; }
-
-    const baseMain=1/Math.max(0.1, LAP_BASE);
-    const vMainBase=baseMain*TRACK_GRIP_FACTOR;
-    const vPit=1/Math.max(0.5, PIT_TRAVEL);
-
-    for(const car of cars){
-      if (simT < 0){ const q=ptOn(pPit, car.sPit); placeAt(car.el, car.lab, q.x, q.y); continue; }
-
-      if (car.mode==='pit'){
-        const q=ptOn(pPit, car.sPit); placeAt(car.el, car.lab, q.x, q.y);
-
-      } else if (car.mode==='pitGo'){
-        const before=car.sPit; car.sPit=(car.sPit + vPit*dtSim)%1;
-        const q=ptOn(pPit, car.sPit); placeAt(car.el, car.lab, q.x, q.y);
-        const targetS=car.pitTargetS ?? sPitOut;
-        if (reachedForward(before, car.sPit, targetS)){
-          if (Math.abs(targetS - sPitOut) < 1e-3){
-            const a=ptOn(pPit, sPitOut), b=ptOn(pMain, sMainOut);
-            car.mode='toMain'; car.fx={t0Sim: simT, durSim: TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
-          } else {
-            car.mode='pitStopWait';
-            car.compound = car.nextCompound || car.compound;
-            car.waitUntil = simT + PIT_WAIT_SEC;
-          }
-        }
-
-      } else if (car.mode==='pitStopWait'){
-        const q=ptOn(pPit, car.sPit); placeAt(car.el, car.lab, q.x, q.y);
-        if (simT >= (car.waitUntil||0)){ car.mode='pit'; car.tireLife = 1.0; }
-
-      } else if (car.mode==='toMain'){
-        const w=Math.max(0,Math.min(1,(simT - car.fx.t0Sim)/car.fx.durSim));
-        const x=car.fx.ax*(1-w)+car.fx.bx*w, y=car.fx.ay*(1-w)+car.fx.by*w; placeAt(car.el, car.lab, x, y);
-        if(w>=1){ car.mode='main'; car.s=sMainOut; car.lap=0; car.lastCross=null; car.inLap=car.wantBox?true:false; car.wantBox=false; }
-
-      } else if (car.mode==='toPit'){
-        const w=Math.max(0,Math.min(1,(simT - car.fx.t0Sim)/car.fx.durSim));
-        const x=car.fx.ax*(1-w)+car.fx.bx*w, y=car.fx.ay*(1-w)+car.fx.by*w; placeAt(car.el, car.lab, x, y);
-        if(w>=1){ car.mode='pitGo'; car.sPit=sPitInPit; car.pitTargetS = sPitStop; }
-
-      } else if (car.mode==='main'){
-        const tDat=TIRE[car.compound] || TIRE.soft;
-        const tireGrip=(ENV.wetness>0.3? tDat.gripWet : tDat.gripDry);
-        const paceFx=PACE[car.pace] || PACE.Standard;
-        const mixFx=FUELMIX[car.fuelMix] || FUELMIX.Balanced;
-        const tireDegFx=(1 - 0.06*(1 - car.tireLife));
-        const fuelMassFx=(1 - 0.006*car.fuel);
-        const vmul=Math.max(0.90, Math.min(1.25, car.base_vmul * paceFx.speed * mixFx.speed * tireGrip * tireDegFx * fuelMassFx));
-        const before=car.s; car.s=(car.s + (1/Math.max(0.1,LAP_BASE))*vmul*dtSim)%1;
-
-        const desiredRate=(FUEL_PER_LAP / LAP_BASE) * (FUELMIX[car.fuelMix]?.burn || 1.0);
-        const actualRate = Math.min(FUEL_FLOW_MAX, desiredRate);
-        car.fuel = Math.max(0, car.fuel - actualRate * dtSim);
-
-        const ds=(car.s - before + 1)%1;
-        const wearLap=(ENV.wetness>0.3? tDat.wearWet : tDat.wearDry) * paceFx.wear;
-        car.tireLife = Math.max(0, car.tireLife - wearLap * ds);
-
-        const sLine=(sFinish||0.01);
-        if (reachedForward(before, car.s, sLine)){
-          car.lap += 1;
-          if (car.lastCross===null){ car.lastCross=simT; }
-          else {
-            const lapTime=simT - car.lastCross; car.lastCross=simT;
-            const isTimed = car.timed ? car.timed.has(car.lap) : true;
-            if (isTimed){
-              car.lapTimes.push(lapTime);
-              if (car.best===null || lapTime < car.best) car.best=lapTime;
-            }
-            if (car.lapsLeft>0){ car.lapsLeft -= 1; if (car.lapsLeft<=0){ car.inLap=true; } }
-            if (car.fuel <= 0.2) car.inLap=true;
-          }
-        }
-        if (car.inLap && reachedForward(before, car.s, sPitInMain)){
-          const a=ptOn(pMain, sPitInMain), b=ptOn(pPit, sPitInPit);
-          car.mode='toPit'; car.fx={t0Sim: simT, durSim: TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
-        }
-        car.dist = (car.runIdx>=0?car.runIdx:0)*10 + car.lap + car.s;
-        const q=ptOn(pMain, car.s); placeAt(car.el, car.lab, q.x, q.y);
-      }
-    }
+  // 차량 위치: 매 프레임. 실제 그리기는 LAYER(svg/canvas)가 맡는다.
+  function renderCars(){
+    const P=HOST.pos;
+    for(let i=0;i<cars.length;i++) LAYER.place(cars[i], P[2*i], P[2*i+1]);
+  }
 
-    // Leaderboard by best, stable sort with previous rank
+  // 리더보드: 개인 베스트 기준 + 이전 순위로 안정 정렬
+  function rankCars(){
     const sorted=cars.slice().sort((a,b)=>{
       const A=(a.best===null? Infinity : a.best);
       const B=(b.best===null? Infinity : b.best);
@@ -1159,7 +1051,13 @@ def run_page():
     });
     sorted.forEach((c,i)=>prevRank.set(`${c.name}|${c.team}`, i));
     lastOrder=sorted; sessionBest = sorted[0] ? (sorted[0].best===null? null : sorted[0].best) : null;
+    return sorted;
+  }
 
+  // 텍스트/표/패널: UI_HZ 로 스로틀
+  function renderUI(){
+    timeText.textContent = (simT<0) ? `Starts in ${fmtTime(-simT)}` : `${fmtTime(Math.min(simT, DURATION))} / ${fmtTime(DURATION)}`;
+    const sorted=rankCars();
     rows.innerHTML = sorted.map((c,i)=>{
       const best=(c.best===null) ? "—" : `${c.best.toFixed(3)}s`;
       const gap =(sessionBest===null || c.best===null) ? "—" : `+${(c.best-sessionBest).toFixed(3)}s`;
@@ -1169,11 +1067,21 @@ def run_page():
     }).join("");
     lapInfo.textContent = ` · t=${Math.max(0,simT).toFixed(1)}s`;
 
-    renderSelPanel(sessionBest); syncSelRing(); updateTeamTelemetry();
-    requestAnimationFrame(loop);
+    renderSelPanel(sessionBest); updateTeamTelemetry(); LAYER.report();
+  }
+
+  function loop(now){
+    if(!HOST || !HOST.frame){ anim=requestAnimationFrame(loop); return; }
+
+    FSTAT.frame(now);
+    const t0=performance.now();
+    LAYER.begin(now); renderCars(); syncSelRing(); LAYER.end();
+    FSTAT.add('render', performance.now()-t0);
+    if (CLOCK.uiDue(now)) FSTAT.time('ui', renderUI);
+    anim=requestAnimationFrame(loop);
   }
 
-  start();
+  loadGeometry(GEO_REF).then(g=>{ RAW=g.raw; TRACK_LUT=g.lut; start(); });
 })();
 </script>
         """
@@ -1183,17 +1091,20 @@ def run_page():
              "runs":p.runs}
             for p in plans
         ]
-        html = (html
-            .replace("%%RAW_SVG%%", json.dumps(RAW_SVG))
-            .replace("%%PLAN_JSON%%", json.dumps(plan_payload, ensure_ascii=False))
-            .replace("%%LAP_BASE%%", f"{float(lap_base):.6f}")
-            .replace("%%DURATION%%", f"{int(duration_sec)}")
-            .replace("%%SESSION_STR%%", json.dumps(SESSION))
-            .replace("%%PIT_TRAVEL%%", f"{pit_travel:.3f}")
-            .replace("%%ENV_JSON%%", json.dumps(env))
-            .replace("%%TIRE_IMGS%%", json.dumps(tire_imgs))
-        )
-        st.components.v1.html(html, height=1320, scrolling=False)
+        with perf.span("ui.html_template", "ui"):
+            html = (html
+                .replace("%%PLAN_JSON%%", json.dumps(plan_payload, ensure_ascii=False))
+                .replace("%%LAP_BASE%%", f"{float(lap_base):.6f}")
+                .replace("%%DURATION%%", f"{int(duration_sec)}")
+                .replace("%%SESSION_STR%%", json.dumps(SESSION))
+                .replace("%%PIT_TRAVEL%%", f"{pit_travel:.3f}")
+                .replace("%%ENV_JSON%%", json.dumps(env))
+                .replace("%%TIRE_IMGS%%", json.dumps(tire_imgs))
+                .replace("%%BUNDLE%%", bundle_tag())
+                .replace("%%GEO_REF%%", json.dumps(geometry_ref(svg_path)))
+                .replace("%%SIM_WORKER%%", worker_ref("quali_core", "makeQualiCore"))
+            )
+        session_channel(html, height=1320, key=f"chan_{SESSION}")
 
     # 우: 간단 날씨/노면(추천 타이어)
     with R:
@@ -1235,4 +1146,6 @@ def run_page():
         st.components.v1.html(weather_html, height=520, scrolling=False)
 
 if __name__ == "__main__":
-    run_page()
+    perf_sidebar()
+    with perf.page("05_q1"):
+        run_page()
@@ -1,12 +1,27 @@
 # pages/06_main_race.py
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import re, json, random
+import re, json, random, sys, hashlib
 from pathlib import Path
 from dataclasses import dataclass
+from datetime import datetime
 import streamlit as st
 import pandas as pd
 
+_PKG_ROOT = Path(__file__).resolve().parents[1]
+if str(_PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PKG_ROOT))
+from f1sim.io.data import read_csv
+from f1sim import shared, perf
+from f1sim.ui.perf_panel import perf_sidebar
+from f1sim.ui.asset_index import find_driver_img, find_tire_img, find_track_svg, thumb_url
+from f1sim.ui.track_lut import load_track_lut, geometry_ref
+from f1sim.ui.page_js import bundle_tag, worker_ref
+from f1sim.ui.session_channel import session_channel, take_messages
+from f1sim.ui.frame_stats import log_frame_stats
+from f1sim.engine.race_timeline import simulate_race, race_run, pit_advice
+from f1sim.engine.weather import track_weather, DEFAULT_LAP_SEC, LAP_SEC_COLS
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 경로/리소스
 def find_root(start: Path) -> Path:
@@ -22,14 +37,16 @@ INFO_DIR    = ROOT / "info"
 DATA_DIR    = ROOT / "data"
 CIRCUIT_DIR = ROOT / "circuit"
 
-DRIVER_IMG_DIRS = [ROOT/"driver_image", ROOT/"images/drivers"]
-TIRE_IMG_DIRS   = [ROOT/"tire", ROOT/"tires", ROOT/"images/tires"]
-
 DRIVERS_CSV_INFO = INFO_DIR / "drivers.csv"
 DRIVERS_CSV_DATA = DATA_DIR / "drivers.csv"
 TEAMS_CSV_INFO   = INFO_DIR / "teams.csv"
 TEAMS_CSV_DATA   = DATA_DIR / "teams.csv"
 TRACKS_CSV       = (INFO_DIR/"tracks.csv") if (INFO_DIR/"tracks.csv").exists() else (DATA_DIR/"tracks.csv")
+SAVE_ROOT        = DATA_DIR / "saves"
+MEDIA_PAGE       = "pages/07_media.py"
+
+COMPOUND_OPTS = ["soft","medium","hard","intermediate","wet"]
+PACE_OPTS     = ["Attack","Aggressive","Standard","Light","Conserve"]
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 공통 유틸
@@ -58,35 +75,12 @@ def _abbr_from_name(name: str) -> str:
         if len(base) >= 3: break
     return (base + "XXX")[:3]
 
-def _find_img_bytes(name: str):
-    if not name: return None
-    for d in DRIVER_IMG_DIRS:
-        png = d/f"{name}.png"; jpg = d/f"{name}.jpg"
-        if png.exists(): return png.read_bytes()
-        if jpg.exists(): return jpg.read_bytes()
-    return None
-
 def _img_uri(name: str):
-    b = _find_img_bytes(name)
-    if not b: return ""
-    import base64 as _b64
-    b64 = _b64.b64encode(b).decode("ascii")
-    return f"data:image/png;base64,{b64}"
+    # 에셋 인덱스 + 썸네일(정적 서빙 URL, 비활성 시 data URI 폴백)
+    return thumb_url(find_driver_img(name), "avatar")
 
 def _tire_uri(compound: str):
-    key = (compound or "").strip().lower()
-    fname = {"soft":"soft","s":"soft",
-             "medium":"medium","m":"medium",
-             "hard":"hard","h":"hard",
-             "intermediate":"intermediate","i":"intermediate","inters":"intermediate",
-             "wet":"wet","w":"wet"}.get(key, key or "soft")
-    for d in TIRE_IMG_DIRS:
-        png = d/f"{fname}.png"
-        if png.exists():
-            import base64 as _b64
-            b64 = _b64.b64encode(png.read_bytes()).decode("ascii")
-            return f"data:image/png;base64,{b64}"
-    return ""
+    return thumb_url(find_tire_img(compound), "tire")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 데이터 적재
@@ -94,7 +88,7 @@ def load_team_catalog():
     by_id, by_name, color_by_id, color_by_name = {}, {}, {}, {}
     for p in [TEAMS_CSV_DATA, TEAMS_CSV_INFO]:
         if not p.exists(): continue
-        df = pd.read_csv(p)
+        df = read_csv(p)
         col_id  = _norm_col(df, ["team_id","id"])
         col_nm  = _norm_col(df, ["name","team","constructor","team_name"], "name")
         col_col = _norm_col(df, ["team_color","color","hex","primary_color"], "team_color")
@@ -111,18 +105,22 @@ def load_team_catalog():
 
 def load_tracks(csv: Path):
     if not csv.exists(): return []
-    df = pd.read_csv(csv)
+    df = read_csv(csv)
     cols = {c.lower(): c for c in df.columns}
     name = cols.get("name") or cols.get("track") or cols.get("circuit") or list(df.columns)[0]
     rd   = cols.get("round") or cols.get("order")
-    lap  = cols.get("typical_lap_sec") or cols.get("lap_sec") or cols.get("lap_time_sec") or cols.get("avg_lap_sec")
+    lap  = next((cols[c] for c in LAP_SEC_COLS if c in cols), None)     # weather.track_lap_sec 와 같은 열
     laps_tot = cols.get("laps") or cols.get("race_laps") or cols.get("total_laps")
+    tyre_cols = [cols[c] for c in ("abrasion_index", "temp_mean_c", "temp_std_c") if c in cols]
+    wx_cols = [cols[c] for c in ("rain_base_prob", "temp_mean_c", "temp_std_c") if c in cols]
     out=[]
     for _,r in df.iterrows():
         out.append({"name": str(r[name]).strip(),
                     "round": int(r[rd]) if rd and pd.notna(r[rd]) else None,
                     "lap_sec": float(r[lap]) if lap and pd.notna(r[lap]) else None,
-                    "total_laps": int(r[laps_tot]) if laps_tot and pd.notna(r[laps_tot]) else None})
+                    "total_laps": int(r[laps_tot]) if laps_tot and pd.notna(r[laps_tot]) else None,
+                    "tyre_env": {c.lower(): float(r[c]) for c in tyre_cols if pd.notna(r[c])},
+                    "weather_env": {c.lower(): float(r[c]) for c in wx_cols if pd.notna(r[c])}})
     out.sort(key=lambda x: (999 if x["round"] is None else x["round"], x["name"]))
     return out
 
@@ -134,7 +132,7 @@ def load_roster(by_id, color_by_id, color_by_name):
         src = DRIVERS_CSV_DATA
     if not src or not src.exists(): return roster
 
-    df = pd.read_csv(src)
+    df = read_csv(src)
     num  = _norm_col(df, ["num","number","no","car_number"], "num")
     name = _norm_col(df, ["name","driver","driver_name"], "name")
     team = _norm_col(df, ["team","constructor","team_name"], None)
@@ -191,6 +189,87 @@ def build_grid(roster: list[dict]) -> list[dict]:
         key=lambda x: (next((d.get("num",999) for d in roster if d["name"]==x["name"] and d["team"]==x["team"]), 999), x["name"])
     )
 
+# ─────────────────────────────────────────────────────────────────────────────
+# 저장소 / 레이스 결과
+def ensure_save_dir() -> Path:
+    if "save_dir" in st.session_state and st.session_state["save_dir"]:
+        p = Path(st.session_state["save_dir"])
+        p.mkdir(parents=True, exist_ok=True)
+        return p
+    SAVE_ROOT.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now().strftime("run_%Y%m%d_%H%M%S")
+    p = SAVE_ROOT / ts
+    p.mkdir(parents=True, exist_ok=True)
+    st.session_state["save_dir"] = str(p)
+    return p
+
+def persist_race_result(payload: dict):
+    # 미디어 페이지(load_main_race_result)가 session_state["race"] → save_dir/*race*.json 순으로 읽는다
+    st.session_state["race"] = shared.put(payload)          # 세션에는 공유 핸들만
+    out = ensure_save_dir() / "race_result.json"
+    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(out)
+
+def _sim_inputs(plan_payload: list[dict], lap_base, total_laps, track_s, seed, speed,
+                tyre_env=None, wet=None) -> tuple[list, str]:
+    sim_plan = [{k: p[k] for k in ("name","team","abbr","base_vmul","stint_plan")} for p in plan_payload]
+    key = hashlib.sha1(json.dumps([sim_plan, lap_base, total_laps, track_s, (speed or {}).get("data"), seed,
+                                   tyre_env, wet], sort_keys=True).encode("utf-8")).hexdigest()
+    return sim_plan, key
+
+def race_timeline_cached(plan_payload: list[dict], *, lap_base: float, total_laps: int,
+                         track_s: dict | None, seed: int, speed: dict | None = None,
+                         tyre_env: dict | None = None, wet: list | None = None) -> tuple[dict, bool]:
+    """입력 해시가 같으면 (다른 세션이 만든 것이라도) 공유 저장소의 계산 결과 재사용. (out, 새로 계산했는지)"""
+    sim_plan, key = _sim_inputs(plan_payload, lap_base, total_laps, track_s, seed, speed, tyre_env, wet)
+    h, fresh = shared.memo(("race_timeline", key), lambda: simulate_race(
+        sim_plan, lap_base=lap_base, total_laps=total_laps, track_s=track_s, seed=seed, speed=speed,
+        tyre_env=tyre_env, wet=wet))
+    st.session_state["race_timeline"] = h      # 핸들을 쥐고 있는 동안 값이 유지된다
+    return h.value, fresh
+
+def race_advice_cached(plan_payload: list[dict], *, car: int, lap: int, lap_base: float, total_laps: int,
+                       track_s: dict | None, seed: int, speed: dict | None = None,
+                       tyre_env: dict | None = None, wet: list | None = None) -> dict:
+    """lap 랩 끝 체크포인트에서 car 의 피트 시점/타이어 분기 평가(f1sim.engine.race_timeline.pit_advice).
+    본 레이스 체크포인트(RaceRun)는 세션에, 분기 결과는 공유 저장소에 둔다."""
+    sim_plan, key = _sim_inputs(plan_payload, lap_base, total_laps, track_s, seed, speed, tyre_env, wet)
+
+    def make():
+        held = st.session_state.get("race_run")
+        if not held or held[0] != key:
+            held = (key, race_run(sim_plan, lap_base=lap_base, total_laps=total_laps,
+                                  track_s=track_s, seed=seed, speed=speed, tyre_env=tyre_env, wet=wet))
+            st.session_state["race_run"] = held
+        return pit_advice(held[1], car, lap)
+
+    h, _ = shared.memo(("race_advice", key, car, lap), make)
+    st.session_state["race_advice"] = h
+    return h.value
+
+@st.fragment
+def strategy_advice(plan_payload: list[dict], *, round_no: int, total_laps: int, **sim_kw):
+    """사이드바 조언 패널: 결정 시점 랩을 옮기면 이 조각만 다시 계산(레이스 iframe 은 그대로)."""
+    players = [i for i, p in enumerate(plan_payload) if p["isPlayer"]]
+    if not players or total_laps < 3:
+        return
+    with st.expander("언더컷 / 오버컷 조언", expanded=False):
+        car = st.selectbox("차량", players, format_func=lambda i: plan_payload[i]["abbr"], key=f"adv_car_{round_no}")
+        lap = st.slider("결정 시점(끝낸 랩)", 1, total_laps - 2, min(10, total_laps - 2), key=f"adv_lap_{round_no}")
+        adv = race_advice_cached(plan_payload, car=car, lap=lap, total_laps=total_laps, **sim_kw)
+        base, opts = adv["base"], adv["options"]
+        rival = plan_payload[adv["rival"]]["abbr"] if adv["rival"] is not None else None
+        st.caption(f"현재 계획: P{base['pos']}" + (f" · 피트 {base['pit_lap']}랩" if base["pit_lap"] else "")
+                   + (f" · 앞차 {rival}" if rival else ""))
+        if opts:
+            best = opts[0]
+            label = {"undercut": "언더컷", "overcut": "오버컷", "plan": "계획대로", "add_stop": "추가 피트"}[best["kind"]]
+            st.markdown(f"**{label}**: {best['pit_lap']}랩 피트 → {best['compound']} · "
+                        f"P{best['pos']} ({best['delta']:+.1f}s)")
+            st.dataframe([{"피트 랩": o["pit_lap"], "타이어": o["compound"], "순위": o["pos"],
+                           "계획 대비(s)": o["delta"], "앞차 대비(s)": o["rival_gap"]} for o in opts[:8]],
+                         use_container_width=True, hide_index=True)
+
 # ─────────────────────────────────────────────────────────────────────────────
 @dataclass
 class DriverSlot:
@@ -205,6 +284,11 @@ class DriverSlot:
 def run_main_race():
     st.set_page_config(layout="wide", page_title="Main Race — SVG")
 
+    # 레이스가 끝나면 페이지가 프레임 시간 요약을 한 번 보낸다
+    for msg in take_messages("chan_RACE", "frame_stats"):
+        if not msg.get("error"):
+            log_frame_stats("RACE", msg["body"])
+
     st.markdown("""
     <style>
       :root, html, body { background:#0b0f1a !important; color:#e5e7eb !important; }
@@ -228,25 +312,21 @@ def run_main_race():
     trk = [t for t in tracks if t["round"] == round_no]
     trk = trk[0] if trk else tracks[0]
     circuit = trk["name"]
-    lap_base = float(trk.get("lap_sec") or 90.0)
+    lap_base = float(trk.get("lap_sec") or DEFAULT_LAP_SEC)
     total_laps = int(trk.get("total_laps") or 50)
+    # 랩별 노면 젖음 — 랩 엔진(core/sim.py)·타임라인·브라우저 코어가 같은 (라운드, 세션, 시드) 타임라인을 본다
+    race_wx = track_weather(trk.get("weather_env"), round_no, "RACE").laps(total_laps, lap_base)
+    race_wet = [round(float(x), 3) for x in race_wx["wet"]] if race_wx["cls"].any() else None
 
     # SVG
     def find_svg_for_track(track_name: str) -> Path | None:
-        if not track_name or not CIRCUIT_DIR.exists(): return None
-        cands = list(CIRCUIT_DIR.glob("*.svg"))
-        key = re.sub(r"[^a-z0-9]","", track_name.lower())
-        for p in cands:
-            if re.sub(r"[^a-z0-9]","", p.stem.lower()) == key: return p
-        for p in cands:
-            if key in re.sub(r"[^a-z0-9]","", p.stem.lower()): return p
-        return cands[0] if cands else None
+        return find_track_svg(track_name)
 
     svg_path = find_svg_for_track(circuit)
     if not svg_path or not svg_path.exists():
         st.error(f"서킷 SVG가 없습니다: circuit/{circuit}.svg")
         st.stop()
-    RAW_SVG = svg_path.read_text(encoding="utf-8", errors="ignore")
+    TRACK_LUT = load_track_lut(svg_path)   # 없으면 JS가 시작 시 1회 샘플링
 
     # 로스터/플레이어 팀
     roster = load_roster(by_id, color_by_id, color_by_name)
@@ -308,6 +388,47 @@ def run_main_race():
             "stint_plan": stint
         })
 
+    # ─────────────────────────────────────────────────────────────────────────
+    # 계산 방식 / 플레이어 전략(사이드바)
+    sim_mode = st.sidebar.radio("레이스 계산", ["서버 타임라인", "브라우저 실시간"], index=0,
+                                help="서버 타임라인: 레이스를 한 번에 계산해 재생(탐색/배속 즉시, 결과 확정)")
+    use_timeline = (sim_mode == "서버 타임라인")
+    if race_wet:
+        first = next(i for i, c in enumerate(race_wx["cls"]) if c) + 1
+        st.sidebar.caption(f"🌧 노면 젖음 예보: {first}랩부터 · 최대 {max(race_wet)*100:.0f}% — 인터/웻 크로스오버")
+    for p in plan_payload:
+        if not p["isPlayer"]:
+            continue
+        st0, st1 = p["stint_plan"][0], p["stint_plan"][-1]
+        kp = f"race_strat_{round_no}_{p['abbr']}"
+        with st.sidebar.expander(f"#{p['abbr']} 전략", expanded=False):
+            pit_lap = st.slider("피트 랩", 1, max(1, total_laps-1), min(st0["to_lap"], max(1, total_laps-1)), key=kp+"_lap")
+            c1 = st.selectbox("1스틴트 타이어", COMPOUND_OPTS, index=COMPOUND_OPTS.index(st0["compound"]), key=kp+"_c1")
+            c2 = st.selectbox("2스틴트 타이어", COMPOUND_OPTS, index=COMPOUND_OPTS.index(st1["compound"]), key=kp+"_c2")
+            pace = st.selectbox("페이스", PACE_OPTS, index=PACE_OPTS.index(st0["pace"]), key=kp+"_pace")
+        p["stint_plan"] = [{"to_lap": pit_lap, "compound": c1, "pace": pace},
+                           {"to_lap": total_laps, "compound": c2, "pace": pace}]
+
+    timeline = None
+    if use_timeline:
+        out, fresh = race_timeline_cached(plan_payload, lap_base=lap_base, total_laps=total_laps,
+                                          track_s=(TRACK_LUT or {}).get("s"), seed=round_no,
+                                          speed=(TRACK_LUT or {}).get("speed"), tyre_env=trk.get("tyre_env"),
+                                          wet=race_wet)
+        timeline = out["timeline"]
+        if fresh or not st.session_state.get("race"):
+            persist_race_result({"circuit": circuit, "round": round_no, **out["result"]})
+        win = out["result"]["results"][0] if out["result"]["results"] else None
+        if win:
+            st.sidebar.caption(f"우승: {win['name']} ({win['team']}) · 결과 저장됨")
+        with st.sidebar:
+            strategy_advice(plan_payload, round_no=round_no, total_laps=total_laps, lap_base=lap_base,
+                            track_s=(TRACK_LUT or {}).get("s"), seed=round_no, speed=(TRACK_LUT or {}).get("speed"),
+                            tyre_env=trk.get("tyre_env"), wet=race_wet)
+    if st.session_state.get("race"):
+        if st.sidebar.button("📰 미디어 페이지로", use_container_width=True):
+            st.switch_page(MEDIA_PAGE)
+
     # ─────────────────────────────────────────────────────────────────────────
     # HTML 템플릿 (f-string 아님!)
     HTML_TMPL = r"""
@@ -390,6 +511,11 @@ def run_main_race():
         </div>
       </div>
       <div class="muted" style="margin:4px 0 2px;">그리드 스타트 → 5 레드라이트 → 라이트 아웃!</div>
+      <div class="muted" style="display:flex; gap:6px; align-items:center;">렌더 <button class="btn" data-r="svg">SVG</button><button class="btn" data-r="canvas">Canvas</button> <span id="rdrInfo"></span></div>
+      <div id="tlBar" class="muted" style="display:none; gap:6px; align-items:center; margin-top:6px;">
+        <button class="btn" id="tlPlay">▶</button>
+        <input id="tlSeek" type="range" min="0" max="1" step="0.1" value="0" style="flex:1;">
+      </div>
     </div>
 
     <div id="selPanel">
@@ -430,15 +556,20 @@ def run_main_race():
   </div>
 </div>
 
+%%BUNDLE%%
 <script>
 (function(){
   // 서버에서 주입
-  const RAW = %%RAW_SVG%%;
+  const GEO_REF = %%GEO_REF%%;            // {svg, lut} 정적 URL — 본문은 시작 시 loadGeometry 로
   const PLAN = %%PLAN_JSON%%;
   const LAP_BASE = %%LAP_BASE%%;
   const TOTAL_LAPS = %%TOTAL_LAPS%%;
+  const WET = %%WET_JSON%%;               // 랩별 노면 젖음(f1sim/engine/weather.py) | null = 건조
   const TIRE_IMGS = %%TIRE_IMGS%%;
   const PLAYER_TEAM = %%PLAYER_TEAM%%;
+  let RAW = "", TRACK_LUT = null;
+  const SIM_WORKER = %%SIM_WORKER%%;        // {url, factory} 정적 워커 번들 | {src}
+  const TIMELINE = %%TIMELINE%%;             // 서버 계산 타임라인(없으면 워커 실시간 시뮬)
 
   // 파라미터
   const TRANS_SIM = 0.25;
@@ -464,9 +595,14 @@ def run_main_race():
 
   // 런타임
   let SPEED = 1, simT = 0.0, running = false, raceFinished = false;
+  const SIM_STEP = 1/60, UI_HZ = 8;          // 시뮬 고정 스텝(초) / 표·패널 갱신 빈도
+  const OTK_SIDE_RATE = 0.132;               // 사이드 바이 사이드 추가 진행(랩/시뮬초) = 0.0022/프레임 × 60fps
+  const CLOCK = makeSimClock({step: SIM_STEP, uiHz: UI_HZ});
+  let HOST = null;                             // 시뮬 워커(sim_host.js) — 메인 스레드는 그리기만
+  let PLAY = null;                             // 타임라인 재생(race_timeline.js) — 보간만
 
   const stage=document.getElementById('stage'), gTrack=document.getElementById('track'), gAct=document.getElementById('actors');
-  const rows=document.getElementById('rows');
+  const rows=document.getElementById('rows'), lbNote=document.getElementById('lbNote');
   const timeText=document.getElementById('timeText'), lapText=document.getElementById('lapText');
   const selRing=document.getElementById('selRing');
 
@@ -476,43 +612,27 @@ def run_main_race():
   const selProg=document.getElementById('selProg'), selLaps=document.getElementById('selLaps');
 
   document.querySelectorAll('.speed .btn').forEach(b=>{
-    b.addEventListener('click', ()=>{ const m=parseFloat(b.getAttribute('data-m')||'1'); if(Number.isFinite(m)) SPEED=m; });
+    b.addEventListener('click', ()=>{ const m=parseFloat(b.getAttribute('data-m')||'1'); if(Number.isFinite(m)){ SPEED=m; if(HOST) HOST.speed(m); if(PLAY) PLAY.setSpeed(m); } });
   });
 
   // SVG 유틸
-  function parseSVG(raw){ return (!raw||!raw.trim())?null:new DOMParser().parseFromString(raw, "image/svg+xml"); }
-  function getViewBox(doc){ const root=doc.querySelector('svg'); return (root && root.getAttribute('viewBox'))?root.getAttribute('viewBox'):"0 0 1200 800"; }
-  function grabPathD(doc,id){ const el=doc.querySelector(`path#${id}`); if(el) return el.getAttribute('d')||''; const any=doc.querySelector('path'); return any?(any.getAttribute('d')||''):''; }
-  function nearestS(path,p){ if(!path||!p) return 0; const L=path.getTotalLength(),N=1000; let bestS=0,bestD=1e9; for(let i=0;i<=N;i++){const s=i/N; const q=path.getPointAtLength(s*L); const dx=q.x-p.x,dy=q.y-p.y; const d=dx*dx+dy*dy; if(d<bestD){bestD=d;bestS=s;} } return bestS; }
+  function nearestS(g,p){ return lutNearestS(g,p); }
   function reachedForward(a,b,target){ return (b>=a) ? (target>=a && target<=b) : (target>=a || target<=b); }
   function fmtTime(t){ const mm=Math.floor(t/60); const ss=(t%60).toFixed(1).padStart(4,'0'); return `${mm}:${ss}`; }
 
   // 법선 포함 좌표/차선
-  function ptOnPlus(path,s){
-    const L=Math.max(1,path.getTotalLength());
-    const c=Math.max(0,Math.min(1,s));
-    const P = path.getPointAtLength(c*L);
-    const dL=3;
-    const P2=path.getPointAtLength(Math.min(L, c*L+dL));
-    const tx=P2.x-P.x, ty=P2.y-P.y;
-    const mag=Math.hypot(tx,ty)||1;
-    const nx=-ty/mag, ny=tx/mag;
-    return {x:P.x,y:P.y,nx,ny};
-  }
-  function placeAtLane(el,lab,p,lane){
-    const offset=6*(lane||0);
-    const x=p.x+offset*p.nx, y=p.y+offset*p.ny;
-    el.setAttribute('transform',`translate(${x},${y})`);
-    lab.setAttribute('x',x+8); lab.setAttribute('y',y-8);
+  function ptOnPlus(g,s){
+    const P = lutAt(g, s);
+    return {x:P.x, y:P.y, nx:-P.ty, ny:P.tx};
   }
-
   // 트랙
+  const GEO = {main:null, pit:null, speed:null};   // 트랙 LUT {n,len,a} / 속도 배율
   let sFinish=0, sMainOut=0, sPitStop=0, sPitOut=0, sPitInMain=0.90, sPitInPit=0.02;
   function build(){
-    const doc=parseSVG(RAW); if(!doc) return null;
-    stage.setAttribute('viewBox', getViewBox(doc));
-    const dMainRaw=grabPathD(doc,'main');
-    const dPitRaw =grabPathD(doc,'pit');
+    const shp=trackShape(RAW, TRACK_LUT); if(!shp) return null;
+    stage.setAttribute('viewBox', shp.view);
+    const dMainRaw=shp.main;
+    const dPitRaw =shp.pit;
     gTrack.innerHTML='';
     const pMain=document.createElementNS(stage.namespaceURI,'path');
     const pPit =document.createElementNS(stage.namespaceURI,'path');
@@ -525,32 +645,26 @@ def run_main_race():
     pMain.setAttribute('stroke-linecap','round'); pMain.setAttribute('stroke-linejoin','round');
     pPit .setAttribute('stroke-linecap','round'); pPit .setAttribute('stroke-linejoin','round');
     gTrack.appendChild(pMain); gTrack.appendChild(pPit);
-
-    const fin = doc.querySelector('polyline#finish, line#finish');
-    if(fin){
-      let x1,y1,x2,y2;
-      if (fin.tagName.toLowerCase()==='polyline'){
-        const pts=(fin.getAttribute('points')||'').trim().split(/\s+/).map(s=>s.split(',').map(parseFloat));
-        if (pts.length>=2){ x1=pts[0][0]; y1=pts[0][1]; x2=pts[1][0]; y2=pts[1][1]; }
-      } else { x1=+fin.getAttribute('x1'); y1=+fin.getAttribute('y1'); x2=+fin.getAttribute('x2'); y2=+fin.getAttribute('y2'); }
+    // 주행 기하는 LUT(사전 계산 or 시작 시 1회 샘플링)로만 계산
+    GEO.main = lutFromB64(TRACK_LUT && TRACK_LUT.main) || lutFromPath(pMain);
+    GEO.pit  = lutFromB64(TRACK_LUT && TRACK_LUT.pit)  || lutFromPath(pPit);
+    GEO.speed = speedFromB64(TRACK_LUT && TRACK_LUT.speed);   // 없으면 등속
+    const LS = (TRACK_LUT && TRACK_LUT.s) || {};
+
+    if(shp.finish){
+      const [x1,y1,x2,y2]=shp.finish;
       const ln=document.createElementNS(stage.namespaceURI,'line');
       ln.setAttribute('x1',x1); ln.setAttribute('y1',y1); ln.setAttribute('x2',x2); ln.setAttribute('y2',y2);
       ln.setAttribute('stroke','#ef4444'); ln.setAttribute('stroke-width','3'); gTrack.appendChild(ln);
-      const mid={x:(x1+x2)/2,y:(y1+y2)/2}; sFinish = nearestS(pMain, mid);
+      const mid={x:(x1+x2)/2,y:(y1+y2)/2}; sFinish = lutPick(LS.finish, nearestS(GEO.main, mid));
     } else { sFinish=0.01; }
 
-    function ptFromMeta(id){ const el=doc.querySelector(`#${id}`); if(!el) return null; const a=(el.getAttribute('data-pt')||'').split(',').map(parseFloat); if(a.length===2 && a.every(Number.isFinite)) return {x:a[0],y:a[1]}; return null; }
-    const md = doc.querySelector('metadata'); let meta={}; try{ meta = md ? JSON.parse(md.textContent||"{}") : {}; }catch(e){ meta={}; }
-    const mk = {
-      pitIn : ptFromMeta('pitIn')  || (meta.pitIn  && meta.pitIn.pts  && meta.pitIn.pts[0])  || null,
-      pitOut: ptFromMeta('pitOut') || (meta.pitOut && meta.pitOut.pts && meta.pitOut.pts[0]) || null,
-      pitStop:ptFromMeta('pitStop')|| (meta.pitStop&& meta.pitStop.pts&& meta.pitStop.pts[0])|| null
-    };
-    sPitOut    = mk.pitOut  ? nearestS(pPit, mk.pitOut)  : 0.85;
-    sMainOut   = mk.pitOut  ? nearestS(pMain, mk.pitOut) : 0.02;
-    sPitStop   = mk.pitStop ? nearestS(pPit, mk.pitStop) : 0.05;
-    sPitInMain = mk.pitIn   ? nearestS(pMain, mk.pitIn)  : 0.90;
-    sPitInPit  = mk.pitIn   ? nearestS(pPit,  mk.pitIn)  : 0.02;
+    const mk = shp.mk;
+    sPitOut    = lutPick(LS.pitOut,    mk.pitOut  ? nearestS(GEO.pit,  mk.pitOut)  : 0.85);
+    sMainOut   = lutPick(LS.mainOut,   mk.pitOut  ? nearestS(GEO.main, mk.pitOut)  : 0.02);
+    sPitStop   = lutPick(LS.pitStop,   mk.pitStop ? nearestS(GEO.pit,  mk.pitStop) : 0.05);
+    sPitInMain = lutPick(LS.pitInMain, mk.pitIn   ? nearestS(GEO.main, mk.pitIn)   : 0.90);
+    sPitInPit  = lutPick(LS.pitInPit,  mk.pitIn   ? nearestS(GEO.pit,  mk.pitIn)   : 0.02);
 
     return { pMain, pPit };
   }
@@ -582,15 +696,7 @@ def run_main_race():
     };
   }
 
-  function syncSelRing(){
-    if (selectedIdx === null) { selRing.style.display='none'; return; }
-    const car = cars[selectedIdx];
-    if (!car) { selRing.style.display='none'; return; }
-    selRing.style.display='block';
-    const tr = car.el.getAttribute('transform') || 'translate(0,0)';
-    selRing.setAttribute('transform', tr);
-    selRing.setAttribute('stroke', car.el.getAttribute('fill') || '#0b5cff');
-  }
+  function syncSelRing(){ LAYER.draw(cars, selectedIdx); }
 
   function renderSelPanel(){
     if (selectedIdx===null) { selPanel.style.display='none'; return; }
@@ -616,8 +722,20 @@ def run_main_race():
     const idx = parseInt(t.getAttribute('data-idx')||'-1',10);
     if (Number.isFinite(idx) && idx>=0) showSelection(idx);
   });
+  const LAYER = makeCarLayer({stage, gAct, selRing, r:5, strokeW:1.8, onPick: showSelection});
+  // 프레임 시간 계측 — 타임라인 재생은 'timeline'(보간), 워커 모드는 워커가 physics/overtake 를 따로 잰다
+  const FSTAT = makeFrameStats({meta: {page: 'RACE'}});
+  let statsSent = false;
+  const frameStats = ()=>FSTAT.summary({engine: PLAY ? 'timeline' : (HOST ? HOST.mode : 'none'),
+                                        backend: LAYER.backend, worker: HOST ? HOST.prof : null});
 
   // 플레이어 카드
+  function pushCarSettings(car, compound){
+    if (!HOST) return;
+    const i=cars.indexOf(car);
+    HOST.send('set', i, {pace:car.pace, compound});
+    if (car.wantBox) HOST.send('box', i);
+  }
   function playerCards(){
     const mount=document.getElementById('playerCards'); if(!mount) return;
     mount.replaceChildren();
@@ -638,8 +756,8 @@ def run_main_race():
       rbox.appendChild(h); rbox.appendChild(s); rbox.appendChild(line1);
       card.appendChild(img); card.appendChild(rbox); mount.appendChild(card);
 
-      const apply=()=>{ const car=cars.find(c=>c.name===p.name && c.team===p.team); if(!car) return; car.pace=paceSel.value; tyIcon.src=TIRE_IMGS[selTy.value]||''; if(car.mode==='pitStopWait') car.compound=selTy.value; else car.wantBox=true; };
-      selTy.addEventListener('change', apply); paceSel.addEventListener('change', apply); bGo.addEventListener('click', ()=>{ const car=cars.find(c=>c.name===p.name && c.team===p.team); if(!car) return; car.wantBox=true; });
+      const apply=()=>{ const car=cars.find(c=>c.name===p.name && c.team===p.team); if(!car) return; car.pace=paceSel.value; tyIcon.src=TIRE_IMGS[selTy.value]||''; if(car.mode==='pitStopWait') car.compound=selTy.value; else car.wantBox=true; pushCarSettings(car, selTy.value); };
+      selTy.addEventListener('change', apply); paceSel.addEventListener('change', apply); bGo.addEventListener('click', ()=>{ const car=cars.find(c=>c.name===p.name && c.team===p.team); if(!car) return; car.wantBox=true; if (HOST) HOST.send('box', cars.indexOf(car)); });
     });
   }
 
@@ -653,7 +771,7 @@ def run_main_race():
         clearInterval(timer);
         setTimeout(()=>{
           Ls.forEach(x=>x.classList.remove('on'));
-          running = true; // Race start
+          running = true; if (HOST) HOST.send('go'); if (PLAY && PLAY.t===0) PLAY.play(true); // Race start
         }, 500 + Math.random()*300);
       }
     }, 600);
@@ -663,8 +781,8 @@ def run_main_race():
   let pMain=null, pPit=null;
   function buildAll(){
     const built=build(); if(!built) return false;
-    pMain=gTrack.querySelector('path:nth-of-type(1)');
-    pPit =gTrack.querySelector('path:nth-of-type(2)');
+    LAYER.layout();
+    pMain=GEO.main; pPit=GEO.pit;
     gAct.innerHTML=''; cars.length=0;
 
     // 그리드 정렬(피니시 라인 근처 뒤쪽으로 줄세우기)
@@ -672,152 +790,51 @@ def run_main_race():
       const car=mkCar(PLAN[i], i);
       const s0 = (sFinish - 0.010*(i)) % 1; car.s = (s0<0? s0+1 : s0);
       const p = ptOnPlus(pMain, car.s);
-      placeAtLane(car.el, car.lab, p, 0);
+      LAYER.place(car, p.x, p.y);
       cars.push(car);
     }
 
+    if (TIMELINE){
+      PLAY = makeRaceTimeline(TIMELINE, {geo: {main: GEO.main, pit: GEO.pit},
+        s: {finish: sFinish, pitInMain: sPitInMain, mainOut: sMainOut}, speed: GEO.speed});
+      PLAY.setSpeed(SPEED); PLAY.load();
+      timelineBar();
+      document.getElementById('playerPane').innerHTML = '<div class="muted">서버 타임라인 재생 중 — 플레이어 전략은 사이드바에서 바꾸면 다시 계산됩니다.</div>';
+      startLights();
+      return true;
+    }
     playerCards();
+    HOST = makeSimHost({worker: SIM_WORKER, cars, speed: SPEED, clock: {step: SIM_STEP}, onFrame: onSimFrame, cfg: {
+      plan: PLAN, geo: {main: GEO.main, pit: GEO.pit, speed: GEO.speed}, s: {finish: sFinish},
+      LAP_BASE, PIT_TRAVEL, TRANS_SIM, PIT_WAIT_SEC, FUEL_PER_LAP, FUEL_FLOW_MAX, TOTAL_LAPS, PACE, TIRE, OTK_SIDE_RATE, WET,
+    }});
     startLights();
     return true;
   }
 
-  // 루프
-  let anim=null, tPrev=0;
-  function loop(now){
-    if(!tPrev) tPrev=now;
-    const dt=(now-tPrev)/1000; tPrev=now;
-    const dtSim = dt * SPEED;
-
-    if (running){ simT += dtSim; timeText.textContent = fmtTime(simT); } else { timeText.textContent = "Grid"; }
-    if (!pMain || !pPit){ anim=requestAnimationFrame(loop); return; }
-
-    const vMainBase = 1 / Math.max(0.1, LAP_BASE);
-    const vPit = 1 / Math.max(0.5, PIT_TRAVEL);
-
-    // 업데이트
-    for(const car of cars){
-      if (car.mode==='grid'){
-        const p = ptOnPlus(pMain, car.s);
-        placeAtLane(car.el, car.lab, p, 0);
-        if (running){ car.mode='main'; car.lastCross=null; }
-        continue;
-      }
-      if (car.mode==='pit'){
-        const p=ptOnPlus(pPit, car.sPit); placeAtLane(car.el, car.lab, p, 0);
-        continue;
-      }
-      if (car.mode==='pitGo'){
-        const before=car.sPit;
-        car.sPit=(car.sPit + vPit*dtSim)%1;
-        const p=ptOnPlus(pPit, car.sPit); placeAtLane(car.el, car.lab, p, 0);
-        const targetS = car.pitTargetS ?? 0.85;
-        if (reachedForward(before, car.sPit, targetS)){
-          if (Math.abs(targetS - 0.85) < 1e-3){
-            const a=ptOnPlus(pPit, 0.85), b=ptOnPlus(pMain, 0.02);
-            car.mode='toMain'; car.fx={t0Sim: simT, durSim: TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
-          } else {
-            car.mode='pitStopWait'; car.waitUntil = simT + PIT_WAIT_SEC;
-          }
-        }
-        continue;
-      }
-      if (car.mode==='pitStopWait'){
-        const p=ptOnPlus(pPit, car.sPit); placeAtLane(car.el, car.lab, p, 0);
-        if (simT >= (car.waitUntil||0)){ car.mode='pit'; car.tireLife = 1.0; }
-        continue;
-      }
-      if (car.mode==='toMain'){
-        const w=Math.max(0,Math.min(1,(simT - car.fx.t0Sim)/car.fx.durSim));
-        const x=car.fx.ax*(1-w)+car.fx.bx*w, y=car.fx.ay*(1-w)+car.fx.by*w;
-        car.el.setAttribute('transform',`translate(${x},${y})`); car.lab.setAttribute('x',x+8); car.lab.setAttribute('y',y-8);
-        if(w>=1){ car.mode='main'; car.s=0.02; }
-        continue;
-      }
-      if (car.mode==='toPit'){
-        const w=Math.max(0,Math.min(1,(simT - car.fx.t0Sim)/car.fx.durSim));
-        const x=car.fx.ax*(1-w)+car.fx.bx*w, y=car.fx.ay*(1-w)+car.fx.by*w;
-        car.el.setAttribute('transform',`translate(${x},${y})`); car.lab.setAttribute('x',x+8); car.lab.setAttribute('y',y-8);
-        if(w>=1){ car.mode='pitGo'; car.sPit=0.02; car.pitTargetS = 0.05; }
-        continue;
-      }
-
-      // === main 주행 ===
-      const paceFx = PACE[car.pace] || PACE.Standard;
-      const tDat = TIRE[car.compound] || TIRE.soft;
-
-      const groupBias = (car.base_vmul || 1.0);
-      const perLapNoise = 1.0 + ( (Math.sin((car.lap + car.s)*11.0 + car.base_vmul*7.7) ) * 0.004 );
-      const vmul = Math.max(0.90, Math.min(1.25, groupBias * paceFx.speed * tDat.gripDry * perLapNoise * (1 - 0.004*car.fuel)));
-      car._vmulInst = vmul;
-
-      const before=car.s;
-      car.s = (car.s + vMainBase*vmul*dtSim) % 1;
-
-      const desiredRate = (FUEL_PER_LAP / LAP_BASE);
-      const actualRate  = Math.min(FUEL_FLOW_MAX, desiredRate);
-      car.fuel = Math.max(0, car.fuel - actualRate * dtSim);
-
-      const ds = (car.s - before + 1) % 1;
-      const wearLap = tDat.wearDry * (PACE[car.pace]?.wear || 1.0);
-      car.tireLife = Math.max(0, car.tireLife - wearLap * ds);
-
-      const sLine = (sFinish || 0.01);
-      if (reachedForward(before, car.s, sLine)){
-        car.lap += 1;
-        if (car.lastCross === null){ car.lastCross = simT; }
-        else { const lapTime = simT - car.lastCross; car.lastCross = simT; car.lastLapTime = lapTime; car.lapTimes.push(lapTime); }
-        if (car.lap >= TOTAL_LAPS) { raceFinished = true; running = false; }
-      }
-
-      const plan = car.plan || [];
-      const stint = plan.find(st => (car.lap < (st.to_lap||TOTAL_LAPS+1)));
-      if (stint) {
-        car.pace = stint.pace || car.pace;
-        if (car.lap+0.0001 >= (stint.to_lap||9999) || car.tireLife<0.12) { car.wantBox = true; }
-        if (car.mode==='pitStopWait') { car.compound = stint.compound || car.compound; }
-      }
-      if (car.wantBox && reachedForward(before, car.s, 0.90)) {
-        const a=ptOnPlus(pMain, 0.90), b=ptOnPlus(pPit, 0.02);
-        car.mode='toPit'; car.fx={t0Sim: simT, durSim: TRANS_SIM, ax:a.x, ay:a.y, bx:b.x, by:b.y};
-        car.wantBox=false;
-      }
+  // 타임라인 재생 바: 재생/일시정지 + 탐색
+  const tlSeek=document.getElementById('tlSeek'), tlPlay=document.getElementById('tlPlay');
+  let seeking=false;
+  function timelineBar(){
+    document.getElementById('tlBar').style.display='flex';
+    tlSeek.max=String(PLAY.end);
+    tlSeek.addEventListener('input', ()=>{ seeking=true; PLAY.seek(parseFloat(tlSeek.value)); });
+    tlSeek.addEventListener('change', ()=>{ seeking=false; });
+    tlPlay.addEventListener('click', ()=>{ PLAY.play(); });
+  }
 
-      const p=ptOnPlus(pMain, car.s); placeAtLane(car.el, car.lab, p, car.lane);
-    }
+  // 워커 프레임 수신: cars(미러)는 sim_host가 채우고, 여기선 레이스 상태만
+  function onSimFrame(m){ simT=m.simT; running=m.running; raceFinished=m.done; }
 
-    // === 오버테이크 FSM ===
-    const onMain = cars.filter(c => c.mode==='main').slice().sort((a,b)=> (b.lap+b.s) - (a.lap+a.s));
-    for (let i=0; i<onMain.length-1; i++){
-      const front=onMain[i], back=onMain[i+1];
-      if (front.otk.state!=='none' || back.otk.state!=='none') continue;
-      if (front.lap !== back.lap) continue;
-      let gap = (front.s - back.s); if (gap < 0) gap += 1.0;
-      if (gap > 0 && gap < 0.018 && (back._vmulInst||1.0) > (front._vmulInst||1.0) + 0.015){
-        const dir = (Math.random()<0.5 ? -1 : +1);
-        back.otk = { state:'prep', until: simT + 0.8, dir, rival: `${front.name}|${front.team}` };
-        back.lane = dir;
-      }
-    }
-    for (const car of onMain){
-      if (car.otk.state==='none') continue;
-      const rival = cars.find(c => `${c.name}|${c.team}`===car.otk.rival);
-      const ahead = rival && ( (car.lap + car.s) > (rival.lap + rival.s) );
-      if (car.otk.state==='prep'){
-        if (simT >= car.otk.until){ car.otk.state='side'; car.otk.until = simT + 1.6; }
-      } else if (car.otk.state==='side'){
-        car.s = (car.s + 0.0022*SPEED) % 1;
-        if (ahead || simT >= car.otk.until){ car.otk.state='merge'; car.otk.until = simT + 0.7; }
-      } else if (car.otk.state==='merge'){
-        if (simT >= car.otk.until){ car.lane = 0; car.otk={state:'none', until:0, dir:0, rival:null}; }
-        else { const w = 1 - Math.max(0, Math.min(1, (car.otk.until - simT)/0.7)); car.lane = car.otk.dir * (1 - w); }
-      }
-    }
-    for (const car of cars){
-      if (car.mode==='main'){ const p=ptOnPlus(pMain, car.s); placeAtLane(car.el, car.lab, p, car.lane); }
-      else if (car.mode==='pit' || car.mode==='pitGo' || car.mode==='pitStopWait'){ const p=ptOnPlus(pPit, car.sPit); placeAtLane(car.el, car.lab, p, 0); }
-    }
+  // 차량 위치: 매 프레임. 실제 그리기는 LAYER(svg/canvas)가 맡는다.
+  function renderCars(){
+    const P=PLAY ? PLAY.pos : HOST.pos;
+    for (let i=0;i<cars.length;i++) LAYER.place(cars[i], P[2*i], P[2*i+1]);
+  }
 
-    // 리더보드(랩/거리)
+  // 리더보드/패널: UI_HZ 로 스로틀
+  function renderUI(){
+    timeText.textContent = (running || raceFinished) ? fmtTime(simT) : "Grid";
     const ordered = cars.slice().sort((a,b)=> (b.lap - a.lap) || (b.s - a.s));
     rows.innerHTML = ordered.map((c,i)=>{
       const pill = c.color ? c.color : '#334155';
@@ -830,37 +847,65 @@ def run_main_race():
     }).join("");
 
     const lead = ordered[0]; lapText.textContent = `${lead?lead.lap:0}/${TOTAL_LAPS}`;
+    if (PLAY){ if (!seeking) tlSeek.value=String(PLAY.t); tlPlay.textContent = PLAY.playing ? '⏸' : '▶'; }
+    renderSelPanel(); LAYER.report();
+  }
 
-    renderSelPanel(); syncSelRing();
-
-    if (raceFinished){ /* TODO: 결과 저장 및 다음 페이지 전환 훅 */ }
+  // 루프
+  let anim=null;
+  function loop(now){
+    if (PLAY){
+      if (!PLAY.ready){ anim=requestAnimationFrame(loop); return; }
+      FSTAT.frame(now);
+      FSTAT.time('timeline', ()=>{ PLAY.tick(now); PLAY.sample(cars); });
+      simT=PLAY.t; raceFinished=PLAY.finished(); running=(simT>0 && !raceFinished);
+    } else if (!HOST || !HOST.frame){ anim=requestAnimationFrame(loop); return; }
+    else FSTAT.frame(now);
+
+    const t0=performance.now();
+    LAYER.begin(now); renderCars(); syncSelRing(); LAYER.end();
+    FSTAT.add('render', performance.now()-t0);
+    if (CLOCK.uiDue(now)) FSTAT.time('ui', renderUI);
+
+    if (raceFinished){
+      if (!statsSent){ statsSent = true; CHAN.send('frame_stats', frameStats()); }
+      if (PLAY) lbNote.textContent = '· Final (결과 저장됨 — 사이드바에서 미디어 페이지로)';
+      /* TODO(실시간 모드): 결과 저장 및 다음 페이지 전환 훅 */
+    }
 
-    requestAnimationFrame(loop);
+    anim=requestAnimationFrame(loop);
   }
 
   // 시작
   function init(){
     if (!buildAll()) return;
-    let anim=null; if(anim) cancelAnimationFrame(anim);
-    requestAnimationFrame(loop);
+    if(anim) cancelAnimationFrame(anim);
+    CLOCK.reset(); anim=requestAnimationFrame(loop);
   }
-  init();
+  loadGeometry(GEO_REF).then(g=>{ RAW=g.raw; TRACK_LUT=g.lut; init(); });
 })();
 </script>
 """
 
     # 치환
-    html = (HTML_TMPL
-            .replace("%%RAW_SVG%%", json.dumps(RAW_SVG))
-            .replace("%%PLAN_JSON%%", json.dumps(plan_payload, ensure_ascii=False))
-            .replace("%%LAP_BASE%%", f"{lap_base:.6f}")
-            .replace("%%TOTAL_LAPS%%", str(total_laps))
-            .replace("%%TIRE_IMGS%%", json.dumps({k:(v or "") for k,v in tire_imgs.items()}))
-            .replace("%%PLAYER_TEAM%%", json.dumps(player_team))
-            )
-
-    st.components.v1.html(html, height=1320, scrolling=False)
+    with perf.span("ui.html_template", "ui"):
+        html = (HTML_TMPL
+                .replace("%%PLAN_JSON%%", json.dumps(plan_payload, ensure_ascii=False))
+                .replace("%%LAP_BASE%%", f"{lap_base:.6f}")
+                .replace("%%TOTAL_LAPS%%", str(total_laps))
+                .replace("%%WET_JSON%%", json.dumps(race_wet))
+                .replace("%%TIRE_IMGS%%", json.dumps({k:(v or "") for k,v in tire_imgs.items()}))
+                .replace("%%PLAYER_TEAM%%", json.dumps(player_team))
+                .replace("%%BUNDLE%%", bundle_tag())
+                .replace("%%GEO_REF%%", json.dumps(geometry_ref(svg_path)))
+                .replace("%%SIM_WORKER%%", "null" if use_timeline else worker_ref("race_core", "makeRaceCore"))
+                .replace("%%TIMELINE%%", json.dumps(timeline))
+                )
+
+    session_channel(html, height=1320, key="chan_RACE")
 
 # 실행
 if __name__ == "__main__":
-    run_main_race()
+    perf_sidebar()
+    with perf.page("06_main_race"):
+        run_main_race()
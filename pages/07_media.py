@@ -29,6 +29,13 @@ DRIVERS_CSV_INFO = INFO_DIR / "drivers.csv"
 DRIVERS_CSV_DATA = DATA_DIR / "drivers.csv"
 TRACKS_CSV       = (INFO_DIR/"tracks.csv") if (INFO_DIR/"tracks.csv").exists() else (DATA_DIR/"tracks.csv")
 
+import sys
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+from f1sim import jobs, shared, perf
+from f1sim.ui.perf_panel import perf_sidebar
+from f1sim.ui.jobs_panel import take_job, job_busy, job_key
+
 def _norm_col(df, candidates, default=None):
     for c in candidates:
         if c in df.columns:
@@ -90,7 +97,7 @@ def _try_load_json(p: Path):
 
 def load_main_race_result() -> dict | None:
     # 1) 세션 메모리에 race가 있으면 우선 사용
-    race = st.session_state.get("race")
+    race = shared.deref(st.session_state.get("race"))
     if isinstance(race, dict) and race.get("results"):
         return race
 
@@ -338,13 +345,21 @@ def main():
         with col_in1:
             user_msg = st.text_input("기자 질문을 입력하세요", key="media_user_msg", placeholder="이번 레이스 전략이 보수적이었다는 비판이 있습니다. 어떻게 답하시겠습니까?")
         with col_in2:
-            ask = st.button("질문 보내기", type="primary", use_container_width=True)
+            ask = st.button("질문 보내기", type="primary", use_container_width=True,
+                            disabled=job_busy("media_job"))
 
         if ask and user_msg.strip():
-            out = call_media_llm(ctx, user_msg.strip())
+            # 답변 생성은 백그라운드 작업(같은 슬롯·같은 레이스 컨텍스트의 같은 질문 연타는 한 번만 실행)
+            q = user_msg.strip()
+            st.session_state["media_q"] = q
+            st.session_state["media_job"] = jobs.submit("media_reply", call_media_llm, ctx, q,
+                                                        key=job_key("media", ensure_save_dir(), [ctx, q]))
+
+        out = take_job("media_job", "답변 생성")
+        if out:
             entry = {
                 "ts": datetime.now().isoformat(timespec="seconds"),
-                "user": user_msg.strip(),
+                "user": st.session_state.pop("media_q", ""),
                 "ai": out.get("reply_text",""),
                 "tone": out.get("tone","diplomatic"),
                 "score": float(out.get("score", 60)),
@@ -395,4 +410,6 @@ def main():
 
 # ─────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    main()
+    perf_sidebar()
+    with perf.page("07_media"):
+        main()
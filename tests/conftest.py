@@ -0,0 +1,10 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+"""pytest 공용 설정 — 저장소 루트를 import 경로에 넣는다(루트의 test*.py 는 Streamlit 스크립트라 수집하지 않음)."""
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
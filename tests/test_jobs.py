@@ -0,0 +1,45 @@
+# tests/test_jobs.py
+# -*- coding: utf-8 -*-
+"""백그라운드 작업 큐(f1sim/jobs.py)의 key 중복 제거와 결과 공유."""
+from __future__ import annotations
+import threading
+
+import pytest
+
+from f1sim import jobs
+from f1sim.ui.jobs_panel import job_key
+
+
+@pytest.fixture(autouse=True)
+def _tmp_jobs_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_JSON", tmp_path / ".jobs.json")
+
+
+def test_job_key_separates_slots_and_context():
+    ctx = {"round": 3, "team_id": "ferrari", "top3": ["LEC", "VER", "NOR"]}
+    k = job_key("media", "data/saves/run_a", [ctx, "전략이 보수적이었나?"])
+    assert k == job_key("media", "data/saves/run_a", [dict(ctx), "전략이 보수적이었나?"])
+    assert k != job_key("media", "data/saves/run_b", [ctx, "전략이 보수적이었나?"])
+    assert k != job_key("media", "data/saves/run_a", [{**ctx, "team_id": "mclaren"}, "전략이 보수적이었나?"])
+    assert k.startswith("media:")
+
+
+def test_same_key_shares_one_job_and_result_stays_readable():
+    gate = threading.Event()
+    calls = []
+
+    def work(x):
+        calls.append(x)
+        gate.wait(5.0)
+        return {"answer": x}
+
+    key = job_key("test", "slot", {"q": 1})
+    a = jobs.submit("test_job", work, 1, key=key)
+    b = jobs.submit("test_job", work, 1, key=key)       # 다른 세션이 같은 질문 — 같은 작업에 붙는다
+    assert a == b
+    gate.set()
+    assert jobs.wait(a, 5.0)["status"] == "done"
+    assert calls == [1]
+    # 먼저 받아 간 세션이 있어도 다른 세션이 같은 결과를 읽는다
+    assert jobs.result(a) == {"answer": 1}
+    assert jobs.result(b) == {"answer": 1}
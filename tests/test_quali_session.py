@@ -0,0 +1,30 @@
+# tests/test_quali_session.py
+# -*- coding: utf-8 -*-
+"""서버 퀄리 세션(f1sim/engine/quali_session.py) — 날씨 크로스오버."""
+from __future__ import annotations
+
+from f1sim.engine.quali_session import simulate_quali
+
+
+def _plans(n: int = 3) -> list:
+    return [{"name": f"D{i}", "team": "T", "abbr": f"D{i}", "base_vmul": 1 + 0.005 * i, "is_player": i == 0,
+             "runs": [{"start_sec": 30 + i * 10, "laps": 3, "timed_laps": [2]},
+                      {"start_sec": 600, "laps": 3, "timed_laps": [2]}]} for i in range(n)]
+
+
+def _by_abbr(env: dict) -> dict:
+    out = simulate_quali(_plans(), session="Q1", duration_sec=1080, lap_base=90, pit_travel=16, env=env)
+    return {r["abbr"]: r for r in out["results"]}
+
+
+def test_reports_fitted_tyre_after_crossover():
+    # 10분부터 인터 노면: AI 는 두 번째 러닝에 인터로 갈아 끼우고, 플레이어는 계획(슬릭) 그대로
+    res = _by_abbr({"wetness": 0.0, "wet_min": [0.0] * 8 + [0.5] * 10})
+    assert res["D0"]["compound"] == "soft"
+    assert res["D1"]["compound"] == "intermediate"
+    assert res["D2"]["compound"] == "intermediate"
+
+
+def test_dry_session_keeps_planned_tyre():
+    res = _by_abbr({"wetness": 0.0})
+    assert {r["compound"] for r in res.values()} == {"soft"}
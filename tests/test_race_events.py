@@ -0,0 +1,142 @@
+# tests/test_race_events.py
+# -*- coding: utf-8 -*-
+"""이산 사건 레이스 엔진(f1sim/engine/race_events.py) — 실제 시각을 확인한다."""
+from __future__ import annotations
+
+import pytest
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from f1sim.config import SC_FACTOR, VSC_FACTOR
+from f1sim.core import sim
+from f1sim.engine.race_events import CarSpec, PitLane, run_events
+
+DATA = Path(__file__).resolve().parents[1] / "data"
+
+LAP = 90.0
+LAPS = 10
+START_GAP = 0.25
+
+
+def _cars(n: int = 4, **kw) -> list:
+    """같은 랩타임 차량 n 대(팀 모두 다름)."""
+    return [CarSpec(car_id=f"C{i}", team=f"T{i}", lap_times=[LAP] * LAPS, **kw) for i in range(n)]
+
+
+def _times(out: dict) -> list:
+    return [r["time_s"] for r in out["results"]]
+
+
+# ── SC / VSC ─────────────────────────────────────────────────────────────────
+@pytest.mark.parametrize("window", [(1, 2), (4, 5), (9, 10)])
+def test_vsc_keeps_order_and_gaps(window):
+    out = run_events(_cars(), laps=LAPS, pit=PitLane(loss_sec=20.0), sc={"VSC": [window]}, start_gap=START_GAP)
+    n_sc = window[1] - window[0] + 1
+    lead = (LAPS - n_sc) * LAP + n_sc * LAP / VSC_FACTOR
+    assert _times(out) == pytest.approx([lead + i * START_GAP for i in range(4)])
+    assert [p[0] for p in out["sc_periods"]] == ["VSC"]
+
+
+@pytest.mark.parametrize("window", [(1, 2), (4, 5), (9, 10)])
+def test_sc_leader_keeps_lead_and_field_queues(window):
+    pit = PitLane(loss_sec=20.0)
+    out = run_events(_cars(), laps=LAPS, pit=pit, sc={"SC": [window]}, start_gap=START_GAP)
+    n_sc = window[1] - window[0] + 1
+    lead = (LAPS - n_sc) * LAP + n_sc * LAP / SC_FACTOR      # 선두는 SC 뒤에서 SC 랩을 다 돈다
+    # 뒤차는 SC 뒤 줄서기 간격으로 모이고, 끝난 뒤에도 그 간격이 유지된다
+    assert _times(out) == pytest.approx([lead + i * pit.sc_gap for i in range(4)])
+    (kind, t0, t1), = out["sc_periods"]
+    assert kind == "SC"
+    assert t0 == pytest.approx((window[0] - 1) * LAP)
+    assert t1 == pytest.approx(lead - (LAPS - window[1]) * LAP)
+
+
+@pytest.mark.parametrize("kind", ["SC", "VSC"])
+def test_pit_under_caution_gets_discounted_lane(kind):
+    pit = PitLane(loss_sec=20.0)
+    cars = [CarSpec(car_id="C0", team="T0", lap_times=[LAP] * LAPS, pit_laps=[5], service_sec=2.5)]
+    out = run_events(cars, laps=LAPS, pit=pit, sc={kind: [(5, 6)]})
+    (stop,) = out["results"][0]["stops"]
+    assert stop["sc"] == kind
+    assert stop["out"] - stop["in"] == pytest.approx(2.5 + 17.5 * 0.75)
+
+
+# ── 피트레인 ─────────────────────────────────────────────────────────────────
+def test_double_stack_waits_for_teammate_box():
+    pit = PitLane(loss_sec=20.0, stack_gap=0.8)
+    cars = [CarSpec(car_id=f"C{i}", team="T", lap_times=[LAP] * LAPS, pit_laps=[5], service_sec=2.5)
+            for i in range(2)]
+    a, b = run_events(cars, laps=LAPS, pit=pit, start_gap=START_GAP)["results"]
+    # 앞차: 레인 17.5 + 작업 2.5, 대기 없음
+    assert a["pit_wait_s"] == 0.0 and a["time_s"] == pytest.approx(LAPS * LAP + 20.0)
+    # 뒷차: 0.25초 뒤 박스 도착 → 앞차 작업 끝 + 0.8 까지 대기(2.5 + 0.8 − 0.25)
+    wait = 2.5 + 0.8 - START_GAP
+    assert b["pit_wait_s"] == pytest.approx(wait)
+    assert b["time_s"] == pytest.approx(LAPS * LAP + START_GAP + 20.0 + wait)
+    assert b["stops"][0]["out"] - a["stops"][0]["out"] == pytest.approx(START_GAP + wait)
+
+
+def test_release_gap_spaces_pit_exits():
+    pit = PitLane(loss_sec=20.0, release_gap=1.0)
+    cars = [CarSpec(car_id=f"C{i}", team=f"T{i}", lap_times=[LAP] * LAPS, pit_laps=[5], service_sec=2.5)
+            for i in range(3)]
+    res = run_events(cars, laps=LAPS, pit=pit, start_gap=START_GAP)["results"]
+    outs = [r["stops"][0]["out"] for r in res]
+    assert outs == pytest.approx([outs[0] + i * pit.release_gap for i in range(3)])
+    assert [r["pit_wait_s"] for r in res] == pytest.approx([i * (pit.release_gap - START_GAP) for i in range(3)])
+    assert [r["time_s"] for r in res] == pytest.approx([LAPS * LAP + 20.0 + i * pit.release_gap for i in range(3)])
+
+
+def test_lapped_car_finishes_on_its_own_lap_count():
+    cars = [CarSpec(car_id="FAST", team="T0", lap_times=[LAP] * LAPS),
+            CarSpec(car_id="SLOW", team="T1", lap_times=[LAP * 1.12] * LAPS)]
+    fast, slow = run_events(cars, laps=LAPS, pit=PitLane(loss_sec=20.0), start_gap=0.0)["results"]
+    assert (fast["laps"], fast["time_s"]) == (LAPS, pytest.approx(LAPS * LAP))
+    # 체커(900초) 뒤 첫 통과는 9랩 끝(907.2초) — 10랩을 다 돌지 않고 끝난다
+    assert slow["status"] == "Finished"
+    assert (slow["laps"], slow["time_s"]) == (LAPS - 1, pytest.approx((LAPS - 1) * LAP * 1.12))
+
+
+# ── run_race 분류(랩 수 → 시간) ───────────────────────────────────────────────
+@pytest.fixture
+def data_root(tmp_path):
+    for f in ("teams.csv", "tracks.csv"):
+        shutil.copy(DATA / f, tmp_path / f)
+    dr = pd.read_csv(DATA / "drivers.csv")
+    dr["skill"] = dr.get("skill", dr["pace"])          # 세이브 슬롯에서는 apply_effects 가 채우는 열
+    dr.to_csv(tmp_path / "drivers.csv", index=False)
+    return tmp_path
+
+
+def test_run_race_ranks_lapped_cars_behind_lead_lap(data_root, monkeypatch):
+    total = int(pd.read_csv(data_root / "tracks.csv").set_index("round").loc[1, "laps"])
+    plan = {0: (total, 1000.0), 1: (total - 1, 990.0), 2: (total, 1005.0), 3: (total - 2, 950.0), 4: (10, None)}
+
+    def fake_events(specs, *, laps, pit, sc):
+        res = []
+        for i, s in enumerate(specs):
+            n, t = plan.get(i, (total, 1010.0 + i))
+            res.append({"car_id": s.car_id, "status": "DNF" if i == 4 else "Finished", "laps": n,
+                        "time_s": None if i == 4 else t, "fastest_lap_s": 1.0, "pit_stops": 0, "pit_wait_s": 0.0})
+        return {"results": res, "events": [], "sc_periods": []}
+
+    monkeypatch.setattr(sim, "run_events", fake_events)
+    df = sim.run_race(1, data_root, engine="events")
+    out = df.set_index("driver_id")
+    ids = df.sort_values("grid_pos")["driver_id"].tolist()
+
+    assert list(df["pos"]) == list(range(1, len(df) + 1))
+    # 선두 랩 차량이 시간 순으로 먼저, 랩 다운은 그 뒤(시간이 짧아도), DNF 는 맨 뒤
+    lead = df[df["status"] == "Finished"]
+    assert (lead["laps"] == total).all()
+    assert (lead["pos"] < df.loc[df["status"] != "Finished", "pos"].min()).all()
+    assert lead["total_time_s"].is_monotonic_increasing
+    assert out.loc[ids[0], "pos"] == 1 and out.loc[ids[2], "pos"] == 2
+    assert out.loc[ids[1], "status"] == "+1 Lap" and pd.isna(out.loc[ids[1], "total_time_s"])
+    assert out.loc[ids[3], "status"] == "+2 Laps" and pd.isna(out.loc[ids[3], "total_time_s"])
+    assert out.loc[ids[1], "pos"] == len(df) - 2 and out.loc[ids[3], "pos"] == len(df) - 1
+    assert out.loc[ids[4], "status"] == "DNF" and out.loc[ids[4], "pos"] == len(df)
+    assert int(df["points"].sum()) == 101
@@ -0,0 +1,83 @@
+# tests/test_race_timeline.py
+# -*- coding: utf-8 -*-
+"""서버 레이스 타임라인(f1sim/engine/race_timeline.py) — 피트 조언 분기."""
+from __future__ import annotations
+import logging
+
+import numpy as np
+import pytest
+
+from f1sim.engine.race_timeline import pit_advice, race_run
+
+LAPS = 50
+
+
+def _plan(stints: list) -> list:
+    return [{"name": f"D{i}", "team": f"T{i // 2}", "abbr": f"D{i}", "base_vmul": 1 - 0.003 * i,
+             "stint_plan": [dict(s) for s in stints]} for i in range(10)]
+
+
+TWO_STOP = [{"to_lap": 15, "compound": "medium", "pace": "normal"},
+            {"to_lap": 32, "compound": "hard", "pace": "normal"},
+            {"to_lap": LAPS, "compound": "soft", "pace": "normal"}]
+
+
+@pytest.fixture(scope="module")
+def run():
+    return race_run(_plan(TWO_STOP), lap_base=90, total_laps=LAPS,
+                    tyre_env=dict(abrasion_index=0.53, temp_mean_c=18, temp_std_c=4))
+
+
+@pytest.mark.parametrize("lap, planned, comp", [(10, 15, "hard"), (28, 32, "soft")])
+def test_planned_branch_reproduces_base(run, lap, planned, comp):
+    adv = pit_advice(run, 3, lap)
+    same = [o for o in adv["options"] if o["pit_lap"] == planned and o["compound"] == comp]
+    assert len(same) == 1
+    assert same[0]["time_sec"] == adv["base"]["time_sec"]
+    assert same[0]["delta"] == 0.0
+    kinds = {o["pit_lap"]: o["kind"] for o in adv["options"]}
+    assert kinds[planned] == "plan"
+    assert kinds[planned - 1] == "undercut" and kinds[planned + 1] == "overcut"
+
+
+def test_branches_keep_later_stints(run):
+    # 첫 스톱을 11랩으로 당기고 다음 스틴트를 미디엄으로 — 두 번째 스톱(32랩 → 소프트)은 그대로
+    adv = pit_advice(run, 3, 10)
+    opt = next(o for o in adv["options"] if o["pit_lap"] == 11 and o["compound"] == "medium")
+    cp = run.checkpoint(10)
+    want = [dict(cp.stints[3][0], to_lap=11), dict(cp.stints[3][1], compound="medium"), cp.stints[3][2]]
+    ref = run.branches(10, [{3: want}])[0]
+    assert opt["time_sec"] == round(float(ref["finish"][3]), 3)
+
+
+def test_passed_stints_are_pushed_back():
+    # 두 번째 스톱(17랩)을 넘어선 p 는 그 뒤 스틴트 끝을 p+1 로 밀고 스톱 수는 그대로
+    stints = [dict(TWO_STOP[0]), dict(TWO_STOP[1], to_lap=17), dict(TWO_STOP[2])]
+    rr = race_run(_plan(stints), lap_base=90, total_laps=LAPS)
+    adv = pit_advice(rr, 3, 14, horizon=6)
+    opt = next(o for o in adv["options"] if o["pit_lap"] == 19 and o["compound"] == "hard")
+    cp = rr.checkpoint(14)
+    want = [dict(cp.stints[3][0], to_lap=19), dict(cp.stints[3][1], to_lap=20), cp.stints[3][2]]
+    ref = rr.branches(14, [{3: want}])[0]
+    assert opt["time_sec"] == round(float(ref["finish"][3]), 3)
+
+
+def test_no_planned_stop_is_add_stop(run):
+    adv = pit_advice(run, 3, 40)
+    assert adv["base"]["pit_lap"] is None
+    assert adv["options"] and {o["kind"] for o in adv["options"]} == {"add_stop"}
+
+
+def test_mismatched_plan_branch_is_skipped(run, monkeypatch, caplog):
+    real = run.branches
+
+    def skewed(lap, options):
+        res = real(lap, options)
+        return [res[0]] + [dict(r, finish=np.asarray(r["finish"]) + 1.0) for r in res[1:]]
+
+    monkeypatch.setattr(run, "branches", skewed)
+    with caplog.at_level(logging.WARNING, logger="f1sim.engine.race_timeline"):
+        adv = pit_advice(run, 3, 10)
+    assert not any(o["pit_lap"] == 15 and o["compound"] == "hard" for o in adv["options"])
+    assert any(o["pit_lap"] == 15 and o["compound"] == "soft" for o in adv["options"])
+    assert "불일치" in caplog.text
@@ -0,0 +1,45 @@
+# tests/test_tyres.py
+# -*- coding: utf-8 -*-
+"""공용 타이어 표(f1sim/engine/tyres.py) — 예전 랩 엔진 스틴트 배율과 비교."""
+from __future__ import annotations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from f1sim.engine.tyres import track_tyres
+
+# 예전 physics.stint_multiplier(스틴트 길이와 무관한 상수 배율)의 계수
+OLD_BASE_DEG = {"S": 0.010, "M": 0.006, "H": 0.004}
+TRACKS = pd.read_csv(Path(__file__).resolve().parents[1] / "data" / "tracks.csv")
+
+
+def _old(comp: str, abrasion: float, tire_mgmt: float) -> float:
+    mg = (100.0 - tire_mgmt) / 100.0
+    return 1.0 + OLD_BASE_DEG[comp] * (0.5 + 0.9 * abrasion) * (1.0 + 0.6 * mg)
+
+
+def _new(tab, comp: str, laps: int, tire_mgmt: float) -> float:
+    mg = 1.0 + 0.6 * (100.0 - tire_mgmt) / 100.0          # core/sim.py run_race 와 같은 관리 배율
+    return 1.0 + float(tab.delta(tab.index(comp), np.arange(laps), mg).mean())
+
+
+@pytest.mark.parametrize("comp", ["S", "M", "H"])
+@pytest.mark.parametrize("mgmt", [70.0, 90.0])
+def test_stint_pace_against_old_multiplier(comp, mgmt):
+    for _, row in TRACKS.iterrows():
+        tab, a = track_tyres(row), float(row["abrasion_index"])
+        old = _old(comp, a, mgmt)
+        short, mid, long_ = (_new(tab, comp, n, mgmt) for n in (15, 25, 35))
+        # 짧은 스틴트는 예전 상수 배율과 1.5% 안 — 평균 페이스 수준은 유지
+        assert abs(short - old) < 0.015
+        # 의도한 변화: 예전엔 스틴트 길이와 무관했지만, 이제 나이만큼 누적돼 길수록 느리다(예전보다 빠르지 않음)
+        assert old <= mid < long_
+        assert long_ - old < 0.05
+
+
+def test_compound_order_over_a_stint():
+    tab = track_tyres(TRACKS.iloc[0])
+    s, m, h = (_new(tab, c, 25, 80.0) for c in "SMH")
+    assert s > m > h
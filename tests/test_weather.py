@@ -0,0 +1,26 @@
+# tests/test_weather.py
+# -*- coding: utf-8 -*-
+"""날씨 타임라인(f1sim/engine/weather.py) — 엔진끼리 같은 랩에 같은 노면을 보는지."""
+from __future__ import annotations
+
+import numpy as np
+
+from f1sim.engine.weather import DEFAULT_LAP_SEC, track_lap_sec, track_weather
+
+ROW = {"rain_base_prob": 0.9, "temp_mean_c": 18.0, "temp_std_c": 4.0}
+
+
+def test_track_lap_sec_columns_and_default():
+    assert track_lap_sec(ROW) == DEFAULT_LAP_SEC
+    assert track_lap_sec({**ROW, "lap_sec": 81.5}) == 81.5
+    assert track_lap_sec({**ROW, "typical_lap_sec": 77.0, "lap_sec": 81.5}) == 77.0
+    assert track_lap_sec(None) == DEFAULT_LAP_SEC
+
+
+def test_lap_mapping_depends_only_on_lap_length():
+    # 랩 엔진(tracks.csv 한 행)과 06 페이지(weather_env dict)가 같은 랩 길이로 같은 분을 본다
+    wide = {**ROW, "name": "X", "laps": 57, "abrasion_index": 0.5}
+    a = track_weather(wide, 3, "RACE").laps(57, track_lap_sec(wide))
+    b = track_weather(ROW, 3, "RACE").laps(57, DEFAULT_LAP_SEC)
+    np.testing.assert_array_equal(a["cls"], b["cls"])
+    np.testing.assert_allclose(a["wet"], b["wet"])